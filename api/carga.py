@@ -0,0 +1,152 @@
+"""
+Teste de carga da API com relatório de latência (p50/p99).
+
+Sem `--url`, chama a aplicação ASGI em processo (mede só o custo do servidor, sem rede).
+Com `--url`, envia requisições HTTP reais a um servidor em execução.
+
+Uso:
+    python -m api.carga --rota /calcular --requisicoes 5000 --concorrencia 50
+    python -m api.carga --url http://127.0.0.1:8000 --rota /montecarlo --requisicoes 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import http.client
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+from api.esquemas import exemplo_payload, gerar_json
+
+
+@dataclass
+class RelatorioCarga:
+    requisicoes: int
+    erros: int
+    duracao_s: float
+    p50_ms: float
+    p99_ms: float
+    max_ms: float
+
+    @property
+    def vazao_rps(self) -> float:
+        return self.requisicoes / self.duracao_s if self.duracao_s > 0 else 0.0
+
+    def formatar(self) -> str:
+        return (
+            f"{self.requisicoes} requisições ({self.erros} erros) em {self.duracao_s:.2f}s — "
+            f"{self.vazao_rps:,.0f} req/s • p50 {self.p50_ms:.2f} ms • p99 {self.p99_ms:.2f} ms • máx {self.max_ms:.2f} ms"
+        )
+
+
+def _percentil(ordenados: List[float], p: float) -> float:
+    return ordenados[max(0, math.ceil(p / 100 * len(ordenados)) - 1)]
+
+
+def _relatorio(latencias: List[float], erros: int, duracao: float) -> RelatorioCarga:
+    ordenadas = sorted(latencias)
+    return RelatorioCarga(
+        requisicoes=len(ordenadas),
+        erros=erros,
+        duracao_s=duracao,
+        p50_ms=_percentil(ordenadas, 50) * 1000,
+        p99_ms=_percentil(ordenadas, 99) * 1000,
+        max_ms=ordenadas[-1] * 1000,
+    )
+
+
+async def carga_em_processo(app, rota: str, corpo: bytes, requisicoes: int, concorrencia: int) -> RelatorioCarga:
+    """Dispara `requisicoes` chamadas ASGI com no máximo `concorrencia` simultâneas."""
+    latencias: List[float] = []
+    erros = 0
+    semaforo = asyncio.Semaphore(concorrencia)
+
+    async def _uma():
+        nonlocal erros
+        async with semaforo:
+            enviado = False
+            status = 0
+
+            async def receive():
+                nonlocal enviado
+                if enviado:
+                    return {"type": "http.disconnect"}
+                enviado = True
+                return {"type": "http.request", "body": corpo, "more_body": False}
+
+            async def send(mensagem):
+                nonlocal status
+                if mensagem["type"] == "http.response.start":
+                    status = mensagem["status"]
+
+            scope = {"type": "http", "method": "POST", "path": rota, "headers": []}
+            inicio = time.perf_counter()
+            await app(scope, receive, send)
+            latencias.append(time.perf_counter() - inicio)
+            if status != 200:
+                erros += 1
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(_uma() for _ in range(requisicoes)))
+    return _relatorio(latencias, erros, time.perf_counter() - inicio)
+
+
+def carga_http(url: str, rota: str, corpo: bytes, requisicoes: int, concorrencia: int) -> RelatorioCarga:
+    """Mesma carga contra um servidor HTTP (uma conexão keep-alive por thread)."""
+    partes = urlsplit(url)
+    por_thread = [requisicoes // concorrencia + (1 if i < requisicoes % concorrencia else 0) for i in range(concorrencia)]
+
+    def _trabalhador(n: int):
+        conexao = http.client.HTTPConnection(partes.hostname, partes.port or 80, timeout=120)
+        latencias, erros = [], 0
+        for _ in range(n):
+            inicio = time.perf_counter()
+            conexao.request("POST", rota, body=corpo, headers={"Content-Type": "application/json"})
+            resposta = conexao.getresponse()
+            resposta.read()
+            latencias.append(time.perf_counter() - inicio)
+            erros += resposta.status != 200
+        conexao.close()
+        return latencias, erros
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concorrencia) as pool:
+        parciais = list(pool.map(_trabalhador, por_thread))
+    duracao = time.perf_counter() - inicio
+    return _relatorio([t for lat, _ in parciais for t in lat], sum(e for _, e in parciais), duracao)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="servidor em execução (ex.: http://127.0.0.1:8000); sem isso, roda em processo")
+    parser.add_argument("--rota", default="/calcular", choices=["/calcular", "/batch", "/montecarlo", "/pptx"])
+    parser.add_argument("--requisicoes", type=int, default=2000)
+    parser.add_argument("--concorrencia", type=int, default=32)
+    parser.add_argument("--itens-batch", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    payload = exemplo_payload()
+    if args.rota == "/batch":
+        payload = {"itens": [payload] * args.itens_batch}
+    corpo = gerar_json(payload)
+
+    if args.url:
+        relatorio = carga_http(args.url, args.rota, corpo, args.requisicoes, args.concorrencia)
+    else:
+        from api.servidor import AplicacaoAPI
+
+        app = AplicacaoAPI()
+        try:
+            relatorio = asyncio.run(carga_em_processo(app, args.rota, corpo, args.requisicoes, args.concorrencia))
+        finally:
+            app.encerrar()
+    print(f"{args.rota}: {relatorio.formatar()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Conversão entre JSON da API e os dataclasses de `models/`.
+
+Payload de cálculo:
+
+    {
+      "cliente":      {...ClienteBasicInfo},
+      "processo":     {...ProcessoAtual},
+      "dores":        {...DoresSelecionadas}, ["F01", "F05", ...] ou máscara inteira (bit 0 = F01),
+      "parametros":   {...ParametrosDetalhados},   (opcional)
+      "investimento": {...InvestimentoAutomacao},
+      "metas":        {...MetasReducao}            (opcional)
+    }
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import MISSING, asdict, fields, is_dataclass
+from typing import Any, Dict
+
+from core.validators import (
+    campos_com_tipo_invalido,
+    validar_cliente,
+    validar_investimento,
+    validar_metas,
+    validar_parametros_detalhados,
+    validar_processo_atual,
+)
+from models.inputs import (
+    ClienteBasicInfo,
+    DoresSelecionadas,
+    Formula,
+    InvestimentoAutomacao,
+    ParametrosDetalhados,
+    ProcessoAtual,
+)
+from models.results import MetasReducao
+
+try:  # decodificador JSON rápido (opcional)
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+
+class ErroPayload(ValueError):
+    """Payload inválido (vira HTTP 400)."""
+
+
+def carregar_json(corpo: bytes) -> Any:
+    try:
+        return orjson.loads(corpo) if orjson is not None else json.loads(corpo)
+    except ValueError as e:
+        raise ErroPayload(f"JSON inválido: {e}") from e
+
+
+def _sem_infinitos(valor: Any) -> Any:
+    if isinstance(valor, float) and not math.isfinite(valor):
+        return None
+    if isinstance(valor, dict):
+        return {k: _sem_infinitos(v) for k, v in valor.items()}
+    if isinstance(valor, list):
+        return [_sem_infinitos(v) for v in valor]
+    return valor
+
+
+def gerar_json(valor: Any) -> bytes:
+    """Serializa para JSON; dataclasses viram objetos e `inf`/`nan` (ex.: payback sem ganho) viram `null`."""
+    if is_dataclass(valor) and not isinstance(valor, type):
+        valor = asdict(valor)
+    valor = _sem_infinitos(valor)
+    if orjson is not None:
+        return orjson.dumps(valor)
+    return json.dumps(valor, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _dataclass_de_dict(tipo, dados: Any, rotulo: str):
+    if not isinstance(dados, dict):
+        raise ErroPayload(f"'{rotulo}' deve ser um objeto JSON.")
+    nomes = {f.name for f in fields(tipo)}
+    desconhecidos = sorted(set(dados) - nomes)
+    if desconhecidos:
+        raise ErroPayload(f"'{rotulo}': campos desconhecidos: {', '.join(desconhecidos)}")
+    faltando = [
+        f.name for f in fields(tipo) if f.default is MISSING and f.default_factory is MISSING and f.name not in dados
+    ]
+    if faltando:
+        raise ErroPayload(f"'{rotulo}': campos obrigatórios ausentes: {', '.join(faltando)}")
+    invalidos = campos_com_tipo_invalido(tipo, dados)
+    if invalidos:
+        raise ErroPayload(f"'{rotulo}': tipo inválido em: {', '.join(invalidos)}")
+    return tipo(**dados)
+
+
+def _dores_de_json(dados: Any) -> DoresSelecionadas:
+    if isinstance(dados, list):
+        invalidos = [c for c in dados if not isinstance(c, str) or c.upper() not in Formula.__members__]
+        if invalidos:
+            raise ErroPayload(f"'dores': códigos inválidos: {invalidos}")
+        return DoresSelecionadas.de_mascara(Formula.de_codigos(dados))
+    if isinstance(dados, int) and not isinstance(dados, bool):
+        if not 0 <= dados < 1 << len(Formula):
+            raise ErroPayload("'dores': máscara fora do intervalo das fórmulas F01–F18.")
+        return DoresSelecionadas.de_mascara(dados)
+    return _dataclass_de_dict(DoresSelecionadas, dados, "dores")
+
+
+def entradas_de_json(dados: Any) -> Dict[str, Any]:
+    """
+    Converte o payload nos argumentos de `ROICalculator` e aplica os mesmos validadores do app.
+
+    Levanta `ErroPayload` com a lista de erros de validação.
+    """
+    if not isinstance(dados, dict):
+        raise ErroPayload("O corpo deve ser um objeto JSON.")
+    for chave in ("cliente", "processo", "dores", "investimento"):
+        if chave not in dados:
+            raise ErroPayload(f"Campo obrigatório ausente: '{chave}'.")
+
+    entradas = {
+        "cliente": _dataclass_de_dict(ClienteBasicInfo, dados["cliente"], "cliente"),
+        "processo": _dataclass_de_dict(ProcessoAtual, dados["processo"], "processo"),
+        "dores": _dores_de_json(dados["dores"]),
+        "parametros": _dataclass_de_dict(ParametrosDetalhados, dados.get("parametros") or {}, "parametros"),
+        "investimento": _dataclass_de_dict(InvestimentoAutomacao, dados["investimento"], "investimento"),
+        "metas": _dataclass_de_dict(MetasReducao, dados.get("metas") or {}, "metas"),
+    }
+
+    erros = (
+        validar_cliente(entradas["cliente"])
+        + validar_processo_atual(entradas["processo"])
+        + validar_parametros_detalhados(entradas["parametros"], entradas["dores"], entradas["processo"])
+        + validar_investimento(entradas["investimento"])
+        + validar_metas(entradas["metas"])
+    )
+    if erros:
+        raise ErroPayload("; ".join(erros))
+    return entradas
+
+
+def exemplo_payload() -> Dict[str, Any]:
+    """Payload mínimo válido (usado pelo teste de carga e pelos testes)."""
+    return {
+        "cliente": {
+            "nome_cliente": "Lead",
+            "nome_projeto": "Automação",
+            "area_atuacao": "area_1_linhas_montagem",
+            "porte_empresa": "media",
+            "fator_encargos": 1.7,
+        },
+        "processo": {"cadencia_producao": 10.0, "faturamento_mensal_linha": 1_760_000.0},
+        "dores": ["F01", "F02", "F06", "F10"],
+        "parametros": {
+            "f02_media_he_mes_por_pessoa": 10.0,
+            "f10_paradas_mes": 4,
+            "f10_duracao_media_parada_horas": 1.0,
+        },
+        "investimento": {"valor_investimento_min": 400_000.0, "valor_investimento_max": 600_000.0},
+        "metas": {"meta_f01": 0.5, "meta_f02": 0.7, "meta_f06": 1.0, "meta_f10": 0.5},
+    }
@@ -0,0 +1,299 @@
+"""
+API HTTP/JSON de cálculo (ASGI, sem framework).
+
+Rotas (todas POST, corpo JSON no formato de `api.esquemas`):
+
+- `/calcular`   — resultados financeiros (cálculo puro, executado no próprio loop); com `"exato": true`
+  no payload, pelo modo exato em centavos (`core.centavos`).
+- `/batch`      — `{"itens": [payload, ...], "exato": false}` → `{"resultados": [...]}` (erros por item).
+- `/montecarlo` — payload + `"simulacao": {"iteracoes", "variacao", "semente", "benchmark"}` (pool de
+  processos); com `"benchmark": true`, a variação de cada fórmula vem da tabela de benchmarks;
+  `"correlacoes": [[campo, campo, ρ], ...]` sorteia essas entradas correlacionadas (`core.correlacao`).
+- `/pptx`       — apresentação `.pptx` (pool de processos).
+- `GET /saude`  — status e métricas.
+
+Com `ROI_REPOSITORIO_SQLITE` configurado, as análises de `/calcular` e `/batch` são gravadas no
+repositório (`core.repositorio`; o lote em uma única transação), em uma thread fora do loop.
+
+Requisições idênticas em andamento para `/montecarlo` e `/pptx` compartilham o mesmo trabalho.
+
+Uso:
+    uvicorn api.servidor:app --workers 1
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from api.esquemas import ErroPayload, carregar_json, entradas_de_json, gerar_json
+from config.constants import (
+    API_MAX_CORPO_BYTES,
+    API_MAX_ITENS_BATCH,
+    API_MAX_WORKERS,
+    MONTECARLO_ITERACOES_DEFAULT,
+    MONTECARLO_MAX_ITERACOES,
+    MONTECARLO_VARIACAO_DEFAULT,
+)
+from core.benchmarks import variacoes_montecarlo
+from core.cache import chave_entradas
+from core.calculator import ROICalculator
+from core.centavos import calcular_exato
+from core.correlacao import EspecCorrelacao, fator_correlacao
+from core.montecarlo import simular_montecarlo
+from core.repositorio import RepositorioAnalises, obter_repositorio
+from core.validators import formulas_selecionadas
+from models.results import ResultadosFinanceiros
+
+MIME_PPTX = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+
+class ErroHTTP(Exception):
+    def __init__(self, status: int, mensagem: str):
+        super().__init__(mensagem)
+        self.status = status
+        self.mensagem = mensagem
+
+
+# --- Tarefas executadas nos processos do pool (precisam ser funções de módulo) ---
+
+def _tarefa_montecarlo(entradas: Dict[str, Any], simulacao: Dict[str, Any]) -> Dict[str, Any]:
+    return asdict(simular_montecarlo(**entradas, **simulacao))
+
+
+def _tarefa_pptx(entradas: Dict[str, Any]) -> bytes:
+    from export.pptx_generator import PPTXGenerator
+
+    resultados = ROICalculator(**entradas).calcular(rastrear=True)
+    return PPTXGenerator().gerar(resultados=resultados, **entradas).getvalue()
+
+
+def _flag_exato(dados: Any) -> bool:
+    exato = dados.pop("exato", False) if isinstance(dados, dict) else False
+    if not isinstance(exato, bool):
+        raise ErroPayload("'exato' deve ser booleano.")
+    return exato
+
+
+def _calcular_resultados(entradas: Dict[str, Any], exato: bool) -> ResultadosFinanceiros:
+    return calcular_exato(**entradas) if exato else ROICalculator(**entradas).calcular()
+
+
+def _parametros_simulacao(dados: Any) -> Dict[str, Any]:
+    if dados is None:
+        dados = {}
+    if not isinstance(dados, dict):
+        raise ErroPayload("'simulacao' deve ser um objeto JSON.")
+    iteracoes = dados.get("iteracoes", MONTECARLO_ITERACOES_DEFAULT)
+    variacao = dados.get("variacao", MONTECARLO_VARIACAO_DEFAULT)
+    semente = dados.get("semente")
+    benchmark = dados.get("benchmark", False)
+    if not isinstance(iteracoes, int) or not (1 <= iteracoes <= MONTECARLO_MAX_ITERACOES):
+        raise ErroPayload(f"'simulacao.iteracoes' deve ser inteiro entre 1 e {MONTECARLO_MAX_ITERACOES}.")
+    if not isinstance(variacao, (int, float)) or not (0 <= variacao < 1):
+        raise ErroPayload("'simulacao.variacao' deve estar em [0, 1).")
+    if semente is not None and not isinstance(semente, int):
+        raise ErroPayload("'simulacao.semente' deve ser inteiro.")
+    if not isinstance(benchmark, bool):
+        raise ErroPayload("'simulacao.benchmark' deve ser booleano.")
+    parametros = {"iteracoes": iteracoes, "variacao": float(variacao), "semente": semente, "benchmark": benchmark}
+    correlacoes = dados.get("correlacoes")
+    if correlacoes is not None:
+        if not isinstance(correlacoes, list) or not all(
+            isinstance(par, list) and len(par) == 3 and isinstance(par[0], str) and isinstance(par[1], str)
+            and isinstance(par[2], (int, float)) and not isinstance(par[2], bool)
+            for par in correlacoes
+        ):
+            raise ErroPayload("'simulacao.correlacoes' deve ser uma lista de [campo, campo, correlação].")
+        try:
+            parametros["correlacao"] = EspecCorrelacao.de_pares(correlacoes)
+            fator_correlacao(parametros["correlacao"])
+        except ValueError as erro:
+            raise ErroPayload(f"'simulacao.correlacoes': {erro}") from erro
+    return parametros
+
+
+@dataclass
+class MetricasAPI:
+    requisicoes: int = 0
+    erros: int = 0
+    coalescidas: int = 0  # requisições atendidas por trabalho já em andamento
+
+
+class AplicacaoAPI:
+    """
+    Aplicação ASGI.
+
+    `executor` permite injetar o pool (ex.: `ThreadPoolExecutor` em testes); sem ele, um
+    `ProcessPoolExecutor(API_MAX_WORKERS)` é criado no startup (ou na primeira tarefa).
+    """
+
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        max_workers: int = API_MAX_WORKERS,
+        repositorio: Optional[RepositorioAnalises] = None,
+    ):
+        self._executor = executor
+        self._repositorio = repositorio if repositorio is not None else obter_repositorio()
+        self._executor_proprio = executor is None
+        self._max_workers = max_workers
+        self._em_andamento: Dict[str, asyncio.Future] = {}
+        self.metricas = MetricasAPI()
+        self._rotas: Dict[str, Callable[[Any], Awaitable[tuple]]] = {
+            "/calcular": self._calcular,
+            "/batch": self._batch,
+            "/montecarlo": self._montecarlo,
+            "/pptx": self._pptx,
+        }
+
+    # --- ASGI ---
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            mensagem = await receive()
+            if mensagem["type"] == "lifespan.startup":
+                self._obter_executor()
+                await send({"type": "lifespan.startup.complete"})
+            elif mensagem["type"] == "lifespan.shutdown":
+                self.encerrar()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _http(self, scope, receive, send):
+        self.metricas.requisicoes += 1
+        caminho, metodo = scope["path"], scope["method"]
+        try:
+            if caminho == "/saude" and metodo == "GET":
+                status, corpo, tipo = 200, gerar_json({"status": "ok", **asdict(self.metricas)}), "application/json"
+            elif caminho not in self._rotas:
+                raise ErroHTTP(404, "Rota não encontrada.")
+            elif metodo != "POST":
+                raise ErroHTTP(405, "Use POST.")
+            else:
+                dados = carregar_json(await self._ler_corpo(receive))
+                status, corpo, tipo = await self._rotas[caminho](dados)
+        except ErroPayload as e:
+            self.metricas.erros += 1
+            status, corpo, tipo = 400, gerar_json({"erro": str(e)}), "application/json"
+        except ErroHTTP as e:
+            self.metricas.erros += 1
+            status, corpo, tipo = e.status, gerar_json({"erro": e.mensagem}), "application/json"
+        except Exception as e:  # noqa: BLE001 - qualquer falha vira 500 com a mensagem
+            self.metricas.erros += 1
+            status, corpo, tipo = 500, gerar_json({"erro": f"{type(e).__name__}: {e}"}), "application/json"
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(b"content-type", tipo.encode()), (b"content-length", str(len(corpo)).encode())],
+            }
+        )
+        await send({"type": "http.response.body", "body": corpo})
+
+    async def _ler_corpo(self, receive) -> bytes:
+        partes = []
+        tamanho = 0
+        while True:
+            mensagem = await receive()
+            if mensagem["type"] == "http.disconnect":
+                raise ErroHTTP(400, "Conexão encerrada pelo cliente.")
+            parte = mensagem.get("body", b"")
+            tamanho += len(parte)
+            if tamanho > API_MAX_CORPO_BYTES:
+                raise ErroHTTP(413, f"Corpo excede {API_MAX_CORPO_BYTES} bytes.")
+            partes.append(parte)
+            if not mensagem.get("more_body", False):
+                return b"".join(partes)
+
+    # --- Pool e coalescência ---
+
+    def _obter_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+        return self._executor
+
+    def encerrar(self):
+        if self._executor is not None and self._executor_proprio:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _no_pool(self, chave: str, funcao, *args):
+        """Executa `funcao(*args)` no pool; requisições com a mesma `chave` em andamento aguardam o mesmo futuro."""
+        futuro = self._em_andamento.get(chave)
+        if futuro is not None:
+            self.metricas.coalescidas += 1
+        else:
+            loop = asyncio.get_running_loop()
+            futuro = asyncio.ensure_future(loop.run_in_executor(self._obter_executor(), funcao, *args))
+            self._em_andamento[chave] = futuro
+            futuro.add_done_callback(lambda _: self._em_andamento.pop(chave, None))
+        # `shield`: se um cliente desconectar, o trabalho continua para os demais
+        return await asyncio.shield(futuro)
+
+    async def _gravar(self, gravacao, *args):
+        """Executa a gravação no SQLite em uma thread (executor padrão do loop), sem bloquear o loop."""
+        await asyncio.get_running_loop().run_in_executor(None, gravacao, *args)
+
+    # --- Rotas ---
+
+    async def _calcular(self, dados):
+        exato = _flag_exato(dados)
+        entradas = entradas_de_json(dados)
+        resultados = _calcular_resultados(entradas, exato)
+        if self._repositorio is not None:
+            await self._gravar(self._repositorio.salvar, entradas, resultados)
+        return 200, gerar_json(resultados), "application/json"
+
+    async def _batch(self, dados):
+        exato = _flag_exato(dados)
+        itens = dados.get("itens") if isinstance(dados, dict) else None
+        if not isinstance(itens, list):
+            raise ErroPayload("Envie {\"itens\": [payload, ...]}.")
+        if len(itens) > API_MAX_ITENS_BATCH:
+            raise ErroHTTP(413, f"Máximo de {API_MAX_ITENS_BATCH} itens por lote.")
+
+        resultados, concluidas = [], []
+        for item in itens:
+            try:
+                entradas = entradas_de_json(item)
+                calculado = _calcular_resultados(entradas, exato)
+            except ErroPayload as e:
+                resultados.append({"erro": str(e)})
+            except Exception as e:  # noqa: BLE001 - a falha de um item não derruba o lote
+                resultados.append({"erro": f"{type(e).__name__}: {e}"})
+            else:
+                resultados.append(asdict(calculado))
+                concluidas.append((entradas, calculado, None))
+        if self._repositorio is not None:
+            await self._gravar(self._repositorio.salvar_lote, concluidas)
+        return 200, gerar_json({"resultados": resultados}), "application/json"
+
+    async def _montecarlo(self, dados):
+        simulacao = _parametros_simulacao(dados.pop("simulacao", None) if isinstance(dados, dict) else None)
+        entradas = entradas_de_json(dados)
+        if simulacao.pop("benchmark"):
+            simulacao["variacoes"] = variacoes_montecarlo(
+                entradas["cliente"], formulas_selecionadas(entradas["dores"])
+            )
+        chave = chave_entradas("montecarlo", *entradas.values(), simulacao)
+        resultado = await self._no_pool(chave, _tarefa_montecarlo, entradas, simulacao)
+        return 200, gerar_json(resultado), "application/json"
+
+    async def _pptx(self, dados):
+        entradas = entradas_de_json(dados)
+        chave = chave_entradas("pptx", *entradas.values())
+        conteudo = await self._no_pool(chave, _tarefa_pptx, entradas)
+        return 200, conteudo, MIME_PPTX
+
+
+app = AplicacaoAPI()
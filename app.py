@@ -1,8 +1,24 @@
 """
 ROI Calculator - MVP
 Ferramenta web para acelerar propostas comerciais de projetos de automação industrial.
+
+Dependências pesadas (pandas no dashboard, python-pptx/lxml na exportação) são importadas
+apenas quando a etapa correspondente é alcançada. Com `ROI_PERFIL_INICIALIZACAO=1`, a barra
+lateral mostra o tempo do script e quais desses módulos já estão carregados.
+
+Objetos grandes da sessão (deck PPTX) ficam em `core.memoria_sessoes`,
+com orçamento de memória por sessão; com `ROI_ADMIN=1`, a barra lateral mostra o uso por sessão.
 """
-import streamlit as st
+import time
+
+_INICIO_SCRIPT = time.perf_counter()
+
+import copy  # noqa: E402
+import os  # noqa: E402
+import sys  # noqa: E402
+from datetime import datetime  # noqa: E402
+
+import streamlit as st  # noqa: E402
 
 from ui.styles import apply_custom_styles
 from ui.forms import (
@@ -11,16 +27,35 @@ from ui.forms import (
     render_parametros_detalhados,
     render_metas_reducao,
     render_investimento,
+    valores_widgets,
 )
-from ui.dashboard import render_dashboard
+from core.armazenamento import obter_armazenamento
+from core.atribuicao import atribuicao_shapley
+from core.cache import CACHES, chave_entradas, obter_cache
+from core.memoria_sessoes import DEPOSITO
 from core.calculator import ROICalculator
+from core.especulacao import ESPECULADOR_CALCULO
+from core.intervalos import indicadores_faixa
+from core.links import ErroLink, codificar_link, decodificar_link
 from core.validators import (
     validar_cliente,
     validar_investimento,
+    validar_metas,
     validar_parametros_detalhados,
     validar_processo_atual,
 )
-from export.pptx_generator import PPTXGenerator
+from core.previa import PreviaIncremental
+from core.repositorio import obter_repositorio
+from core.sessoes import novo_token, restaurar_sessao, salvar_sessao
+from config.constants import (
+    ADMIN_ENV,
+    EXPORT_INTERVALO_POLL_SEGUNDOS,
+    LINK_PARAMETRO_URL,
+    MODULOS_PESADOS,
+    PREVIA_INTERVALO_SEGUNDOS,
+)
+from export.jobs import CANCELADO, CONCLUIDO, ERRO, GERENCIADOR, ControleJob
+from models.results import CAMPOS_BREAKDOWN
 
 st.set_page_config(
     page_title="Calculadora do Custo da Inação",
@@ -33,27 +68,151 @@ apply_custom_styles()
 
 TOTAL_ETAPAS = 7
 
+CHAVES_CALCULO = ["cliente", "processo", "dores", "parametros", "investimento", "metas"]
+CHAVES_EXPORTACAO = [
+    "cliente", "processo", "dores", "resultados", "metas", "investimento", "parametros", "mapa_equilibrio",
+]
+
 
 def _init_state():
-    """Inicializa session_state se necessário."""
+    """Inicializa session_state se necessário (a partir de um link de análise ou da sessão compartilhada)."""
     if "etapa" not in st.session_state:
-        st.session_state["etapa"] = 0
+        # Um link de análise abre uma sessão nova, mesmo que a URL também traga `?sessao=` de quem o copiou
+        _restaurar_sessao_compartilhada(restaurar=not _carregar_link_analise())
+        st.session_state.setdefault("etapa", 0)
+    # Identifica a sessão no depósito de memória (o token compartilhado, quando existe)
+    st.session_state.setdefault("sessao_id", st.session_state.get("sessao_token") or novo_token())
+
+
+def _carregar_link_analise() -> bool:
+    """
+    `?analise=<blob>` (ver `core.links`): reconstrói entradas e widgets e abre direto nos resultados.
+
+    Retorna True se o link foi carregado; link inválido vira uma mensagem e a sessão começa vazia.
+    """
+    texto = st.query_params.get(LINK_PARAMETRO_URL)
+    if not texto:
+        return False
+    try:
+        estado = decodificar_link(texto)
+    except ErroLink as e:
+        st.error(f"Link de análise inválido: {e}")
+        return False
+
+    faltando = [k for k in CHAVES_CALCULO if k not in estado]
+    erros = [f"Entradas ausentes: {', '.join(faltando)}"] if faltando else (
+        validar_cliente(estado["cliente"])
+        + validar_processo_atual(estado["processo"])
+        + validar_parametros_detalhados(estado["parametros"], estado["dores"], estado["processo"])
+        + validar_investimento(estado["investimento"])
+        + validar_metas(estado["metas"])
+    )
+    if erros:
+        st.error("Link de análise com dados inválidos: " + "; ".join(erros))
+        return False
+
+    st.session_state.update(valores_widgets(**estado))
+    st.session_state.update(estado)
+    st.session_state["parametros_validos"] = True
+    st.session_state["etapa"] = 6
+    # Quem abre um link revê uma análise já registrada por quem o gerou: não grava de novo
+    st.session_state["analise_registrada"] = chave_entradas(*(estado[k] for k in CHAVES_CALCULO))
+    return True
+
+
+def _registrar_analise(chave: str, entradas: dict, resultados):
+    """
+    Grava a análise concluída no repositório (se configurado), uma vez por conjunto de entradas.
+    A análise aberta por um link não é gravada de novo (ver `_carregar_link_analise`).
+    """
+    repositorio = obter_repositorio()
+    if repositorio is None or st.session_state.get("analise_registrada") == chave:
+        return
+    repositorio.salvar(entradas, resultados)
+    st.session_state["analise_registrada"] = chave
+
+
+def _percentis_benchmark(resultados) -> dict:
+    """Percentil de cada custo entre as análises gravadas da mesma área e porte (vazio sem repositório)."""
+    repositorio = obter_repositorio()
+    if repositorio is None:
+        return {}
+    custos = {}
+    for nome in CAMPOS_BREAKDOWN:
+        custos.update(getattr(resultados, nome))
+    return repositorio.percentis(resultados.area_atuacao, resultados.porte_empresa, custos)
+
+
+def _render_link_analise():
+    """Mantém na URL o link da análise atual (`?analise=`), pronto para copiar e compartilhar."""
+    texto = codificar_link({k: st.session_state[k] for k in CHAVES_CALCULO})
+    if st.query_params.get(LINK_PARAMETRO_URL) != texto:
+        st.query_params[LINK_PARAMETRO_URL] = texto
+    if obter_repositorio() is not None:
+        gravado = "a análise também fica registrada no servidor, na base de comparação."
+    elif obter_armazenamento() is not None:
+        gravado = "o estado da sessão também fica gravado no servidor, para retomá-la."
+    else:
+        gravado = "nada fica gravado no servidor."
+    st.caption(
+        f"🔗 O endereço desta página contém a análise completa ({len(texto)} caracteres): "
+        f"copie-o para reabrir ou compartilhar — {gravado}"
+    )
+
+
+def _restaurar_sessao_compartilhada(restaurar: bool = True):
+    """
+    Com armazenamento compartilhado, a sessão é identificada por `?sessao=<token>` na URL.
+    Uma réplica sem estado local para o token (reinício/troca de réplica) restaura o instantâneo;
+    com `restaurar=False`, a sessão recebe um token novo.
+    """
+    armazenamento = obter_armazenamento()
+    if armazenamento is None:
+        return
+    token = st.query_params.get("sessao") if restaurar else None
+    if token:
+        st.session_state.update(restaurar_sessao(armazenamento, token) or {})
+    else:
+        token = novo_token()
+        st.query_params["sessao"] = token
+    st.session_state["sessao_token"] = token
+
+
+def _salvar_sessao_compartilhada(so_se_mudou: bool = False):
+    """
+    Grava o instantâneo da sessão. Com `so_se_mudou`, só quando as entradas do wizard mudaram desde
+    a última gravação — a comparação dos dataclasses evita serializar a sessão a cada rerun.
+    """
+    armazenamento = obter_armazenamento()
+    token = st.session_state.get("sessao_token")
+    if armazenamento is None or token is None:
+        return
+    entradas = [st.session_state.get(k) for k in CHAVES_CALCULO]
+    if so_se_mudou and entradas == st.session_state.get("sessao_entradas_salvas"):
+        return
+    st.session_state["sessao_digest"] = salvar_sessao(
+        armazenamento, token, st.session_state, st.session_state.get("sessao_digest")
+    )
+    st.session_state["sessao_entradas_salvas"] = [copy.copy(v) for v in entradas]
 
 
 def _nav_buttons(etapa: int, *, can_advance: bool = True):
-    """Renderiza botões de navegação."""
+    """Renderiza botões de navegação (grava o instantâneo da sessão ao navegar ou se as entradas mudaram)."""
+    _salvar_sessao_compartilhada(so_se_mudou=True)
     col1, _, col3 = st.columns([1, 2, 1])
 
     with col1:
         if etapa > 1:
             if st.button("← Voltar", key=f"voltar_{etapa}"):
                 st.session_state["etapa"] = etapa - 1
+                _salvar_sessao_compartilhada()
                 st.rerun()
 
     with col3:
         if etapa < TOTAL_ETAPAS:
             if st.button("Próximo →", key=f"proximo_{etapa}", type="primary", disabled=not can_advance):
                 st.session_state["etapa"] = etapa + 1
+                _salvar_sessao_compartilhada()
                 st.rerun()
 
 
@@ -69,6 +228,8 @@ def _render_progress(etapa: int):
 
 def main():
     _init_state()
+    DEPOSITO.limpar_inativas_se_devido()
+    _render_metricas_cache()
     etapa = st.session_state["etapa"]
 
     # --- Tela Inicial ---
@@ -93,89 +254,192 @@ def main():
         )
         if st.button("Nova Análise", type="primary", use_container_width=True):
             st.session_state["etapa"] = 1
+            _salvar_sessao_compartilhada()
             st.rerun()
         return
 
     # --- Etapas do fluxo ---
     st.title("📉 Calculadora do Custo da Inação")
     _render_progress(etapa)
+    if etapa in ETAPAS_COM_PREVIA:
+        _render_previa()
     st.markdown("---")
 
-    # Etapa 1: Dados Básicos
-    if etapa == 1:
-        cliente, processo = render_dados_basicos()
-        erros = validar_cliente(cliente) + validar_processo_atual(processo)
-        if erros:
-            for e in erros:
-                st.error(e)
-        else:
-            st.session_state["cliente"] = cliente
-            st.session_state["processo"] = processo
-        _nav_buttons(etapa, can_advance=not bool(erros))
-
-    # Etapa 2: Seleção de Dores
-    elif etapa == 2:
-        cliente = st.session_state.get("cliente")
-        if cliente is None:
-            st.warning("Volte à etapa 1 e preencha os dados do cliente.")
-        else:
-            dores = render_selecao_dores(cliente.area_atuacao)
-            st.session_state["dores"] = dores
-        _nav_buttons(etapa, can_advance=cliente is not None)
-
-    # Etapa 3: Parâmetros Detalhados
-    elif etapa == 3:
-        dores = st.session_state.get("dores")
-        cliente = st.session_state.get("cliente")
-        processo = st.session_state.get("processo")
-        if dores is None:
-            st.warning("Volte à etapa 2 e selecione as dores.")
-        elif cliente is None or processo is None:
-            st.warning("Volte à etapa 1 e preencha os dados básicos.")
-        else:
-            parametros = render_parametros_detalhados(dores, processo=processo, cliente=cliente)
-            erros = validar_parametros_detalhados(parametros, dores, processo)
-            if erros:
-                for e in erros:
-                    st.error(e)
-            else:
-                st.session_state["parametros"] = parametros
-        _nav_buttons(etapa, can_advance=(dores is not None and cliente is not None and processo is not None and not bool(erros)))
-
-    # Etapa 4: Metas de Redução
-    elif etapa == 4:
-        dores = st.session_state.get("dores")
-        if dores is None:
-            st.warning("Volte à etapa 2 e selecione as dores.")
-        else:
-            metas = render_metas_reducao(dores)
-            st.session_state["metas"] = metas
-        _nav_buttons(etapa, can_advance=dores is not None)
-
-    # Etapa 5: Investimento
-    elif etapa == 5:
-        investimento = render_investimento()
-        erros = validar_investimento(investimento)
-        if erros:
-            for e in erros:
-                st.error(e)
-        else:
-            st.session_state["investimento"] = investimento
-        _nav_buttons(etapa, can_advance=not bool(erros))
-
-    # Etapa 6: Dashboard de Resultados
-    elif etapa == 6:
-        _run_calculo_e_dashboard()
-        _nav_buttons(etapa)
+    ETAPAS[etapa]()
+
+
+# Cada etapa é um fragmento: interagir com um campo reexecuta só a etapa (formulário, validação
+# e navegação), sem título/progresso/barra lateral. A navegação usa `st.rerun()` (escopo app).
+
+@st.fragment
+def _etapa_dados_basicos():
+    cliente, processo = render_dados_basicos()
+    erros = validar_cliente(cliente) + validar_processo_atual(processo)
+    if erros:
+        for e in erros:
+            st.error(e)
+    else:
+        st.session_state["cliente"] = cliente
+        st.session_state["processo"] = processo
+    _nav_buttons(1, can_advance=not bool(erros))
+
+
+@st.fragment
+def _etapa_selecao_dores():
+    cliente = st.session_state.get("cliente")
+    if cliente is None:
+        st.warning("Volte à etapa 1 e preencha os dados do cliente.")
+    else:
+        dores = render_selecao_dores(cliente.area_atuacao)
+        st.session_state["dores"] = dores
+    _nav_buttons(2, can_advance=cliente is not None)
+
+
+@st.fragment
+def _etapa_parametros():
+    dores = st.session_state.get("dores")
+    cliente = st.session_state.get("cliente")
+    processo = st.session_state.get("processo")
+    erros = []
+    if dores is None:
+        st.warning("Volte à etapa 2 e selecione as dores.")
+    elif cliente is None or processo is None:
+        st.warning("Volte à etapa 1 e preencha os dados básicos.")
+    else:
+        # Durante a renderização completa da etapa os blocos não precisam reexecutar nada:
+        # o estado consolidado é salvo logo abaixo, antes dos botões de navegação.
+        st.session_state["parametros_em_render"] = True
+        try:
+            parametros, erros = render_parametros_detalhados(
+                dores, processo=processo, cliente=cliente, ao_validar=_ao_validar_parametros
+            )
+        finally:
+            st.session_state["parametros_em_render"] = False
+        _salvar_parametros(parametros, erros)
+    _nav_buttons(3, can_advance=(dores is not None and cliente is not None and processo is not None and not bool(erros)))
+
+
+@st.fragment
+def _etapa_metas():
+    dores = st.session_state.get("dores")
+    if dores is None:
+        st.warning("Volte à etapa 2 e selecione as dores.")
+    else:
+        metas = render_metas_reducao(dores)
+        st.session_state["metas"] = metas
+    _nav_buttons(4, can_advance=dores is not None)
+
+
+@st.fragment
+def _etapa_investimento():
+    investimento = render_investimento()
+    erros = validar_investimento(investimento)
+    if erros:
+        for e in erros:
+            st.error(e)
+    else:
+        st.session_state["investimento"] = investimento
+        _especular_calculo()
+    _nav_buttons(5, can_advance=not bool(erros))
+
+
+@st.fragment
+def _etapa_resultados():
+    _run_calculo_e_dashboard()
+    _nav_buttons(6)
+
+
+@st.fragment
+def _etapa_exportar():
+    _render_exportar()
+    _nav_buttons(7)
+
+
+ETAPAS = {
+    1: _etapa_dados_basicos,
+    2: _etapa_selecao_dores,
+    3: _etapa_parametros,
+    4: _etapa_metas,
+    5: _etapa_investimento,
+    6: _etapa_resultados,
+    7: _etapa_exportar,
+}
+
+
+ETAPAS_COM_PREVIA = {3, 4, 5}
+
+
+@st.fragment(run_every=PREVIA_INTERVALO_SEGUNDOS)
+def _render_previa():
+    """
+    Painel fixo com custo da inação, ganho e payback enquanto os parâmetros são editados.
+
+    Roda no próprio ciclo (`run_every`) lendo o estado mais recente da sessão, então várias edições
+    entre dois ciclos resultam em uma única atualização; `PreviaIncremental` reavalia só as
+    fórmulas cujos campos mudaram.
+    """
+    cliente = st.session_state.get("cliente")
+    processo = st.session_state.get("processo")
+    dores = st.session_state.get("dores")
+    if cliente is None or processo is None or dores is None:
+        return
 
-    # Etapa 7: Exportar PPTX
-    elif etapa == 7:
-        _render_exportar()
-        _nav_buttons(etapa)
+    motor = st.session_state.setdefault("previa_motor", PreviaIncremental())
+    previa = motor.atualizar(
+        cliente,
+        processo,
+        dores,
+        st.session_state.get("parametros"),
+        st.session_state.get("metas"),
+        st.session_state.get("investimento"),
+    )
+
+    with st.container(border=True):
+        st.markdown('<div class="previa-roi"></div>', unsafe_allow_html=True)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Custo da Inação (Anual)", f"R$ {previa.custo_total_anual_inacao:,.2f}")
+        with col2:
+            ganho_txt = f"R$ {previa.ganho_anual_potencial:,.2f}" if previa.ganho_anual_potencial is not None else "—"
+            st.metric("Ganho Anual Potencial", ganho_txt)
+        with col3:
+            if previa.payback_anos is None:
+                payback_txt = "—"
+            elif previa.payback_anos == float("inf"):
+                payback_txt = "N/A"
+            else:
+                payback_txt = f"{previa.payback_anos:.2f} anos"
+            st.metric("Payback Simples", payback_txt)
+
+
+def _salvar_parametros(parametros, erros: list[str]) -> bool:
+    """Persiste os parâmetros se válidos. Retorna True se a validade da etapa mudou."""
+    valido = not erros
+    if valido:
+        st.session_state["parametros"] = parametros
+    mudou = st.session_state.get("parametros_validos") != valido
+    st.session_state["parametros_validos"] = valido
+    return mudou
+
+
+def _ao_validar_parametros(parametros, erros: list[str]):
+    """
+    Chamado por cada bloco de fórmula da etapa 3. Numa reexecução isolada do bloco, persiste o
+    estado consolidado e, se a etapa passou a (in)válida, reexecuta o app para atualizar "Próximo".
+    """
+    if st.session_state.get("parametros_em_render"):
+        return
+    if _salvar_parametros(parametros, erros):
+        st.rerun()
 
 
 def _render_exportar():
-    """Renderiza etapa de exportação do PPTX."""
+    """
+    Renderiza etapa de exportação do PPTX.
+
+    A geração roda em segundo plano (`export.jobs`); cada rerun apenas consulta o status do job.
+    O polling reexecuta só o fragmento da etapa 7.
+    """
     st.header("7 - Exportar Apresentação")
 
     required_keys = ["cliente", "processo", "dores", "resultados", "metas", "investimento"]
@@ -187,60 +451,244 @@ def _render_exportar():
 
     st.success("Apresentação pronta para ser gerada com 16+ slides customizados.")
 
-    if st.button("Gerar Apresentação PPTX", type="primary", use_container_width=True):
-        with st.spinner("Gerando apresentação..."):
-            try:
-                gen = PPTXGenerator()
-                buffer = gen.gerar(
-                    cliente=st.session_state["cliente"],
-                    processo=st.session_state["processo"],
-                    dores=st.session_state["dores"],
-                    resultados=st.session_state["resultados"],
-                    metas=st.session_state["metas"],
-                    investimento=st.session_state["investimento"],
-                    parametros=st.session_state.get("parametros"),
-                )
-                st.session_state["pptx_buffer"] = buffer
-            except Exception as e:
-                st.error(f"Erro ao gerar apresentação: {e}")
-
-    if "pptx_buffer" in st.session_state:
+    entradas = {k: st.session_state.get(k) for k in CHAVES_EXPORTACAO}
+    chave = _chave_exportacao(entradas)
+
+    # Deck de entradas antigas não pode ser baixado; deck já gerado (ex.: especulativo) é entregue direto.
+    if st.session_state.get("pptx_buffer_chave") != chave:
+        _descartar_pptx_buffer()
+        conteudo = obter_cache("pptx").obter(chave)
+        if conteudo is not None:
+            _definir_pptx_buffer(chave, conteudo)
+
+    # Deck especulativo (iniciado na etapa 6) ainda em geração: acompanha o mesmo job.
+    especulativo = st.session_state.get("pptx_especulativo")
+    if (
+        "pptx_buffer_chave" not in st.session_state
+        and "pptx_job_id" not in st.session_state
+        and especulativo is not None
+        and especulativo["chave"] == chave
+    ):
+        st.session_state["pptx_job_id"] = especulativo["job_id"]
+
+    job_id = st.session_state.get("pptx_job_id")
+    job = GERENCIADOR.obter(job_id) if job_id else None
+    em_andamento = job is not None and not job.finalizado
+
+    if st.button("Gerar Apresentação PPTX", type="primary", use_container_width=True, disabled=em_andamento):
+        conteudo = obter_cache("pptx").obter(chave)
+        if conteudo is not None:
+            _definir_pptx_buffer(chave, conteudo)
+        else:
+            st.session_state["pptx_job_id"] = GERENCIADOR.submeter(
+                chave,
+                lambda controle: _gerar_pptx_bytes(chave, entradas, controle),
+                inscrito=st.session_state["sessao_id"],
+            )
+            st.rerun(scope="fragment")
+
+    if job is not None:
+        if em_andamento:
+            _acompanhar_exportacao(job.id)
+        elif job.status == CONCLUIDO:
+            if job.chave == chave:
+                _definir_pptx_buffer(chave, job.resultado)
+            del st.session_state["pptx_job_id"]
+        elif job.status == CANCELADO:
+            st.info("Geração da apresentação cancelada.")
+            del st.session_state["pptx_job_id"]
+        elif job.status == ERRO:
+            st.error(f"Erro ao gerar apresentação: {job.erro}")
+            del st.session_state["pptx_job_id"]
+
+    deck = DEPOSITO.obter(st.session_state["sessao_id"], "pptx") if "pptx_buffer_chave" in st.session_state else None
+    if deck is not None:
         nome_cliente = st.session_state["cliente"].nome_cliente or "cliente"
         nome_arquivo = f"analise_{nome_cliente.replace(' ', '_')}.pptx"
         st.download_button(
             label="Baixar Apresentação (.pptx)",
-            data=st.session_state["pptx_buffer"],
+            data=deck,
             file_name=nome_arquivo,
             mime="application/vnd.openxmlformats-officedocument.presentationml.presentation",
             use_container_width=True,
         )
 
 
+@st.fragment(run_every=EXPORT_INTERVALO_POLL_SEGUNDOS)
+def _acompanhar_exportacao(job_id: str):
+    """
+    Progresso do job de exportação, atualizado no próprio ciclo (`run_every`) sem bloquear o script.
+
+    Só é renderizado enquanto o job está em andamento; ao terminar, reexecuta o app para a etapa 7
+    entregar o deck (ou a mensagem de cancelamento/erro).
+    """
+    job = GERENCIADOR.obter(job_id)
+    if job is None or job.finalizado:
+        st.rerun()
+    st.progress(
+        job.progresso,
+        text=f"Gerando apresentação... etapa {job.etapas_concluidas}/{job.total_etapas or '?'}",
+    )
+    if st.button("Cancelar geração", key="cancelar_pptx"):
+        if not GERENCIADOR.cancelar(job.id, st.session_state["sessao_id"]):
+            # Outra sessão aguarda o mesmo deck: o job segue, esta sessão apenas deixa de acompanhá-lo.
+            st.session_state.pop("pptx_job_id", None)
+            st.session_state.pop("pptx_especulativo", None)
+        st.rerun()
+
+
+def _chave_exportacao(entradas: dict) -> str:
+    """Chave do deck: entradas + data (o deck inclui a data na capa)."""
+    return chave_entradas(*entradas.values(), datetime.now().strftime("%Y-%m-%d"))
+
+
+def _definir_pptx_buffer(chave: str, conteudo: bytes):
+    """O deck fica no depósito da sessão (pode ir para disco); o session_state guarda só a chave."""
+    DEPOSITO.guardar(st.session_state["sessao_id"], "pptx", conteudo)
+    st.session_state["pptx_buffer_chave"] = chave
+
+
+def _descartar_pptx_buffer():
+    DEPOSITO.remover(st.session_state["sessao_id"], "pptx")
+    st.session_state.pop("pptx_buffer_chave", None)
+
+
+def _gerar_pptx_bytes(chave: str, entradas: dict, controle: ControleJob) -> bytes:
+    """
+    Gera o PPTX (executa no worker; não acessa `st.session_state`) e guarda os bytes no cache.
+    """
+    from export.pptx_generator import PPTXGenerator  # python-pptx + lxml: só na exportação
+
+    buffer = PPTXGenerator().gerar(**entradas, controle=controle)
+    conteudo = buffer.getvalue()
+    obter_cache("pptx").definir(chave, conteudo)
+    return conteudo
+
+
 def _run_calculo_e_dashboard():
     """Executa o cálculo e renderiza o dashboard."""
-    required_keys = ["cliente", "processo", "dores", "parametros", "investimento", "metas"]
-    missing = [k for k in required_keys if k not in st.session_state]
+    missing = [k for k in CHAVES_CALCULO if k not in st.session_state]
 
     if missing:
         st.warning("Dados incompletos. Volte e preencha todas as etapas anteriores.")
         return
 
+    from ui.dashboard import render_dashboard, render_mapa_equilibrio  # pandas: só a partir da etapa 6
+
     try:
-        calc = ROICalculator(
-            cliente=st.session_state["cliente"],
-            processo=st.session_state["processo"],
-            dores=st.session_state["dores"],
-            parametros=st.session_state["parametros"],
-            investimento=st.session_state["investimento"],
-            metas=st.session_state["metas"],
+        entradas = {k: st.session_state[k] for k in CHAVES_CALCULO}
+        chave = chave_entradas(*entradas.values())
+        # Normalmente já calculado em segundo plano desde a etapa 5 (ver `_especular_calculo`).
+        resultados = ESPECULADOR_CALCULO.obter_ou_calcular(
+            chave, lambda: ROICalculator(**entradas).calcular(rastrear=True)
         )
-
-        resultados = calc.calcular()
         st.session_state["resultados"] = resultados
-        render_dashboard(resultados, st.session_state["processo"], st.session_state["parametros"])
+        render_dashboard(
+            resultados,
+            chave=chave,
+            percentis=_percentis_benchmark(resultados),
+            faixa=indicadores_faixa(resultados, entradas["investimento"]),
+            atribuicao=atribuicao_shapley(resultados, entradas["metas"], entradas["investimento"]),
+        )
+        try:
+            render_mapa_equilibrio(entradas)
+        except Exception as e:  # o mapa é opcional: não impede o registro, o link e o PPTX
+            st.error(f"Erro no mapa de equilíbrio: {e}")
+        _registrar_analise(chave, entradas, resultados)
+        _render_link_analise()
+        _especular_pptx()
     except Exception as e:
         st.error(f"Erro no cálculo: {e}")
 
 
+def _especular_calculo():
+    """Etapa 5 validada: inicia o cálculo dos resultados em segundo plano."""
+    if any(k not in st.session_state for k in CHAVES_CALCULO):
+        return
+    entradas = {k: st.session_state[k] for k in CHAVES_CALCULO}
+    ESPECULADOR_CALCULO.iniciar(
+        chave_entradas(*entradas.values()),
+        lambda: ROICalculator(**entradas).calcular(rastrear=True),
+    )
+
+
+def _especular_pptx():
+    """
+    Etapa 6 renderizada: inicia a geração do deck em segundo plano.
+
+    Se as entradas mudaram desde a última especulação, esta sessão deixa o job anterior (que só é
+    cancelado se nenhuma outra sessão o aguarda).
+    Na etapa 7, `GERENCIADOR.submeter` com a mesma chave reaproveita este job.
+    """
+    entradas = {k: st.session_state.get(k) for k in CHAVES_EXPORTACAO}
+    chave = _chave_exportacao(entradas)
+
+    anterior = st.session_state.get("pptx_especulativo")
+    if anterior is not None and anterior["chave"] != chave:
+        GERENCIADOR.cancelar(anterior["job_id"], st.session_state["sessao_id"])
+        del st.session_state["pptx_especulativo"]
+    elif anterior is not None:
+        return
+
+    if obter_cache("pptx").contem(chave):
+        return
+    st.session_state["pptx_especulativo"] = {
+        "chave": chave,
+        "job_id": GERENCIADOR.submeter(
+            chave,
+            lambda controle: _gerar_pptx_bytes(chave, entradas, controle),
+            inscrito=st.session_state["sessao_id"],
+        ),
+    }
+
+
+def _render_perfil_inicializacao():
+    """Modo perfil (`ROI_PERFIL_INICIALIZACAO=1`): tempo do script e dependências pesadas já carregadas."""
+    if os.environ.get("ROI_PERFIL_INICIALIZACAO") != "1":
+        return
+    decorrido_ms = (time.perf_counter() - _INICIO_SCRIPT) * 1000
+    carregados = [m for m in MODULOS_PESADOS if m in sys.modules]
+    st.sidebar.caption(
+        f"⏱ Script: {decorrido_ms:,.1f} ms • módulos pesados carregados: {', '.join(carregados) or 'nenhum'}"
+    )
+
+
+def _render_metricas_cache():
+    """Exibe acertos/falhas por camada de cache (barra lateral)."""
+    with st.sidebar.expander("⚙️ Cache"):
+        for nome, cache in CACHES.items():
+            m = cache.metricas
+            st.caption(
+                f"**{nome}**: {m.acertos} acertos ({m.acertos_compartilhados} de outras réplicas) • "
+                f"{m.falhas} falhas • {m.taxa_acerto:.0%} • "
+                f"{len(cache)}/{cache.max_entradas} entradas • {m.expiracoes} expiradas • {m.descartes} descartadas"
+            )
+
+
+def _render_memoria_sessoes():
+    """
+    Modo admin (`ROI_ADMIN=1`): bytes em memória/disco por sessão no depósito.
+    Só os decks PPTX passam pelo depósito; o estado do wizard e os resultados não entram na conta.
+    """
+    if os.environ.get(ADMIN_ENV) != "1":
+        return
+    uso = DEPOSITO.uso_por_sessao()
+    with st.sidebar.expander("🧠 Decks PPTX por sessão"):
+        st.caption(
+            f"{len(uso)} sessões com deck • {DEPOSITO.memoria_total / 1024:,.0f} KB de decks em memória "
+            f"(limite {DEPOSITO.orcamento_total / 1024 ** 2:,.0f} MB) • "
+            f"{DEPOSITO.descartes_para_disco} decks enviados para disco • estado do wizard não incluído"
+        )
+        atual = st.session_state.get("sessao_id")
+        for sessao, u in sorted(uso.items(), key=lambda item: -item[1].memoria_bytes):
+            marcador = " (esta)" if sessao == atual else ""
+            st.caption(
+                f"`{sessao[:8]}`{marcador}: {u.memoria_bytes / 1024:,.1f} KB memória • "
+                f"{u.disco_bytes / 1024:,.1f} KB disco • {u.itens} itens"
+            )
+
+
 if __name__ == "__main__":
     main()
+    _render_perfil_inicializacao()
+    _render_memoria_sessoes()
@@ -4,6 +4,8 @@ Mapeamento das 6 Áreas de Atuação ARV → Fórmulas aplicáveis.
 Usado para pré-selecionar fórmulas na UI com base na área escolhida.
 """
 
+from models.inputs import Formula
+
 AREAS_ARV: dict[str, dict] = {
     "area_1_linhas_montagem": {
         "nome": "🔧 Linhas de Montagem Automáticas",
@@ -95,3 +97,7 @@ AREAS_ARV: dict[str, dict] = {
     },
 }
 
+# Fórmulas aplicáveis de cada área como máscara (ex.: `MASCARAS_AREAS[area] & dores.mascara`)
+MASCARAS_AREAS: dict[str, Formula] = {
+    area: Formula.de_codigos(info["formulas_aplicaveis"]) for area, info in AREAS_ARV.items()
+}
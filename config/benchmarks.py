@@ -0,0 +1,179 @@
+"""
+Tabela de benchmarks de parâmetros: valores típicos e faixas por área × porte × região.
+
+Cada faixa é (mínimo, típico, máximo), nas unidades dos modelos (frações em 0–1, R$ brutos).
+A tabela é esparsa — `core.benchmarks` completa as células ausentes:
+
+1. células da própria área e região: a do porte, ou interpolada entre os portes vizinhos
+   (pequena → média → grande), ou a de todos os portes (`"*"`);
+2. células de todas as áreas (`"*"`) da região, idem;
+3. fora de "brasil": a célula nacional, com os campos em R$ ajustados por `FATORES_REGIONAIS`;
+4. `FAIXAS_NACIONAIS`.
+
+Ao alterar valores, incremente `BENCHMARKS_VERSAO`.
+"""
+
+BENCHMARKS_VERSAO = "2025.1"
+
+PORTES = ("pequena", "media", "grande")  # ordem usada na interpolação
+
+REGIOES: dict[str, str] = {
+    "brasil": "Brasil (média nacional)",
+    "sudeste": "Sudeste",
+    "sul": "Sul",
+    "centro_oeste": "Centro-Oeste",
+    "nordeste": "Nordeste",
+    "norte": "Norte",
+}
+
+# Nível de custos/salários da região em relação à média nacional (aplicado aos campos em R$)
+FATORES_REGIONAIS: dict[str, float] = {
+    "brasil": 1.0,
+    "sudeste": 1.10,
+    "sul": 1.04,
+    "centro_oeste": 0.97,
+    "nordeste": 0.80,
+    "norte": 0.86,
+}
+
+CAMPOS_MONETARIOS = frozenset(
+    {
+        "salario_medio_operador",
+        "salario_medio_inspetor",
+        "salario_medio_supervisor",
+        "f07_custo_medio_por_reclamacao",
+        "f12_custo_medio_afastamento",
+        "f12_custo_medio_acidente",
+        "f12_custo_estimado_processo",
+        "f13_custo_equipamento_mes",
+        "f13_custo_energia_mes",
+        "f13_custo_manutencao_mes",
+        "f15_custo_epi_ano_por_pessoa",
+        "f15_custo_exames_ano_por_pessoa",
+        "f16_custo_energia_m2_ano",
+        "f17_custo_m2_ano",
+    }
+)
+
+# Campos de `ProcessoAtual`/`ParametrosDetalhados` com benchmark. Campos derivados de outras
+# entradas (salário do novato, custo hora parada, custo do operador de empilhadeira, supervisores
+# da F14) não entram: o formulário os sugere a partir do processo.
+FAIXAS_NACIONAIS: dict[str, tuple[float, float, float]] = {
+    # Processo
+    "salario_medio_operador": (1_800.0, 2_500.0, 4_000.0),
+    "salario_medio_inspetor": (2_200.0, 3_000.0, 4_800.0),
+    "salario_medio_supervisor": (3_800.0, 5_000.0, 9_000.0),
+    "dias_operacao_ano": (220, 250, 330),
+    # F02–F04
+    "f02_media_he_mes_por_pessoa": (0.0, 10.0, 40.0),
+    "f03_novas_contratacoes_ano": (0, 3, 30),
+    "f03_meses_curva": (1, 3, 12),
+    "f03_percentual_tempo_supervisor": (0.05, 0.20, 0.50),
+    "f04_desligamentos_ano": (0, 3, 30),
+    "f04_fator_custo_turnover": (1.5, 1.5, 3.0),
+    # F05–F07
+    "f05_percentual_refugo": (0.002, 0.01, 0.08),
+    "f05_percentual_retrabalho": (0.005, 0.03, 0.12),
+    "f05_horas_retrabalho_por_unidade": (0.05, 0.2, 1.0),
+    "f07_reclamacoes_clientes_ano": (0, 12, 60),
+    "f07_custo_medio_por_reclamacao": (500.0, 2_000.0, 15_000.0),
+    # F08–F11
+    "f08_percentual_demanda_reprimida": (0.0, 0.10, 0.35),
+    "f08_margem_contribuicao": (0.10, 0.30, 0.55),
+    "f09_minutos_ociosos_por_dia": (0.0, 15.0, 60.0),
+    "f10_paradas_mes": (0, 4, 20),
+    "f10_duracao_media_parada_horas": (0.25, 1.0, 4.0),
+    "f11_setups_mes": (0, 10, 60),
+    "f11_horas_por_setup": (0.1, 0.5, 3.0),
+    # F12–F13
+    "f12_afastamentos_ano": (0, 2, 12),
+    "f12_custo_medio_afastamento": (3_000.0, 8_000.0, 25_000.0),
+    "f12_acidentes_com_lesao_ano": (0, 1, 6),
+    "f12_custo_medio_acidente": (5_000.0, 15_000.0, 60_000.0),
+    "f12_probabilidade_processo": (0.0, 0.05, 0.25),
+    "f12_custo_estimado_processo": (20_000.0, 50_000.0, 250_000.0),
+    "f13_num_empilhadeiras": (1, 2, 15),
+    "f13_custo_equipamento_mes": (1_500.0, 2_500.0, 5_000.0),
+    "f13_custo_energia_mes": (150.0, 300.0, 900.0),
+    "f13_custo_manutencao_mes": (300.0, 600.0, 1_500.0),
+    # F15–F18
+    "f15_custo_epi_ano_por_pessoa": (300.0, 600.0, 1_500.0),
+    "f15_custo_exames_ano_por_pessoa": (200.0, 400.0, 900.0),
+    "f16_area_operacao_m2": (50.0, 200.0, 2_000.0),
+    "f16_custo_energia_m2_ano": (80.0, 150.0, 350.0),
+    "f17_area_m2": (50.0, 200.0, 2_000.0),
+    "f17_custo_m2_ano": (200.0, 500.0, 1_200.0),
+    "f17_percentual_reducao_automacao": (0.05, 0.20, 0.50),
+    "f18_pessoas_envolvidas": (1, 2, 10),
+    "f18_horas_dia_tarefas_dados": (0.25, 1.0, 4.0),
+}
+
+# Células (área ou "*", porte ou "*", região) → faixas que diferem do nível seguinte. Um porte
+# ausente entre dois definidos é interpolado (ex.: "media" entre "pequena" e "grande"); fora
+# deles vale a célula de porte "*", se houver, ou o nível seguinte.
+CELULAS: dict[tuple[str, str, str], dict[str, tuple[float, float, float]]] = {
+    ("*", "pequena", "brasil"): {
+        "salario_medio_supervisor": (3_500.0, 4_500.0, 7_000.0),
+        "f03_novas_contratacoes_ano": (0, 2, 10),
+        "f04_desligamentos_ano": (0, 2, 10),
+        "f07_reclamacoes_clientes_ano": (0, 6, 30),
+        "f10_paradas_mes": (0, 3, 12),
+        "f12_custo_estimado_processo": (15_000.0, 40_000.0, 150_000.0),
+        "f13_num_empilhadeiras": (1, 1, 4),
+        "f16_area_operacao_m2": (50.0, 120.0, 600.0),
+        "f17_area_m2": (50.0, 120.0, 600.0),
+        "f18_pessoas_envolvidas": (1, 1, 4),
+    },
+    ("*", "grande", "brasil"): {
+        "salario_medio_operador": (2_200.0, 2_900.0, 4_500.0),
+        "salario_medio_supervisor": (4_500.0, 6_200.0, 11_000.0),
+        "dias_operacao_ano": (240, 270, 340),
+        "f03_novas_contratacoes_ano": (2, 8, 60),
+        "f04_desligamentos_ano": (2, 8, 60),
+        "f07_reclamacoes_clientes_ano": (2, 24, 120),
+        "f10_paradas_mes": (1, 6, 30),
+        "f12_custo_estimado_processo": (40_000.0, 120_000.0, 600_000.0),
+        "f13_num_empilhadeiras": (2, 6, 30),
+        "f16_area_operacao_m2": (300.0, 800.0, 5_000.0),
+        "f17_area_m2": (300.0, 800.0, 5_000.0),
+        "f18_pessoas_envolvidas": (2, 4, 20),
+    },
+    ("*", "*", "norte"): {
+        "f16_custo_energia_m2_ano": (100.0, 190.0, 420.0),
+    },
+    ("area_1_linhas_montagem", "*", "brasil"): {
+        "f05_percentual_retrabalho": (0.01, 0.04, 0.12),
+        "f10_paradas_mes": (1, 6, 25),
+        "f11_setups_mes": (2, 12, 60),
+    },
+    ("area_2_maquinas_especiais", "*", "brasil"): {
+        "f03_meses_curva": (2, 6, 18),
+        "f11_setups_mes": (1, 6, 30),
+        "f11_horas_por_setup": (0.5, 1.5, 6.0),
+    },
+    ("area_3_controle_qualidade", "*", "brasil"): {
+        "f05_percentual_refugo": (0.005, 0.02, 0.10),
+        "f05_percentual_retrabalho": (0.01, 0.04, 0.15),
+        "f07_reclamacoes_clientes_ano": (2, 18, 80),
+        "f07_custo_medio_por_reclamacao": (1_000.0, 3_500.0, 25_000.0),
+    },
+    ("area_4_embalagem", "*", "brasil"): {
+        "f02_media_he_mes_por_pessoa": (4.0, 16.0, 45.0),
+        "f08_percentual_demanda_reprimida": (0.02, 0.12, 0.35),
+        "f12_afastamentos_ano": (1, 3, 15),
+    },
+    ("area_5_logistica_interna", "pequena", "brasil"): {
+        "f09_minutos_ociosos_por_dia": (5.0, 25.0, 90.0),
+        "f13_num_empilhadeiras": (1, 2, 5),
+    },
+    ("area_5_logistica_interna", "grande", "brasil"): {
+        "f09_minutos_ociosos_por_dia": (5.0, 25.0, 90.0),
+        "f13_num_empilhadeiras": (3, 10, 40),
+    },
+    ("area_6_robotica", "*", "brasil"): {
+        "f12_afastamentos_ano": (1, 4, 18),
+        "f12_custo_medio_acidente": (10_000.0, 30_000.0, 120_000.0),
+        "f12_probabilidade_processo": (0.02, 0.10, 0.35),
+        "f07_custo_medio_por_reclamacao": (2_000.0, 6_000.0, 40_000.0),
+    },
+}
@@ -44,3 +44,138 @@ SALARIO_SUPERVISOR_DEFAULT = 5000.0  # R$
 
 DIAS_OPERACAO_ANO_DEFAULT = 250
 DIAS_OPERACAO_MES_DEFAULT = 21  # usado para estimativa de produção mensal via cadência
+
+# =============================================================================
+# Cache de cálculo/exportação (memoização entre reruns do Streamlit)
+# =============================================================================
+
+CACHE_TTL_SEGUNDOS = 3600  # 1h — entradas expiram mesmo se continuarem sendo acessadas
+CACHE_MAX_ENTRADAS_CALCULO = 512
+CACHE_MAX_ENTRADAS_DASHBOARD = 512
+CACHE_MAX_ENTRADAS_PPTX = 32  # decks ocupam alguns MB cada
+CACHE_MAX_ENTRADAS_ATRIBUICAO = 512
+CACHE_MAX_ENTRADAS_MAPA = 64  # mapas de equilíbrio do dashboard (~150 kB cada em 80 × 80)
+
+# =============================================================================
+# Exportação em segundo plano
+# =============================================================================
+
+EXPORT_MAX_WORKERS = 2  # gerações de PPTX simultâneas por processo
+EXPORT_MAX_JOBS_RETIDOS = 64  # jobs finalizados mantidos para consulta/download
+EXPORT_INTERVALO_POLL_SEGUNDOS = 0.5
+
+# =============================================================================
+# Orçamento de inicialização (tela inicial / etapa 0)
+# =============================================================================
+
+# Dependências que só devem ser carregadas quando a etapa correspondente é alcançada
+MODULOS_PESADOS = ("pptx", "lxml", "pandas", "numpy")
+ORCAMENTO_IMPORTACAO_INICIAL_MS = 250  # import a frio dos módulos do app (exceto o próprio Streamlit)
+
+# =============================================================================
+# Prévia de ROI (etapas 3–5)
+# =============================================================================
+
+# O painel relê o estado da sessão a cada intervalo: edições mais rápidas que isso viram uma única avaliação
+PREVIA_INTERVALO_SEGUNDOS = 0.5
+
+# =============================================================================
+# Simulação Monte Carlo
+# =============================================================================
+
+MONTECARLO_ITERACOES_DEFAULT = 2000
+MONTECARLO_MAX_ITERACOES = 100_000
+MONTECARLO_VARIACAO_DEFAULT = 0.20  # ±20% sobre o custo de cada fórmula
+# Limites da variação por fórmula derivada dos benchmarks (`core.benchmarks.variacoes_montecarlo`)
+MONTECARLO_VARIACAO_MIN = 0.05
+MONTECARLO_VARIACAO_MAX = 0.60
+MONTECARLO_BLOCO = 1024  # sorteios correlacionados gerados por bloco (core/correlacao.py)
+MONTECARLO_CORRELACAO_AUTOVALOR_MIN = 1e-6  # piso dos autovalores no reparo da matriz de correlação
+# Pares de entradas que costumam andar juntos (campo, campo, correlação)
+MONTECARLO_CORRELACOES_PADRAO = (
+    ("processo.salario_medio_operador", "parametros.f03_salario_novato", 0.8),
+    ("parametros.f10_paradas_mes", "parametros.f11_setups_mes", 0.5),
+    ("processo.producao_mensal", "processo.faturamento_mensal_linha", 0.9),
+)
+
+# =============================================================================
+# API HTTP/JSON (api/servidor.py)
+# =============================================================================
+
+API_MAX_WORKERS = 2  # processos para Monte Carlo e PPTX
+API_MAX_CORPO_BYTES = 5_000_000
+API_MAX_ITENS_BATCH = 1000
+
+# =============================================================================
+# Armazenamento compartilhado entre réplicas (opcional)
+# =============================================================================
+
+ARMAZENAMENTO_SQLITE_ENV = "ROI_ARMAZENAMENTO_SQLITE"  # caminho do arquivo; ausente = só memória local
+SESSAO_TTL_SEGUNDOS = 7 * 24 * 3600  # instantâneos de sessão (link com ?sessao=...) valem 7 dias
+ARMAZENAMENTO_LIMPEZA_INTERVALO_SEGUNDOS = 10 * 60  # entradas expiradas são apagadas ao gravar, no máximo a cada 10 min
+
+# =============================================================================
+# Memória por sessão (core/memoria_sessoes.py)
+# =============================================================================
+
+SESSAO_ORCAMENTO_BYTES = 8 * 1024 * 1024  # decks em memória por sessão
+DEPOSITO_ORCAMENTO_TOTAL_BYTES = 256 * 1024 * 1024  # soma de todas as sessões no processo
+DEPOSITO_DIRETORIO_ENV = "ROI_DEPOSITO_DIRETORIO"  # onde os blobs frios são gravados; ausente = diretório temporário
+SESSAO_INATIVA_SEGUNDOS = 2 * 3600  # blobs de sessões sem acesso há mais tempo são descartados
+SESSAO_LIMPEZA_INTERVALO_SEGUNDOS = 5 * 60  # varredura das sessões inativas no máximo a cada 5 min
+ADMIN_ENV = "ROI_ADMIN"  # "1" exibe o painel de memória por sessão na barra lateral
+
+# =============================================================================
+# Links compartilháveis (core/links.py)
+# =============================================================================
+
+LINK_PARAMETRO_URL = "analise"  # ?analise=<blob>
+LINK_MAX_CARACTERES = 2000  # limite prático de URL em navegadores/proxies/clientes de e-mail
+
+# =============================================================================
+# Repositório de análises (core/repositorio.py)
+# =============================================================================
+
+VERSAO_FORMULAS = "2.0"  # gravada com cada análise: resultados de versões diferentes não se comparam
+REPOSITORIO_SQLITE_ENV = "ROI_REPOSITORIO_SQLITE"  # caminho do arquivo; ausente = análises não são gravadas
+REPOSITORIO_PAGINA_MAX = 500
+
+# =============================================================================
+# Percentis de benchmark (core/esbocos.py)
+# =============================================================================
+
+ESBOCO_K = 200  # itens por nível do esboço KLL (erro de posto ≈ 1,7/k ≈ 1%)
+ESBOCO_MIN_AMOSTRAS = 30  # abaixo disso o dashboard não mostra a comparação
+ESBOCO_CACHE_TTL_SEGUNDOS = 60  # esboços lidos do repositório ficam em memória por esse tempo
+
+# =============================================================================
+# Mapa de equilíbrio (core/mapa_equilibrio.py)
+# =============================================================================
+
+MAPA_PONTOS_PADRAO = 200  # pontos por eixo (200 × 200 = 40 mil células)
+MAPA_PONTOS_DASHBOARD = 80  # o heatmap do dashboard vai ao navegador célula a célula
+MAPA_POSTO_MAX = 6  # acima disso a grade é avaliada célula a célula
+MAPA_SONDAS_ALEATORIAS = 24  # células avaliadas para verificar a aproximação (além da grade 5 × 5)
+MAPA_LIMIARES_PAYBACK = (1.0, 2.0, 3.0)  # anos
+
+# =============================================================================
+# Atribuição de Shapley (core/atribuicao.py)
+# =============================================================================
+
+SHAPLEY_HORIZONTE_ANOS = 5.0  # payback atribuído como anos reduzidos a partir deste horizonte
+
+# =============================================================================
+# Árvore de cenários de projetos em fases (core/arvore_cenarios.py)
+# =============================================================================
+
+ARVORE_HORIZONTE_ANOS = 5  # VPL das fases até este ano
+ARVORE_TAXA_DESCONTO = 0.12  # a.a., sobre os fluxos de fim de ano
+
+# =============================================================================
+# Opções reais: adiar/expandir a automação (core/opcoes_reais.py)
+# =============================================================================
+
+OPCOES_PRAZO_ANOS = 3  # janela em que o cliente pode adiar a decisão
+OPCOES_PASSOS_POR_ANO = 12  # passos da árvore binomial por ano
+OPCOES_TAXA_LIVRE_RISCO = 0.10  # a.a., capitalização contínua
+OPCOES_VIDA_UTIL_ANOS = 5  # anos de ganho do projeto a partir do investimento (valor do ativo-objeto)
@@ -0,0 +1,142 @@
+"""
+Armazenamento compartilhado entre réplicas (opcional).
+
+Chave-valor com TTL e namespaces, usado como segundo nível dos caches de cálculo/PPTX
+(`core.cache`) e para instantâneos de sessão (`core.sessoes`). Com várias réplicas apontando
+para o mesmo arquivo, resultados e decks gerados em uma réplica são reaproveitados nas outras,
+e uma sessão continua após reinício ou troca de réplica.
+
+Ativado pela variável de ambiente `ROI_ARMAZENAMENTO_SQLITE` (caminho do arquivo SQLite);
+sem ela, `obter_armazenamento()` retorna None e tudo permanece em memória, por processo.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+import threading
+import time
+from typing import Callable, Optional
+
+from config.constants import ARMAZENAMENTO_LIMPEZA_INTERVALO_SEGUNDOS, ARMAZENAMENTO_SQLITE_ENV
+
+
+class Armazenamento(ABC):
+    """
+    Interface do armazenamento compartilhado (valores em bytes, expiração em segundos de relógio de parede).
+
+    Um backend sem `obter`, `definir` ou `remover` falha já ao ser instanciado; `contem` tem implementação padrão.
+    """
+
+    @abstractmethod
+    def obter(self, namespace: str, chave: str) -> Optional[bytes]:
+        ...
+
+    def contem(self, namespace: str, chave: str) -> bool:
+        return self.obter(namespace, chave) is not None
+
+    @abstractmethod
+    def definir(self, namespace: str, chave: str, valor: bytes, ttl_segundos: Optional[float] = None) -> None:
+        ...
+
+    @abstractmethod
+    def remover(self, namespace: str, chave: str) -> None:
+        ...
+
+
+class ArmazenamentoSQLite(Armazenamento):
+    """
+    Implementação em arquivo SQLite (modo WAL): várias réplicas no mesmo host/volume compartilham o arquivo.
+
+    Uma conexão por thread; entradas expiradas são ignoradas na leitura e removidas por `limpar_expirados`,
+    que `definir` chama no máximo uma vez a cada `intervalo_limpeza` segundos (decks expirados ocupam MB).
+    """
+
+    def __init__(
+        self,
+        caminho: str,
+        relogio: Callable[[], float] = time.time,
+        intervalo_limpeza: float = ARMAZENAMENTO_LIMPEZA_INTERVALO_SEGUNDOS,
+    ):
+        self.caminho = caminho
+        self._relogio = relogio
+        self._local = threading.local()
+        self._intervalo_limpeza = intervalo_limpeza
+        self._proxima_limpeza = relogio() + intervalo_limpeza
+        self._limpeza_lock = threading.Lock()
+        conexao = self._conexao()
+        conexao.execute("PRAGMA journal_mode=WAL")
+        conexao.execute(
+            "CREATE TABLE IF NOT EXISTS kv ("
+            " namespace TEXT NOT NULL,"
+            " chave TEXT NOT NULL,"
+            " valor BLOB NOT NULL,"
+            " expira_em REAL,"
+            " PRIMARY KEY (namespace, chave))"
+        )
+        conexao.execute("CREATE INDEX IF NOT EXISTS kv_expira_em ON kv (expira_em)")
+
+    def _conexao(self) -> sqlite3.Connection:
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is None:
+            conexao = sqlite3.connect(self.caminho, timeout=30, isolation_level=None, check_same_thread=False)
+            conexao.execute("PRAGMA synchronous=NORMAL")
+            self._local.conexao = conexao
+        return conexao
+
+    def obter(self, namespace: str, chave: str) -> Optional[bytes]:
+        linha = self._conexao().execute(
+            "SELECT valor FROM kv WHERE namespace = ? AND chave = ? AND (expira_em IS NULL OR expira_em > ?)",
+            (namespace, chave, self._relogio()),
+        ).fetchone()
+        return bytes(linha[0]) if linha is not None else None
+
+    def contem(self, namespace: str, chave: str) -> bool:
+        linha = self._conexao().execute(
+            "SELECT 1 FROM kv WHERE namespace = ? AND chave = ? AND (expira_em IS NULL OR expira_em > ?)",
+            (namespace, chave, self._relogio()),
+        ).fetchone()
+        return linha is not None
+
+    def definir(self, namespace: str, chave: str, valor: bytes, ttl_segundos: Optional[float] = None) -> None:
+        expira_em = self._relogio() + ttl_segundos if ttl_segundos is not None else None
+        self._conexao().execute(
+            "INSERT OR REPLACE INTO kv (namespace, chave, valor, expira_em) VALUES (?, ?, ?, ?)",
+            (namespace, chave, sqlite3.Binary(valor), expira_em),
+        )
+        self._limpar_se_devido()
+
+    def remover(self, namespace: str, chave: str) -> None:
+        self._conexao().execute("DELETE FROM kv WHERE namespace = ? AND chave = ?", (namespace, chave))
+
+    def limpar_expirados(self) -> int:
+        """Remove entradas expiradas; retorna quantas foram removidas."""
+        cursor = self._conexao().execute(
+            "DELETE FROM kv WHERE expira_em IS NOT NULL AND expira_em <= ?", (self._relogio(),)
+        )
+        return cursor.rowcount
+
+    def _limpar_se_devido(self) -> None:
+        with self._limpeza_lock:
+            agora = self._relogio()
+            if agora < self._proxima_limpeza:
+                return
+            self._proxima_limpeza = agora + self._intervalo_limpeza
+        self.limpar_expirados()
+
+
+_armazenamento: Optional[Armazenamento] = None
+_armazenamento_lock = threading.Lock()
+
+
+def obter_armazenamento() -> Optional[Armazenamento]:
+    """Armazenamento configurado por `ROI_ARMAZENAMENTO_SQLITE`, ou None (somente memória local)."""
+    global _armazenamento
+    caminho = os.environ.get(ARMAZENAMENTO_SQLITE_ENV)
+    if not caminho:
+        return None
+    with _armazenamento_lock:
+        if _armazenamento is None:
+            _armazenamento = ArmazenamentoSQLite(caminho)
+        return _armazenamento
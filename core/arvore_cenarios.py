@@ -0,0 +1,207 @@
+"""
+Árvore de cenários para projetos de automação em fases.
+
+"Automatizar a inspeção agora (F06/F07) e decidir sobre robótica (F12/F15) depois" não cabe em um
+único cenário do `ROICalculator`. Aqui cada `NoCenario` é uma fase com uma parcela de investimento
+(paga no início da fase) e um acréscimo de metas (`delta_metas`, somado às metas das fases
+anteriores e válido até o fim do horizonte). Os filhos de um nó são:
+
+- nó de acaso: cenários alternativos com `probabilidades` (ex.: a inspeção atinge ou não a meta);
+- nó de decisão (`decisao=True`): opções do cliente; vale a de maior VPL.
+
+Fluxos: parcelas no início do ano da fase, ganhos no fim de cada ano, descontados a
+`taxa_desconto` até `horizonte_anos`. Como o ganho é linear nas metas (Σ custo × meta), a
+contribuição de cada nó — −parcela + ganho do seu delta × anuidade até o horizonte — não depende do
+caminho até ele, só do ano em que começa. A indução retroativa calcula o valor por (nó, ano), dos
+filhos para os pais: subárvores compartilhadas (o mesmo objeto em vários pais) são avaliadas uma
+vez por ano de início.
+
+O payback de cada caminho (seguindo as decisões ótimas) é o momento em que o caixa acumulado, sem
+desconto e com o ganho acumulando ao longo do ano, fica positivo de vez; na última fase o ganho
+continua após o horizonte, então um projeto de fase única tem o payback de `calcular_payback`.
+A distribuição não enumera caminhos (exponenciais numa rede recombinante): a probabilidade é
+propagada dos pais para os filhos por (nó, ano, estado do caixa), somando os caminhos que chegam
+com o mesmo caixa e ganho ao centavo; um caminho sai da propagação quando nenhuma parcela ou queda
+de ganho abaixo dele pode deixar o caixa negativo de novo.
+
+As fórmulas dos deltas precisam estar selecionadas nas dores do cálculo: fórmulas não selecionadas
+têm custo 0 em `resultados.custos_formulas` e não geram ganho.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from operator import mul
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from config.constants import ARVORE_HORIZONTE_ANOS, ARVORE_TAXA_DESCONTO
+from core.formulas import calcular_ganho_anual_total
+from models.results import AvaliacaoArvore, MetasReducao, ResultadosFinanceiros
+
+
+@dataclass(slots=True, eq=False)
+class NoCenario:
+    """Fase do projeto. Nós são comparados por identidade: o mesmo objeto em vários pais é uma subárvore compartilhada."""
+
+    nome: str
+    investimento: float = 0.0  # parcela paga no início da fase (R$)
+    delta_metas: Optional[MetasReducao] = None  # acréscimo às metas das fases anteriores
+    anos: int = 1  # duração da fase antes dos filhos (0: ponto de decisão; nas folhas, o ganho segue até o horizonte)
+    filhos: Sequence["NoCenario"] = ()
+    probabilidades: Optional[Sequence[float]] = None  # nó de acaso: uma por filho, somando 1
+    decisao: bool = False  # nó de decisão: segue o filho de maior VPL
+
+
+def _validar(raiz: NoCenario) -> List[NoCenario]:
+    """Nós distintos da árvore, pais antes dos filhos; ValueError para nós inválidos ou ciclos."""
+    visitados: Dict[int, NoCenario] = {}
+    pos_ordem: List[NoCenario] = []
+    em_caminho = set()
+    pilha = [(raiz, False)]
+    while pilha:
+        no, saindo = pilha.pop()
+        if saindo:
+            em_caminho.discard(id(no))
+            pos_ordem.append(no)
+            continue
+        if id(no) in em_caminho:
+            raise ValueError(f"Ciclo na árvore de cenários em {no.nome!r}.")
+        if id(no) in visitados:
+            continue
+        visitados[id(no)] = no
+
+        if no.investimento < 0:
+            raise ValueError(f"{no.nome}: investimento negativo.")
+        if no.filhos:
+            if not isinstance(no.anos, int) or no.anos < 0:
+                raise ValueError(f"{no.nome}: 'anos' deve ser inteiro >= 0.")
+            if not no.decisao:
+                probabilidades = no.probabilidades
+                if probabilidades is None or len(probabilidades) != len(no.filhos):
+                    raise ValueError(f"{no.nome}: informe uma probabilidade por filho.")
+                if any(p < 0 for p in probabilidades) or not math.isclose(sum(probabilidades), 1.0, abs_tol=1e-9):
+                    raise ValueError(f"{no.nome}: probabilidades devem ser >= 0 e somar 1.")
+        elif no.decisao:
+            raise ValueError(f"{no.nome}: nó de decisão sem opções.")
+
+        em_caminho.add(id(no))
+        pilha.append((no, True))
+        pilha.extend((filho, False) for filho in no.filhos)
+    return pos_ordem[::-1]
+
+
+def avaliar_arvore(
+    raiz: NoCenario,
+    resultados: ResultadosFinanceiros,
+    metas: Optional[MetasReducao] = None,
+    horizonte_anos: int = ARVORE_HORIZONTE_ANOS,
+    taxa_desconto: float = ARVORE_TAXA_DESCONTO,
+) -> AvaliacaoArvore:
+    """
+    VPL esperado (decisões ótimas) e distribuição do payback da árvore a partir de `raiz`.
+
+    `resultados` fornece o custo anual de cada fórmula; `metas` são as metas já em vigor antes da
+    raiz (padrão: nenhuma).
+    """
+    if horizonte_anos < 1:
+        raise ValueError("horizonte_anos deve ser >= 1")
+    nos = _validar(raiz)
+    por_id = {id(no): no for no in nos}
+
+    custos = resultados.custos_formulas
+    ganho_base = calcular_ganho_anual_total(custos, metas.valores) if metas is not None else 0.0
+    ganhos = {
+        id(no): sum(map(mul, custos, no.delta_metas.valores)) if no.delta_metas is not None else 0.0
+        for no in nos
+    }
+
+    # anuidade[t]: valor presente de R$ 1/ano recebido no fim dos anos t+1 … horizonte
+    descontos = [(1 + taxa_desconto) ** -ano for ano in range(horizonte_anos + 1)]
+    anuidade = [0.0] * (horizonte_anos + 1)
+    for ano in range(horizonte_anos - 1, -1, -1):
+        anuidade[ano] = anuidade[ano + 1] + descontos[ano + 1]
+
+    # Anos de início de cada nó: os pais vêm antes dos filhos em `nos`
+    inicios: Dict[int, Set[int]] = {id(no): set() for no in nos}
+    inicios[id(raiz)].add(0)
+    for no in nos:
+        for ano in inicios[id(no)]:
+            for filho in no.filhos:
+                inicios[id(filho)].add(ano + no.anos)
+
+    # Indução retroativa: filhos antes dos pais
+    valores: Dict[Tuple[int, int], float] = {}
+    escolhas: Dict[Tuple[int, int], int] = {}
+    for no in reversed(nos):
+        for ano in inicios[id(no)]:
+            total = ganhos[id(no)] * (anuidade[ano] if ano < horizonte_anos else 0.0)
+            if no.investimento:
+                total -= no.investimento * (1 + taxa_desconto) ** -ano
+            if no.filhos:
+                seguintes = [valores[(id(filho), ano + no.anos)] for filho in no.filhos]
+                if no.decisao:
+                    melhor = max(range(len(seguintes)), key=seguintes.__getitem__)
+                    escolhas[(id(no), ano)] = melhor
+                    total += seguintes[melhor]
+                else:
+                    total += sum(map(mul, no.probabilidades, seguintes))
+            valores[(id(no), ano)] = total
+
+    vpl = ganho_base * anuidade[0] + valores[(id(raiz), 0)]
+
+    # Pior caso abaixo de cada nó: maior soma de parcelas e maior queda acumulada do ganho
+    exposicao: Dict[int, float] = {}
+    queda: Dict[int, float] = {}
+    for no in reversed(nos):
+        exposicao[id(no)] = no.investimento + max((exposicao[id(f)] for f in no.filhos), default=0.0)
+        queda[id(no)] = min(0.0, ganhos[id(no)] + min((queda[id(f)] for f in no.filhos), default=0.0))
+
+    # Probabilidade por (nó, ano) e estado ao entrar no nó: (caixa, ganho anual, pago desde)
+    estados: Dict[Tuple[int, int], Dict[tuple, list]] = {(id(raiz), 0): {None: [0.0, ganho_base, 0.0, 1.0]}}
+    distribuicao: Dict[float, float] = {}
+    for no in nos:
+        for ano in sorted(inicios[id(no)]):
+            for caixa, ganho, pago_em, probabilidade in estados.pop((id(no), ano), {}).values():
+                caixa -= no.investimento
+                ganho += ganhos[id(no)]
+                if not no.filhos:
+                    if caixa < 0:
+                        pago_em = ano + -caixa / ganho if ganho > 0 else math.inf
+                    elif ganho < 0:
+                        pago_em = math.inf
+                    distribuicao[pago_em] = distribuicao.get(pago_em, 0.0) + probabilidade
+                    continue
+                fim = caixa + ganho * no.anos
+                if fim < 0:
+                    pago_em = None
+                elif caixa < 0:
+                    pago_em = ano + -caixa / ganho
+                if no.decisao:
+                    ramos = [(no.filhos[escolhas[(id(no), ano)]], 1.0)]
+                else:
+                    ramos = [(f, p) for f, p in zip(no.filhos, no.probabilidades) if p > 0]
+                if (
+                    pago_em is not None
+                    and fim >= max(exposicao[id(f)] for f, _ in ramos)
+                    and ganho + min(queda[id(f)] for f, _ in ramos) >= 0
+                ):
+                    # Nenhuma fase seguinte deixa o caixa negativo: payback definido
+                    distribuicao[pago_em] = distribuicao.get(pago_em, 0.0) + probabilidade
+                    continue
+                chave = (round(fim, 2), round(ganho, 2), pago_em if pago_em is None else round(pago_em, 9))
+                for filho, p in ramos:
+                    destino = estados.setdefault((id(filho), ano + no.anos), {})
+                    if chave in destino:
+                        destino[chave][3] += probabilidade * p
+                    else:
+                        destino[chave] = [fim, ganho, pago_em, probabilidade * p]
+
+    return AvaliacaoArvore(
+        vpl_esperado=vpl,
+        horizonte_anos=horizonte_anos,
+        taxa_desconto=taxa_desconto,
+        paybacks=tuple(sorted(distribuicao.items())),
+        decisoes={(por_id[id_no].nome, ano): por_id[id_no].filhos[i].nome for (id_no, ano), i in escolhas.items()},
+        nos_avaliados=len(valores),
+    )
@@ -0,0 +1,143 @@
+"""
+Atribuição de payback e ROI às fórmulas por valores de Shapley exatos.
+
+"Quanto do payback de 1,4 ano vem da inspeção manual e quanto das paradas de linha?" Com o
+investimento fixo, o payback é Investimento ÷ Σ ganhos: repartir pela fatia de cada fórmula no
+ganho depende da ordem em que as fórmulas são somadas. O valor de Shapley é a contribuição marginal
+média de cada fórmula sobre todas as ordens — a única repartição simétrica e aditiva.
+
+Jogos (o valor de uma coalizão S só depende do ganho somado G(S) das suas fórmulas):
+
+- payback: anos reduzidos a partir de `SHAPLEY_HORIZONTE_ANOS`, v(S) = H − min(I ÷ G(S), H), com
+  v(∅) = 0 (sem ganho não há payback) — as contribuições somam H − min(payback, H). O jogo satura
+  no horizonte: com payback ≥ H nenhuma coalizão se paga em H anos e todas as contribuições são 0;
+  abaixo disso, só as coalizões que se pagam no horizonte geram contribuição;
+- ROI em N anos: v(S) = (G(S)·N − I) ÷ I × 100, com v(∅) = −100% — as contribuições somam ROI + 100.
+  O ROI é linear no ganho, então o valor de Shapley é exatamente a fatia de cada fórmula
+  (G_i·N ÷ I × 100) e dispensa a enumeração.
+
+A enumeração cobre os 2^k subconjuntos das k fórmulas com ganho (k ≤ 18): G(S) sai por somas
+incrementais (cada fórmula dobra o vetor de somas), v(S) é aplicado ao vetor inteiro e cada
+contribuição é uma soma ponderada de diferenças entre fatias do vetor. Fórmulas sem ganho são
+jogadores nulos (contribuição 0) e ficam de fora. Resultados ficam no cache "atribuicao", por
+(ganhos, investimento, horizonte, rótulos dos breakdowns).
+"""
+
+from __future__ import annotations
+
+from array import array
+from math import factorial
+from operator import mul, sub
+from typing import Callable, List, Sequence
+
+from config.constants import SHAPLEY_HORIZONTE_ANOS
+from core.cache import chave_entradas, obter_cache
+from core.intervalos import ANOS_ROI
+from models.inputs import InvestimentoAutomacao
+from models.results import (
+    CAMPOS_BREAKDOWN,
+    CODIGOS_FORMULAS,
+    AtribuicaoShapley,
+    MetasReducao,
+    ResultadosFinanceiros,
+    codigo_do_rotulo,
+)
+
+
+def _somas_subconjuntos(ganhos: Sequence[float]) -> array:
+    """G(S) para cada máscara S (bit i ↔ `ganhos[i]`)."""
+    somas = array("d", [0.0])
+    for ganho in ganhos:
+        somas.extend([s + ganho for s in somas])
+    return somas
+
+
+def _pesos(k: int) -> array:
+    """Peso de Shapley |S|!·(k − |S| − 1)! ÷ k! de cada máscara S (usado só nas máscaras sem o jogador)."""
+    por_tamanho = [factorial(s) * factorial(k - s - 1) / factorial(k) for s in range(k)] + [0.0]
+    tamanhos = [0]
+    for _ in range(k):
+        tamanhos.extend([t + 1 for t in tamanhos])
+    return array("d", [por_tamanho[t] for t in tamanhos])
+
+
+def valores_shapley(ganhos: Sequence[float], valor: Callable[[float], float]) -> List[float]:
+    """
+    Valores de Shapley do jogo v(S) = valor(G(S)), onde G(S) é a soma dos `ganhos` da coalizão S.
+
+    As contribuições somam valor(Σ ganhos) − valor(0).
+    """
+    k = len(ganhos)
+    if k == 0:
+        return []
+    v = array("d", map(valor, _somas_subconjuntos(ganhos)))
+    pesos = _pesos(k)
+    total = len(v)
+
+    contribuicoes = []
+    for i in range(k):
+        passo = 1 << i
+        soma = 0.0
+        # Máscaras sem o bit i: blocos de `passo` máscaras a cada 2·passo (fatias contíguas) ou,
+        # com blocos pequenos, fatias espaçadas de 2·passo — no máximo ~√(2^k) fatias por jogador.
+        if passo * passo >= total // 2:
+            for b in range(0, total, 2 * passo):
+                sem, com = slice(b, b + passo), slice(b + passo, b + 2 * passo)
+                soma += sum(map(mul, pesos[sem], map(sub, v[com], v[sem])))
+        else:
+            for r in range(passo):
+                sem, com = slice(r, total, 2 * passo), slice(r + passo, total, 2 * passo)
+                soma += sum(map(mul, pesos[sem], map(sub, v[com], v[sem])))
+        contribuicoes.append(soma)
+    return contribuicoes
+
+
+def _rotulos(resultados: ResultadosFinanceiros, codigos: Sequence[str]) -> List[str]:
+    """Rótulo de cada código; fórmulas com componentes (F05, F12) juntam os nomes dos componentes."""
+    componentes = {}
+    for nome in CAMPOS_BREAKDOWN:
+        for rotulo in getattr(resultados, nome):
+            componentes.setdefault(codigo_do_rotulo(rotulo), []).append(rotulo[6:])
+    return [f"{codigo} - {', '.join(componentes.get(codigo, ()))}" for codigo in codigos]
+
+
+def _calcular(resultados, ganhos_por_formula, investimento_medio, horizonte, anos_roi) -> AtribuicaoShapley:
+    ativos = [i for i, g in enumerate(ganhos_por_formula) if g > 0]
+    codigos = tuple(CODIGOS_FORMULAS[i] for i in ativos)
+    ganhos = tuple(ganhos_por_formula[i] for i in ativos)
+
+    def anos_reduzidos(ganho: float) -> float:
+        if ganho <= 0:
+            return 0.0
+        return horizonte - min(investimento_medio / ganho, horizonte)
+
+    def roi(anos: int) -> tuple:
+        if investimento_medio == 0:
+            return (0.0,) * len(ganhos)
+        return tuple(ganho * anos / investimento_medio * 100 for ganho in ganhos)
+
+    return AtribuicaoShapley(
+        codigos=codigos,
+        rotulos=tuple(_rotulos(resultados, codigos)),
+        ganhos=ganhos,
+        horizonte_anos=horizonte,
+        payback_anos=tuple(valores_shapley(ganhos, anos_reduzidos)),
+        roi=tuple(roi(anos) for anos in anos_roi),
+    )
+
+
+def atribuicao_shapley(
+    resultados: ResultadosFinanceiros,
+    metas: MetasReducao,
+    investimento: InvestimentoAutomacao,
+    horizonte_anos: float = SHAPLEY_HORIZONTE_ANOS,
+    anos_roi: Sequence[int] = ANOS_ROI,
+) -> AtribuicaoShapley:
+    """Contribuição de cada fórmula para payback e ROI (ver docstring do módulo); memoizada por cenário."""
+    ganhos = [custo * meta for custo, meta in zip(resultados.custos_formulas, metas.valores)]
+    investimento_medio = investimento.valor_investimento_medio
+    rotulos = [rotulo for nome in CAMPOS_BREAKDOWN for rotulo in getattr(resultados, nome)]  # compõem `rotulos`
+    chave = chave_entradas(ganhos, investimento_medio, horizonte_anos, list(anos_roi), rotulos)
+    return obter_cache("atribuicao").obter_ou_calcular(
+        chave, lambda: _calcular(resultados, ganhos, investimento_medio, horizonte_anos, anos_roi)
+    )
@@ -0,0 +1,162 @@
+"""
+Índice da tabela de benchmarks (`config.benchmarks`): faixas típicas por área × porte × região.
+
+A tabela esparsa é resolvida uma única vez (na primeira consulta) para todas as combinações de
+área, porte e região; depois disso, cada consulta é um acesso a dicionário. Usada para sugerir
+valores nos formulários e para dimensionar a incerteza de cada fórmula no Monte Carlo.
+"""
+
+from __future__ import annotations
+
+import threading
+import typing
+from dataclasses import dataclass, fields
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from config.areas import AREAS_ARV
+from config.benchmarks import (
+    BENCHMARKS_VERSAO,
+    CAMPOS_MONETARIOS,
+    CELULAS,
+    FAIXAS_NACIONAIS,
+    FATORES_REGIONAIS,
+    PORTES,
+    REGIOES,
+)
+from config.constants import MONTECARLO_VARIACAO_MAX, MONTECARLO_VARIACAO_MIN
+from core.validators import CAMPOS_POR_FORMULA
+from models.inputs import ClienteBasicInfo, ParametrosDetalhados, ProcessoAtual
+
+QUALQUER_AREA = "*"
+QUALQUER_PORTE = "*"
+REGIAO_NACIONAL = "brasil"
+
+Celula = Tuple[float, float, float]
+
+
+@dataclass(frozen=True, slots=True)
+class Faixa:
+    minimo: float
+    tipico: float
+    maximo: float
+
+    @property
+    def variacao_relativa(self) -> float:
+        """Meia-amplitude da faixa relativa ao seu centro (0 = sem dispersão)."""
+        soma = self.maximo + self.minimo
+        return (self.maximo - self.minimo) / soma if soma > 0 else 0.0
+
+
+def _campos_inteiros() -> frozenset:
+    inteiros = set()
+    for modelo in (ProcessoAtual, ParametrosDetalhados):
+        for campo in fields(modelo):
+            if campo.type is int or int in typing.get_args(campo.type):
+                inteiros.add(campo.name)
+    return frozenset(inteiros)
+
+
+_CAMPOS_INTEIROS = _campos_inteiros()
+
+
+def _interpolar(celulas: Mapping[str, Mapping[str, Celula]], porte: str, campo: str) -> Optional[Celula]:
+    """
+    Faixa de `campo` no `porte` a partir das células (porte → faixas) de uma mesma área e região:
+    a do próprio porte, a interpolação entre os portes vizinhos definidos ou a do porte `"*"`.
+    """
+    posicao = PORTES.index(porte)
+    definidos = [(PORTES.index(p), c[campo]) for p, c in celulas.items() if p != QUALQUER_PORTE and campo in c]
+    abaixo = max((d for d in definidos if d[0] <= posicao), default=None)
+    acima = min((d for d in definidos if d[0] >= posicao), default=None)
+    if abaixo is None or acima is None:
+        return celulas.get(QUALQUER_PORTE, {}).get(campo)
+    if abaixo[0] == acima[0]:
+        return abaixo[1]
+    peso = (posicao - abaixo[0]) / (acima[0] - abaixo[0])
+    return tuple(a + (b - a) * peso for a, b in zip(abaixo[1], acima[1]))
+
+
+class TabelaBenchmarks:
+    """Faixas resolvidas para cada (área, porte, região); consultas em O(1)."""
+
+    def __init__(
+        self,
+        faixas_nacionais: Mapping[str, Celula] = FAIXAS_NACIONAIS,
+        celulas: Mapping[Tuple[str, str, str], Mapping[str, Celula]] = CELULAS,
+        versao: str = BENCHMARKS_VERSAO,
+    ):
+        self.versao = versao
+        por_area_regiao: Dict[Tuple[str, str], Dict[str, Mapping[str, Celula]]] = {}
+        for (area, porte, regiao), faixas in celulas.items():
+            if (porte not in PORTES and porte != QUALQUER_PORTE) or regiao not in REGIOES:
+                raise ValueError(f"Célula de benchmark inválida: {(area, porte, regiao)}")
+            por_area_regiao.setdefault((area, regiao), {})[porte] = faixas
+
+        def resolver(area: str, porte: str, regiao: str, campo: str) -> Celula:
+            for chave in ((area, regiao), (QUALQUER_AREA, regiao)):
+                faixa = _interpolar(por_area_regiao.get(chave, {}), porte, campo)
+                if faixa is not None:
+                    return faixa
+            if regiao != REGIAO_NACIONAL:
+                faixa = resolver(area, porte, REGIAO_NACIONAL, campo)
+                fator = FATORES_REGIONAIS[regiao] if campo in CAMPOS_MONETARIOS else 1.0
+                return tuple(v * fator for v in faixa)
+            return faixas_nacionais[campo]
+
+        self._indice: Dict[Tuple[str, str, str], Dict[str, Faixa]] = {}
+        for area in (*AREAS_ARV, QUALQUER_AREA):
+            for porte in PORTES:
+                for regiao in REGIOES:
+                    self._indice[(area, porte, regiao)] = {
+                        campo: self._faixa(campo, resolver(area, porte, regiao, campo)) for campo in faixas_nacionais
+                    }
+
+    @staticmethod
+    def _faixa(campo: str, valores: Iterable[float]) -> Faixa:
+        if campo in _CAMPOS_INTEIROS:
+            return Faixa(*(int(round(v)) for v in valores))
+        return Faixa(*(round(v, 4) for v in valores))
+
+    def faixas(self, area: str, porte: str, regiao: str = REGIAO_NACIONAL) -> Mapping[str, Faixa]:
+        """Faixas de todos os campos; área desconhecida usa a média das áreas, região desconhecida a nacional."""
+        faixas = self._indice.get((area, porte, regiao))
+        if faixas is None:
+            faixas = self._indice[(
+                area if area in AREAS_ARV else QUALQUER_AREA,
+                porte if porte in PORTES else "media",
+                regiao if regiao in REGIOES else REGIAO_NACIONAL,
+            )]
+        return faixas
+
+    def faixas_cliente(self, cliente: ClienteBasicInfo) -> Mapping[str, Faixa]:
+        return self.faixas(cliente.area_atuacao, cliente.porte_empresa, cliente.regiao)
+
+
+_tabela: Optional[TabelaBenchmarks] = None
+_tabela_lock = threading.Lock()
+
+
+def obter_tabela() -> TabelaBenchmarks:
+    """Tabela de `config.benchmarks`, resolvida na primeira chamada e compartilhada pelo processo."""
+    global _tabela
+    if _tabela is None:
+        with _tabela_lock:
+            if _tabela is None:
+                _tabela = TabelaBenchmarks()
+    return _tabela
+
+
+def variacoes_montecarlo(cliente: ClienteBasicInfo, codigos: Iterable[str]) -> Dict[str, float]:
+    """
+    Variação (±) do custo de cada fórmula no Monte Carlo: a variação relativa média das faixas
+    dos parâmetros da fórmula para área/porte/região do cliente, limitada a
+    [MONTECARLO_VARIACAO_MIN, MONTECARLO_VARIACAO_MAX]. Fórmulas sem parâmetros na tabela ficam de fora.
+    """
+    faixas = obter_tabela().faixas_cliente(cliente)
+    variacoes = {}
+    for codigo in codigos:
+        relativas = [faixas[c].variacao_relativa for c in CAMPOS_POR_FORMULA.get(codigo, ()) if c in faixas]
+        if relativas:
+            media = sum(relativas) / len(relativas)
+            variacoes[codigo] = min(MONTECARLO_VARIACAO_MAX, max(MONTECARLO_VARIACAO_MIN, media))
+    return variacoes
@@ -0,0 +1,189 @@
+"""
+Cache em memória com TTL, limite de entradas (LRU) e métricas por camada.
+
+Usado pelo app para memoizar cálculo, tabelas do dashboard e exportação PPTX
+entre reruns do Streamlit. As chaves são derivadas das entradas normalizadas
+(ver `chave_entradas`), de modo que sessões com os mesmos dados compartilham resultado.
+
+Com um armazenamento compartilhado configurado (`core.armazenamento`), as camadas de cálculo e
+PPTX consultam o armazenamento quando não encontram a chave em memória e gravam nele cada valor
+novo, de modo que réplicas diferentes reaproveitam o mesmo resultado.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, is_dataclass
+from typing import Any, Callable, Dict, Optional
+
+from config.constants import (
+    CACHE_MAX_ENTRADAS_ATRIBUICAO,
+    CACHE_MAX_ENTRADAS_CALCULO,
+    CACHE_MAX_ENTRADAS_DASHBOARD,
+    CACHE_MAX_ENTRADAS_MAPA,
+    CACHE_MAX_ENTRADAS_PPTX,
+    CACHE_TTL_SEGUNDOS,
+)
+from core.armazenamento import Armazenamento, obter_armazenamento
+from models.inputs import DoresSelecionadas
+
+
+def _normalizar(valor: Any) -> Any:
+    """
+    Normaliza valores para serialização estável (int/float unificados, dataclasses → dict;
+    a seleção de dores vira a sua máscara de bits).
+    """
+    if isinstance(valor, DoresSelecionadas):
+        return {"mascara": int(valor.mascara)}
+    if is_dataclass(valor) and not isinstance(valor, type):
+        return _normalizar(asdict(valor))
+    if isinstance(valor, dict):
+        return {str(k): _normalizar(v) for k, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_normalizar(v) for v in valor]
+    if isinstance(valor, bool) or valor is None or isinstance(valor, str):
+        return valor
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    return str(valor)
+
+
+def chave_entradas(*partes: Any) -> str:
+    """
+    Chave determinística para um conjunto de entradas.
+
+    `10` e `10.0` geram a mesma chave; a ordem dos campos não importa.
+    """
+    payload = json.dumps([_normalizar(p) for p in partes], sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass
+class MetricasCache:
+    """Contadores de uma camada de cache."""
+
+    acertos: int = 0
+    falhas: int = 0
+    expiracoes: int = 0
+    descartes: int = 0  # removidos por exceder `max_entradas`
+    acertos_compartilhados: int = 0  # acertos (já contados em `acertos`) vindos do armazenamento compartilhado
+
+    @property
+    def taxa_acerto(self) -> float:
+        total = self.acertos + self.falhas
+        return (self.acertos / total) if total else 0.0
+
+
+class CacheTTL:
+    """
+    Cache LRU thread-safe com expiração por tempo (TTL).
+
+    Com `compartilhado`, funciona como primeiro nível de um armazenamento entre réplicas
+    (valores serializados com pickle, namespace = `nome`).
+    """
+
+    def __init__(
+        self,
+        nome: str,
+        ttl_segundos: float,
+        max_entradas: int,
+        relogio: Callable[[], float] = time.monotonic,
+        compartilhado: Optional[Armazenamento] = None,
+    ):
+        if max_entradas < 1:
+            raise ValueError("max_entradas deve ser >= 1.")
+        self.nome = nome
+        self.ttl_segundos = ttl_segundos
+        self.max_entradas = max_entradas
+        self.metricas = MetricasCache()
+        self._relogio = relogio
+        self.compartilhado = compartilhado
+        self._dados: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._dados)
+
+    def contem(self, chave: str) -> bool:
+        """Indica se há valor válido para `chave` (não altera métricas nem a ordem LRU)."""
+        with self._lock:
+            item = self._dados.get(chave)
+            if item is not None and self._relogio() < item[0]:
+                return True
+        return self.compartilhado is not None and self.compartilhado.contem(self.nome, chave)
+
+    def obter(self, chave: str, padrao: Any = None) -> Any:
+        """Retorna o valor armazenado (ou `padrao`), contabilizando acerto/falha."""
+        agora = self._relogio()
+        with self._lock:
+            item = self._dados.get(chave)
+            if item is not None:
+                expira_em, valor = item
+                if agora < expira_em:
+                    self._dados.move_to_end(chave)
+                    self.metricas.acertos += 1
+                    return valor
+                del self._dados[chave]
+                self.metricas.expiracoes += 1
+
+        serializado = self.compartilhado.obter(self.nome, chave) if self.compartilhado is not None else None
+        if serializado is None:
+            with self._lock:
+                self.metricas.falhas += 1
+            return padrao
+
+        valor = pickle.loads(serializado)
+        self._definir_local(chave, valor)
+        with self._lock:
+            self.metricas.acertos += 1
+            self.metricas.acertos_compartilhados += 1
+        return valor
+
+    def definir(self, chave: str, valor: Any) -> None:
+        """Armazena `valor`, descartando as entradas menos usadas acima do limite."""
+        self._definir_local(chave, valor)
+        if self.compartilhado is not None:
+            self.compartilhado.definir(self.nome, chave, pickle.dumps(valor), self.ttl_segundos)
+
+    def _definir_local(self, chave: str, valor: Any) -> None:
+        expira_em = self._relogio() + self.ttl_segundos
+        with self._lock:
+            self._dados[chave] = (expira_em, valor)
+            self._dados.move_to_end(chave)
+            while len(self._dados) > self.max_entradas:
+                self._dados.popitem(last=False)
+                self.metricas.descartes += 1
+
+    def obter_ou_calcular(self, chave: str, calcular: Callable[[], Any]) -> Any:
+        """Retorna o valor em cache ou executa `calcular()` e armazena o resultado."""
+        sentinela = object()
+        valor = self.obter(chave, sentinela)
+        if valor is sentinela:
+            valor = calcular()
+            self.definir(chave, valor)
+        return valor
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._dados.clear()
+
+
+# Camadas do app — instâncias de módulo sobrevivem aos reruns (o Streamlit só reexecuta `app.py`).
+# Tabelas do dashboard são baratas de derivar do cálculo e ficam só em memória local.
+CACHES: Dict[str, CacheTTL] = {
+    "calculo": CacheTTL("calculo", CACHE_TTL_SEGUNDOS, CACHE_MAX_ENTRADAS_CALCULO, compartilhado=obter_armazenamento()),
+    "dashboard": CacheTTL("dashboard", CACHE_TTL_SEGUNDOS, CACHE_MAX_ENTRADAS_DASHBOARD),
+    "pptx": CacheTTL("pptx", CACHE_TTL_SEGUNDOS, CACHE_MAX_ENTRADAS_PPTX, compartilhado=obter_armazenamento()),
+    "atribuicao": CacheTTL("atribuicao", CACHE_TTL_SEGUNDOS, CACHE_MAX_ENTRADAS_ATRIBUICAO),
+    "mapa": CacheTTL("mapa", CACHE_TTL_SEGUNDOS, CACHE_MAX_ENTRADAS_MAPA),
+}
+
+
+def obter_cache(nome: str) -> CacheTTL:
+    """Retorna a camada de cache `nome` ("calculo", "dashboard", "pptx", "atribuicao" ou "mapa")."""
+    return CACHES[nome]
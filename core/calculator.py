@@ -6,13 +6,17 @@ Orquestra as fórmulas F01–F18 e gera resultados consolidados por 5 Dores.
 
 from __future__ import annotations
 
+from typing import Union
+
 from config.constants import FATOR_CUSTO_TURNOVER_DEFAULT
 from core.formulas import (
+    calcular_custo_hora_extra_base,
     calcular_custo_hora_operador,
     calcular_custo_hora_parada,
     calcular_f01_mao_de_obra_direta,
     calcular_f02_horas_extras,
     calcular_f03_curva_aprendizagem,
+    calcular_f03_custo_por_contratacao,
     calcular_f04_turnover,
     calcular_f05_refugo_retrabalho,
     calcular_f06_inspecao_manual,
@@ -28,7 +32,7 @@ from core.formulas import (
     calcular_f16_energia,
     calcular_f17_espaco_fisico,
     calcular_f18_gestao_dados,
-    calcular_ganho_anual,
+    calcular_ganho_anual_total,
     calcular_horas_operacao_mes,
     calcular_horas_anuais,
     calcular_payback,
@@ -43,26 +47,39 @@ from models.calculations import (
     CustosDor3Produtividade,
     CustosDor4Seguranca,
     CustosDor5CustosOcultos,
+    PassoCalculo,
+    RastreioCalculo,
+)
+from models.inputs import (
+    ClienteBasicInfo,
+    DoresSelecionadas,
+    Formula,
+    InvestimentoAutomacao,
+    ParametrosDetalhados,
+    ProcessoAtual,
 )
-from models.inputs import ClienteBasicInfo, DoresSelecionadas, InvestimentoAutomacao, ParametrosDetalhados, ProcessoAtual
 from models.results import MetasReducao, ResultadosFinanceiros
 
 
 class ROICalculator:
-    """Motor de cálculo de Custo da Inação (V2.0)."""
+    """
+    Motor de cálculo de Custo da Inação (V2.0).
+
+    `dores` aceita também a seleção como máscara (`Formula` ou `int`, bit 0 = F01).
+    """
 
     def __init__(
         self,
         cliente: ClienteBasicInfo,
         processo: ProcessoAtual,
-        dores: DoresSelecionadas,
+        dores: Union[DoresSelecionadas, Formula, int],
         parametros: ParametrosDetalhados,
         investimento: InvestimentoAutomacao,
         metas: MetasReducao,
     ):
         self.cliente = cliente
         self.processo = processo
-        self.dores = dores
+        self.dores = dores if isinstance(dores, DoresSelecionadas) else DoresSelecionadas.de_mascara(dores)
         self.parametros = parametros
         self.investimento = investimento
         self.metas = metas
@@ -109,8 +126,13 @@ class ROICalculator:
             fator_encargos=fator_encargos,
         )
 
-    def calcular(self) -> ResultadosFinanceiros:
-        """Executa o cálculo completo (V2.0) e retorna resultados consolidados."""
+    def calcular(self, rastrear: bool = False) -> ResultadosFinanceiros:
+        """
+        Executa o cálculo completo (V2.0) e retorna resultados consolidados.
+
+        Com `rastrear=True`, `ResultadosFinanceiros.rastreio` registra as entradas, fontes (fallbacks)
+        e o resultado de cada fórmula avaliada — dashboard e PPTX detalham os cálculos a partir dele.
+        """
 
         d = self.dores
         p = self.processo
@@ -124,20 +146,55 @@ class ROICalculator:
         dor4 = CustosDor4Seguranca()
         dor5 = CustosDor5CustosOcultos()
 
+        rastreio = (
+            RastreioCalculo(
+                bases={
+                    "producao_anual": b.producao_anual,
+                    "producao_mensal": b.producao_mensal,
+                    "horas_anuais_operacao": b.horas_anuais_operacao,
+                    "horas_operacao_mes": calcular_horas_operacao_mes(p.horas_por_turno, p.turnos_por_dia, p.dias_operacao_ano),
+                    "pessoas_expostas_processo": b.pessoas_expostas_processo,
+                    "pessoas_expostas_inspecao": b.pessoas_expostas_inspecao,
+                    "custo_hora_operador": b.custo_hora_operador,
+                    "custo_hora_extra_base": calcular_custo_hora_extra_base(p.salario_medio_operador, fator_encargos),
+                    "custo_hora_parada": b.custo_hora_parada,
+                    "fator_encargos": fator_encargos,
+                }
+            )
+            if rastrear
+            else None
+        )
+
+        def _registrar(codigo: str, rotulo: str, entradas: dict, resultado: float, **extras):
+            if rastreio is not None:
+                rastreio.passos.append(
+                    PassoCalculo(codigo=codigo, rotulo=rotulo, entradas=entradas, resultado=resultado, **extras)
+                )
+
         # --- Dor 1 ---
         if d.f01_mao_de_obra_direta:
-            dor1.f01_mao_de_obra_direta = calcular_f01_mao_de_obra_direta(
-                b.pessoas_expostas_processo,
-                p.salario_medio_operador,
-                fator_encargos,
+            entradas = dict(
+                num_operadores=b.pessoas_expostas_processo,
+                salario_medio=p.salario_medio_operador,
+                fator_encargos=fator_encargos,
             )
+            dor1.f01_mao_de_obra_direta = calcular_f01_mao_de_obra_direta(**entradas)
+            _registrar("F01", "F01 - Mão de Obra Direta", entradas, dor1.f01_mao_de_obra_direta)
 
         if d.f02_horas_extras and params.f02_media_he_mes_por_pessoa is not None:
-            dor1.f02_horas_extras = calcular_f02_horas_extras(
-                b.pessoas_expostas_processo,
-                params.f02_media_he_mes_por_pessoa,
-                p.salario_medio_operador,
-                fator_encargos,
+            entradas = dict(
+                num_operadores=b.pessoas_expostas_processo,
+                media_he_mes=params.f02_media_he_mes_por_pessoa,
+                salario_medio=p.salario_medio_operador,
+                fator_encargos=fator_encargos,
+            )
+            dor1.f02_horas_extras = calcular_f02_horas_extras(**entradas)
+            _registrar(
+                "F02",
+                "F02 - Horas Extras",
+                entradas,
+                dor1.f02_horas_extras,
+                intermediarios={"custo_hora_he": calcular_custo_hora_extra_base(p.salario_medio_operador, fator_encargos)},
             )
 
         if d.f03_curva_aprendizagem and (
@@ -147,7 +204,7 @@ class ROICalculator:
             and (params.f03_salario_supervisor is not None or p.salario_medio_supervisor is not None)
             and params.f03_percentual_tempo_supervisor is not None
         ):
-            dor1.f03_curva_aprendizagem = calcular_f03_curva_aprendizagem(
+            entradas = dict(
                 num_contratacoes=params.f03_novas_contratacoes_ano,
                 salario_novato=params.f03_salario_novato or p.salario_medio_operador,
                 fator_encargos=fator_encargos,
@@ -155,13 +212,57 @@ class ROICalculator:
                 salario_supervisor=params.f03_salario_supervisor or p.salario_medio_supervisor,
                 pct_tempo_supervisor=params.f03_percentual_tempo_supervisor,
             )
+            dor1.f03_curva_aprendizagem = calcular_f03_curva_aprendizagem(**entradas)
+            if rastreio is not None:
+                custo_novato, custo_supervisor = calcular_f03_custo_por_contratacao(
+                    entradas["salario_novato"],
+                    fator_encargos,
+                    entradas["meses_curva"],
+                    entradas["salario_supervisor"],
+                    entradas["pct_tempo_supervisor"],
+                )
+                _registrar(
+                    "F03",
+                    "F03 - Curva de Aprendizagem",
+                    entradas,
+                    dor1.f03_curva_aprendizagem,
+                    fontes={
+                        "salario_novato": (
+                            "parametros.f03_salario_novato" if params.f03_salario_novato else "processo.salario_medio_operador"
+                        ),
+                        "salario_supervisor": (
+                            "parametros.f03_salario_supervisor"
+                            if params.f03_salario_supervisor
+                            else "processo.salario_medio_supervisor"
+                        ),
+                    },
+                    intermediarios={
+                        "custo_novato": custo_novato,
+                        "custo_supervisor": custo_supervisor,
+                        "custo_por_contratacao": custo_novato + custo_supervisor,
+                    },
+                )
 
         if d.f04_turnover and params.f04_desligamentos_ano is not None:
-            dor1.f04_turnover = calcular_f04_turnover(
+            entradas = dict(
                 num_desligamentos=params.f04_desligamentos_ano,
                 salario_medio=p.salario_medio_operador,
                 fator_custo_turnover=params.f04_fator_custo_turnover or FATOR_CUSTO_TURNOVER_DEFAULT,
             )
+            dor1.f04_turnover = calcular_f04_turnover(**entradas)
+            _registrar(
+                "F04",
+                "F04 - Turnover",
+                entradas,
+                dor1.f04_turnover,
+                fontes={
+                    "fator_custo_turnover": (
+                        "parametros.f04_fator_custo_turnover"
+                        if params.f04_fator_custo_turnover
+                        else "FATOR_CUSTO_TURNOVER_DEFAULT"
+                    )
+                },
+            )
 
         dor1.total = dor1.f01_mao_de_obra_direta + dor1.f02_horas_extras + dor1.f03_curva_aprendizagem + dor1.f04_turnover
 
@@ -171,7 +272,7 @@ class ROICalculator:
             and params.f05_percentual_retrabalho is not None
             and params.f05_horas_retrabalho_por_unidade is not None
         ):
-            refugo, retrabalho, total = calcular_f05_refugo_retrabalho(
+            entradas = dict(
                 producao_mensal=b.producao_mensal,
                 pct_refugo=params.f05_percentual_refugo,
                 custo_mp_unidade=p.custo_materia_prima_peca,
@@ -179,24 +280,36 @@ class ROICalculator:
                 horas_retrab_unidade=params.f05_horas_retrabalho_por_unidade,
                 custo_hora_operador=b.custo_hora_operador,
             )
+            refugo, retrabalho, total = calcular_f05_refugo_retrabalho(**entradas)
             dor2.f05_refugo = refugo
             dor2.f05_retrabalho = retrabalho
             dor2.f05_total = total
+            _registrar(
+                "F05",
+                "F05 - Refugo e Retrabalho",
+                entradas,
+                total,
+                componentes={"F05 - Refugo": refugo, "F05 - Retrabalho": retrabalho},
+            )
 
         if d.f06_inspecao_manual:
-            dor2.f06_inspecao_manual = calcular_f06_inspecao_manual(
+            entradas = dict(
                 num_inspetores=b.pessoas_expostas_inspecao,
                 salario_inspetor=p.salario_medio_inspetor,
                 fator_encargos=fator_encargos,
             )
+            dor2.f06_inspecao_manual = calcular_f06_inspecao_manual(**entradas)
+            _registrar("F06", "F06 - Inspeção Manual", entradas, dor2.f06_inspecao_manual)
 
         if d.f07_escapes_qualidade and (
             params.f07_reclamacoes_clientes_ano is not None and params.f07_custo_medio_por_reclamacao is not None
         ):
-            dor2.f07_escapes_qualidade = calcular_f07_escapes_qualidade(
+            entradas = dict(
                 reclamacoes_ano=params.f07_reclamacoes_clientes_ano,
                 custo_medio_reclamacao=params.f07_custo_medio_por_reclamacao,
             )
+            dor2.f07_escapes_qualidade = calcular_f07_escapes_qualidade(**entradas)
+            _registrar("F07", "F07 - Escapes de Qualidade", entradas, dor2.f07_escapes_qualidade)
 
         dor2.total = dor2.f05_total + dor2.f06_inspecao_manual + dor2.f07_escapes_qualidade
 
@@ -206,34 +319,56 @@ class ROICalculator:
             and params.f08_percentual_demanda_reprimida is not None
             and params.f08_margem_contribuicao is not None
         ):
-            dor3.f08_custo_oportunidade = calcular_f08_custo_oportunidade(
+            entradas = dict(
                 faturamento_mensal=p.faturamento_mensal_linha,
                 pct_demanda_reprimida=params.f08_percentual_demanda_reprimida,
                 margem_contribuicao=params.f08_margem_contribuicao,
             )
+            dor3.f08_custo_oportunidade = calcular_f08_custo_oportunidade(**entradas)
+            _registrar("F08", "F08 - Custo de Oportunidade", entradas, dor3.f08_custo_oportunidade)
 
         if d.f09_ociosidade_silenciosa and params.f09_minutos_ociosos_por_dia is not None:
-            dor3.f09_ociosidade = calcular_f09_ociosidade_silenciosa(
+            entradas = dict(
                 num_operadores=b.pessoas_expostas_processo,
                 min_ociosos_dia=params.f09_minutos_ociosos_por_dia,
                 custo_hora_operador=b.custo_hora_operador,
                 dias_ano=p.dias_operacao_ano,
             )
+            dor3.f09_ociosidade = calcular_f09_ociosidade_silenciosa(**entradas)
+            _registrar("F09", "F09 - Ociosidade Silenciosa", entradas, dor3.f09_ociosidade)
 
         if d.f10_paradas_linha and (
             params.f10_paradas_mes is not None and params.f10_duracao_media_parada_horas is not None
         ):
-            dor3.f10_paradas_linha = calcular_f10_paradas_linha(
+            chp_manual = params.f10_custo_hora_parada is not None and params.f10_custo_hora_parada > 0
+            entradas = dict(
                 paradas_mes=params.f10_paradas_mes,
                 duracao_media_horas=params.f10_duracao_media_parada_horas,
-                custo_hora_parada=params.f10_custo_hora_parada if (params.f10_custo_hora_parada is not None and params.f10_custo_hora_parada > 0) else b.custo_hora_parada,
+                custo_hora_parada=params.f10_custo_hora_parada if chp_manual else b.custo_hora_parada,
+            )
+            dor3.f10_paradas_linha = calcular_f10_paradas_linha(**entradas)
+            _registrar(
+                "F10",
+                "F10 - Paradas de Linha",
+                entradas,
+                dor3.f10_paradas_linha,
+                fontes={"custo_hora_parada": "parametros.f10_custo_hora_parada" if chp_manual else "bases.custo_hora_parada"},
             )
 
         if d.f11_setup_changeover and (params.f11_setups_mes is not None and params.f11_horas_por_setup is not None):
-            dor3.f11_setup_changeover = calcular_f11_setup_changeover(
+            chp_manual = params.f11_custo_hora_parada is not None and params.f11_custo_hora_parada > 0
+            entradas = dict(
                 setups_mes=params.f11_setups_mes,
                 horas_setup=params.f11_horas_por_setup,
-                custo_hora_parada=params.f11_custo_hora_parada if (params.f11_custo_hora_parada is not None and params.f11_custo_hora_parada > 0) else b.custo_hora_parada,
+                custo_hora_parada=params.f11_custo_hora_parada if chp_manual else b.custo_hora_parada,
+            )
+            dor3.f11_setup_changeover = calcular_f11_setup_changeover(**entradas)
+            _registrar(
+                "F11",
+                "F11 - Setup/Changeover",
+                entradas,
+                dor3.f11_setup_changeover,
+                fontes={"custo_hora_parada": "parametros.f11_custo_hora_parada" if chp_manual else "bases.custo_hora_parada"},
             )
 
         dor3.total = dor3.f08_custo_oportunidade + dor3.f09_ociosidade + dor3.f10_paradas_linha + dor3.f11_setup_changeover
@@ -247,7 +382,7 @@ class ROICalculator:
             and params.f12_probabilidade_processo is not None
             and params.f12_custo_estimado_processo is not None
         ):
-            afast, acid, legal, total = calcular_f12_riscos_acidentes(
+            entradas = dict(
                 afastamentos_ano=params.f12_afastamentos_ano,
                 custo_afastamento=params.f12_custo_medio_afastamento,
                 acidentes_ano=params.f12_acidentes_com_lesao_ano,
@@ -255,10 +390,18 @@ class ROICalculator:
                 prob_processo=params.f12_probabilidade_processo,
                 custo_processo=params.f12_custo_estimado_processo,
             )
+            afast, acid, legal, total = calcular_f12_riscos_acidentes(**entradas)
             dor4.f12_afastamentos = afast
             dor4.f12_acidentes = acid
             dor4.f12_risco_legal = legal
             dor4.f12_total = total
+            _registrar(
+                "F12",
+                "F12 - Riscos, Acidentes e Doenças",
+                entradas,
+                total,
+                componentes={"F12 - Afastamentos": afast, "F12 - Acidentes": acid, "F12 - Risco Legal": legal},
+            )
 
         if d.f13_frota_empilhadeiras and (
             params.f13_num_empilhadeiras is not None
@@ -267,13 +410,15 @@ class ROICalculator:
             and params.f13_custo_energia_mes is not None
             and params.f13_custo_manutencao_mes is not None
         ):
-            dor4.f13_frota_empilhadeiras = calcular_f13_frota_empilhadeiras(
+            entradas = dict(
                 num_empilhadeiras=params.f13_num_empilhadeiras,
                 custo_operador=params.f13_custo_operador_mes,
                 custo_equipamento=params.f13_custo_equipamento_mes,
                 custo_energia=params.f13_custo_energia_mes,
                 custo_manutencao=params.f13_custo_manutencao_mes,
             )
+            dor4.f13_frota_empilhadeiras = calcular_f13_frota_empilhadeiras(**entradas)
+            _registrar("F13", "F13 - Frota de Empilhadeiras", entradas, dor4.f13_frota_empilhadeiras)
 
         dor4.total = dor4.f12_total + dor4.f13_frota_empilhadeiras
 
@@ -286,70 +431,98 @@ class ROICalculator:
             else (p.supervisores_por_turno * p.turnos_por_dia)
         )
         if d.f14_supervisao and total_supervisores > 0:
-            dor5.f14_supervisao = calcular_f14_supervisao(
+            entradas = dict(
                 num_supervisores=total_supervisores,
                 salario_supervisor=params.f14_salario_supervisor or p.salario_medio_supervisor,
                 fator_encargos=fator_encargos,
             )
+            dor5.f14_supervisao = calcular_f14_supervisao(**entradas)
+            _registrar(
+                "F14",
+                "F14 - Supervisão",
+                entradas,
+                dor5.f14_supervisao,
+                fontes={
+                    "num_supervisores": (
+                        "parametros.f14_num_supervisores"
+                        if params.f14_num_supervisores is not None
+                        else "processo.supervisores_por_turno × turnos_por_dia"
+                    ),
+                    "salario_supervisor": (
+                        "parametros.f14_salario_supervisor"
+                        if params.f14_salario_supervisor
+                        else "processo.salario_medio_supervisor"
+                    ),
+                },
+            )
 
         if d.f15_compliance_epis and (
             params.f15_custo_epi_ano_por_pessoa is not None and params.f15_custo_exames_ano_por_pessoa is not None
         ):
-            dor5.f15_compliance_epis = calcular_f15_compliance_epis(
+            entradas = dict(
                 num_operadores=b.pessoas_expostas_processo,
                 custo_epi_ano=params.f15_custo_epi_ano_por_pessoa,
                 custo_exames_ano=params.f15_custo_exames_ano_por_pessoa,
             )
+            dor5.f15_compliance_epis = calcular_f15_compliance_epis(**entradas)
+            _registrar("F15", "F15 - Compliance/EPIs", entradas, dor5.f15_compliance_epis)
 
         if d.f16_energia_utilidades and (params.f16_area_operacao_m2 is not None and params.f16_custo_energia_m2_ano is not None):
-            dor5.f16_energia = calcular_f16_energia(
+            entradas = dict(
                 area_m2=params.f16_area_operacao_m2,
                 custo_energia_m2_ano=params.f16_custo_energia_m2_ano,
             )
+            dor5.f16_energia = calcular_f16_energia(**entradas)
+            _registrar("F16", "F16 - Energia e Utilidades", entradas, dor5.f16_energia)
 
         if d.f17_espaco_fisico and (
             params.f17_area_m2 is not None
             and params.f17_custo_m2_ano is not None
             and params.f17_percentual_reducao_automacao is not None
         ):
-            dor5.f17_espaco_fisico = calcular_f17_espaco_fisico(
+            entradas = dict(
                 area_m2=params.f17_area_m2,
                 custo_m2_ano=params.f17_custo_m2_ano,
                 pct_reducao=params.f17_percentual_reducao_automacao,
             )
+            dor5.f17_espaco_fisico = calcular_f17_espaco_fisico(**entradas)
+            _registrar("F17", "F17 - Espaço Físico", entradas, dor5.f17_espaco_fisico)
 
         if d.f18_gestao_dados and (params.f18_pessoas_envolvidas is not None and params.f18_horas_dia_tarefas_dados is not None):
-            dor5.f18_gestao_dados = calcular_f18_gestao_dados(
+            entradas = dict(
                 num_pessoas=params.f18_pessoas_envolvidas,
                 horas_dia=params.f18_horas_dia_tarefas_dados,
                 custo_hora_operador=b.custo_hora_operador,
                 dias_ano=p.dias_operacao_ano,
             )
+            dor5.f18_gestao_dados = calcular_f18_gestao_dados(**entradas)
+            _registrar("F18", "F18 - Gestão de Dados", entradas, dor5.f18_gestao_dados)
 
         dor5.total = dor5.f14_supervisao + dor5.f15_compliance_epis + dor5.f16_energia + dor5.f17_espaco_fisico + dor5.f18_gestao_dados
 
         custo_total = dor1.total + dor2.total + dor3.total + dor4.total + dor5.total
 
-        m = self.metas
-        ganho_anual = 0.0
-        ganho_anual += calcular_ganho_anual(dor1.f01_mao_de_obra_direta, m.meta_f01)
-        ganho_anual += calcular_ganho_anual(dor1.f02_horas_extras, m.meta_f02)
-        ganho_anual += calcular_ganho_anual(dor1.f03_curva_aprendizagem, m.meta_f03)
-        ganho_anual += calcular_ganho_anual(dor1.f04_turnover, m.meta_f04)
-        ganho_anual += calcular_ganho_anual(dor2.f05_total, m.meta_f05)
-        ganho_anual += calcular_ganho_anual(dor2.f06_inspecao_manual, m.meta_f06)
-        ganho_anual += calcular_ganho_anual(dor2.f07_escapes_qualidade, m.meta_f07)
-        ganho_anual += calcular_ganho_anual(dor3.f08_custo_oportunidade, m.meta_f08)
-        ganho_anual += calcular_ganho_anual(dor3.f09_ociosidade, m.meta_f09)
-        ganho_anual += calcular_ganho_anual(dor3.f10_paradas_linha, m.meta_f10)
-        ganho_anual += calcular_ganho_anual(dor3.f11_setup_changeover, m.meta_f11)
-        ganho_anual += calcular_ganho_anual(dor4.f12_total, m.meta_f12)
-        ganho_anual += calcular_ganho_anual(dor4.f13_frota_empilhadeiras, m.meta_f13)
-        ganho_anual += calcular_ganho_anual(dor5.f14_supervisao, m.meta_f14)
-        ganho_anual += calcular_ganho_anual(dor5.f15_compliance_epis, m.meta_f15)
-        ganho_anual += calcular_ganho_anual(dor5.f16_energia, m.meta_f16)
-        ganho_anual += calcular_ganho_anual(dor5.f17_espaco_fisico, m.meta_f17)
-        ganho_anual += calcular_ganho_anual(dor5.f18_gestao_dados, m.meta_f18)
+        custos = (
+            dor1.f01_mao_de_obra_direta,
+            dor1.f02_horas_extras,
+            dor1.f03_curva_aprendizagem,
+            dor1.f04_turnover,
+            dor2.f05_total,
+            dor2.f06_inspecao_manual,
+            dor2.f07_escapes_qualidade,
+            dor3.f08_custo_oportunidade,
+            dor3.f09_ociosidade,
+            dor3.f10_paradas_linha,
+            dor3.f11_setup_changeover,
+            dor4.f12_total,
+            dor4.f13_frota_empilhadeiras,
+            dor5.f14_supervisao,
+            dor5.f15_compliance_epis,
+            dor5.f16_energia,
+            dor5.f17_espaco_fisico,
+            dor5.f18_gestao_dados,
+        )
+        ganho_anual = calcular_ganho_anual_total(custos, self.metas.valores)
 
         investimento_medio = self.investimento.valor_investimento_medio
 
@@ -404,4 +577,5 @@ class ROICalculator:
             area_atuacao=self.cliente.area_atuacao,
             porte_empresa=self.cliente.porte_empresa,
             fator_encargos_usado=fator_encargos,
+            rastreio=rastreio,
         )
@@ -0,0 +1,285 @@
+"""
+Modo exato do cálculo: valores monetários em centavos inteiros.
+
+No cálculo em float, somar componentes (e carteiras de análises) acumula diferenças de centavos
+que aparecem ao conferir as tabelas do PPTX em planilha. No modo exato, as entradas numéricas
+viram frações decimais exatas — o valor como foi digitado (0.1 é 1/10, não o binário mais
+próximo) — e as mesmas fórmulas de `ROICalculator` são avaliadas sem arredondamento intermediário.
+
+Regras de arredondamento (meio centavo para cima, o arredondamento comercial):
+
+1. cada linha dos breakdowns e cada base em R$ é arredondada uma única vez para centavos;
+2. totais por dor e o custo total são somas inteiras das linhas arredondadas;
+3. o ganho de cada fórmula é o seu custo em centavos × meta, arredondado; o ganho anual é a soma;
+4. investimento médio em centavos; payback e ROI são razões exatas entre centavos.
+
+Os resultados saem como `ResultadosFinanceiros` (R$ = centavos / 100), então dashboard, PPTX e
+API os consomem sem mudanças, e os totais batem com a soma das linhas exibidas.
+"""
+
+from __future__ import annotations
+
+from dataclasses import fields, replace
+from decimal import Decimal
+from fractions import Fraction
+from functools import lru_cache
+from math import gcd
+from typing import Any, Dict
+
+from core.calculator import ROICalculator
+from models.calculations import PassoCalculo, RastreioCalculo
+from models.inputs import ClienteBasicInfo, DoresSelecionadas, InvestimentoAutomacao, ParametrosDetalhados, ProcessoAtual
+from models.results import (
+    CAMPOS_BREAKDOWN,
+    CODIGOS_FORMULAS,
+    INDICE_FORMULA,
+    MetasReducao,
+    ResultadosFinanceiros,
+    codigo_do_rotulo,
+)
+
+
+class _Exato:
+    """
+    Racional exato n/d (d > 0, forma reduzida) para as fórmulas do cálculo.
+
+    Mais enxuto que `fractions.Fraction` e, ao contrário dela, absorve floats pelo decimal que
+    representam em vez de virar float — constantes como `1.5` em `core.formulas` seguem exatas.
+    """
+
+    __slots__ = ("n", "d")
+
+    def __init__(self, n: int, d: int = 1):
+        self.n = n
+        self.d = d
+
+    @staticmethod
+    def _reduzido(n: int, d: int) -> "_Exato":
+        if d < 0:
+            n, d = -n, -d
+        g = gcd(n, d)
+        return _Exato(n // g, d // g) if g != 1 else _Exato(n, d)
+
+    # --- Aritmética ---
+
+    def __add__(self, outro):
+        o = _exato(outro)
+        if o is NotImplemented:
+            return o
+        if self.d == o.d:
+            return _Exato._reduzido(self.n + o.n, self.d)
+        return _Exato._reduzido(self.n * o.d + o.n * self.d, self.d * o.d)
+
+    __radd__ = __add__
+
+    def __sub__(self, outro):
+        o = _exato(outro)
+        if o is NotImplemented:
+            return o
+        return _Exato._reduzido(self.n * o.d - o.n * self.d, self.d * o.d)
+
+    def __rsub__(self, outro):
+        o = _exato(outro)
+        if o is NotImplemented:
+            return o
+        return o - self
+
+    def __mul__(self, outro):
+        o = _exato(outro)
+        if o is NotImplemented:
+            return o
+        return _Exato._reduzido(self.n * o.n, self.d * o.d)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, outro):
+        o = _exato(outro)
+        if o is NotImplemented:
+            return o
+        if o.n == 0:
+            raise ZeroDivisionError("divisão por zero")
+        return _Exato._reduzido(self.n * o.d, self.d * o.n)
+
+    def __rtruediv__(self, outro):
+        o = _exato(outro)
+        if o is NotImplemented:
+            return o
+        return o / self
+
+    def __neg__(self):
+        return _Exato(-self.n, self.d)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return _Exato(abs(self.n), self.d)
+
+    # --- Comparações e conversões ---
+
+    def _comparar(self, outro) -> int:
+        o = _exato(outro)
+        diferenca = self.n * o.d - o.n * self.d
+        return (diferenca > 0) - (diferenca < 0)
+
+    def __eq__(self, outro):
+        if outro is None or isinstance(outro, str):
+            return False
+        return self._comparar(outro) == 0
+
+    def __lt__(self, outro):
+        return self._comparar(outro) < 0
+
+    def __le__(self, outro):
+        return self._comparar(outro) <= 0
+
+    def __gt__(self, outro):
+        return self._comparar(outro) > 0
+
+    def __ge__(self, outro):
+        return self._comparar(outro) >= 0
+
+    def __hash__(self):
+        return hash(Fraction(self.n, self.d))
+
+    def __bool__(self):
+        return self.n != 0
+
+    def __float__(self):
+        return self.n / self.d
+
+    def __repr__(self):
+        return f"_Exato({self.n}, {self.d})"
+
+
+@lru_cache(maxsize=4096)
+def _de_float(valor: float) -> _Exato:
+    """O decimal que o float representa (`repr`), não o seu valor binário: 0.1 → 1/10."""
+    return _Exato(*Decimal(repr(valor)).as_integer_ratio())
+
+
+def _exato(valor: Any):
+    if isinstance(valor, _Exato):
+        return valor
+    if isinstance(valor, int):
+        return _Exato(int(valor))
+    if isinstance(valor, float):
+        return _de_float(valor)
+    if isinstance(valor, Fraction):
+        return _Exato(valor.numerator, valor.denominator)
+    return NotImplemented
+
+
+def arredondar(valor: _Exato) -> int:
+    """Inteiro mais próximo de `valor`; meios se afastam do zero (ROUND_HALF_UP)."""
+    n, d = valor.n, valor.d
+    inteiro = (2 * abs(n) + d) // (2 * d)
+    return inteiro if n >= 0 else -inteiro
+
+
+def centavos(reais: Any) -> int:
+    """Valor em R$ (float, int ou fração) → centavos inteiros, pelas regras do módulo."""
+    return arredondar(_exato(reais) * 100)
+
+
+def _exatos(modelo):
+    """Cópia de um dataclass de entradas com os campos numéricos (exceto bool) em frações exatas."""
+    valores = {}
+    for campo in fields(modelo):
+        valor = getattr(modelo, campo.name)
+        if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+            valores[campo.name] = _exato(valor)
+    return replace(modelo, **valores)
+
+
+def _float(valor: Any) -> Any:
+    return float(valor) if isinstance(valor, _Exato) else valor
+
+
+def _rastreio_float(rastreio: RastreioCalculo) -> RastreioCalculo:
+    """Rastro com os números convertidos para float (exibição/serialização), sem arredondar."""
+    return RastreioCalculo(
+        bases={k: _float(v) for k, v in rastreio.bases.items()},
+        passos=[
+            PassoCalculo(
+                codigo=p.codigo,
+                rotulo=p.rotulo,
+                entradas={k: _float(v) for k, v in p.entradas.items()},
+                resultado=_float(p.resultado),
+                fontes=p.fontes,
+                intermediarios={k: _float(v) for k, v in p.intermediarios.items()},
+                componentes={k: _float(v) for k, v in p.componentes.items()},
+            )
+            for p in rastreio.passos
+        ],
+    )
+
+
+def _razao(numerador: int, denominador: int) -> float:
+    return numerador / denominador  # int / int: arredondamento correto do quociente exato
+
+
+def calcular_exato(
+    cliente: ClienteBasicInfo,
+    processo: ProcessoAtual,
+    dores: DoresSelecionadas,
+    parametros: ParametrosDetalhados,
+    investimento: InvestimentoAutomacao,
+    metas: MetasReducao,
+    rastrear: bool = False,
+) -> ResultadosFinanceiros:
+    """`ROICalculator(...).calcular()` no modo exato (centavos inteiros; ver docstring do módulo)."""
+    bruto = ROICalculator(
+        _exatos(cliente),
+        _exatos(processo),
+        dores,
+        _exatos(parametros),
+        _exatos(investimento),
+        _exatos(metas),
+    ).calcular(rastrear=rastrear)
+
+    breakdowns: Dict[str, Dict[str, int]] = {
+        nome: {rotulo: centavos(valor) for rotulo, valor in getattr(bruto, nome).items()} for nome in CAMPOS_BREAKDOWN
+    }
+    totais = [sum(breakdowns[nome].values()) for nome in CAMPOS_BREAKDOWN]
+    custo_total = sum(totais)
+
+    custos = [0] * len(CODIGOS_FORMULAS)
+    for breakdown in breakdowns.values():
+        for rotulo, valor in breakdown.items():
+            custos[INDICE_FORMULA[codigo_do_rotulo(rotulo)]] += valor
+    ganho = sum(arredondar(custo * _exato(meta)) for custo, meta in zip(custos, metas.valores) if custo)
+    investimento_medio = centavos(bruto.investimento_medio)
+
+    def roi(anos: int) -> float:
+        if investimento_medio == 0:
+            return 0.0
+        return _razao((ganho * anos - investimento_medio) * 100, investimento_medio)
+
+    def reais(valor_centavos: int) -> float:
+        return valor_centavos / 100
+
+    return ResultadosFinanceiros(
+        total_dor1=reais(totais[0]),
+        total_dor2=reais(totais[1]),
+        total_dor3=reais(totais[2]),
+        total_dor4=reais(totais[3]),
+        total_dor5=reais(totais[4]),
+        custo_total_anual_inacao=reais(custo_total),
+        ganho_anual_potencial=reais(ganho),
+        investimento_medio=reais(investimento_medio),
+        payback_anos=_razao(investimento_medio, ganho) if ganho else float("inf"),
+        roi_1_ano=roi(1),
+        roi_2_anos=roi(2),
+        roi_3_anos=roi(3),
+        roi_4_anos=roi(4),
+        roi_5_anos=roi(5),
+        custo_hora_parada=reais(centavos(bruto.custo_hora_parada)),
+        faturamento_mensal_linha=reais(centavos(bruto.faturamento_mensal_linha)),
+        **{nome: {rotulo: reais(v) for rotulo, v in breakdowns[nome].items()} for nome in CAMPOS_BREAKDOWN},
+        area_atuacao=bruto.area_atuacao,
+        porte_empresa=bruto.porte_empresa,
+        fator_encargos_usado=float(bruto.fator_encargos_usado),
+        rastreio=_rastreio_float(bruto.rastreio) if bruto.rastreio is not None else None,
+    )
+
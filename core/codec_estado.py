@@ -0,0 +1,186 @@
+"""
+Codificação binária compacta do estado do wizard (entradas `ClienteBasicInfo` … `MetasReducao`).
+
+Os campos de cada modelo são gravados na ordem de declaração, sem nomes: cada valor é um byte de
+tipo seguido do conteúdo (varint para inteiros, `float` inteiro como varint, UTF-8 com tamanho para
+textos). O número de campos precede cada modelo, então campos novos no fim do dataclass continuam
+compatíveis com blobs antigos (assumem o default).
+
+Um `ParametrosDetalhados` com poucas fórmulas preenchidas ocupa ~60 bytes (contra ~2 KB em pickle).
+"""
+
+from __future__ import annotations
+
+import struct
+from dataclasses import MISSING, fields
+from typing import Any, Dict, Mapping, Tuple, Type
+
+from core.validators import campos_com_tipo_invalido
+from models.inputs import ClienteBasicInfo, DoresSelecionadas, InvestimentoAutomacao, ParametrosDetalhados, ProcessoAtual
+from models.results import MetasReducao
+
+VERSAO_CODEC = 1
+
+# Entradas do wizard, na ordem gravada (um bit de presença por item)
+MODELOS_ESTADO: Tuple[Tuple[str, Type], ...] = (
+    ("cliente", ClienteBasicInfo),
+    ("processo", ProcessoAtual),
+    ("dores", DoresSelecionadas),
+    ("parametros", ParametrosDetalhados),
+    ("investimento", InvestimentoAutomacao),
+    ("metas", MetasReducao),
+)
+
+_NONE, _FALSO, _VERDADEIRO, _INT, _FLOAT, _FLOAT_INTEIRO, _TEXTO = range(7)
+_DOUBLE = struct.Struct("<d")
+
+
+class ErroCodec(ValueError):
+    """Blob inválido, truncado ou de versão desconhecida."""
+
+
+def _escrever_varint(buf: bytearray, n: int) -> None:
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        if n:
+            buf.append(byte | 0x80)
+        else:
+            buf.append(byte)
+            return
+
+
+def _ler_varint(dados: bytes, pos: int) -> Tuple[int, int]:
+    n = desloc = 0
+    while True:
+        if pos >= len(dados):
+            raise ErroCodec("Blob truncado.")
+        byte = dados[pos]
+        pos += 1
+        n |= (byte & 0x7F) << desloc
+        if not byte & 0x80:
+            return n, pos
+        desloc += 7
+
+
+def _zigzag(n: int) -> int:
+    return (n << 1) if n >= 0 else ((-n << 1) - 1)
+
+
+def _unzigzag(n: int) -> int:
+    return (n >> 1) if not n & 1 else -((n + 1) >> 1)
+
+
+def _escrever_valor(buf: bytearray, valor: Any) -> None:
+    if valor is None:
+        buf.append(_NONE)
+    elif valor is True:
+        buf.append(_VERDADEIRO)
+    elif valor is False:
+        buf.append(_FALSO)
+    elif isinstance(valor, int):
+        buf.append(_INT)
+        _escrever_varint(buf, _zigzag(valor))
+    elif isinstance(valor, float):
+        if valor.is_integer() and abs(valor) < 2**53:
+            buf.append(_FLOAT_INTEIRO)
+            _escrever_varint(buf, _zigzag(int(valor)))
+        else:
+            buf.append(_FLOAT)
+            buf += _DOUBLE.pack(valor)
+    elif isinstance(valor, str):
+        bruto = valor.encode("utf-8")
+        buf.append(_TEXTO)
+        _escrever_varint(buf, len(bruto))
+        buf += bruto
+    else:
+        raise TypeError(f"Tipo não suportado pelo codec: {type(valor).__name__}")
+
+
+def _ler_valor(dados: bytes, pos: int) -> Tuple[Any, int]:
+    if pos >= len(dados):
+        raise ErroCodec("Blob truncado.")
+    tipo = dados[pos]
+    pos += 1
+    if tipo == _NONE:
+        return None, pos
+    if tipo == _FALSO:
+        return False, pos
+    if tipo == _VERDADEIRO:
+        return True, pos
+    if tipo in (_INT, _FLOAT_INTEIRO):
+        n, pos = _ler_varint(dados, pos)
+        return (_unzigzag(n) if tipo == _INT else float(_unzigzag(n))), pos
+    if tipo == _FLOAT:
+        if pos + 8 > len(dados):
+            raise ErroCodec("Blob truncado.")
+        return _DOUBLE.unpack_from(dados, pos)[0], pos + 8
+    if tipo == _TEXTO:
+        tamanho, pos = _ler_varint(dados, pos)
+        if pos + tamanho > len(dados):
+            raise ErroCodec("Blob truncado.")
+        return dados[pos:pos + tamanho].decode("utf-8"), pos + tamanho
+    raise ErroCodec(f"Tipo de valor desconhecido: {tipo}")
+
+
+def _escrever_modelo(buf: bytearray, obj: Any) -> None:
+    campos = fields(obj)
+    _escrever_varint(buf, len(campos))
+    for campo in campos:
+        _escrever_valor(buf, getattr(obj, campo.name))
+
+
+def _ler_modelo(tipo: Type, dados: bytes, pos: int) -> Tuple[Any, int]:
+    campos = fields(tipo)
+    quantidade, pos = _ler_varint(dados, pos)
+    valores: Dict[str, Any] = {}
+    for i in range(quantidade):
+        valor, pos = _ler_valor(dados, pos)
+        if i < len(campos):  # campos extras (blob de versão mais nova do modelo) são ignorados
+            valores[campos[i].name] = valor
+    faltando = [c.name for c in campos[quantidade:] if c.default is MISSING and c.default_factory is MISSING]
+    if faltando:
+        raise ErroCodec(f"{tipo.__name__}: campos obrigatórios ausentes no blob: {', '.join(faltando)}")
+    invalidos = campos_com_tipo_invalido(tipo, valores)
+    if invalidos:
+        raise ErroCodec(f"{tipo.__name__}: tipo inválido em: {', '.join(invalidos)}")
+    return tipo(**valores), pos
+
+
+def codificar_modelo(obj: Any) -> bytes:
+    buf = bytearray()
+    _escrever_modelo(buf, obj)
+    return bytes(buf)
+
+
+def decodificar_modelo(tipo: Type, dados: bytes) -> Any:
+    obj, pos = _ler_modelo(tipo, dados, 0)
+    if pos != len(dados):
+        raise ErroCodec("Bytes extras após o modelo.")
+    return obj
+
+
+def codificar_estado(estado: Mapping[str, Any]) -> bytes:
+    """Versão + bitmap de presença + modelos presentes (chaves ausentes/None são omitidas)."""
+    buf = bytearray([VERSAO_CODEC, 0])
+    for i, (chave, _) in enumerate(MODELOS_ESTADO):
+        obj = estado.get(chave)
+        if obj is not None:
+            buf[1] |= 1 << i
+            _escrever_modelo(buf, obj)
+    return bytes(buf)
+
+
+def decodificar_estado(dados: bytes) -> Dict[str, Any]:
+    if len(dados) < 2:
+        raise ErroCodec("Blob truncado.")
+    if dados[0] != VERSAO_CODEC:
+        raise ErroCodec(f"Versão do codec não suportada: {dados[0]}")
+    presenca, pos = dados[1], 2
+    estado: Dict[str, Any] = {}
+    for i, (chave, tipo) in enumerate(MODELOS_ESTADO):
+        if presenca & (1 << i):
+            estado[chave], pos = _ler_modelo(tipo, dados, pos)
+    if pos != len(dados):
+        raise ErroCodec("Bytes extras após o estado.")
+    return estado
@@ -0,0 +1,230 @@
+"""
+Entradas correlacionadas para o Monte Carlo: matriz de correlação, reparo e sorteio por Cholesky.
+
+Em fábricas reais várias entradas andam juntas (salário do operador e do novato, paradas e setups,
+produção e faturamento); sorteá-las de forma independente subestima o risco do payback.
+
+`EspecCorrelacao` lista campos de `ProcessoAtual`/`ParametrosDetalhados` (`"processo.<campo>"`,
+`"parametros.<campo>"`) e a matriz de correlação entre eles. A matriz é validada (quadrada, simétrica,
+diagonal 1, |ρ| ≤ 1) e, se não for positiva definida, substituída pela matriz de correlação mais
+próxima (Higham, 2002: projeções alternadas com correção de Dykstra). O fator de Cholesky de cada
+matriz é calculado uma vez por processo (`lru_cache`).
+
+Sorteio (cópula gaussiana): em blocos de `MONTECARLO_BLOCO` iterações, z = L·ε com ε normais
+independentes, operando sobre colunas inteiras; u = Φ(z) mantém a correlação de postos e vira o
+fator triangular de cada campo em [1 − variação, 1 + variação], moda 1 — a mesma forma da
+incerteza por fórmula em `core.montecarlo`.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from itertools import repeat
+from operator import add, mul, sub
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from config.constants import MONTECARLO_BLOCO, MONTECARLO_CORRELACAO_AUTOVALOR_MIN
+from models.inputs import ParametrosDetalhados, ProcessoAtual
+
+Matriz = Tuple[Tuple[float, ...], ...]
+
+_GRUPOS = {"processo": ProcessoAtual, "parametros": ParametrosDetalhados}
+_CAMPOS = frozenset(f"{grupo}.{f.name}" for grupo, modelo in _GRUPOS.items() for f in fields(modelo))
+_RAIZ_2 = math.sqrt(2.0)
+
+
+@dataclass(frozen=True)
+class EspecCorrelacao:
+    """Campos correlacionados, matriz de correlação entre eles e variação (±) de cada campo."""
+
+    campos: Tuple[str, ...]
+    matriz: Matriz
+    variacoes: Optional[Tuple[float, ...]] = None  # None: a `variacao` da simulação para todos
+
+    def __post_init__(self):
+        # Tuplas: a especificação é chave do cache do fator de Cholesky
+        object.__setattr__(self, "campos", tuple(self.campos))
+        object.__setattr__(self, "matriz", tuple(tuple(float(x) for x in linha) for linha in self.matriz))
+        if self.variacoes is not None:
+            object.__setattr__(self, "variacoes", tuple(float(v) for v in self.variacoes))
+
+    @classmethod
+    def de_pares(
+        cls, pares: Iterable[Tuple[str, str, float]], variacoes: Optional[dict] = None
+    ) -> "EspecCorrelacao":
+        """Especificação a partir de pares (campo, campo, ρ); pares ausentes têm correlação 0."""
+        pares = list(pares)
+        campos: List[str] = []
+        for a, b, _ in pares:
+            campos += [c for c in (a, b) if c not in campos]
+        indice = {c: i for i, c in enumerate(campos)}
+        matriz = [[float(i == j) for j in range(len(campos))] for i in range(len(campos))]
+        for a, b, rho in pares:
+            if a == b:
+                raise ValueError(f"Par de correlação com o mesmo campo: {a!r}")
+            matriz[indice[a]][indice[b]] = matriz[indice[b]][indice[a]] = float(rho)
+        return cls(
+            campos=tuple(campos),
+            matriz=tuple(map(tuple, matriz)),
+            variacoes=None if variacoes is None else tuple(variacoes[c] for c in campos),
+        )
+
+
+def _validar(espec: EspecCorrelacao) -> None:
+    n = len(espec.campos)
+    if n == 0:
+        raise ValueError("A correlação precisa de pelo menos um campo.")
+    if len(set(espec.campos)) != n:
+        raise ValueError("Campos de correlação repetidos.")
+    invalidos = [c for c in espec.campos if c not in _CAMPOS]
+    if invalidos:
+        raise ValueError(f"Campos de correlação inválidos: {', '.join(invalidos)}")
+    if len(espec.matriz) != n or any(len(linha) != n for linha in espec.matriz):
+        raise ValueError(f"A matriz de correlação deve ser {n} × {n}.")
+    for i in range(n):
+        if espec.matriz[i][i] != 1:
+            raise ValueError("A diagonal da matriz de correlação deve ser 1.")
+        for j in range(i):
+            rho = espec.matriz[i][j]
+            if not -1 <= rho <= 1:
+                raise ValueError(f"Correlação fora de [-1, 1] entre {espec.campos[i]} e {espec.campos[j]}.")
+            if abs(rho - espec.matriz[j][i]) > 1e-12:
+                raise ValueError("A matriz de correlação deve ser simétrica.")
+    if espec.variacoes is not None:
+        if len(espec.variacoes) != n or not all(0 <= v < 1 for v in espec.variacoes):
+            raise ValueError("variacoes deve ter um valor em [0, 1) por campo.")
+
+
+def cholesky(matriz: Sequence[Sequence[float]]) -> Matriz:
+    """Fator triangular inferior L com L·Lᵀ = matriz; ValueError se a matriz não for positiva definida."""
+    n = len(matriz)
+    fator = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(i + 1):
+            soma = matriz[i][j] - sum(map(mul, fator[i][:j], fator[j][:j]))
+            if i == j:
+                if soma <= 0:
+                    raise ValueError("A matriz de correlação não é positiva definida.")
+                fator[i][i] = math.sqrt(soma)
+            else:
+                fator[i][j] = soma / fator[j][j]
+    return tuple(map(tuple, fator))
+
+
+def _autodecomposicao(matriz: Sequence[Sequence[float]]) -> Tuple[List[float], List[List[float]]]:
+    """Autovalores e autovetores (colunas) de uma matriz simétrica pelo método de Jacobi cíclico."""
+    n = len(matriz)
+    a = [list(linha) for linha in matriz]
+    v = [[float(i == j) for j in range(n)] for i in range(n)]
+    for _ in range(100):
+        fora = sum(a[i][j] ** 2 for i in range(n) for j in range(i))
+        if fora < 1e-22:
+            break
+        for p in range(n - 1):
+            for q in range(p + 1, n):
+                if abs(a[p][q]) < 1e-300:
+                    continue
+                theta = (a[q][q] - a[p][p]) / (2 * a[p][q])
+                t = math.copysign(1.0, theta) / (abs(theta) + math.sqrt(theta * theta + 1))
+                c = 1 / math.sqrt(t * t + 1)
+                s = t * c
+                for k in range(n):
+                    akp, akq = a[k][p], a[k][q]
+                    a[k][p], a[k][q] = c * akp - s * akq, s * akp + c * akq
+                for k in range(n):
+                    apk, aqk = a[p][k], a[q][k]
+                    a[p][k], a[q][k] = c * apk - s * aqk, s * apk + c * aqk
+                for k in range(n):
+                    vkp, vkq = v[k][p], v[k][q]
+                    v[k][p], v[k][q] = c * vkp - s * vkq, s * vkp + c * vkq
+    return [a[i][i] for i in range(n)], v
+
+
+def _projetar_psd(matriz: Sequence[Sequence[float]], minimo: float) -> List[List[float]]:
+    """Matriz com autovalores abaixo de `minimo` elevados a `minimo` (mesmos autovetores)."""
+    autovalores, vetores = _autodecomposicao(matriz)
+    n = len(matriz)
+    lambdas = [max(l, minimo) for l in autovalores]
+    return [
+        [sum(vetores[i][k] * lambdas[k] * vetores[j][k] for k in range(n)) for j in range(n)]
+        for i in range(n)
+    ]
+
+
+def correlacao_mais_proxima(
+    matriz: Sequence[Sequence[float]],
+    autovalor_minimo: float = MONTECARLO_CORRELACAO_AUTOVALOR_MIN,
+    iteracoes: int = 200,
+) -> Matriz:
+    """
+    Matriz de correlação positiva definida mais próxima (Frobenius) de uma matriz simétrica.
+
+    Alterna a projeção no cone semidefinido positivo e a projeção em diagonal unitária (com a
+    correção de Dykstra); ao final, autovalores ficam ≥ `autovalor_minimo` e a diagonal volta a 1.
+    """
+    n = len(matriz)
+    y = [list(map(float, linha)) for linha in matriz]
+    correcao = [[0.0] * n for _ in range(n)]
+    for _ in range(iteracoes):
+        r = [list(map(sub, y[i], correcao[i])) for i in range(n)]
+        x = _projetar_psd(r, 0.0)
+        correcao = [list(map(sub, x[i], r[i])) for i in range(n)]
+        anterior = y
+        y = [[1.0 if i == j else x[i][j] for j in range(n)] for i in range(n)]
+        if max(abs(y[i][j] - anterior[i][j]) for i in range(n) for j in range(n)) < 1e-12:
+            break
+
+    z = _projetar_psd(y, autovalor_minimo)
+    escala = [math.sqrt(z[i][i]) for i in range(n)]
+    return tuple(
+        tuple(1.0 if i == j else z[i][j] / (escala[i] * escala[j]) for j in range(n)) for i in range(n)
+    )
+
+
+@lru_cache(maxsize=64)
+def fator_correlacao(espec: EspecCorrelacao) -> Tuple[Matriz, bool]:
+    """Fator de Cholesky da matriz (reparada se preciso) e se houve reparo; memoizado por especificação."""
+    _validar(espec)
+    try:
+        return cholesky(espec.matriz), False
+    except ValueError:
+        return cholesky(correlacao_mais_proxima(espec.matriz)), True
+
+
+def _fi(z: float) -> float:
+    """CDF da normal padrão."""
+    return 0.5 * math.erfc(-z / _RAIZ_2)
+
+
+def _triangular(u: float, variacao: float) -> float:
+    """Inversa da CDF triangular simétrica em [1 − variacao, 1 + variacao], moda 1."""
+    if u < 0.5:
+        return 1 - variacao + variacao * math.sqrt(2 * u)
+    return 1 + variacao - variacao * math.sqrt(2 * (1 - u))
+
+
+def fatores_correlacionados(
+    espec: EspecCorrelacao, variacao: float, rng: random.Random, iteracoes: int
+) -> Iterator[List[Tuple[float, ...]]]:
+    """
+    Blocos de fatores multiplicativos (um por campo de `espec`) para `iteracoes` sorteios,
+    com as correlações de `espec` entre os campos.
+    """
+    fator, _ = fator_correlacao(espec)
+    variacoes = espec.variacoes or (variacao,) * len(espec.campos)
+    restantes = iteracoes
+    while restantes > 0:
+        tamanho = min(MONTECARLO_BLOCO, restantes)
+        restantes -= tamanho
+        normais = [[rng.gauss(0.0, 1.0) for _ in range(tamanho)] for _ in espec.campos]
+        colunas = []
+        for linha, var in zip(fator, variacoes):
+            z = [0.0] * tamanho
+            for peso, eps in zip(linha, normais):
+                if peso:
+                    z = list(map(add, z, map(mul, repeat(peso), eps)))
+            colunas.append([_triangular(_fi(x), var) for x in z])
+        yield list(zip(*colunas))
@@ -0,0 +1,197 @@
+"""
+Derivadas exatas dos indicadores por diferenciação automática (modo direto, números duais).
+
+Sensibilidade e busca de metas por diferenças finitas custam um cálculo completo por entrada. Aqui
+cada entrada numérica vira um número dual — valor mais as derivadas parciais em relação às entradas —
+e as mesmas fórmulas de `ROICalculator` são avaliadas uma única vez: `ganho_anual_potencial`,
+`custo_total_anual_inacao` e `payback_anos` saem com o gradiente completo, inclusive pelas bases
+comuns (`custo_hora_operador`, `custo_hora_parada`) e pelos fallbacks de F03/F10/F11/F14.
+
+Os desvios do cálculo (ex.: `f10_custo_hora_parada` informado ou derivado do faturamento) seguem os
+valores das entradas, então a derivada é a do ramo ativo — entradas que só alimentam o ramo inativo
+têm derivada zero. Campos `None` não são entradas.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import fields, replace
+from typing import Any, Dict, List, Tuple
+
+from core.calculator import ROICalculator
+from models.inputs import ClienteBasicInfo, DoresSelecionadas, InvestimentoAutomacao, ParametrosDetalhados, ProcessoAtual
+from models.results import CAMPOS_BREAKDOWN, Gradiente, MetasReducao, ResultadosFinanceiros, Sensibilidades
+
+
+class _Dual:
+    """
+    Número dual v + Σ g[k]·εₖ: valor e derivadas parciais esparsas (índice da entrada → derivada).
+
+    Comparações e `bool` usam só o valor, então os desvios do cálculo seguem o caminho do float.
+    """
+
+    __slots__ = ("v", "g")
+
+    def __init__(self, v: float, g: Dict[int, float]):
+        self.v = v
+        self.g = g
+
+    # --- Aritmética ---
+
+    def __add__(self, outro):
+        if isinstance(outro, _Dual):
+            g = dict(self.g)
+            for k, d in outro.g.items():
+                g[k] = g.get(k, 0.0) + d
+            return _Dual(self.v + outro.v, g)
+        if isinstance(outro, (int, float)):
+            return _Dual(self.v + outro, self.g)
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, outro):
+        if isinstance(outro, (_Dual, int, float)):
+            return self + (-outro)
+        return NotImplemented
+
+    def __rsub__(self, outro):
+        if isinstance(outro, (int, float)):
+            return (-self) + outro
+        return NotImplemented
+
+    def __mul__(self, outro):
+        if isinstance(outro, _Dual):
+            g = {k: d * outro.v for k, d in self.g.items()}
+            for k, d in outro.g.items():
+                g[k] = g.get(k, 0.0) + self.v * d
+            return _Dual(self.v * outro.v, g)
+        if isinstance(outro, (int, float)):
+            return _Dual(self.v * outro, {k: d * outro for k, d in self.g.items()})
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, outro):
+        if isinstance(outro, _Dual):
+            # (a/b)' = a'/b − a·b'/b²
+            q = self.v / outro.v
+            g = {k: d / outro.v for k, d in self.g.items()}
+            for k, d in outro.g.items():
+                g[k] = g.get(k, 0.0) - q * d / outro.v
+            return _Dual(q, g)
+        if isinstance(outro, (int, float)):
+            return _Dual(self.v / outro, {k: d / outro for k, d in self.g.items()})
+        return NotImplemented
+
+    def __rtruediv__(self, outro):
+        if isinstance(outro, (int, float)):
+            q = outro / self.v
+            return _Dual(q, {k: -q * d / self.v for k, d in self.g.items()})
+        return NotImplemented
+
+    def __neg__(self):
+        return _Dual(-self.v, {k: -d for k, d in self.g.items()})
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return -self if self.v < 0 else self
+
+    # --- Comparações e conversões (pelo valor) ---
+
+    def __eq__(self, outro):
+        return self.v == _valor(outro)
+
+    def __lt__(self, outro):
+        return self.v < _valor(outro)
+
+    def __le__(self, outro):
+        return self.v <= _valor(outro)
+
+    def __gt__(self, outro):
+        return self.v > _valor(outro)
+
+    def __ge__(self, outro):
+        return self.v >= _valor(outro)
+
+    __hash__ = None
+
+    def __bool__(self):
+        return self.v != 0
+
+    def __float__(self):
+        return float(self.v)
+
+    def __repr__(self):
+        return f"_Dual({self.v!r}, {self.g!r})"
+
+
+def _valor(x: Any) -> Any:
+    return x.v if isinstance(x, _Dual) else x
+
+
+def _semear(modelo, grupo: str, entradas: List[str], valores: List[float]):
+    """Cópia de um dataclass de entradas com cada campo numérico (exceto bool/None) como dual semente."""
+    duais = {}
+    for campo in fields(modelo):
+        valor = getattr(modelo, campo.name)
+        if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+            duais[campo.name] = _Dual(valor, {len(entradas): 1.0})
+            entradas.append(f"{grupo}.{campo.name}")
+            valores.append(float(valor))
+    return replace(modelo, **duais)
+
+
+def _gradiente(x: Any, n: int) -> Gradiente:
+    derivadas = array("d", bytes(8 * n))
+    if isinstance(x, _Dual):
+        for k, d in x.g.items():
+            derivadas[k] = d
+        return Gradiente(float(x.v), derivadas)
+    if x == float("inf"):  # payback sem ganho: derivadas indefinidas
+        return Gradiente(x, array("d", [float("nan")]) * n)
+    return Gradiente(float(x), derivadas)
+
+
+def _resultados_float(bruto: ResultadosFinanceiros) -> ResultadosFinanceiros:
+    """Resultados com os duais reduzidos aos seus valores (idênticos ao cálculo em float)."""
+    valores = {}
+    for campo in fields(bruto):
+        valor = getattr(bruto, campo.name)
+        if campo.name in CAMPOS_BREAKDOWN:
+            valor = {rotulo: _valor(v) for rotulo, v in valor.items()}
+        valores[campo.name] = _valor(valor)
+    return ResultadosFinanceiros(**valores)
+
+
+def calcular_derivadas(
+    cliente: ClienteBasicInfo,
+    processo: ProcessoAtual,
+    dores: DoresSelecionadas,
+    parametros: ParametrosDetalhados,
+    investimento: InvestimentoAutomacao,
+    metas: MetasReducao,
+) -> Sensibilidades:
+    """`ROICalculator(...).calcular()` com as derivadas parciais dos indicadores (ver docstring do módulo)."""
+    entradas: List[str] = []
+    valores: List[float] = []
+    bruto = ROICalculator(
+        _semear(cliente, "cliente", entradas, valores),
+        _semear(processo, "processo", entradas, valores),
+        dores,
+        _semear(parametros, "parametros", entradas, valores),
+        _semear(investimento, "investimento", entradas, valores),
+        _semear(metas, "metas", entradas, valores),
+    ).calcular()
+
+    n = len(entradas)
+    return Sensibilidades(
+        entradas=tuple(entradas),
+        valores_entradas=array("d", valores),
+        resultados=_resultados_float(bruto),
+        ganho_anual_potencial=_gradiente(bruto.ganho_anual_potencial, n),
+        custo_total_anual_inacao=_gradiente(bruto.custo_total_anual_inacao, n),
+        payback_anos=_gradiente(bruto.payback_anos, n),
+    )
@@ -0,0 +1,130 @@
+"""
+Esboço de quantis KLL (Karnin–Lang–Liberty): percentis aproximados em memória constante.
+
+Os valores ficam em níveis; o nível `h` guarda itens de peso 2^h. Quando um nível enche, seus
+itens são ordenados e metade (posições pares ou ímpares, ao acaso) sobe para o nível seguinte —
+o peso total é preservado. Com `k` itens por nível, o erro de posto é da ordem de 1,7/k do total
+(≈1% com o `k` padrão), independentemente de quantos valores foram adicionados.
+
+Esboços são mescláveis (`mesclar`) e serializáveis (`serializar`/`desserializar`), então podem ser
+mantidos por grupo, atualizados a cada análise e combinados entre grupos ou processos.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import struct
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Iterable, List, Optional, Tuple
+
+from config.constants import ESBOCO_K
+
+_VERSAO = 1
+_CABECALHO = struct.Struct("<BHQB")  # versão, k, n, número de níveis
+
+
+class EsbocoKLL:
+    def __init__(self, k: int = ESBOCO_K, semente: Optional[int] = None):
+        if k < 8:
+            raise ValueError("k deve ser pelo menos 8.")
+        self.k = k
+        self.n = 0
+        self.niveis: List[List[float]] = [[]]
+        self._rng = random.Random(semente)
+        self._indice: Optional[Tuple[List[float], List[int]]] = None
+
+    def __len__(self) -> int:
+        return self.n
+
+    def _capacidade(self, nivel: int) -> int:
+        profundidade = len(self.niveis) - nivel - 1
+        return max(2, math.ceil(self.k * (2 / 3) ** profundidade))
+
+    # --- Atualização ---
+
+    def adicionar(self, valor: float) -> None:
+        self.niveis[0].append(float(valor))
+        self.n += 1
+        self._indice = None
+        if len(self.niveis[0]) >= self._capacidade(0):
+            self._compactar()
+
+    def adicionar_varios(self, valores: Iterable[float]) -> None:
+        for valor in valores:
+            self.adicionar(valor)
+
+    def mesclar(self, outro: "EsbocoKLL") -> None:
+        while len(self.niveis) < len(outro.niveis):
+            self.niveis.append([])
+        for nivel, itens in enumerate(outro.niveis):
+            self.niveis[nivel].extend(itens)
+        self.n += outro.n
+        self._indice = None
+        self._compactar()
+
+    def _compactar(self) -> None:
+        nivel = 0
+        while nivel < len(self.niveis):
+            if len(self.niveis[nivel]) >= self._capacidade(nivel):
+                if nivel + 1 == len(self.niveis):
+                    self.niveis.append([])  # as capacidades dos níveis abaixo crescem
+                itens = sorted(self.niveis[nivel])
+                sobra = [itens.pop()] if len(itens) % 2 else []
+                self.niveis[nivel + 1].extend(itens[self._rng.randint(0, 1)::2])
+                self.niveis[nivel] = sobra
+            nivel += 1
+
+    # --- Consultas ---
+
+    def _obter_indice(self) -> Tuple[List[float], List[int]]:
+        """Valores ordenados e pesos acumulados (refeito só após atualizações)."""
+        if self._indice is None:
+            pares = sorted((v, 1 << nivel) for nivel, itens in enumerate(self.niveis) for v in itens)
+            self._indice = ([v for v, _ in pares], list(accumulate(p for _, p in pares)))
+        return self._indice
+
+    def posto(self, valor: float) -> float:
+        """Fração (0–1) dos valores abaixo de `valor` (empates contam pela metade)."""
+        if self.n == 0:
+            raise ValueError("Esboço vazio.")
+        valores, acumulado = self._obter_indice()
+        abaixo = bisect_left(valores, valor)
+        ate = bisect_right(valores, valor)
+        peso_abaixo = acumulado[abaixo - 1] if abaixo else 0
+        peso_ate = acumulado[ate - 1] if ate else 0
+        return (peso_abaixo + peso_ate) / 2 / acumulado[-1]
+
+    def quantil(self, q: float) -> float:
+        """Valor no quantil `q` (0–1)."""
+        if self.n == 0:
+            raise ValueError("Esboço vazio.")
+        if not 0 <= q <= 1:
+            raise ValueError("q deve estar em [0, 1].")
+        valores, acumulado = self._obter_indice()
+        return valores[min(bisect_left(acumulado, q * acumulado[-1]), len(valores) - 1)]
+
+    # --- Serialização ---
+
+    def serializar(self) -> bytes:
+        partes = [_CABECALHO.pack(_VERSAO, self.k, self.n, len(self.niveis))]
+        for itens in self.niveis:
+            partes.append(struct.pack(f"<I{len(itens)}d", len(itens), *itens))
+        return b"".join(partes)
+
+    @classmethod
+    def desserializar(cls, dados: bytes) -> "EsbocoKLL":
+        versao, k, n, quantidade = _CABECALHO.unpack_from(dados)
+        if versao != _VERSAO:
+            raise ValueError(f"Versão de esboço não suportada: {versao}")
+        esboco = cls(k)
+        esboco.n = n
+        esboco.niveis = []
+        pos = _CABECALHO.size
+        for _ in range(quantidade):
+            (tamanho,) = struct.unpack_from("<I", dados, pos)
+            pos += 4
+            esboco.niveis.append(list(struct.unpack_from(f"<{tamanho}d", dados, pos)))
+            pos += 8 * tamanho
+        return esboco
@@ -0,0 +1,60 @@
+"""
+Pré-cálculo especulativo em segundo plano.
+
+Enquanto o usuário ainda está no wizard, o resultado de uma etapa futura é calculado
+em uma thread e depositado em um `CacheTTL`. Quando a etapa é alcançada:
+- se o valor já está no cache, é usado diretamente;
+- se ainda está em execução, aguarda-se o mesmo futuro (sem recalcular).
+Entradas alteradas geram outra chave; o resultado antigo apenas expira no cache.
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from core.cache import CacheTTL, obter_cache
+
+
+class CalculoEspeculativo:
+    """Executa `calcular()` antecipadamente por chave, sem duplicar trabalho em andamento."""
+
+    def __init__(self, cache: CacheTTL, max_workers: int = 1):
+        self.cache = cache
+        self.iniciados = 0
+        self.aproveitados = 0  # consultas atendidas por um cálculo especulativo em andamento
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"especulacao-{cache.nome}")
+        self._pendentes: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def iniciar(self, chave: str, calcular: Callable[[], Any]) -> None:
+        """Agenda `calcular()` para `chave`, se ainda não estiver em cache nem em andamento."""
+        with self._lock:
+            if chave in self._pendentes or self.cache.contem(chave):
+                return
+            self._pendentes[chave] = self._executor.submit(self._executar, chave, calcular)
+            self.iniciados += 1
+
+    def obter_ou_calcular(self, chave: str, calcular: Callable[[], Any]) -> Any:
+        """Retorna o valor especulado (aguardando se necessário) ou calcula na thread atual."""
+        with self._lock:
+            futuro = self._pendentes.get(chave)
+            if futuro is not None:
+                self.aproveitados += 1
+        if futuro is not None:
+            return futuro.result()
+        return self.cache.obter_ou_calcular(chave, calcular)
+
+    def _executar(self, chave: str, calcular: Callable[[], Any]) -> Any:
+        try:
+            valor = calcular()
+            self.cache.definir(chave, valor)
+            return valor
+        finally:
+            with self._lock:
+                self._pendentes.pop(chave, None)
+
+
+# Resultados financeiros (etapa 5 → 6)
+ESPECULADOR_CALCULO = CalculoEspeculativo(obter_cache("calculo"))
@@ -4,7 +4,8 @@ Fórmulas detalhadas — V2.0 (Custo da Inação).
 
 from __future__ import annotations
 
-from typing import Tuple
+from operator import mul
+from typing import List, Sequence, Tuple
 
 from config.constants import DIAS_OPERACAO_MES_DEFAULT, HORAS_MES_CUSTO_PRODUCAO, HORAS_MES_CLT
 
@@ -97,6 +98,15 @@ def calcular_custo_hora_operador(salario: float, fator_encargos: float) -> float
     return (salario * fator_encargos) / HORAS_MES_CUSTO_PRODUCAO
 
 
+def calcular_custo_hora_extra_base(salario: float, fator_encargos: float) -> float:
+    """
+    Hora base para horas extras (Regra #2: divisor CLT 220h, sem o adicional).
+    Fórmula: (Salário × Fator Encargos) ÷ 220
+    """
+
+    return (salario * fator_encargos) / HORAS_MES_CLT
+
+
 def calcular_custo_hora_parada(
     faturamento_mensal: float | None,
     horas_operacao_mes: float,
@@ -132,7 +142,7 @@ def calcular_f02_horas_extras(num_operadores: int, media_he_mes: float, salario_
     """
 
     # Regra #2: HE usa hora base CLT (220h)
-    custo_hora = (salario_medio * fator_encargos) / HORAS_MES_CLT
+    custo_hora = calcular_custo_hora_extra_base(salario_medio, fator_encargos)
     return num_operadores * media_he_mes * custo_hora * 1.5 * 12
 
 
@@ -151,9 +161,27 @@ def calcular_f03_curva_aprendizagem(
                         + (Salário Supervisor × Encargos × %Tempo × Meses) ]
     """
 
+    custo_novato, custo_supervisor = calcular_f03_custo_por_contratacao(
+        salario_novato, fator_encargos, meses_curva, salario_supervisor, pct_tempo_supervisor
+    )
+    return num_contratacoes * (custo_novato + custo_supervisor)
+
+
+def calcular_f03_custo_por_contratacao(
+    salario_novato: float,
+    fator_encargos: float,
+    meses_curva: int,
+    salario_supervisor: float,
+    pct_tempo_supervisor: float,
+) -> Tuple[float, float]:
+    """
+    F03 (parcelas por contratação).
+    Retorna: (custo do novato, custo do supervisor dedicado ao treinamento)
+    """
+
     custo_novato = salario_novato * fator_encargos * meses_curva
     custo_supervisor = salario_supervisor * fator_encargos * pct_tempo_supervisor * meses_curva
-    return num_contratacoes * (custo_novato + custo_supervisor)
+    return (custo_novato, custo_supervisor)
 
 
 def calcular_f04_turnover(num_desligamentos: int, salario_medio: float, fator_custo_turnover: float) -> float:
@@ -336,3 +364,25 @@ def calcular_ganho_anual(custo_atual: float, meta_reducao: float) -> float:
     """Ganho anual potencial. Fórmula: Custo atual × Meta de redução (fração 0–1)."""
 
     return custo_atual * meta_reducao
+
+
+def calcular_ganho_anual_total(custos: Sequence[float], metas: Sequence[float]) -> float:
+    """Ganho anual potencial de todas as fórmulas. Fórmula: Σ Custo atual × Meta (vetores F01–F18)."""
+
+    return sum(map(mul, custos, metas))
+
+
+def calcular_ganhos_cenarios(
+    custos: Sequence[Sequence[float]],
+    metas: Sequence[float] | Sequence[Sequence[float]],
+) -> List[float]:
+    """
+    Ganho anual de cada cenário: `custos` é uma matriz cenários × 18; `metas` é um vetor F01–F18
+    (as mesmas metas em todos os cenários) ou uma matriz com uma linha por cenário.
+    """
+
+    if metas and isinstance(metas[0], (int, float)):
+        return [sum(map(mul, linha, metas)) for linha in custos]
+    if len(metas) != len(custos):
+        raise ValueError("custos e metas devem ter o mesmo número de cenários.")
+    return [sum(map(mul, linha, linha_metas)) for linha, linha_metas in zip(custos, metas)]
@@ -0,0 +1,60 @@
+"""
+Indicadores em faixa: payback e ROI na faixa de investimento informada, em vez de só no ponto médio.
+
+O ganho anual é linear nas metas e payback/ROI são monótonos no ganho e no investimento, então as
+faixas saem exatas avaliando só três cenários de uma vez:
+
+- otimista: investimento mínimo, ganho máximo (metas máximas);
+- central: investimento médio, ganho com as metas informadas (o mesmo de `ResultadosFinanceiros`);
+- pessimista: investimento máximo, ganho mínimo (metas mínimas).
+
+Sem faixa de metas, o ganho é o mesmo nos três cenários e só o investimento varia.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from core.formulas import calcular_ganho_anual_total, calcular_payback, calcular_roi
+from models.inputs import InvestimentoAutomacao
+from models.results import IndicadoresFaixa, Intervalo, MetasReducao, ResultadosFinanceiros
+
+ANOS_ROI = (1, 2, 3, 4, 5)
+
+
+def indicadores_faixa(
+    resultados: ResultadosFinanceiros,
+    investimento: InvestimentoAutomacao,
+    metas_min: Optional[MetasReducao] = None,
+    metas_max: Optional[MetasReducao] = None,
+) -> IndicadoresFaixa:
+    """
+    Payback e ROI (1–5 anos) nos cenários otimista/central/pessimista.
+
+    `metas_min`/`metas_max` (opcionais) dão a faixa das metas de redução; o cenário central usa o
+    ganho de `resultados`. Levanta `ValueError` se alguma meta mínima superar a máxima.
+    """
+    central = resultados.ganho_anual_potencial
+    custos = resultados.custos_formulas
+    ganho_min = calcular_ganho_anual_total(custos, metas_min.valores) if metas_min is not None else central
+    ganho_max = calcular_ganho_anual_total(custos, metas_max.valores) if metas_max is not None else central
+    if metas_min is not None and metas_max is not None and any(
+        a > b for a, b in zip(metas_min.valores, metas_max.valores)
+    ):
+        raise ValueError("Metas mínimas não podem superar as máximas.")
+
+    # Cenários (pessimista, central, otimista): (investimento, ganho anual)
+    cenarios = (
+        (investimento.valor_investimento_max, min(ganho_min, central)),
+        (investimento.valor_investimento_medio, central),
+        (investimento.valor_investimento_min, max(ganho_max, central)),
+    )
+    paybacks = [calcular_payback(inv, ganho) for inv, ganho in cenarios]
+    rois = [[calcular_roi(inv, ganho, anos) for inv, ganho in cenarios] for anos in ANOS_ROI]
+
+    return IndicadoresFaixa(
+        investimento=Intervalo(*(inv for inv, _ in reversed(cenarios))),
+        ganho_anual=Intervalo(*(ganho for _, ganho in cenarios)),
+        payback_anos=Intervalo(*reversed(paybacks)),
+        roi=tuple(Intervalo(*valores) for valores in rois),
+    )
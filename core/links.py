@@ -0,0 +1,66 @@
+"""
+Links compartilháveis de uma análise: todas as entradas do wizard em um parâmetro de URL.
+
+Nada é gravado no servidor — quem abre o link reconstrói a sessão e recalcula os resultados.
+
+Formato (antes do base64url sem padding):
+
+    versão (1 byte) | CRC-32 do estado (4 bytes, big-endian) | estado comprimido (deflate bruto)
+
+O estado é o blob de `core.codec_estado`; o CRC é conferido após a descompressão, então links
+truncados ou editados à mão são rejeitados com `ErroLink` em vez de carregar valores errados.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import struct
+import zlib
+from typing import Any, Dict, Mapping
+
+from config.constants import LINK_MAX_CARACTERES
+from core.codec_estado import ErroCodec, codificar_estado, decodificar_estado
+
+VERSAO_LINK = 1
+_CABECALHO = struct.Struct(">BI")
+
+
+class ErroLink(ValueError):
+    """Link inválido, corrompido ou de versão desconhecida."""
+
+
+def _comprimir(dados: bytes) -> bytes:
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -15)  # sem cabeçalho/adler do zlib: o CRC já cobre
+    return compressor.compress(dados) + compressor.flush()
+
+
+def codificar_link(estado: Mapping[str, Any]) -> str:
+    """Texto URL-safe com as entradas presentes em `estado` (chaves de `codec_estado.MODELOS_ESTADO`)."""
+    bruto = codificar_estado(estado)
+    blob = _CABECALHO.pack(VERSAO_LINK, zlib.crc32(bruto)) + _comprimir(bruto)
+    return base64.urlsafe_b64encode(blob).rstrip(b"=").decode("ascii")
+
+
+def decodificar_link(texto: str) -> Dict[str, Any]:
+    if len(texto) > LINK_MAX_CARACTERES:
+        raise ErroLink("Link excede o tamanho máximo.")
+    try:
+        blob = base64.urlsafe_b64decode(texto + "=" * (-len(texto) % 4))
+    except (binascii.Error, ValueError) as e:
+        raise ErroLink("Link com caracteres inválidos.") from e
+    if len(blob) < _CABECALHO.size:
+        raise ErroLink("Link truncado.")
+    versao, crc = _CABECALHO.unpack_from(blob)
+    if versao != VERSAO_LINK:
+        raise ErroLink(f"Versão do link não suportada: {versao}")
+    try:
+        bruto = zlib.decompress(blob[_CABECALHO.size:], -15)
+    except zlib.error as e:
+        raise ErroLink("Link corrompido.") from e
+    if zlib.crc32(bruto) != crc:
+        raise ErroLink("Link corrompido (checksum não confere).")
+    try:
+        return decodificar_estado(bruto)
+    except ErroCodec as e:
+        raise ErroLink(str(e)) from e
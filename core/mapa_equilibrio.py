@@ -0,0 +1,366 @@
+"""
+Mapa de equilíbrio: payback e ROI numa grade de dois parâmetros, com as curvas de nível de payback.
+
+Responde a perguntas como "com qual % de refugo e qual investimento o payback cruza 3 anos?".
+Os eixos são campos numéricos de `ProcessoAtual` (`"processo.<campo>"`), `ParametrosDetalhados`
+(`"parametros.<campo>"`) ou do investimento (`"investimento.<campo>"`, ou `"investimento"` para
+um valor único, mínimo = máximo).
+
+O ganho anual em função dos dois eixos é, para as fórmulas do motor, uma soma de poucos produtos
+g(x)·h(y) (produtos e somas de entradas; o investimento nem entra no ganho). Em vez de rodar o
+`ROICalculator` nas 40 mil células de uma grade 200 × 200, a grade do ganho é reconstruída por
+aproximação cruzada (linhas e colunas inteiras avaliadas pelo próprio motor) e conferida em células
+de sondagem. Se a aproximação não reproduz cada sondagem com erro relativo de 1e-9 até
+`MAPA_POSTO_MAX` termos, a grade é avaliada célula a célula. Na reconstrução, cada célula cuja cota
+de erro de arredondamento passa de 1e-9 do próprio ganho (ganhos muito menores que os termos
+somados, ex.: ganho nulo) é avaliada pelo motor. Payback e ROI saem do ganho e do
+investimento de cada célula pelas fórmulas de `core.formulas`.
+
+Grades: uma linha por valor do eixo y, uma coluna por valor do eixo x (`grade[i][j]` ↔ `(x[j], y[i])`).
+Campos inteiros (ex.: turnos) são avaliados como contínuos.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import sys
+from array import array
+from dataclasses import dataclass, fields, replace
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from config.constants import (
+    MAPA_LIMIARES_PAYBACK,
+    MAPA_PONTOS_PADRAO,
+    MAPA_POSTO_MAX,
+    MAPA_SONDAS_ALEATORIAS,
+)
+from core.calculator import ROICalculator
+from core.formulas import calcular_payback, calcular_roi
+from core.validators import CAMPOS_POR_FORMULA, formulas_selecionadas
+from models.inputs import DoresSelecionadas, InvestimentoAutomacao, ParametrosDetalhados, ProcessoAtual
+
+Ponto = Tuple[float, float]
+Eixo = Tuple[str, float, float]  # (campo, mínimo, máximo)
+
+INVESTIMENTO_UNICO = "investimento"
+_GRUPOS = {"processo": ProcessoAtual, "parametros": ParametrosDetalhados, "investimento": InvestimentoAutomacao}
+_TOLERANCIA_RELATIVA = 1e-9
+_PISO_RELATIVO = 1e-13  # erro absoluto aceito nas sondagens, relativo ao maior ganho sondado
+
+
+def _numerico(tipo: Any) -> bool:
+    texto = str(tipo)
+    return ("float" in texto or "int" in texto) and "bool" not in texto
+
+
+def campos_eixo(dores: Optional[DoresSelecionadas] = None) -> List[str]:
+    """
+    Campos aceitos como eixo do mapa.
+
+    Com `dores`, só os que mexem no ganho: processo, investimento e os parâmetros das fórmulas
+    selecionadas (os demais parâmetros ficam `None` e não mudam o payback).
+    """
+    campos = [INVESTIMENTO_UNICO]
+    for grupo, modelo in _GRUPOS.items():
+        campos += [f"{grupo}.{f.name}" for f in fields(modelo) if _numerico(f.type)]
+    if dores is None:
+        return campos
+    ativos = {nome for codigo in formulas_selecionadas(dores) for nome in CAMPOS_POR_FORMULA.get(codigo, ())}
+    return [c for c in campos if not c.startswith("parametros.") or c.split(".", 1)[1] in ativos]
+
+
+def faixa_sugerida(entradas: Mapping[str, Any], campo: str, faixa: Any = None) -> Tuple[float, float]:
+    """
+    Mínimo e máximo sugeridos para o eixo `campo`.
+
+    `faixa` é a faixa de benchmark do campo (com `minimo`/`maximo`), quando houver; sem ela, de 0 ao
+    dobro do valor atual. Campos sem valor (`None`, fórmula não selecionada) ou zerados ficam em (0, 1).
+    """
+    if campo.startswith(INVESTIMENTO_UNICO):
+        investimento = entradas["investimento"]
+        return 0.5 * investimento.valor_investimento_min, 1.5 * investimento.valor_investimento_max
+    if faixa is not None:
+        return float(faixa.minimo), float(faixa.maximo)
+    grupo, nome = campo.split(".", 1)
+    atual = getattr(entradas[grupo], nome)
+    return 0.0, (2 * float(atual) if atual else 1.0)
+
+
+_CAMPOS_EIXO = frozenset(campos_eixo())
+
+
+@dataclass
+class MapaEquilibrio:
+    """Grades do mapa (linhas: `valores_y`; colunas: `valores_x`) e curvas de nível do payback."""
+
+    eixo_x: str
+    eixo_y: str
+    valores_x: array
+    valores_y: array
+    ganho_anual: List[array]
+    payback_anos: List[array]
+    roi: List[array]  # ROI (%) em `anos_roi` anos
+    anos_roi: int
+    contornos: Dict[float, List[List[Ponto]]]  # limiar de payback (anos) → polilinhas (x, y)
+    posto: Optional[int]  # termos da aproximação do ganho; None = avaliado célula a célula
+
+
+def _com_valor(entradas: Mapping[str, Any], campo: str, valor: float) -> Dict[str, Any]:
+    if campo == INVESTIMENTO_UNICO:
+        return dict(entradas, investimento=InvestimentoAutomacao(valor, valor))
+    grupo, nome = campo.split(".", 1)
+    return dict(entradas, **{grupo: replace(entradas[grupo], **{nome: valor})})
+
+
+def _valores(eixo: Eixo, pontos: int) -> array:
+    campo, minimo, maximo = eixo
+    if campo not in _CAMPOS_EIXO:
+        raise ValueError(f"Campo de eixo inválido: {campo!r}")
+    if not 0 <= minimo < maximo:
+        raise ValueError(f"Faixa inválida para {campo}: exige 0 ≤ mínimo < máximo.")
+    passo = (maximo - minimo) / (pontos - 1)
+    return array("d", [minimo + passo * k for k in range(pontos - 1)] + [maximo])
+
+
+def _aproximacao_cruzada(
+    avaliar_linha: Callable[[int], List[float]],
+    avaliar_coluna: Callable[[int], List[float]],
+    sondas: Mapping[Tuple[int, int], float],
+    linhas: int,
+    posto_max: int,
+) -> Optional[Tuple[List[List[float]], List[List[float]]]]:
+    """
+    Fatores (u, v) com grade[i][j] = Σ u[k][i]·v[k][j], ou None se as sondagens não fecharem.
+
+    Cada termo sai de uma linha e uma coluna do resíduo (pivô no maior resíduo da linha); a próxima
+    linha é a da sondagem com maior erro.
+    """
+    us: List[List[float]] = []
+    vs: List[List[float]] = []
+    if not all(map(math.isfinite, sondas.values())):
+        return None
+    escala = max(map(abs, sondas.values()), default=0.0) or 1.0
+    piso = escala * _PISO_RELATIVO
+    tolerancia = escala * _TOLERANCIA_RELATIVA  # pivôs abaixo disso são ruído
+
+    def aproximado(i: int, j: int) -> float:
+        return sum(u[i] * v[j] for u, v in zip(us, vs))
+
+    i = linhas // 2
+    visitadas = set()
+    while i not in visitadas:
+        visitadas.add(i)
+        residuo = avaliar_linha(i)
+        for u, v in zip(us, vs):
+            if u[i]:
+                residuo = [r - u[i] * b for r, b in zip(residuo, v)]
+        j = max(range(len(residuo)), key=lambda k: abs(residuo[k]))
+        pivo = residuo[j]
+        if not math.isfinite(pivo):
+            return None
+        if abs(pivo) > tolerancia:
+            if len(us) == posto_max:
+                return None
+            coluna = avaliar_coluna(j)
+            us.append([(c - aproximado(k, j)) / pivo for k, c in enumerate(coluna)])
+            vs.append(residuo)
+        # Erro relativo por célula sondada (com piso absoluto para ganhos nulos)
+        erro, i = max(
+            (abs(valor - aproximado(p, q)) / (abs(valor) * _TOLERANCIA_RELATIVA + piso), p)
+            for (p, q), valor in sondas.items()
+        )
+        if erro <= 1:
+            return us, vs
+    return None
+
+
+def _grade_ganho(
+    entradas: Mapping[str, Any], eixo_x: str, eixo_y: str, xs: array, ys: array, posto_max: int
+) -> Tuple[List[array], Optional[int]]:
+    def ganho(e: Mapping[str, Any]) -> float:
+        return ROICalculator(**e).calcular().ganho_anual_potencial
+
+    def avaliar_linha(i: int) -> List[float]:
+        base = _com_valor(entradas, eixo_y, ys[i])
+        return [ganho(_com_valor(base, eixo_x, x)) for x in xs]
+
+    def avaliar_coluna(j: int) -> List[float]:
+        base = _com_valor(entradas, eixo_x, xs[j])
+        return [ganho(_com_valor(base, eixo_y, y)) for y in ys]
+
+    def avaliar(i: int, j: int) -> float:
+        return ganho(_com_valor(_com_valor(entradas, eixo_y, ys[i]), eixo_x, xs[j]))
+
+    n, m = len(ys), len(xs)
+    rng = random.Random(0)
+    indices = {(round(a * (n - 1) / 4), round(b * (m - 1) / 4)) for a in range(5) for b in range(5)}
+    indices |= {(rng.randrange(n), rng.randrange(m)) for _ in range(MAPA_SONDAS_ALEATORIAS)}
+    sondas = {(i, j): avaliar(i, j) for i, j in indices}
+
+    fatores = _aproximacao_cruzada(avaliar_linha, avaliar_coluna, sondas, n, posto_max)
+    if fatores is None:
+        return [array("d", avaliar_linha(i)) for i in range(n)], None
+
+    us, vs = fatores
+    # Cota do erro de arredondamento de cada célula: ~ε·Σ|u·v| (cresce com o posto). Células em que
+    # ela passa da tolerância relativa — ganho pequeno frente aos termos somados, ex.: ganho nulo —
+    # são avaliadas pelo motor.
+    erro_por_termo = 8 * (len(us) + 1) * sys.float_info.epsilon
+    grade = []
+    for i in range(n):
+        linha, cota = [0.0] * m, [0.0] * m
+        for u, v in zip(us, vs):
+            if u[i]:
+                linha = [a + u[i] * b for a, b in zip(linha, v)]
+                cota = [c + abs(u[i] * b) for c, b in zip(cota, v)]
+        for j in range(m):
+            if cota[j] * erro_por_termo > abs(linha[j]) * _TOLERANCIA_RELATIVA:
+                linha[j] = avaliar(i, j)
+        grade.append(array("d", linha))
+    return grade, len(us)
+
+
+def _investimentos(
+    entradas: Mapping[str, Any], eixo_x: str, eixo_y: str, xs: array, ys: array
+) -> Callable[[int], Sequence[float]]:
+    """Investimento médio de cada célula da linha `i` (só os eixos de investimento o alteram)."""
+    m = len(xs)
+    x_inv = eixo_x.startswith(INVESTIMENTO_UNICO)
+    y_inv = eixo_y.startswith(INVESTIMENTO_UNICO)
+    if not x_inv and not y_inv:
+        constante = [entradas["investimento"].valor_investimento_medio] * m
+        return lambda i: constante
+    if not y_inv:
+        linha = [_com_valor(entradas, eixo_x, x)["investimento"].valor_investimento_medio for x in xs]
+        return lambda i: linha
+    if not x_inv:
+        return lambda i: [_com_valor(entradas, eixo_y, ys[i])["investimento"].valor_investimento_medio] * m
+    return lambda i: [
+        _com_valor(_com_valor(entradas, eixo_y, ys[i]), eixo_x, x)["investimento"].valor_investimento_medio
+        for x in xs
+    ]
+
+
+def _interpolar(va: float, vb: float, limiar: float) -> float:
+    """Fração (0–1) do caminho de `va` a `vb` em que o valor cruza `limiar` (infinito fica na ponta)."""
+    if math.isinf(va):
+        return 1.0
+    if math.isinf(vb):
+        return 0.0
+    return (limiar - va) / (vb - va)
+
+
+def contornos(grade: Sequence[Sequence[float]], xs: Sequence[float], ys: Sequence[float], limiar: float) -> List[List[Ponto]]:
+    """
+    Curvas de nível `limiar` de uma grade (marching squares), como polilinhas em (x, y).
+
+    Pontos de cruzamento são interpolados linearmente ao longo das arestas; pontos de sela são
+    resolvidos pela média dos quatro cantos.
+    """
+    pontos: Dict[tuple, Ponto] = {}
+
+    def ponto(aresta: tuple) -> tuple:
+        if aresta not in pontos:
+            tipo, i, j = aresta
+            if tipo == "h":  # (i, j) → (i, j + 1)
+                t = _interpolar(grade[i][j], grade[i][j + 1], limiar)
+                pontos[aresta] = (xs[j] + t * (xs[j + 1] - xs[j]), ys[i])
+            else:  # (i, j) → (i + 1, j)
+                t = _interpolar(grade[i][j], grade[i + 1][j], limiar)
+                pontos[aresta] = (xs[j], ys[i] + t * (ys[i + 1] - ys[i]))
+        return aresta
+
+    vizinhos: Dict[tuple, List[tuple]] = {}
+
+    def ligar(a: tuple, b: tuple) -> None:
+        vizinhos.setdefault(ponto(a), []).append(ponto(b))
+        vizinhos.setdefault(b, []).append(a)
+
+    acima_anterior = [v > limiar for v in grade[0]]
+    for i in range(len(grade) - 1):
+        acima = [v > limiar for v in grade[i + 1]]
+        for j, (a00, a01, a10, a11) in enumerate(zip(acima_anterior, acima_anterior[1:], acima, acima[1:])):
+            if a00 == a01 == a10 == a11:
+                continue
+            baixo, cima = ("h", i, j), ("h", i + 1, j)
+            esquerda, direita = ("v", i, j), ("v", i, j + 1)
+            cruzadas = [
+                aresta
+                for aresta, cruza in ((baixo, a00 != a01), (direita, a01 != a11), (cima, a10 != a11), (esquerda, a00 != a10))
+                if cruza
+            ]
+            if len(cruzadas) == 2:
+                ligar(*cruzadas)
+                continue
+            # Sela: os cantos diagonais concordam; o centro decide quais arestas se ligam
+            centro = (grade[i][j] + grade[i][j + 1] + grade[i + 1][j] + grade[i + 1][j + 1]) / 4
+            if (centro > limiar) == a00:
+                ligar(baixo, direita)
+                ligar(cima, esquerda)
+            else:
+                ligar(baixo, esquerda)
+                ligar(cima, direita)
+        acima_anterior = acima
+
+    polilinhas: List[List[Ponto]] = []
+    restantes = set(vizinhos)
+    # Curvas abertas começam numa ponta (aresta com um só vizinho); depois, as fechadas
+    for inicio in sorted(restantes, key=lambda a: len(vizinhos[a])):
+        if inicio not in restantes:
+            continue
+        caminho, atual, anterior = [inicio], inicio, None
+        restantes.discard(inicio)
+        while True:
+            proximo = next((v for v in vizinhos[atual] if v != anterior and v in restantes), None)
+            if proximo is None:
+                if len(caminho) > 2 and inicio in vizinhos[atual] and anterior is not None:
+                    caminho.append(inicio)  # fecha o ciclo
+                break
+            restantes.discard(proximo)
+            caminho.append(proximo)
+            anterior, atual = atual, proximo
+        polilinhas.append([pontos[a] for a in caminho])
+    return polilinhas
+
+
+def mapa_equilibrio(
+    entradas: Mapping[str, Any],
+    eixo_x: Eixo,
+    eixo_y: Eixo,
+    limiares_payback: Sequence[float] = MAPA_LIMIARES_PAYBACK,
+    pontos: int = MAPA_PONTOS_PADRAO,
+    anos_roi: int = 5,
+    posto_max: int = MAPA_POSTO_MAX,
+) -> MapaEquilibrio:
+    """
+    Payback e ROI em `anos_roi` anos na grade `pontos` × `pontos` de `eixo_x` × `eixo_y`
+    (`(campo, mínimo, máximo)`), a partir das `entradas` de `ROICalculator`, e as curvas de nível
+    do payback em cada limiar (anos).
+    """
+    if pontos < 2:
+        raise ValueError("pontos deve ser >= 2")
+    if eixo_x[0] == eixo_y[0]:
+        raise ValueError("Os eixos devem ser campos diferentes.")
+    xs, ys = _valores(eixo_x, pontos), _valores(eixo_y, pontos)
+
+    ganho, posto = _grade_ganho(entradas, eixo_x[0], eixo_y[0], xs, ys, posto_max)
+    investimentos = _investimentos(entradas, eixo_x[0], eixo_y[0], xs, ys)
+    payback, roi = [], []
+    for i, linha in enumerate(ganho):
+        linha_inv = investimentos(i)
+        payback.append(array("d", [calcular_payback(inv, g) for inv, g in zip(linha_inv, linha)]))
+        roi.append(array("d", [calcular_roi(inv, g, anos_roi) for inv, g in zip(linha_inv, linha)]))
+
+    return MapaEquilibrio(
+        eixo_x=eixo_x[0],
+        eixo_y=eixo_y[0],
+        valores_x=xs,
+        valores_y=ys,
+        ganho_anual=ganho,
+        payback_anos=payback,
+        roi=roi,
+        anos_roi=anos_roi,
+        contornos={limiar: contornos(payback, xs, ys, limiar) for limiar in limiares_payback},
+        posto=posto,
+    )
@@ -0,0 +1,229 @@
+"""
+Depósito de blobs por sessão com orçamento de memória e descarte para disco.
+
+Cada sessão do Streamlit guarda aqui seus objetos grandes em bytes — o deck PPTX gerado — em vez
+de mantê-los no `st.session_state`. Só o deck entra no depósito: o estado do wizard e os
+`resultados` (com o rastreio) continuam no `session_state`, fora dos orçamentos e da visão admin.
+
+- Orçamento por sessão: ao exceder, os blobs menos usados *da própria sessão* vão para disco.
+- Orçamento total: ao exceder, os blobs menos usados *entre todas as sessões* (LRU) vão para disco.
+- Um blob em disco volta para a memória no próximo `obter` (e os orçamentos são reaplicados).
+- Os arquivos são gravados fora do lock (nomes únicos via `tempfile.mkstemp`); enquanto a gravação
+  não termina, o blob continua disponível para `obter`.
+- Sessões sem acesso há `SESSAO_INATIVA_SEGUNDOS` são descartadas por `limpar_inativas`
+  (o Streamlit não avisa quando uma sessão termina); `limpar_inativas_se_devido`, chamada a cada
+  rerun, varre as sessões no máximo uma vez a cada `SESSAO_LIMPEZA_INTERVALO_SEGUNDOS`.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config.constants import (
+    DEPOSITO_DIRETORIO_ENV,
+    DEPOSITO_ORCAMENTO_TOTAL_BYTES,
+    SESSAO_INATIVA_SEGUNDOS,
+    SESSAO_LIMPEZA_INTERVALO_SEGUNDOS,
+    SESSAO_ORCAMENTO_BYTES,
+)
+
+_Chave = Tuple[str, str]  # (sessão, nome)
+
+
+@dataclass
+class UsoSessao:
+    """Uso de uma sessão no depósito."""
+    memoria_bytes: int = 0
+    disco_bytes: int = 0
+    itens: int = 0
+    ultimo_acesso: float = 0.0
+
+
+class DepositoSessoes:
+    """
+    Blobs por (sessão, nome), com LRU global e descarte para arquivos em `diretorio`.
+
+    Thread-safe: o Streamlit executa cada sessão em uma thread própria.
+    """
+
+    def __init__(
+        self,
+        orcamento_sessao: int = SESSAO_ORCAMENTO_BYTES,
+        orcamento_total: int = DEPOSITO_ORCAMENTO_TOTAL_BYTES,
+        diretorio: Optional[str] = None,
+        relogio: Callable[[], float] = time.monotonic,
+    ):
+        self.orcamento_sessao = orcamento_sessao
+        self.orcamento_total = orcamento_total
+        self._diretorio = diretorio
+        self._relogio = relogio
+        self._memoria: "OrderedDict[_Chave, bytes]" = OrderedDict()  # mais antigo primeiro
+        self._disco: Dict[_Chave, Tuple[str, int]] = {}  # caminho, tamanho
+        self._gravando: Dict[_Chave, bytes] = {}  # fora do orçamento, a caminho do disco
+        self._uso_memoria: Dict[str, int] = {}
+        self._acessos: Dict[str, float] = {}
+        self._total_memoria = 0
+        self._lock = threading.Lock()
+        self.descartes_para_disco = 0
+        self._proxima_limpeza = 0.0
+
+    # --- API pública ---
+
+    def guardar(self, sessao: str, nome: str, dados: bytes) -> None:
+        with self._lock:
+            chave = (sessao, nome)
+            self._remover_item(chave)
+            self._memoria[chave] = bytes(dados)
+            self._somar(sessao, len(dados))
+            self._acessos[sessao] = self._relogio()
+            pendentes = self._aplicar_orcamentos(sessao)
+        self._gravar_em_disco(pendentes)
+
+    def obter(self, sessao: str, nome: str) -> Optional[bytes]:
+        with self._lock:
+            chave = (sessao, nome)
+            if chave in self._memoria:
+                self._memoria.move_to_end(chave)
+                self._acessos[sessao] = self._relogio()
+                return self._memoria[chave]
+            if chave in self._gravando:
+                dados = self._gravando.pop(chave)  # a gravação em andamento é descartada
+            elif chave in self._disco:
+                caminho, _ = self._disco.pop(chave)
+                with open(caminho, "rb") as f:
+                    dados = f.read()
+                os.remove(caminho)
+            else:
+                return None
+            self._memoria[chave] = dados
+            self._somar(sessao, len(dados))
+            self._acessos[sessao] = self._relogio()
+            pendentes = self._aplicar_orcamentos(sessao, preservar=chave)
+        self._gravar_em_disco(pendentes)
+        return dados
+
+    def remover(self, sessao: str, nome: str) -> None:
+        with self._lock:
+            self._remover_item((sessao, nome))
+
+    def remover_sessao(self, sessao: str) -> None:
+        with self._lock:
+            for chave in [c for c in (*self._memoria, *self._gravando, *self._disco) if c[0] == sessao]:
+                self._remover_item(chave)
+            self._uso_memoria.pop(sessao, None)
+            self._acessos.pop(sessao, None)
+
+    def limpar_inativas(self, inatividade_segundos: float = SESSAO_INATIVA_SEGUNDOS) -> int:
+        """Descarta sessões sem acesso há mais de `inatividade_segundos`; retorna quantas."""
+        with self._lock:
+            limite = self._relogio() - inatividade_segundos
+            inativas = [s for s, t in self._acessos.items() if t < limite]
+        for sessao in inativas:
+            self.remover_sessao(sessao)
+        return len(inativas)
+
+    def limpar_inativas_se_devido(self, intervalo_segundos: float = SESSAO_LIMPEZA_INTERVALO_SEGUNDOS) -> int:
+        """`limpar_inativas` no máximo uma vez a cada `intervalo_segundos`; nas demais chamadas, retorna 0."""
+        with self._lock:
+            agora = self._relogio()
+            if agora < self._proxima_limpeza:
+                return 0
+            self._proxima_limpeza = agora + intervalo_segundos
+        return self.limpar_inativas()
+
+    def uso_por_sessao(self) -> Dict[str, UsoSessao]:
+        with self._lock:
+            uso: Dict[str, UsoSessao] = {}
+            for (sessao, _), dados in self._memoria.items():
+                u = uso.setdefault(sessao, UsoSessao())
+                u.memoria_bytes += len(dados)
+                u.itens += 1
+            for (sessao, _), tamanho in [
+                *((c, len(d)) for c, d in self._gravando.items()),
+                *((c, t) for c, (_, t) in self._disco.items()),
+            ]:
+                u = uso.setdefault(sessao, UsoSessao())
+                u.disco_bytes += tamanho
+                u.itens += 1
+            for sessao, u in uso.items():
+                u.ultimo_acesso = self._acessos.get(sessao, 0.0)
+            return uso
+
+    @property
+    def memoria_total(self) -> int:
+        return self._total_memoria
+
+    # --- Internos (chamados com o lock) ---
+
+    def _somar(self, sessao: str, delta: int) -> None:
+        self._uso_memoria[sessao] = self._uso_memoria.get(sessao, 0) + delta
+        self._total_memoria += delta
+
+    def _remover_item(self, chave: _Chave) -> None:
+        dados = self._memoria.pop(chave, None)
+        if dados is not None:
+            self._somar(chave[0], -len(dados))
+        self._gravando.pop(chave, None)
+        em_disco = self._disco.pop(chave, None)
+        if em_disco is not None and os.path.exists(em_disco[0]):
+            os.remove(em_disco[0])
+
+    def _aplicar_orcamentos(self, sessao: str, preservar: Optional[_Chave] = None) -> List[_Chave]:
+        # Itera sobre cópias: `_descartar` altera `_memoria`. O item relido do disco (`preservar`)
+        # permanece em memória; um item recém-guardado maior que o orçamento vai direto para disco.
+        # Retorna os itens descartados, a gravar com `_gravar_em_disco` depois de liberar o lock.
+        descartados = []
+        if self._uso_memoria.get(sessao, 0) > self.orcamento_sessao:
+            for chave in [c for c in self._memoria if c[0] == sessao]:
+                if self._uso_memoria[sessao] <= self.orcamento_sessao:
+                    break
+                if chave != preservar:
+                    descartados.append(self._descartar(chave))
+        for chave in list(self._memoria):
+            if self._total_memoria <= self.orcamento_total:
+                break
+            if chave != preservar:
+                descartados.append(self._descartar(chave))
+        return descartados
+
+    def _descartar(self, chave: _Chave) -> _Chave:
+        dados = self._memoria.pop(chave)
+        self._gravando[chave] = dados
+        self._somar(chave[0], -len(dados))
+        self.descartes_para_disco += 1
+        return chave
+
+    def _obter_diretorio(self) -> str:
+        if self._diretorio is None:
+            self._diretorio = os.environ.get(DEPOSITO_DIRETORIO_ENV) or tempfile.mkdtemp(prefix="roi-sessoes-")
+        os.makedirs(self._diretorio, exist_ok=True)
+        return self._diretorio
+
+    # --- Gravação em disco (sem o lock) ---
+
+    def _gravar_em_disco(self, chaves: List[_Chave]) -> None:
+        """Grava os blobs descartados; um blob relido, substituído ou removido no meio do caminho é ignorado."""
+        if not chaves:
+            return
+        with self._lock:
+            diretorio = self._obter_diretorio()
+            pendentes = [(c, self._gravando[c]) for c in chaves if c in self._gravando]
+        for chave, dados in pendentes:
+            descritor, caminho = tempfile.mkstemp(suffix=".bin", dir=diretorio)
+            with os.fdopen(descritor, "wb") as f:
+                f.write(dados)
+            with self._lock:
+                if self._gravando.get(chave) is dados:
+                    del self._gravando[chave]
+                    self._disco[chave] = (caminho, len(dados))
+                    continue
+            os.remove(caminho)
+
+
+DEPOSITO = DepositoSessoes()
@@ -0,0 +1,190 @@
+"""
+Simulação Monte Carlo do retorno da automação.
+
+Os custos por fórmula são calculados uma única vez (mesmas regras de `ROICalculator`); cada
+iteração apenas sorteia um fator de incerteza por fórmula e um investimento dentro da faixa
+informada, então o custo por iteração é O(nº de fórmulas selecionadas).
+
+Com `correlacao` (`core.correlacao.EspecCorrelacao`), os campos correlacionados são sorteados juntos
+(cópula gaussiana, fator de Cholesky) e as fórmulas que dependem deles são reavaliadas pelo motor a
+cada iteração com as entradas sorteadas; as demais seguem com o fator independente por fórmula.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import dataclass, replace
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from config.constants import MONTECARLO_ITERACOES_DEFAULT, MONTECARLO_VARIACAO_DEFAULT
+from core.calculator import ROICalculator
+from core.correlacao import EspecCorrelacao, fator_correlacao, fatores_correlacionados
+from core.formulas import calcular_payback, calcular_roi
+from core.previa import custo_formula
+from core.validators import formulas_selecionadas
+from models.inputs import (
+    ClienteBasicInfo,
+    DoresSelecionadas,
+    Formula,
+    InvestimentoAutomacao,
+    ParametrosDetalhados,
+    ProcessoAtual,
+)
+from models.results import INDICE_FORMULA, MetasReducao
+
+# As fórmulas reavaliadas só fornecem o ganho; o investimento é sorteado à parte.
+_SEM_INVESTIMENTO = InvestimentoAutomacao(valor_investimento_min=0.0, valor_investimento_max=0.0)
+
+
+@dataclass
+class ResumoDistribuicao:
+    """Média e percentis de uma grandeza simulada."""
+
+    media: float
+    p05: float
+    p50: float
+    p95: float
+
+
+@dataclass
+class ResultadoMonteCarlo:
+    """Distribuições simuladas do ganho anual, payback e ROI em 5 anos."""
+
+    iteracoes: int
+    ganho_anual: ResumoDistribuicao
+    payback_anos: ResumoDistribuicao
+    roi_5_anos: ResumoDistribuicao
+    prob_payback_ate_3_anos: float  # fração das iterações com payback ≤ 3 anos
+
+
+def _percentil(ordenados: List[float], p: float) -> float:
+    """Percentil pelo método do posto mais próximo (`ordenados` crescente, `p` em 0–100)."""
+    indice = max(0, math.ceil(p / 100 * len(ordenados)) - 1)
+    return ordenados[indice]
+
+
+def _resumir(valores: List[float]) -> ResumoDistribuicao:
+    ordenados = sorted(valores)
+    return ResumoDistribuicao(
+        media=sum(ordenados) / len(ordenados),
+        p05=_percentil(ordenados, 5),
+        p50=_percentil(ordenados, 50),
+        p95=_percentil(ordenados, 95),
+    )
+
+
+def _campos_presentes(
+    espec: EspecCorrelacao, processo: ProcessoAtual, parametros: ParametrosDetalhados
+) -> List[Tuple[int, str, str, float]]:
+    """(índice em `espec`, grupo, campo, valor base) dos campos correlacionados que têm valor."""
+    grupos = {"processo": processo, "parametros": parametros}
+    presentes = []
+    for i, nome in enumerate(espec.campos):
+        grupo, campo = nome.split(".", 1)
+        valor = getattr(grupos[grupo], campo)
+        if valor is not None:
+            presentes.append((i, grupo, campo, float(valor)))
+    return presentes
+
+
+def _entradas_sorteadas(
+    processo: ProcessoAtual,
+    parametros: ParametrosDetalhados,
+    presentes: List[Tuple[int, str, str, float]],
+    fatores: Tuple[float, ...],
+) -> Tuple[ProcessoAtual, ParametrosDetalhados]:
+    novos: Dict[str, Dict[str, float]] = {"processo": {}, "parametros": {}}
+    for i, grupo, campo, base in presentes:
+        novos[grupo][campo] = base * fatores[i]
+    return replace(processo, **novos["processo"]), replace(parametros, **novos["parametros"])
+
+
+def simular_montecarlo(
+    cliente: ClienteBasicInfo,
+    processo: ProcessoAtual,
+    dores: DoresSelecionadas,
+    parametros: ParametrosDetalhados,
+    investimento: InvestimentoAutomacao,
+    metas: MetasReducao,
+    iteracoes: int = MONTECARLO_ITERACOES_DEFAULT,
+    variacao: float = MONTECARLO_VARIACAO_DEFAULT,
+    semente: Optional[int] = None,
+    variacoes: Optional[Mapping[str, float]] = None,
+    correlacao: Optional[EspecCorrelacao] = None,
+) -> ResultadoMonteCarlo:
+    """
+    Simula o ganho anual com incerteza nos custos e no investimento.
+
+    - Custo de cada fórmula: fator triangular em [1 − variacao, 1 + variacao], moda 1; `variacoes`
+      (código → variação, ex.: `core.benchmarks.variacoes_montecarlo`) substitui `variacao` por fórmula.
+    - Investimento: uniforme entre mínimo e máximo.
+    - `correlacao`: entradas correlacionadas, cada uma com fator triangular em ±variação (a da
+      especificação ou `variacao`); as fórmulas afetadas usam só essa incerteza das entradas.
+    """
+    if iteracoes < 1:
+        raise ValueError("iteracoes deve ser >= 1")
+    variacoes = dict(variacoes or {})
+    if not all(0 <= v < 1 for v in (variacao, *variacoes.values())):
+        raise ValueError("variacao deve estar em [0, 1)")
+
+    rng = random.Random(semente)
+    valores_metas = metas.valores
+    ganhos_base: Dict[str, float] = {
+        codigo: custo_formula(codigo, cliente, processo, parametros) * valores_metas[INDICE_FORMULA[codigo]]
+        for codigo in formulas_selecionadas(dores)
+    }
+    ganhos_base = {codigo: g for codigo, g in ganhos_base.items() if g != 0}
+
+    # Fórmulas afetadas pela correlação: o custo muda ao escalar os campos correlacionados (o fator
+    # é positivo, então sinais e ramos das fórmulas — ex.: valor informado ou derivado — se mantêm)
+    presentes = []
+    if correlacao is not None:
+        fator_correlacao(correlacao)  # valida a especificação (ValueError)
+        presentes = _campos_presentes(correlacao, processo, parametros)
+    afetadas: List[str] = []
+    if presentes:
+        escalados = _entradas_sorteadas(processo, parametros, presentes, (2.0,) * len(correlacao.campos))
+        afetadas = [
+            codigo for codigo in ganhos_base
+            if custo_formula(codigo, cliente, *escalados) != custo_formula(codigo, cliente, processo, parametros)
+        ]
+
+    inv_min = investimento.valor_investimento_min
+    inv_max = investimento.valor_investimento_max
+    faixas = [
+        (g, 1 - variacoes.get(codigo, variacao), 1 + variacoes.get(codigo, variacao))
+        for codigo, g in ganhos_base.items()
+        if codigo not in afetadas
+    ]
+
+    ganhos: List[float] = []
+    paybacks: List[float] = []
+    rois: List[float] = []
+
+    def registrar(ganho: float) -> None:
+        inv = rng.uniform(inv_min, inv_max)
+        ganhos.append(ganho)
+        paybacks.append(calcular_payback(inv, ganho))
+        rois.append(calcular_roi(inv, ganho, 5))
+
+    if afetadas:
+        # As fórmulas afetadas são avaliadas juntas, numa única chamada do motor por iteração
+        dores_afetadas = DoresSelecionadas.de_mascara(Formula.de_codigos(afetadas))
+        for bloco in fatores_correlacionados(correlacao, variacao, rng, iteracoes):
+            for fatores in bloco:
+                p, params = _entradas_sorteadas(processo, parametros, presentes, fatores)
+                calc = ROICalculator(cliente, p, dores_afetadas, params, _SEM_INVESTIMENTO, metas)
+                ganho = calc.calcular().ganho_anual_potencial
+                registrar(ganho + sum(g * rng.triangular(baixo, alto, 1.0) for g, baixo, alto in faixas))
+    else:
+        for _ in range(iteracoes):
+            registrar(sum(g * rng.triangular(baixo, alto, 1.0) for g, baixo, alto in faixas))
+
+    return ResultadoMonteCarlo(
+        iteracoes=iteracoes,
+        ganho_anual=_resumir(ganhos),
+        payback_anos=_resumir(paybacks),
+        roi_5_anos=_resumir(rois),
+        prob_payback_ate_3_anos=sum(1 for p in paybacks if p <= 3) / iteracoes,
+    )
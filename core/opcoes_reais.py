@@ -0,0 +1,176 @@
+"""
+Opções reais: quanto vale poder adiar (ou expandir) a automação.
+
+O cliente que diz "vamos automatizar no ano que vem" tem uma opção de compra americana: pode investir
+a qualquer momento da janela (`prazo_anos`) pagando o investimento (preço de exercício) e recebendo
+o projeto. O ativo-objeto é o valor presente dos ganhos do projeto ao investir:
+
+    V = ganho anual (`ROICalculator`) × anuidade(`vida_util_anos`, `taxa_desconto`)
+
+Esperar adia os ganhos: cada ano parado abre mão de um ganho anual, um "dividendo" contínuo de
+δ = ganho ÷ V = 1 ÷ anuidade. A volatilidade do ganho vem da simulação Monte Carlo
+(`volatilidade_montecarlo`). Expandir é a mesma opção com o ganho incremental da expansão e o seu
+custo.
+
+Árvore binomial recombinante (Cox-Ross-Rubinstein) com `passos_por_ano` passos; a indução
+retroativa opera sobre o vetor de nós de cada nível. Volatilidades abaixo de |r − δ|·√Δt são
+elevadas a esse piso, que dá o limite determinístico (probabilidade 0 ou 1) em vez de uma árvore
+inválida. Para muitos clientes, `valorar_opcoes` reaproveita a árvore (fatores e probabilidades)
+entre clientes com a mesma volatilidade.
+"""
+
+from __future__ import annotations
+
+import math
+from functools import lru_cache
+from itertools import chain, repeat
+from operator import add, gt, mul, sub
+from typing import List, Optional, Sequence, Tuple
+
+from config.constants import (
+    ARVORE_TAXA_DESCONTO,
+    MONTECARLO_ITERACOES_DEFAULT,
+    OPCOES_PASSOS_POR_ANO,
+    OPCOES_PRAZO_ANOS,
+    OPCOES_TAXA_LIVRE_RISCO,
+    OPCOES_VIDA_UTIL_ANOS,
+)
+from core.calculator import ROICalculator
+from core.montecarlo import ResultadoMonteCarlo, simular_montecarlo
+from models.inputs import ClienteBasicInfo, DoresSelecionadas, InvestimentoAutomacao, ParametrosDetalhados, ProcessoAtual
+from models.results import MetasReducao, OpcaoReal
+
+_Z_95 = 1.6448536269514722  # quantil 95% da normal padrão
+
+
+def volatilidade_montecarlo(resultado: ResultadoMonteCarlo) -> float:
+    """Volatilidade anual do ganho a partir de p05–p95 da simulação (ganho aproximado como lognormal)."""
+    p05, p95 = resultado.ganho_anual.p05, resultado.ganho_anual.p95
+    if p05 <= 0 or p95 <= p05:
+        return 0.0
+    return math.log(p95 / p05) / (2 * _Z_95)
+
+
+def _anuidade(anos: int, taxa: float) -> float:
+    return sum((1 + taxa) ** -ano for ano in range(1, anos + 1))
+
+
+@lru_cache(maxsize=256)
+def _arvore(volatilidade: float, rendimento: float, taxa: float, passos_por_ano: int, passos: int):
+    """Volatilidade efetiva, probabilidade de subida, pesos descontados e fatores V/V₀ (u^−n … u^n)."""
+    dt = 1 / passos_por_ano
+    piso = abs(taxa - rendimento) * math.sqrt(dt)
+    if volatilidade == piso == 0:  # r = δ e sem incerteza: V constante
+        u, p = 1.0, 0.5
+    elif volatilidade <= piso:  # limite determinístico: V segue e^{(r − δ)t}
+        volatilidade = piso
+        u, p = math.exp(piso * math.sqrt(dt)), float(taxa > rendimento)
+    else:
+        u = math.exp(volatilidade * math.sqrt(dt))
+        p = (math.exp((taxa - rendimento) * dt) - 1 / u) / (u - 1 / u)
+    desconto = math.exp(-taxa * dt)
+    return volatilidade, p, desconto * p, desconto * (1 - p), tuple(u ** k for k in range(-passos, passos + 1))
+
+
+def _induzir(valor_projeto: float, investimento: float, arvore) -> Tuple[float, Optional[int], float]:
+    """Valor da opção, 1º nível com exercício no caminho do ganho estimado e probabilidade de exercício."""
+    _, p, peso_sobe, peso_desce, potencias = arvore
+    passos = len(potencias) // 2
+    # Valor de investir em cada nó: o nó j do nível i tem V = V₀·u^(2j − i)
+    exercicio = list(map(sub, map(mul, repeat(valor_projeto), potencias), repeat(investimento)))
+
+    # Opção de compra: em cada nível, investir é ótimo do nó `limiares[i]` para cima (V maior)
+    limiares = [0] * (passos + 1)
+    imediato = exercicio[::2]
+    decisao = list(map(gt, imediato, repeat(0.0)))
+    limiares[passos] = decisao.index(True) if True in decisao else passos + 1
+    valores = list(map(max, imediato, repeat(0.0)))
+    for i in range(passos - 1, -1, -1):
+        continuar = list(map(add, map(mul, repeat(peso_desce), valores[:-1]), map(mul, repeat(peso_sobe), valores[1:])))
+        imediato = exercicio[passos - i : passos + i + 1 : 2]
+        decisao = list(map(gt, imediato, continuar))
+        limiares[i] = decisao.index(True) if True in decisao else i + 1
+        valores = list(map(max, imediato, continuar))
+
+    # Caminho do ganho estimado: nó com V ≥ V₀ mais próximo do centro
+    nivel_exercicio = next((i for i in range(passos + 1) if limiares[i] <= (i + 1) // 2), None)
+
+    probabilidade = 0.0
+    massa = [1.0]
+    for i in range(passos + 1):
+        probabilidade += sum(massa[limiares[i]:])
+        massa = massa[: limiares[i]]
+        if i < passos and massa:
+            massa = list(map(add, chain(map(mul, repeat(1 - p), massa), (0.0,)), chain((0.0,), map(mul, repeat(p), massa))))
+    return valores[0], nivel_exercicio, probabilidade
+
+
+def valorar_opcoes(
+    ganhos_anuais: Sequence[float],
+    investimentos: Sequence[float],
+    volatilidades: Sequence[float],
+    prazo_anos: float = OPCOES_PRAZO_ANOS,
+    passos_por_ano: int = OPCOES_PASSOS_POR_ANO,
+    taxa_livre_risco: float = OPCOES_TAXA_LIVRE_RISCO,
+    vida_util_anos: int = OPCOES_VIDA_UTIL_ANOS,
+    taxa_desconto: float = ARVORE_TAXA_DESCONTO,
+) -> List[OpcaoReal]:
+    """Opção de adiar o investimento de cada cliente (listas alinhadas: ganho anual, investimento, volatilidade)."""
+    if not len(ganhos_anuais) == len(investimentos) == len(volatilidades):
+        raise ValueError("ganhos_anuais, investimentos e volatilidades devem ter o mesmo tamanho.")
+    if passos_por_ano < 1 or prazo_anos < 0 or vida_util_anos < 1:
+        raise ValueError("passos_por_ano e vida_util_anos devem ser >= 1 e prazo_anos >= 0.")
+    anuidade = _anuidade(vida_util_anos, taxa_desconto)
+    rendimento = 1 / anuidade
+    passos = round(prazo_anos * passos_por_ano)
+
+    opcoes = []
+    for ganho, investimento, volatilidade in zip(ganhos_anuais, investimentos, volatilidades):
+        if ganho < 0 or investimento < 0 or volatilidade < 0:
+            raise ValueError("Ganho, investimento e volatilidade devem ser >= 0.")
+        arvore = _arvore(float(volatilidade), rendimento, taxa_livre_risco, passos_por_ano, passos)
+        valor_projeto = ganho * anuidade
+        valor, nivel, probabilidade = _induzir(valor_projeto, investimento, arvore)
+        vpl = valor_projeto - investimento
+        opcoes.append(
+            OpcaoReal(
+                valor_projeto=valor_projeto,
+                investimento=investimento,
+                volatilidade=arvore[0],
+                vpl_imediato=vpl,
+                valor_opcao=valor,
+                valor_espera=valor - max(vpl, 0.0),
+                ano_exercicio=None if nivel is None else nivel / passos_por_ano,
+                prob_exercicio=probabilidade,
+            )
+        )
+    return opcoes
+
+
+def valorar_opcao(ganho_anual: float, investimento: float, volatilidade: float, **kwargs) -> OpcaoReal:
+    """Opção de adiar de um único cliente (mesmos parâmetros de `valorar_opcoes`)."""
+    return valorar_opcoes([ganho_anual], [investimento], [volatilidade], **kwargs)[0]
+
+
+def opcao_do_cenario(
+    cliente: ClienteBasicInfo,
+    processo: ProcessoAtual,
+    dores: DoresSelecionadas,
+    parametros: ParametrosDetalhados,
+    investimento: InvestimentoAutomacao,
+    metas: MetasReducao,
+    iteracoes: int = MONTECARLO_ITERACOES_DEFAULT,
+    semente: Optional[int] = None,
+    **kwargs,
+) -> OpcaoReal:
+    """Opção de adiar o cenário: ganho do `ROICalculator`, volatilidade do Monte Carlo e investimento médio."""
+    resultados = ROICalculator(cliente, processo, dores, parametros, investimento, metas).calcular()
+    simulacao = simular_montecarlo(
+        cliente, processo, dores, parametros, investimento, metas, iteracoes=iteracoes, semente=semente
+    )
+    return valorar_opcao(
+        resultados.ganho_anual_potencial,
+        investimento.valor_investimento_medio,
+        volatilidade_montecarlo(simulacao),
+        **kwargs,
+    )
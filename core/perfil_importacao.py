@@ -0,0 +1,85 @@
+"""
+Perfil de tempo de importação (custo acumulado por módulo).
+
+Executa `python -X importtime` em um subprocesso (import a frio) e agrega a saída.
+
+Uso:
+    python -m core.perfil_importacao app            # tabela dos módulos mais caros
+    python -m core.perfil_importacao core.calculator ui.dashboard
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+
+@dataclass
+class TempoImportacao:
+    """Linha da saída de `-X importtime` (tempos em microssegundos)."""
+
+    modulo: str
+    proprio_us: int
+    acumulado_us: int
+    profundidade: int
+
+
+def _parse_importtime(saida: str) -> List[TempoImportacao]:
+    linhas: List[TempoImportacao] = []
+    for linha in saida.splitlines():
+        if not linha.startswith("import time:") or "imported package" in linha:
+            continue
+        proprio, acumulado, nome = linha[len("import time:"):].split("|", 2)
+        nome = nome[1:]  # espaço separador após "|"
+        profundidade = (len(nome) - len(nome.lstrip(" "))) // 2
+        linhas.append(
+            TempoImportacao(
+                modulo=nome.strip(),
+                proprio_us=int(proprio.strip()),
+                acumulado_us=int(acumulado.strip()),
+                profundidade=profundidade,
+            )
+        )
+    return linhas
+
+
+def medir_importacao(modulos: Sequence[str]) -> List[TempoImportacao]:
+    """Importa `modulos` em um interpretador novo e retorna os tempos de todos os módulos carregados."""
+    codigo = "; ".join(f"import {m}" for m in modulos)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return _parse_importtime(proc.stderr)
+
+
+def modulos_carregados(modulos: Sequence[str]) -> List[str]:
+    """Nomes de todos os módulos presentes em `sys.modules` após importar `modulos` a frio."""
+    codigo = "; ".join(f"import {m}" for m in modulos) + "; import sys; print('\\n'.join(sys.modules))"
+    proc = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True)
+    return proc.stdout.split()
+
+
+def custo_por_modulo(tempos: List[TempoImportacao]) -> Dict[str, int]:
+    """Custo acumulado (µs) dos módulos importados diretamente (profundidade 0)."""
+    return {t.modulo: t.acumulado_us for t in tempos if t.profundidade == 0}
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    modulos = list(argv if argv is not None else sys.argv[1:]) or ["app"]
+    tempos = medir_importacao(modulos)
+    custos = custo_por_modulo(tempos)
+    total_us = sum(custos.get(m, 0) for m in modulos)
+
+    print(f"Importação a frio de {', '.join(modulos)}: {total_us / 1000:,.1f} ms")
+    print(f"{'acumulado (ms)':>15} {'próprio (ms)':>13}  módulo")
+    for t in sorted(tempos, key=lambda t: t.acumulado_us, reverse=True)[:40]:
+        print(f"{t.acumulado_us / 1000:>15,.1f} {t.proprio_us / 1000:>13,.1f}  {'  ' * t.profundidade}{t.modulo}")
+
+
+if __name__ == "__main__":
+    main()
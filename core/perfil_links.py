@@ -0,0 +1,122 @@
+"""
+Benchmark dos links compartilháveis (`core.links`): tamanho e tempo de codificação/decodificação.
+
+Para cada área ARV, monta o estado de pior caso — todas as fórmulas da área selecionadas, com
+todos os parâmetros e metas preenchidos com valores não inteiros — e mede o link gerado.
+
+Uso:
+    python -m core.perfil_links
+    python -m core.perfil_links --repeticoes 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from config.areas import AREAS_ARV, MASCARAS_AREAS
+from config.constants import LINK_MAX_CARACTERES
+from core.links import codificar_link, decodificar_link
+from core.validators import CAMPOS_POR_FORMULA
+from models.inputs import (
+    ClienteBasicInfo,
+    DoresSelecionadas,
+    InvestimentoAutomacao,
+    ParametrosDetalhados,
+    ProcessoAtual,
+)
+from models.results import MetasReducao
+
+
+@dataclass
+class PerfilLink:
+    area: str
+    formulas: int
+    caracteres: int
+    codificar_us: float
+    decodificar_us: float
+
+
+def estado_representativo(area: str) -> Dict[str, Any]:
+    """Entradas completas (pior caso de tamanho) para a área, com valores determinísticos."""
+    rng = random.Random(area)
+    codigos = AREAS_ARV[area]["formulas_aplicaveis"]
+    dores = DoresSelecionadas.de_mascara(MASCARAS_AREAS[area])
+
+    parametros = ParametrosDetalhados()
+    for codigo in codigos:
+        for nome in CAMPOS_POR_FORMULA.get(codigo, ()):
+            if "percentual" in nome or "probabilidade" in nome or "margem" in nome:
+                valor = round(rng.uniform(0.01, 0.6), 4)  # frações (0–1)
+            elif "int" in str(ParametrosDetalhados.__dataclass_fields__[nome].type):
+                valor = rng.randint(1, 12)
+            else:
+                valor = round(rng.uniform(1.5, 9.5), 2)
+            setattr(parametros, nome, valor)
+
+    metas = MetasReducao(**{f"meta_{c.lower()}": rng.randint(5, 95) / 100 for c in codigos})
+
+    return {
+        "cliente": ClienteBasicInfo(
+            nome_cliente="Indústria Metalúrgica Exemplo Ltda.",
+            nome_projeto="Automação da célula de montagem — fase 2",
+            area_atuacao=area,
+            porte_empresa="grande",
+            fator_encargos=1.85,
+        ),
+        "processo": ProcessoAtual(
+            cadencia_producao=12.5,
+            horas_por_turno=8.8,
+            turnos_por_dia=3,
+            dias_operacao_ano=264,
+            pessoas_processo_turno=14,
+            pessoas_inspecao_turno=3,
+            supervisores_por_turno=1,
+            salario_medio_operador=2_870.5,
+            salario_medio_inspetor=3_340.25,
+            salario_medio_supervisor=6_125.75,
+            custo_unitario_peca=87.35,
+            custo_materia_prima_peca=21.9,
+            preco_venda_peca=129.9,
+            faturamento_mensal_linha=2_143_560.0,
+        ),
+        "dores": dores,
+        "parametros": parametros,
+        "investimento": InvestimentoAutomacao(valor_investimento_min=1_250_000.0, valor_investimento_max=1_780_500.0),
+        "metas": metas,
+    }
+
+
+def medir(area: str, repeticoes: int = 2000) -> PerfilLink:
+    estado = estado_representativo(area)
+    link = codificar_link(estado)
+    assert decodificar_link(link) == estado
+    return PerfilLink(
+        area=area,
+        formulas=len(AREAS_ARV[area]["formulas_aplicaveis"]),
+        caracteres=len(link),
+        codificar_us=timeit.timeit(lambda: codificar_link(estado), number=repeticoes) / repeticoes * 1e6,
+        decodificar_us=timeit.timeit(lambda: decodificar_link(link), number=repeticoes) / repeticoes * 1e6,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeticoes", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    print(f"{'área':<32} {'fórmulas':>8} {'caracteres':>10} {'codificar':>12} {'decodificar':>12}")
+    for area in AREAS_ARV:
+        p = medir(area, args.repeticoes)
+        print(
+            f"{p.area:<32} {p.formulas:>8} {p.caracteres:>10} "
+            f"{p.codificar_us:>9.1f} µs {p.decodificar_us:>9.1f} µs"
+        )
+    print(f"(limite de tamanho: {LINK_MAX_CARACTERES} caracteres)")
+
+
+if __name__ == "__main__":
+    main()
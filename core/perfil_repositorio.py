@@ -0,0 +1,120 @@
+"""
+Benchmark do repositório de análises (`core.repositorio`) com dados sintéticos.
+
+Preenche um arquivo SQLite com N análises (áreas, portes e datas distribuídos ao longo de dois
+anos) e mede a inserção em lote e as consultas típicas da gestão.
+
+Uso:
+    python -m core.perfil_repositorio --analises 1000000 --arquivo /tmp/analises.sqlite
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from config.areas import AREAS_ARV
+from core.calculator import ROICalculator
+from core.perfil_links import estado_representativo
+from core.repositorio import RepositorioAnalises, trimestre
+from models.results import CAMPOS_BREAKDOWN
+
+PORTES = ("pequena", "media", "grande")
+INICIO = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def analises_sinteticas(quantidade: int, semente: int = 0) -> Iterator[Tuple[dict, object, datetime]]:
+    """Entradas/resultados reais por área × porte, com indicadores e datas variados por análise."""
+    rng = random.Random(semente)
+    bases = []
+    for area in AREAS_ARV:
+        for porte in PORTES:
+            entradas = estado_representativo(area)
+            entradas["cliente"] = replace(entradas["cliente"], porte_empresa=porte)
+            bases.append((entradas, ROICalculator(**entradas).calcular()))
+    for i in range(quantidade):
+        entradas, base = bases[i % len(bases)]
+        fator = rng.lognormvariate(0, 0.5)
+        entradas = dict(entradas, cliente=replace(entradas["cliente"], nome_cliente=f"Cliente {rng.randrange(20_000)}"))
+        resultados = replace(
+            base,
+            custo_total_anual_inacao=base.custo_total_anual_inacao * fator,
+            ganho_anual_potencial=base.ganho_anual_potencial * fator,
+            payback_anos=base.payback_anos / fator,
+            roi_5_anos=base.roi_5_anos * fator,
+        )
+        yield entradas, resultados, INICIO + timedelta(seconds=rng.randrange(2 * 365 * 86400))
+
+
+def _medir(funcao: Callable[[], object], repeticoes: int = 5) -> float:
+    """Melhor tempo (ms) entre `repeticoes` execuções."""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor * 1000
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--analises", type=int, default=100_000)
+    parser.add_argument("--lote", type=int, default=5_000)
+    parser.add_argument("--arquivo", help="arquivo SQLite (padrão: temporário); se já populado, só consulta")
+    args = parser.parse_args(argv)
+
+    caminho = args.arquivo or os.path.join(tempfile.mkdtemp(prefix="roi-repo-"), "analises.sqlite")
+    repositorio = RepositorioAnalises(caminho)
+
+    faltando = args.analises - repositorio.contar()
+    if faltando > 0:
+        inicio = time.perf_counter()
+        lote = []
+        for analise in analises_sinteticas(faltando):
+            lote.append(analise)
+            if len(lote) == args.lote:
+                repositorio.salvar_lote(lote)
+                lote.clear()
+        repositorio.salvar_lote(lote)
+        duracao = time.perf_counter() - inicio
+        print(f"inserção: {faltando:,} análises em {duracao:.1f}s ({faltando / duracao:,.0f}/s)")
+
+    desde, ate = trimestre(2024, 3)
+    _, exemplo, _ = next(analises_sinteticas(1))
+    custos = {
+        rotulo: valor
+        for nome in CAMPOS_BREAKDOWN
+        for rotulo, valor in getattr(exemplo, nome).items()
+    }
+
+    def percentis_sem_cache():
+        repositorio._esbocos.clear()
+        return repositorio.percentis(exemplo.area_atuacao, exemplo.porte_empresa, custos)
+
+    consultas = {
+        "mediana do payback por área (3º tri)": lambda: repositorio.agregar(desde=desde, ate=ate),
+        "mediana do payback, uma área (3º tri)": lambda: repositorio.agregar(
+            area="area_3_controle_qualidade", desde=desde, ate=ate
+        ),
+        "ROI 5 anos por porte (3º tri)": lambda: repositorio.agregar("roi_5_anos", "porte_empresa", desde=desde, ate=ate),
+        "página 1 (área + porte)": lambda: repositorio.listar(area="area_1_linhas_montagem", porte="media"),
+        "análises de um cliente": lambda: repositorio.listar(cliente="Cliente 42"),
+        "carregar uma análise": lambda: repositorio.carregar(1),
+        "percentis dos custos (esboços lidos do arquivo)": percentis_sem_cache,
+        "percentis dos custos (esboços em memória)": lambda: repositorio.percentis(
+            exemplo.area_atuacao, exemplo.porte_empresa, custos
+        ),
+    }
+    print(f"{repositorio.contar():,} análises em {caminho}")
+    for nome, consulta in consultas.items():
+        print(f"  {nome:<48} {_medir(consulta):>9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Prévia de ROI incremental (etapas 3–5).
+
+Mantém o custo anual de cada fórmula da última avaliação e, a cada atualização, reavalia apenas
+as fórmulas cujos parâmetros mudaram. Se o cliente/processo mudou (bases comuns), tudo é
+reavaliado. Metas e investimento só reponderam os custos já conhecidos (O(18), sem fórmulas).
+
+Cada fórmula é avaliada pelo próprio `ROICalculator` com apenas aquela dor selecionada, de modo que
+a prévia segue exatamente as mesmas regras (fallbacks, campos obrigatórios) do cálculo completo.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, replace
+from typing import Dict, Optional, Tuple
+
+from core.calculator import ROICalculator
+from core.formulas import calcular_ganho_anual_total, calcular_payback
+from core.validators import CAMPOS_POR_FORMULA, formulas_selecionadas
+from models.inputs import (
+    ClienteBasicInfo,
+    DoresSelecionadas,
+    Formula,
+    InvestimentoAutomacao,
+    ParametrosDetalhados,
+    ProcessoAtual,
+)
+from models.results import MetasReducao, vetor_formulas
+
+# `calcular()` exige um investimento; o custo de uma fórmula não depende dele.
+_SEM_INVESTIMENTO = InvestimentoAutomacao(valor_investimento_min=0.0, valor_investimento_max=0.0)
+
+
+@dataclass(frozen=True)
+class PreviaROI:
+    """Indicadores exibidos no painel de prévia."""
+
+    custo_total_anual_inacao: float
+    ganho_anual_potencial: Optional[float]  # None enquanto não há metas
+    payback_anos: Optional[float]  # None enquanto não há metas/investimento
+    formulas_recalculadas: int  # fórmulas reavaliadas nesta atualização
+
+
+def _dores_unica(codigo: str) -> DoresSelecionadas:
+    return DoresSelecionadas.de_mascara(Formula[codigo])
+
+
+def custo_formula(
+    codigo: str,
+    cliente: ClienteBasicInfo,
+    processo: ProcessoAtual,
+    parametros: ParametrosDetalhados,
+) -> float:
+    """Custo anual de uma única fórmula, com as mesmas regras de `ROICalculator.calcular`."""
+    calc = ROICalculator(cliente, processo, _dores_unica(codigo), parametros, _SEM_INVESTIMENTO, MetasReducao())
+    return calc.calcular().custo_total_anual_inacao
+
+
+class PreviaIncremental:
+    """
+    Motor da prévia: guarda o custo por fórmula e a assinatura (valores dos campos) usada para obtê-lo.
+
+    Thread-safe; uma instância por sessão.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._contexto: Optional[Tuple[ClienteBasicInfo, ProcessoAtual]] = None
+        self._custos: Dict[str, float] = {}
+        self._assinaturas: Dict[str, tuple] = {}
+        self.avaliacoes = 0  # total de fórmulas avaliadas desde a criação
+
+    def atualizar(
+        self,
+        cliente: ClienteBasicInfo,
+        processo: ProcessoAtual,
+        dores: DoresSelecionadas,
+        parametros: Optional[ParametrosDetalhados],
+        metas: Optional[MetasReducao] = None,
+        investimento: Optional[InvestimentoAutomacao] = None,
+    ) -> PreviaROI:
+        parametros = parametros or ParametrosDetalhados()
+        with self._lock:
+            if self._contexto != (cliente, processo):
+                self._contexto = (replace(cliente), replace(processo))  # cópias: entradas podem ser mutadas
+                self._custos.clear()
+                self._assinaturas.clear()
+
+            selecionadas = formulas_selecionadas(dores)
+            recalculadas = 0
+            for codigo in selecionadas:
+                assinatura = tuple(getattr(parametros, c) for c in CAMPOS_POR_FORMULA.get(codigo, ()))
+                if self._assinaturas.get(codigo) != assinatura or codigo not in self._custos:
+                    self._custos[codigo] = custo_formula(codigo, cliente, processo, parametros)
+                    self._assinaturas[codigo] = assinatura
+                    recalculadas += 1
+            self.avaliacoes += recalculadas
+
+            custos = {codigo: self._custos[codigo] for codigo in selecionadas}
+
+        custo_total = sum(custos.values())
+        if metas is None:
+            return PreviaROI(custo_total, None, None, recalculadas)
+
+        ganho = calcular_ganho_anual_total(vetor_formulas(custos), metas.valores)
+        payback = calcular_payback(investimento.valor_investimento_medio, ganho) if investimento is not None else None
+        return PreviaROI(custo_total, ganho, payback, recalculadas)
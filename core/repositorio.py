@@ -0,0 +1,506 @@
+"""
+Repositório de análises concluídas (SQLite).
+
+Cada análise grava os indicadores de `ResultadosFinanceiros` em colunas, os breakdowns por fórmula
+em `custos`, as entradas (blob de `core.codec_estado`, em `entradas`) e a versão das fórmulas.
+Clientes e rótulos de fórmula ficam em tabelas próprias (um id por nome), e os índices cobrem os
+filtros usados pela gestão: área, porte, cliente e data — os três primeiros sempre combinados com
+a data, e com `payback_anos` no índice para as agregações mais comuns não lerem a tabela.
+
+Datas são gravadas em segundos desde a época (UTC); `datetime` sem fuso é interpretado como UTC.
+
+Para comparar uma análise com as semelhantes, cada (área, porte, rótulo de custo) mantém um esboço
+KLL (`core.esbocos`) em `esbocos`, atualizado na mesma transação que grava as análises: o percentil
+de um custo sai do esboço em memória constante, sem varrer `custos`.
+
+Ativado pela variável de ambiente `ROI_REPOSITORIO_SQLITE` (caminho do arquivo); sem ela,
+`obter_repositorio()` retorna None e nada é gravado.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, fields
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from config.constants import (
+    ESBOCO_CACHE_TTL_SEGUNDOS,
+    ESBOCO_MIN_AMOSTRAS,
+    REPOSITORIO_PAGINA_MAX,
+    REPOSITORIO_SQLITE_ENV,
+    VERSAO_FORMULAS,
+)
+from core.codec_estado import codificar_estado, decodificar_estado
+from core.esbocos import EsbocoKLL
+from models.results import CAMPOS_BREAKDOWN, ResultadosFinanceiros
+
+Data = Union[date, datetime]
+
+# Indicadores numéricos de `ResultadosFinanceiros`, um por coluna de `analises`
+COLUNAS_RESULTADOS: Tuple[str, ...] = tuple(
+    f.name
+    for f in fields(ResultadosFinanceiros)
+    if f.name not in CAMPOS_BREAKDOWN and f.name not in ("rastreio", "area_atuacao", "porte_empresa")
+)
+METRICAS_AGREGAVEIS = frozenset(
+    {"payback_anos", "roi_1_ano", "roi_3_anos", "roi_5_anos", "custo_total_anual_inacao", "ganho_anual_potencial",
+     "investimento_medio"}
+)
+AGRUPAMENTOS = frozenset({"area_atuacao", "porte_empresa", "versao_formulas"})
+
+_ESQUEMA = f"""
+CREATE TABLE IF NOT EXISTS clientes (
+    id INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS rotulos (
+    id INTEGER PRIMARY KEY,
+    rotulo TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS analises (
+    id INTEGER PRIMARY KEY,
+    criado_em INTEGER NOT NULL,
+    cliente_id INTEGER NOT NULL REFERENCES clientes (id),
+    nome_projeto TEXT NOT NULL,
+    area_atuacao TEXT NOT NULL,
+    porte_empresa TEXT NOT NULL,
+    versao_formulas TEXT NOT NULL,
+    {", ".join(f"{c} REAL NOT NULL" for c in COLUNAS_RESULTADOS)}
+);
+CREATE TABLE IF NOT EXISTS entradas (
+    analise_id INTEGER PRIMARY KEY REFERENCES analises (id) ON DELETE CASCADE,
+    blob BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS custos (
+    analise_id INTEGER NOT NULL REFERENCES analises (id) ON DELETE CASCADE,
+    dor INTEGER NOT NULL,
+    posicao INTEGER NOT NULL,
+    rotulo_id INTEGER NOT NULL REFERENCES rotulos (id),
+    valor REAL NOT NULL,
+    PRIMARY KEY (analise_id, dor, posicao)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS esbocos (
+    area_atuacao TEXT NOT NULL,
+    porte_empresa TEXT NOT NULL,
+    rotulo_id INTEGER NOT NULL REFERENCES rotulos (id),
+    dados BLOB NOT NULL,
+    PRIMARY KEY (area_atuacao, porte_empresa, rotulo_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_analises_data ON analises (criado_em, area_atuacao, porte_empresa, payback_anos);
+CREATE INDEX IF NOT EXISTS idx_analises_area_data ON analises (area_atuacao, criado_em, payback_anos);
+CREATE INDEX IF NOT EXISTS idx_analises_porte_data ON analises (porte_empresa, criado_em, payback_anos);
+CREATE INDEX IF NOT EXISTS idx_analises_cliente_data ON analises (cliente_id, criado_em);
+"""
+
+
+def _epoch(valor: Data) -> int:
+    if not isinstance(valor, datetime):
+        valor = datetime(valor.year, valor.month, valor.day)
+    if valor.tzinfo is None:
+        valor = valor.replace(tzinfo=timezone.utc)
+    return int(valor.timestamp())
+
+
+def trimestre(ano: int, numero: int) -> Tuple[date, date]:
+    """Início (inclusivo) e fim (exclusivo) do trimestre `numero` (1–4) de `ano`."""
+    if not 1 <= numero <= 4:
+        raise ValueError("Trimestre deve estar entre 1 e 4.")
+    inicio = date(ano, 3 * numero - 2, 1)
+    return inicio, (date(ano + 1, 1, 1) if numero == 4 else date(ano, 3 * numero + 1, 1))
+
+
+@dataclass
+class ResumoAnalise:
+    """Linha de listagem (sem entradas nem breakdowns)."""
+
+    id: int
+    criado_em: datetime
+    nome_cliente: str
+    nome_projeto: str
+    area_atuacao: str
+    porte_empresa: str
+    versao_formulas: str
+    custo_total_anual_inacao: float
+    ganho_anual_potencial: float
+    payback_anos: float
+    roi_5_anos: float
+
+
+@dataclass
+class PaginaAnalises:
+    itens: List[ResumoAnalise]
+    proximo_cursor: Optional[Tuple[int, int]]  # passe em `listar(cursor=...)`; None = última página
+
+
+@dataclass
+class AnaliseGravada:
+    resumo: ResumoAnalise
+    entradas: Dict[str, Any]
+    resultados: ResultadosFinanceiros
+
+
+@dataclass
+class Agregado:
+    quantidade: int
+    media: float
+    mediana: float
+    minimo: float
+    maximo: float
+
+
+@dataclass
+class PosicaoBenchmark:
+    """Posição de um custo entre as análises da mesma área e porte."""
+
+    percentil: float  # 0–100: fração das análises semelhantes com custo menor
+    amostras: int
+
+
+class RepositorioAnalises:
+    """
+    Repositório em arquivo SQLite (modo WAL). Uma conexão por thread.
+
+    Inserções em lote (`salvar_lote`) usam uma única transação e `executemany`; listagens são
+    paginadas por cursor (data, id) — o custo de uma página não cresce com o número de páginas.
+    """
+
+    def __init__(self, caminho: str, relogio: Callable[[], float] = time.time):
+        self.caminho = caminho
+        self._relogio = relogio
+        self._local = threading.local()
+        self._ids_clientes: Dict[str, int] = {}
+        self._ids_rotulos: Dict[str, int] = {}
+        self._lock_ids = threading.Lock()
+        self._esbocos: Dict[Tuple[str, str], Tuple[float, Dict[str, EsbocoKLL]]] = {}
+        conexao = self._conexao()
+        conexao.execute("PRAGMA journal_mode=WAL")
+        conexao.executescript(_ESQUEMA)
+        # Arquivos anteriores aos esboços: monta-os uma vez a partir dos custos gravados
+        if conexao.execute("SELECT NOT EXISTS (SELECT 1 FROM esbocos) AND EXISTS (SELECT 1 FROM custos)").fetchone()[0]:
+            self.reconstruir_esbocos()
+
+    def _conexao(self) -> sqlite3.Connection:
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is None:
+            conexao = sqlite3.connect(self.caminho, timeout=30, isolation_level=None, check_same_thread=False)
+            conexao.execute("PRAGMA synchronous=NORMAL")
+            conexao.execute("PRAGMA foreign_keys=ON")
+            self._local.conexao = conexao
+        return conexao
+
+    # --- Gravação ---
+
+    def salvar(
+        self, entradas: Mapping[str, Any], resultados: ResultadosFinanceiros, criado_em: Optional[Data] = None
+    ) -> int:
+        """Grava uma análise (entradas com as chaves de `codec_estado.MODELOS_ESTADO`); retorna o id."""
+        return self.salvar_lote([(entradas, resultados, criado_em)])[0]
+
+    def salvar_lote(
+        self, analises: Iterable[Tuple[Mapping[str, Any], ResultadosFinanceiros, Optional[Data]]]
+    ) -> List[int]:
+        """Grava várias análises em uma transação; retorna os ids na mesma ordem."""
+        analises = list(analises)
+        if not analises:
+            return []
+        agora = int(self._relogio())
+        conexao = self._conexao()
+        conexao.execute("BEGIN IMMEDIATE")
+        try:
+            ids_clientes = self._ids(conexao, "clientes", "nome", self._ids_clientes,
+                                     {e["cliente"].nome_cliente for e, _, _ in analises})
+            ids_rotulos = self._ids(conexao, "rotulos", "rotulo", self._ids_rotulos,
+                                    {r for _, res, _ in analises for b in CAMPOS_BREAKDOWN for r in getattr(res, b)})
+            # Ids explícitos (o lock da transação garante a sequência) permitem `executemany` também nos custos
+            proximo = conexao.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM analises").fetchone()[0]
+            ids = list(range(proximo, proximo + len(analises)))
+            linhas_analises, linhas_entradas, linhas_custos = [], [], []
+            novos_custos: Dict[Tuple[str, str, int], List[float]] = {}
+            for id_, (entradas, res, criado_em) in zip(ids, analises):
+                cliente = entradas["cliente"]
+                linhas_analises.append((
+                    id_,
+                    _epoch(criado_em) if criado_em is not None else agora,
+                    ids_clientes[cliente.nome_cliente],
+                    cliente.nome_projeto,
+                    res.area_atuacao,
+                    res.porte_empresa,
+                    VERSAO_FORMULAS,
+                    *(getattr(res, c) for c in COLUNAS_RESULTADOS),
+                ))
+                linhas_entradas.append((id_, codificar_estado(entradas)))
+                for dor, nome in enumerate(CAMPOS_BREAKDOWN, start=1):
+                    for posicao, (rotulo, valor) in enumerate(getattr(res, nome).items()):
+                        linhas_custos.append((id_, dor, posicao, ids_rotulos[rotulo], valor))
+                        if valor > 0:  # custo zero = dor não selecionada, fora da comparação
+                            chave = (res.area_atuacao, res.porte_empresa, ids_rotulos[rotulo])
+                            novos_custos.setdefault(chave, []).append(valor)
+            colunas = ("id", "criado_em", "cliente_id", "nome_projeto", "area_atuacao", "porte_empresa",
+                       "versao_formulas", *COLUNAS_RESULTADOS)
+            conexao.executemany(
+                f"INSERT INTO analises ({', '.join(colunas)}) VALUES ({', '.join('?' * len(colunas))})",
+                linhas_analises,
+            )
+            conexao.executemany("INSERT INTO entradas (analise_id, blob) VALUES (?, ?)", linhas_entradas)
+            conexao.executemany(
+                "INSERT INTO custos (analise_id, dor, posicao, rotulo_id, valor) VALUES (?, ?, ?, ?, ?)",
+                linhas_custos,
+            )
+            self._atualizar_esbocos(conexao, novos_custos)
+            conexao.execute("COMMIT")
+        except BaseException:
+            conexao.execute("ROLLBACK")
+            raise
+        # Só após o COMMIT: ids de uma transação desfeita não podem ficar no cache
+        with self._lock_ids:
+            self._ids_clientes.update(ids_clientes)
+            self._ids_rotulos.update(ids_rotulos)
+            for area, porte, _ in novos_custos:
+                self._esbocos.pop((area, porte), None)
+        return ids
+
+    @staticmethod
+    def _atualizar_esbocos(conexao, novos_custos: Mapping[Tuple[str, str, int], List[float]]) -> None:
+        """Acrescenta os custos aos esboços de cada (área, porte, rótulo), dentro da transação corrente."""
+        linhas = []
+        for (area, porte, rotulo_id), valores in novos_custos.items():
+            linha = conexao.execute(
+                "SELECT dados FROM esbocos WHERE area_atuacao = ? AND porte_empresa = ? AND rotulo_id = ?",
+                (area, porte, rotulo_id),
+            ).fetchone()
+            esboco = EsbocoKLL.desserializar(linha[0]) if linha else EsbocoKLL()
+            esboco.adicionar_varios(valores)
+            linhas.append((area, porte, rotulo_id, esboco.serializar()))
+        conexao.executemany(
+            "INSERT OR REPLACE INTO esbocos (area_atuacao, porte_empresa, rotulo_id, dados) VALUES (?, ?, ?, ?)",
+            linhas,
+        )
+
+    def reconstruir_esbocos(self) -> None:
+        """Refaz todos os esboços a partir de `custos` (migração de arquivos antigos)."""
+        conexao = self._conexao()
+        conexao.execute("BEGIN IMMEDIATE")
+        try:
+            esbocos: Dict[Tuple[str, str, int], EsbocoKLL] = {}
+            for area, porte, rotulo_id, valor in conexao.execute(
+                "SELECT a.area_atuacao, a.porte_empresa, cu.rotulo_id, cu.valor "
+                "FROM custos cu JOIN analises a ON a.id = cu.analise_id WHERE cu.valor > 0"
+            ):
+                esboco = esbocos.get((area, porte, rotulo_id))
+                if esboco is None:
+                    esboco = esbocos[(area, porte, rotulo_id)] = EsbocoKLL()
+                esboco.adicionar(valor)
+            conexao.execute("DELETE FROM esbocos")
+            conexao.executemany(
+                "INSERT INTO esbocos (area_atuacao, porte_empresa, rotulo_id, dados) VALUES (?, ?, ?, ?)",
+                [(*chave, esboco.serializar()) for chave, esboco in esbocos.items()],
+            )
+            conexao.execute("COMMIT")
+        except BaseException:
+            conexao.execute("ROLLBACK")
+            raise
+        with self._lock_ids:
+            self._esbocos.clear()
+
+    def _ids(self, conexao, tabela: str, coluna: str, cache: Dict[str, int], nomes: set) -> Dict[str, int]:
+        """Ids de `nomes` na tabela de dimensão (inserindo os novos, dentro da transação corrente)."""
+        with self._lock_ids:
+            ids = {n: cache[n] for n in nomes if n in cache}
+        faltando = [n for n in nomes if n not in ids]
+        if faltando:
+            conexao.executemany(f"INSERT OR IGNORE INTO {tabela} ({coluna}) VALUES (?)", [(n,) for n in faltando])
+            for inicio in range(0, len(faltando), 500):
+                lote = faltando[inicio:inicio + 500]
+                ids.update(conexao.execute(
+                    f"SELECT {coluna}, id FROM {tabela} WHERE {coluna} IN ({', '.join('?' * len(lote))})", lote
+                ))
+        return ids
+
+    # --- Consultas ---
+
+    _SELECT_RESUMO = (
+        "SELECT a.id, a.criado_em, c.nome, a.nome_projeto, a.area_atuacao, a.porte_empresa, a.versao_formulas, "
+        "a.custo_total_anual_inacao, a.ganho_anual_potencial, a.payback_anos, a.roi_5_anos "
+        "FROM analises a JOIN clientes c ON c.id = a.cliente_id"
+    )
+
+    @staticmethod
+    def _resumo(linha: Sequence[Any]) -> ResumoAnalise:
+        return ResumoAnalise(linha[0], datetime.fromtimestamp(linha[1], timezone.utc), *linha[2:])
+
+    @staticmethod
+    def _filtros(
+        area: Optional[str], porte: Optional[str], cliente: Optional[str], desde: Optional[Data], ate: Optional[Data]
+    ) -> Tuple[List[str], List[Any]]:
+        condicoes, valores = [], []
+        if area is not None:
+            condicoes.append("a.area_atuacao = ?")
+            valores.append(area)
+        if porte is not None:
+            condicoes.append("a.porte_empresa = ?")
+            valores.append(porte)
+        if cliente is not None:
+            condicoes.append("a.cliente_id = (SELECT id FROM clientes WHERE nome = ?)")
+            valores.append(cliente)
+        if desde is not None:
+            condicoes.append("a.criado_em >= ?")
+            valores.append(_epoch(desde))
+        if ate is not None:
+            condicoes.append("a.criado_em < ?")
+            valores.append(_epoch(ate))
+        return condicoes, valores
+
+    def listar(
+        self,
+        *,
+        area: Optional[str] = None,
+        porte: Optional[str] = None,
+        cliente: Optional[str] = None,
+        desde: Optional[Data] = None,
+        ate: Optional[Data] = None,
+        limite: int = 50,
+        cursor: Optional[Tuple[int, int]] = None,
+    ) -> PaginaAnalises:
+        """Análises mais recentes primeiro; `ate` é exclusivo."""
+        limite = max(1, min(limite, REPOSITORIO_PAGINA_MAX))
+        condicoes, valores = self._filtros(area, porte, cliente, desde, ate)
+        if cursor is not None:
+            condicoes.append("(a.criado_em, a.id) < (?, ?)")
+            valores.extend(cursor)
+        where = f" WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        linhas = self._conexao().execute(
+            f"{self._SELECT_RESUMO}{where} ORDER BY a.criado_em DESC, a.id DESC LIMIT ?", (*valores, limite + 1)
+        ).fetchall()
+        itens = [self._resumo(linha) for linha in linhas[:limite]]
+        proximo = (linhas[limite - 1][1], linhas[limite - 1][0]) if len(linhas) > limite else None
+        return PaginaAnalises(itens=itens, proximo_cursor=proximo)
+
+    def carregar(self, id_: int) -> Optional[AnaliseGravada]:
+        """Análise completa: entradas e `ResultadosFinanceiros` (sem rastreio)."""
+        conexao = self._conexao()
+        linha = conexao.execute(f"{self._SELECT_RESUMO} WHERE a.id = ?", (id_,)).fetchone()
+        if linha is None:
+            return None
+        resumo = self._resumo(linha)
+        indicadores = conexao.execute(
+            f"SELECT {', '.join(COLUNAS_RESULTADOS)} FROM analises WHERE id = ?", (id_,)
+        ).fetchone()
+        (entradas_blob,) = conexao.execute("SELECT blob FROM entradas WHERE analise_id = ?", (id_,)).fetchone()
+        breakdowns: Dict[str, Dict[str, float]] = {nome: {} for nome in CAMPOS_BREAKDOWN}
+        for dor, rotulo, valor in conexao.execute(
+            "SELECT cu.dor, r.rotulo, cu.valor FROM custos cu JOIN rotulos r ON r.id = cu.rotulo_id "
+            "WHERE cu.analise_id = ? ORDER BY cu.dor, cu.posicao",
+            (id_,),
+        ):
+            breakdowns[CAMPOS_BREAKDOWN[dor - 1]][rotulo] = valor
+        resultados = ResultadosFinanceiros(
+            **dict(zip(COLUNAS_RESULTADOS, indicadores)),
+            **breakdowns,
+            area_atuacao=resumo.area_atuacao,
+            porte_empresa=resumo.porte_empresa,
+        )
+        return AnaliseGravada(resumo=resumo, entradas=decodificar_estado(entradas_blob), resultados=resultados)
+
+    def contar(self, **filtros) -> int:
+        condicoes, valores = self._filtros(
+            filtros.get("area"), filtros.get("porte"), filtros.get("cliente"), filtros.get("desde"), filtros.get("ate")
+        )
+        where = f" WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        return self._conexao().execute(f"SELECT COUNT(*) FROM analises a{where}", valores).fetchone()[0]
+
+    def agregar(
+        self,
+        metrica: str = "payback_anos",
+        agrupar_por: str = "area_atuacao",
+        *,
+        area: Optional[str] = None,
+        porte: Optional[str] = None,
+        desde: Optional[Data] = None,
+        ate: Optional[Data] = None,
+    ) -> Dict[str, Agregado]:
+        """
+        Quantidade, média, mediana, mínimo e máximo de `metrica` por grupo (ex.: mediana do payback
+        por área no 3º trimestre: `agregar(desde=ini, ate=fim)` com `ini, fim = trimestre(2025, 3)`).
+        """
+        if metrica not in METRICAS_AGREGAVEIS:
+            raise ValueError(f"Métrica não agregável: {metrica}")
+        if agrupar_por not in AGRUPAMENTOS:
+            raise ValueError(f"Agrupamento não suportado: {agrupar_por}")
+        condicoes, valores = self._filtros(area, porte, None, desde, ate)
+        where = f" WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        conexao = self._conexao()
+        grupos = conexao.execute(
+            f"SELECT a.{agrupar_por}, COUNT(*), AVG(a.{metrica}), MIN(a.{metrica}), MAX(a.{metrica}) "
+            f"FROM analises a{where} GROUP BY a.{agrupar_por} ORDER BY a.{agrupar_por}",
+            valores,
+        ).fetchall()
+        # Mediana por grupo: só os 1–2 valores centrais saem do SQLite (ORDER BY + LIMIT/OFFSET no índice)
+        where_grupo = " AND ".join([*condicoes, f"a.{agrupar_por} = ?"])
+        agregados = {}
+        for grupo, n, media, minimo, maximo in grupos:
+            centrais = conexao.execute(
+                f"SELECT a.{metrica} FROM analises a WHERE {where_grupo} ORDER BY a.{metrica} LIMIT ? OFFSET ?",
+                (*valores, grupo, 2 - n % 2, (n - 1) // 2),
+            ).fetchall()
+            agregados[grupo] = Agregado(
+                quantidade=n,
+                media=media,
+                mediana=sum(v for (v,) in centrais) / len(centrais),
+                minimo=minimo,
+                maximo=maximo,
+            )
+        return agregados
+
+    def esbocos(self, area: str, porte: str) -> Dict[str, EsbocoKLL]:
+        """Esboços de custo por rótulo para (área, porte); mantidos em memória por alguns segundos."""
+        agora = self._relogio()
+        with self._lock_ids:
+            em_cache = self._esbocos.get((area, porte))
+        if em_cache is not None and agora - em_cache[0] < ESBOCO_CACHE_TTL_SEGUNDOS:
+            return em_cache[1]
+        esbocos = {
+            rotulo: EsbocoKLL.desserializar(dados)
+            for rotulo, dados in self._conexao().execute(
+                "SELECT r.rotulo, e.dados FROM esbocos e JOIN rotulos r ON r.id = e.rotulo_id "
+                "WHERE e.area_atuacao = ? AND e.porte_empresa = ?",
+                (area, porte),
+            )
+        }
+        with self._lock_ids:
+            self._esbocos[(area, porte)] = (agora, esbocos)
+        return esbocos
+
+    def percentis(
+        self, area: str, porte: str, custos: Mapping[str, float], minimo_amostras: int = ESBOCO_MIN_AMOSTRAS
+    ) -> Dict[str, PosicaoBenchmark]:
+        """
+        Percentil de cada custo (rótulo → valor) entre as análises gravadas da mesma área e porte.
+        Rótulos com custo zero ou com menos de `minimo_amostras` análises semelhantes ficam de fora.
+        """
+        esbocos = self.esbocos(area, porte)
+        posicoes = {}
+        for rotulo, valor in custos.items():
+            esboco = esbocos.get(rotulo)
+            if valor > 0 and esboco is not None and esboco.n >= minimo_amostras:
+                posicoes[rotulo] = PosicaoBenchmark(percentil=100 * esboco.posto(valor), amostras=esboco.n)
+        return posicoes
+
+
+_repositorio: Optional[RepositorioAnalises] = None
+_repositorio_lock = threading.Lock()
+
+
+def obter_repositorio() -> Optional[RepositorioAnalises]:
+    """Repositório configurado por `ROI_REPOSITORIO_SQLITE`, ou None (análises não são gravadas)."""
+    global _repositorio
+    caminho = os.environ.get(REPOSITORIO_SQLITE_ENV)
+    if not caminho:
+        return None
+    with _repositorio_lock:
+        if _repositorio is None:
+            _repositorio = RepositorioAnalises(caminho)
+        return _repositorio
@@ -0,0 +1,90 @@
+"""
+Instantâneos de sessão no armazenamento compartilhado.
+
+O `st.session_state` vive no processo da réplica. Para que uma sessão sobreviva ao reinício ou à
+troca de réplica, o app identifica a sessão por um token na URL (`?sessao=...`) e grava um
+instantâneo do estado persistível ao navegar entre etapas ou quando as entradas mudam; uma réplica
+que recebe o token sem estado local restaura o instantâneo (entradas do wizard + valores dos widgets).
+
+Ficam de fora objetos vivos ou deriváveis: o deck PPTX (no depósito da réplica), jobs, motor da
+prévia e resultados (recalculados a partir das entradas — e normalmente já presentes no cache
+compartilhado).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import pickle
+import secrets
+from dataclasses import is_dataclass
+from typing import Any, Dict, Mapping, Optional
+
+from config.constants import SESSAO_TTL_SEGUNDOS
+from core.armazenamento import Armazenamento
+
+NAMESPACE_SESSOES = "sessao"
+
+CHAVES_NAO_PERSISTIDAS = frozenset({
+    "resultados",
+    "pptx_buffer",
+    "pptx_buffer_chave",
+    "pptx_job_id",
+    "pptx_especulativo",
+    "previa_motor",
+    "parametros_em_render",
+    "sessao_token",
+    "sessao_digest",
+    "sessao_entradas_salvas",
+    "sessao_id",
+})
+# Botões não aceitam valor atribuído via session_state
+PREFIXOS_NAO_PERSISTIDOS = ("voltar_", "proximo_", "cancelar_")
+
+
+def _persistivel(valor: Any) -> bool:
+    if valor is None or isinstance(valor, (bool, int, float, str)):
+        return True
+    if isinstance(valor, (list, tuple)):
+        return all(_persistivel(v) for v in valor)
+    if isinstance(valor, dict):
+        return all(isinstance(k, str) and _persistivel(v) for k, v in valor.items())
+    return is_dataclass(valor) and type(valor).__module__.startswith("models.")
+
+
+def instantaneo(estado: Mapping[str, Any]) -> Dict[str, Any]:
+    """Subconjunto persistível do estado da sessão."""
+    return {
+        chave: valor
+        for chave, valor in estado.items()
+        if chave not in CHAVES_NAO_PERSISTIDAS
+        and not chave.startswith(PREFIXOS_NAO_PERSISTIDOS)
+        and _persistivel(valor)
+    }
+
+
+def novo_token() -> str:
+    return secrets.token_urlsafe(16)
+
+
+def salvar_sessao(
+    armazenamento: Armazenamento,
+    token: str,
+    estado: Mapping[str, Any],
+    digest_anterior: Optional[str] = None,
+) -> str:
+    """
+    Grava o instantâneo da sessão se ele mudou desde `digest_anterior`.
+
+    Retorna o digest do instantâneo atual (o chamador guarda para a próxima comparação).
+    """
+    serializado = pickle.dumps(dict(sorted(instantaneo(estado).items())))
+    digest = hashlib.blake2b(serializado, digest_size=16).hexdigest()
+    if digest != digest_anterior:
+        armazenamento.definir(NAMESPACE_SESSOES, token, serializado, SESSAO_TTL_SEGUNDOS)
+    return digest
+
+
+def restaurar_sessao(armazenamento: Armazenamento, token: str) -> Optional[Dict[str, Any]]:
+    """Instantâneo gravado para `token`, ou None se não existir/expirou."""
+    serializado = armazenamento.obter(NAMESPACE_SESSOES, token)
+    return pickle.loads(serializado) if serializado is not None else None
@@ -3,10 +3,22 @@ Validações de input do usuário.
 """
 from __future__ import annotations
 
-from typing import List
+from dataclasses import fields
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union, get_args, get_type_hints
 
+from config.areas import AREAS_ARV
+from config.benchmarks import REGIOES
 from config.constants import FATOR_ENCARGOS_COMPLETO, FATOR_ENCARGOS_CONSERVADOR, FATOR_ENCARGOS_MEDIO
-from models.inputs import ClienteBasicInfo, DoresSelecionadas, InvestimentoAutomacao, ParametrosDetalhados, ProcessoAtual
+from models.inputs import (
+    ClienteBasicInfo,
+    DoresSelecionadas,
+    Formula,
+    InvestimentoAutomacao,
+    ParametrosDetalhados,
+    ProcessoAtual,
+)
+from models.results import CODIGOS_FORMULAS, MetasReducao
 
 
 def validar_cliente(cliente: ClienteBasicInfo) -> List[str]:
@@ -21,6 +33,8 @@ def validar_cliente(cliente: ClienteBasicInfo) -> List[str]:
 
     if not (cliente.area_atuacao or "").strip():
         erros.append("Área de atuação é obrigatória.")
+    elif cliente.area_atuacao not in AREAS_ARV:
+        erros.append(f"Área de atuação deve ser uma de: {', '.join(AREAS_ARV)}.")
 
     if cliente.porte_empresa not in {"pequena", "media", "grande"}:
         erros.append("Porte da empresa deve ser: pequena, média ou grande.")
@@ -28,6 +42,9 @@ def validar_cliente(cliente: ClienteBasicInfo) -> List[str]:
     if cliente.fator_encargos not in {FATOR_ENCARGOS_CONSERVADOR, FATOR_ENCARGOS_MEDIO, FATOR_ENCARGOS_COMPLETO}:
         erros.append("Fator de encargos deve ser 1,7 / 1,85 / 2,0.")
 
+    if cliente.regiao not in REGIOES:
+        erros.append(f"Região deve ser uma de: {', '.join(REGIOES)}.")
+
     return erros
 
 
@@ -81,12 +98,77 @@ def validar_investimento(investimento: InvestimentoAutomacao) -> List[str]:
     return erros
 
 
+def validar_metas(metas: MetasReducao) -> List[str]:
+    """Metas de redução são frações entre 0 e 1 (0% a 100%). Retorna lista de erros."""
+    return [
+        f"Meta de {codigo} deve estar entre 0% e 100%."
+        for codigo, valor in zip(CODIGOS_FORMULAS, metas.valores)
+        if not 0.0 <= valor <= 1.0
+    ]
+
+
+_TIPOS_ACEITOS = {float: (int, float), int: (int, float), bool: (bool,), str: (str,), type(None): (type(None),)}
+
+
+@lru_cache(maxsize=None)
+def _tipos_por_campo(modelo: type) -> Dict[str, Tuple[type, ...]]:
+    """Tipos aceitos por campo, das anotações do dataclass (números: int ou float; Optional: também None)."""
+    tipos = {}
+    for nome, anotacao in get_type_hints(modelo).items():
+        aceitos = [t for arg in (get_args(anotacao) or (anotacao,)) for t in _TIPOS_ACEITOS.get(arg, ())]
+        if aceitos:
+            tipos[nome] = tuple(aceitos)
+    return tipos
+
+
+def campos_com_tipo_invalido(modelo: type, valores: Mapping[str, Any]) -> List[str]:
+    """Campos de `valores` cujo tipo não confere com a anotação em `modelo` (bool não vale como número)."""
+    tipos = _tipos_por_campo(modelo)
+    return [
+        nome
+        for nome, valor in valores.items()
+        if nome in tipos and not (bool in tipos[nome] if isinstance(valor, bool) else isinstance(valor, tipos[nome]))
+    ]
+
+
+def _campos_por_formula() -> Dict[str, Tuple[str, ...]]:
+    """Agrupa os campos de `ParametrosDetalhados` pelo prefixo do nome ("f02_..." -> "F02")."""
+    campos: Dict[str, List[str]] = {}
+    for campo in fields(ParametrosDetalhados):
+        campos.setdefault(campo.name[:3].upper(), []).append(campo.name)
+    return {codigo: tuple(nomes) for codigo, nomes in campos.items()}
+
+
+CAMPOS_POR_FORMULA = _campos_por_formula()
+
+
+def formulas_selecionadas(dores: Union[DoresSelecionadas, Formula, int]) -> List[str]:
+    """Códigos (F01–F18) das fórmulas marcadas, na ordem do modelo (aceita também a máscara)."""
+    mascara = dores.mascara if isinstance(dores, DoresSelecionadas) else Formula(dores)
+    return mascara.codigos
+
+
 def validar_parametros_detalhados(
     params: ParametrosDetalhados,
     dores: DoresSelecionadas,
     processo: ProcessoAtual,
+    formulas: Optional[Iterable[str]] = None,
 ) -> List[str]:
-    """Valida parâmetros detalhados (V2.0), de forma condicional às fórmulas selecionadas."""
+    """
+    Valida parâmetros detalhados (V2.0), de forma condicional às fórmulas selecionadas.
+
+    `formulas` restringe a validação a um subconjunto (ex.: apenas as fórmulas cujos campos mudaram).
+    """
+    restringir = None if formulas is None else set(formulas)
+    erros: List[str] = []
+    for codigo in formulas_selecionadas(dores):
+        if restringir is None or codigo in restringir:
+            erros.extend(validar_parametros_formula(codigo, params, processo))
+    return erros
+
+
+def validar_parametros_formula(codigo: str, params: ParametrosDetalhados, processo: ProcessoAtual) -> List[str]:
+    """Valida os parâmetros de uma única fórmula (ex.: "F10"). Fórmulas sem parâmetros retornam `[]`."""
 
     erros: List[str] = []
 
@@ -117,12 +199,12 @@ def validar_parametros_detalhados(
             erros.append(f"{rotulo} deve estar entre 0% e 100%.")
 
     # F02
-    if dores.f02_horas_extras:
+    if codigo == "F02":
         _req("f02_media_he_mes_por_pessoa", "F02: Média de horas extras por mês por pessoa")
         _nonneg("f02_media_he_mes_por_pessoa", "F02: Média de horas extras por mês por pessoa")
 
     # F03
-    if dores.f03_curva_aprendizagem:
+    if codigo == "F03":
         _req("f03_novas_contratacoes_ano", "F03: Novas contratações por ano")
         _req("f03_salario_novato", "F03: Salário do novato")
         _req("f03_meses_curva", "F03: Meses de curva de aprendizagem")
@@ -135,13 +217,13 @@ def validar_parametros_detalhados(
         _nonneg("f03_salario_supervisor", "F03: Salário do supervisor")
 
     # F04
-    if dores.f04_turnover:
+    if codigo == "F04":
         _req("f04_desligamentos_ano", "F04: Desligamentos por ano")
         _nonneg("f04_desligamentos_ano", "F04: Desligamentos por ano")
         _nonneg("f04_fator_custo_turnover", "F04: Fator de custo de turnover")
 
     # F05
-    if dores.f05_refugo_retrabalho:
+    if codigo == "F05":
         _req("f05_percentual_refugo", "F05: Percentual de refugo")
         _req("f05_percentual_retrabalho", "F05: Percentual de retrabalho")
         _req("f05_horas_retrabalho_por_unidade", "F05: Horas de retrabalho por unidade")
@@ -152,14 +234,14 @@ def validar_parametros_detalhados(
         _nonneg("f05_horas_retrabalho_por_unidade", "F05: Horas de retrabalho por unidade")
 
     # F07
-    if dores.f07_escapes_qualidade:
+    if codigo == "F07":
         _req("f07_reclamacoes_clientes_ano", "F07: Reclamações de clientes por ano")
         _req("f07_custo_medio_por_reclamacao", "F07: Custo médio por reclamação")
         _nonneg("f07_reclamacoes_clientes_ano", "F07: Reclamações de clientes por ano")
         _nonneg("f07_custo_medio_por_reclamacao", "F07: Custo médio por reclamação")
 
     # F08
-    if dores.f08_custo_oportunidade:
+    if codigo == "F08":
         _req("f08_percentual_demanda_reprimida", "F08: Percentual de demanda reprimida")
         _req("f08_margem_contribuicao", "F08: Margem de contribuição")
         _normalize_fraction("f08_percentual_demanda_reprimida")
@@ -170,12 +252,12 @@ def validar_parametros_detalhados(
             erros.append("F08: Informe o faturamento mensal da linha (senão a fórmula fica zerada).")
 
     # F09
-    if dores.f09_ociosidade_silenciosa:
+    if codigo == "F09":
         _req("f09_minutos_ociosos_por_dia", "F09: Minutos ociosos por dia")
         _nonneg("f09_minutos_ociosos_por_dia", "F09: Minutos ociosos por dia")
 
     # F10
-    if dores.f10_paradas_linha:
+    if codigo == "F10":
         _req("f10_paradas_mes", "F10: Paradas por mês")
         _req("f10_duracao_media_parada_horas", "F10: Duração média da parada (h)")
         _nonneg("f10_paradas_mes", "F10: Paradas por mês")
@@ -185,7 +267,7 @@ def validar_parametros_detalhados(
             erros.append("F10: Informe faturamento mensal da linha ou preencha um Custo hora parada (> 0).")
 
     # F11
-    if dores.f11_setup_changeover:
+    if codigo == "F11":
         _req("f11_setups_mes", "F11: Setups por mês")
         _req("f11_horas_por_setup", "F11: Horas por setup")
         _nonneg("f11_setups_mes", "F11: Setups por mês")
@@ -195,7 +277,7 @@ def validar_parametros_detalhados(
             erros.append("F11: Informe faturamento mensal da linha ou preencha um Custo hora parada (> 0).")
 
     # F12
-    if dores.f12_riscos_acidentes:
+    if codigo == "F12":
         _req("f12_afastamentos_ano", "F12: Afastamentos por ano")
         _req("f12_custo_medio_afastamento", "F12: Custo médio por afastamento")
         _req("f12_acidentes_com_lesao_ano", "F12: Acidentes com lesão por ano")
@@ -211,7 +293,7 @@ def validar_parametros_detalhados(
         _nonneg("f12_custo_estimado_processo", "F12: Custo estimado do processo")
 
     # F13
-    if dores.f13_frota_empilhadeiras:
+    if codigo == "F13":
         _req("f13_num_empilhadeiras", "F13: Número de empilhadeiras")
         _req("f13_custo_operador_mes", "F13: Custo operador/mês")
         _req("f13_custo_equipamento_mes", "F13: Custo equipamento/mês")
@@ -224,26 +306,26 @@ def validar_parametros_detalhados(
         _nonneg("f13_custo_manutencao_mes", "F13: Custo manutenção/mês")
 
     # F14 — 0 supervisores é válido (F14 = R$0 nesse cenário)
-    if dores.f14_supervisao:
+    if codigo == "F14":
         _nonneg("f14_num_supervisores", "F14: Número de supervisores")
         _nonneg("f14_salario_supervisor", "F14: Salário do supervisor (se informado)")
 
     # F15
-    if dores.f15_compliance_epis:
+    if codigo == "F15":
         _req("f15_custo_epi_ano_por_pessoa", "F15: Custo de EPI/ano por pessoa")
         _req("f15_custo_exames_ano_por_pessoa", "F15: Custo de exames/ano por pessoa")
         _nonneg("f15_custo_epi_ano_por_pessoa", "F15: Custo de EPI/ano por pessoa")
         _nonneg("f15_custo_exames_ano_por_pessoa", "F15: Custo de exames/ano por pessoa")
 
     # F16
-    if dores.f16_energia_utilidades:
+    if codigo == "F16":
         _req("f16_area_operacao_m2", "F16: Área de operação (m²)")
         _req("f16_custo_energia_m2_ano", "F16: Custo energia por m²/ano")
         _nonneg("f16_area_operacao_m2", "F16: Área de operação (m²)")
         _nonneg("f16_custo_energia_m2_ano", "F16: Custo energia por m²/ano")
 
     # F17
-    if dores.f17_espaco_fisico:
+    if codigo == "F17":
         _req("f17_area_m2", "F17: Área (m²)")
         _req("f17_custo_m2_ano", "F17: Custo m²/ano")
         _req("f17_percentual_reducao_automacao", "F17: Percentual de redução com automação")
@@ -253,7 +335,7 @@ def validar_parametros_detalhados(
         _fraction("f17_percentual_reducao_automacao", "F17: Percentual de redução com automação")
 
     # F18
-    if dores.f18_gestao_dados:
+    if codigo == "F18":
         _req("f18_pessoas_envolvidas", "F18: Pessoas envolvidas")
         _req("f18_horas_dia_tarefas_dados", "F18: Horas/dia em tarefas de dados")
         _nonneg("f18_pessoas_envolvidas", "F18: Pessoas envolvidas")
@@ -0,0 +1,170 @@
+"""
+Execução de exportações em segundo plano (pool de threads limitado).
+
+Cada exportação vira um job com ID; a UI consulta status/progresso a cada rerun
+e pode pedir cancelamento. Um rerun do Streamlit nunca reinicia um job em andamento:
+jobs ativos com a mesma chave de entradas são reaproveitados — inclusive entre sessões.
+Por isso cada job conta seus inscritos (as sessões que o aguardam): `cancelar` retira um
+inscrito e só interrompe o job quando não resta nenhum.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Set
+
+from config.constants import EXPORT_MAX_JOBS_RETIDOS, EXPORT_MAX_WORKERS
+
+PENDENTE = "pendente"
+EXECUTANDO = "executando"
+CONCLUIDO = "concluido"
+CANCELADO = "cancelado"
+ERRO = "erro"
+
+STATUS_FINAIS = {CONCLUIDO, CANCELADO, ERRO}
+
+
+class JobCancelado(Exception):
+    """Levantada dentro do worker quando o cancelamento foi solicitado."""
+
+
+@dataclass
+class JobExportacao:
+    """Estado de um job de exportação (lido pela UI, escrito pelo worker)."""
+
+    id: str
+    chave: str
+    status: str = PENDENTE
+    etapas_concluidas: int = 0
+    total_etapas: int = 0
+    resultado: Optional[bytes] = None
+    erro: Optional[str] = None
+    criado_em: float = field(default_factory=time.time)
+    inscritos: Set[str] = field(default_factory=set, repr=False)  # sessões que aguardam o resultado
+    _cancelar: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def progresso(self) -> float:
+        """Fração concluída (0–1)."""
+        if self.status == CONCLUIDO:
+            return 1.0
+        return (self.etapas_concluidas / self.total_etapas) if self.total_etapas else 0.0
+
+    @property
+    def finalizado(self) -> bool:
+        return self.status in STATUS_FINAIS
+
+
+class ControleJob:
+    """Canal do worker para reportar progresso; interrompe a execução se o job foi cancelado."""
+
+    def __init__(self, job: JobExportacao):
+        self._job = job
+
+    def reportar(self, concluidas: int, total: int) -> None:
+        self.verificar_cancelamento()
+        self._job.etapas_concluidas = concluidas
+        self._job.total_etapas = total
+
+    def verificar_cancelamento(self) -> None:
+        if self._job._cancelar.is_set():
+            raise JobCancelado()
+
+
+class GerenciadorExportacao:
+    """Pool limitado de workers + registro de jobs por ID."""
+
+    def __init__(self, max_workers: int = EXPORT_MAX_WORKERS, max_jobs_retidos: int = EXPORT_MAX_JOBS_RETIDOS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export")
+        self._max_jobs_retidos = max_jobs_retidos
+        self._jobs: OrderedDict[str, JobExportacao] = OrderedDict()
+        self._ativos_por_chave: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def submeter(self, chave: str, tarefa: Callable[[ControleJob], bytes], inscrito: Optional[str] = None) -> str:
+        """
+        Enfileira `tarefa(controle)` e retorna o ID do job, com `inscrito` (ex.: ID da sessão) entre os
+        que o aguardam; sem `inscrito`, cada chamada conta como um inscrito anônimo.
+
+        Se já houver um job ativo para `chave`, inscreve e retorna o ID existente em vez de criar outro.
+        """
+        inscrito = inscrito or uuid.uuid4().hex
+        with self._lock:
+            job_id = self._ativos_por_chave.get(chave)
+            if job_id is not None:
+                self._jobs[job_id].inscritos.add(inscrito)
+                return job_id
+
+            job = JobExportacao(id=uuid.uuid4().hex, chave=chave, inscritos={inscrito})
+            self._jobs[job.id] = job
+            self._ativos_por_chave[chave] = job.id
+            self._podar()
+
+        self._executor.submit(self._executar, job, tarefa)
+        return job.id
+
+    def obter(self, job_id: str) -> Optional[JobExportacao]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancelar(self, job_id: str, inscrito: Optional[str] = None) -> bool:
+        """
+        Retira `inscrito` do job; sem inscritos restantes (ou sem `inscrito`: cancelamento forçado),
+        solicita o cancelamento — um job pendente termina já, um em execução na próxima etapa.
+
+        Retorna True se o cancelamento foi solicitado.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finalizado:
+                return False
+            if inscrito is not None:
+                job.inscritos.discard(inscrito)
+                if job.inscritos:
+                    return False
+            job._cancelar.set()
+            if job.status == PENDENTE:  # o worker só passa a EXECUTANDO com o lock
+                self._finalizar_com_lock(job, CANCELADO)
+            return True
+
+    def _executar(self, job: JobExportacao, tarefa: Callable[[ControleJob], bytes]) -> None:
+        with self._lock:
+            if job._cancelar.is_set():
+                return
+            job.status = EXECUTANDO
+        try:
+            resultado = tarefa(ControleJob(job))
+        except JobCancelado:
+            self._finalizar(job, CANCELADO)
+        except Exception as e:  # noqa: BLE001 — o erro é exibido na UI
+            job.erro = str(e)
+            self._finalizar(job, ERRO)
+        else:
+            job.resultado = resultado
+            self._finalizar(job, CONCLUIDO)
+
+    def _finalizar(self, job: JobExportacao, status: str) -> None:
+        with self._lock:
+            self._finalizar_com_lock(job, status)
+
+    def _finalizar_com_lock(self, job: JobExportacao, status: str) -> None:
+        job.status = status
+        if self._ativos_por_chave.get(job.chave) == job.id:
+            del self._ativos_por_chave[job.chave]
+
+    def _podar(self) -> None:
+        """Remove os jobs finalizados mais antigos acima do limite de retenção (chamado com lock)."""
+        excedente = len(self._jobs) - self._max_jobs_retidos
+        if excedente <= 0:
+            return
+        for job_id in [j.id for j in self._jobs.values() if j.finalizado][:excedente]:
+            del self._jobs[job_id]
+
+
+# Instância do processo — compartilhada por todas as sessões do Streamlit.
+GERENCIADOR = GerenciadorExportacao()
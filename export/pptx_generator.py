@@ -3,12 +3,18 @@ Gerador de apresentação PPTX customizada (16 slides).
 Cria a apresentação programaticamente com python-pptx.
 """
 import io
+from dataclasses import dataclass
 from datetime import datetime
+from xml.sax.saxutils import escape
 
 from pptx import Presentation
 from pptx.util import Inches, Pt, Emu
+from pptx.chart.data import XyChartData
+from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION
 from pptx.dml.color import RGBColor
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
 
 from models.inputs import (
     ClienteBasicInfo,
@@ -17,10 +23,15 @@ from models.inputs import (
     InvestimentoAutomacao,
     ParametrosDetalhados,
 )
+from models.calculations import PassoCalculo, RastreioCalculo
 from models.results import ResultadosFinanceiros, MetasReducao
 from config.areas import AREAS_ARV
+from export.jobs import ControleJob
 from config.constants import DIAS_OPERACAO_MES_DEFAULT, HORAS_MES_CLT, HORAS_MES_CUSTO_PRODUCAO
 from core.formulas import calcular_faturamento_mensal, calcular_horas_operacao_mes
+from core.atribuicao import atribuicao_shapley
+from core.intervalos import indicadores_faixa
+from core.mapa_equilibrio import mapa_equilibrio as calcular_mapa_equilibrio
 
 # Paleta de cores
 AZUL_ESCURO = RGBColor(0x1F, 0x4E, 0x79)
@@ -37,6 +48,28 @@ SLIDE_WIDTH = Inches(13.333)
 SLIDE_HEIGHT = Inches(7.5)
 
 
+@dataclass(frozen=True)
+class EstiloTabela:
+    """Especificação de estilo aplicada a uma tabela inteira (cabeçalho, corpo e linha de destaque)."""
+
+    tamanho_fonte: int = 11  # pt — cabeçalho
+    tamanho_fonte_corpo: int = 11  # pt — linhas de dados
+    tamanho_fonte_destaque: int = 11  # pt — linha TOTAL
+    destacar_ultima_linha: bool = False  # fundo azul + negrito na última linha
+
+
+def _estilo_celula_xml(tamanho_pt: int, negrito: bool, cor_texto: RGBColor, cor_fundo: RGBColor) -> tuple[str, str]:
+    """Retorna (`<a:rPr>`, `<a:tcPr>`) serializados, compartilhados por todas as células do mesmo tipo."""
+    b = ' b="1"' if negrito else ' b="0"'
+    run_props = (
+        f'<a:rPr lang="pt-BR" sz="{tamanho_pt * 100}"{b} dirty="0">'
+        f'<a:solidFill><a:srgbClr val="{cor_texto}"/></a:solidFill>'
+        f'<a:latin typeface="Calibri"/></a:rPr>'
+    )
+    cell_props = f'<a:tcPr><a:solidFill><a:srgbClr val="{cor_fundo}"/></a:solidFill></a:tcPr>'
+    return run_props, cell_props
+
+
 class PPTXGenerator:
     """Gerador de apresentação PPTX customizada."""
 
@@ -54,28 +87,56 @@ class PPTXGenerator:
         metas: MetasReducao,
         investimento: InvestimentoAutomacao,
         parametros: ParametrosDetalhados = None,
+        controle: ControleJob | None = None,
+        mapa_equilibrio: dict | None = None,
     ) -> io.BytesIO:
-        """Gera PPTX completo e retorna como BytesIO."""
-        self._slide_01_capa(cliente)
-        self._slide_02_agenda()
-        self._slide_03_contexto(cliente)
-        self._slide_04_processo_atual(processo, parametros)
-        self._slide_05_dados_operacionais(processo, cliente)
-        self._slide_06_analise_estrategica(dores)
-        self._slide_07_cenario_critico(resultados)
-        self._slide_08_custos_operacionais(resultados)  # Dor 1
-        self._slide_09_custos_qualidade(resultados)  # Dor 2
-        self._slide_10_custos_seguranca(resultados)  # Dor 3
-        self._slide_11_custos_produtividade(resultados)  # Dor 4
-        self._slide_12_custos_ocultos(resultados)  # Dor 5
-        self._slide_13_consolidacao(resultados)
-        if parametros is not None:
-            self._slides_detalhamento_calculos(resultados, processo, parametros)
-        self._slide_13_escopo_tecnico()
-        self._slide_14_investimento(investimento)
-        self._slide_15_viabilidade(resultados, investimento)
-        self._slide_16_proximas_etapas()
+        """
+        Gera PPTX completo e retorna como BytesIO.
+
+        `mapa_equilibrio` (`{"eixo_x": (campo, mín., máx.), "eixo_y": ...}`, ver
+        `core.mapa_equilibrio`) adiciona, após a viabilidade, o slide com as curvas de payback.
 
+        Com `controle`, reporta o progresso a cada slide (ou grupo de slides de detalhamento)
+        e interrompe com `JobCancelado` se o cancelamento tiver sido solicitado.
+        """
+        etapas = [
+            lambda: self._slide_01_capa(cliente),
+            self._slide_02_agenda,
+            lambda: self._slide_03_contexto(cliente),
+            lambda: self._slide_04_processo_atual(processo, parametros),
+            lambda: self._slide_05_dados_operacionais(processo, cliente),
+            lambda: self._slide_06_analise_estrategica(dores),
+            lambda: self._slide_07_cenario_critico(resultados),
+            lambda: self._slide_08_custos_operacionais(resultados),  # Dor 1
+            lambda: self._slide_09_custos_qualidade(resultados),  # Dor 2
+            lambda: self._slide_10_custos_seguranca(resultados),  # Dor 3
+            lambda: self._slide_11_custos_produtividade(resultados),  # Dor 4
+            lambda: self._slide_12_custos_ocultos(resultados),  # Dor 5
+            lambda: self._slide_13_consolidacao(resultados, metas, investimento),
+        ]
+        if resultados.rastreio is not None:
+            etapas.append(lambda: self._slides_detalhamento_calculos(resultados.rastreio))
+        etapas += [
+            self._slide_13_escopo_tecnico,
+            lambda: self._slide_14_investimento(investimento),
+            lambda: self._slide_15_viabilidade(resultados, investimento),
+        ]
+        if mapa_equilibrio is not None and parametros is not None:
+            entradas = dict(
+                cliente=cliente, processo=processo, dores=dores,
+                parametros=parametros, investimento=investimento, metas=metas,
+            )
+            etapas.append(lambda: self._slide_mapa_equilibrio(entradas, mapa_equilibrio))
+        etapas.append(self._slide_16_proximas_etapas)
+
+        total = len(etapas) + 1  # + serialização
+        for i, etapa in enumerate(etapas):
+            if controle is not None:
+                controle.reportar(i, total)
+            etapa()
+
+        if controle is not None:
+            controle.reportar(len(etapas), total)
         buffer = io.BytesIO()
         self.prs.save(buffer)
         buffer.seek(0)
@@ -155,8 +216,16 @@ class PPTXGenerator:
         )
 
     def _add_table(self, slide, left, top, width, height, rows, cols,
-                   data, col_widths=None):
-        """Adiciona tabela ao slide."""
+                   data, col_widths=None, estilo=None):
+        """
+        Adiciona tabela ao slide.
+
+        O conteúdo é emitido em uma única passada: as linhas `<a:tr>` são montadas
+        como XML (com `<a:rPr>`/`<a:tcPr>` compartilhados por tipo de linha) e
+        substituem as linhas vazias criadas pelo python-pptx. Evita milhares de
+        atribuições célula a célula em tabelas de detalhamento grandes.
+        """
+        estilo = estilo or EstiloTabela()
         table_shape = slide.shapes.add_table(rows, cols, left, top, width, height)
         table = table_shape.table
 
@@ -164,32 +233,45 @@ class PPTXGenerator:
             for i, w in enumerate(col_widths):
                 table.columns[i].width = w
 
+        tbl = table._tbl
+        alturas = [tr.get("h") for tr in tbl.tr_lst]
+        for tr in tbl.tr_lst:
+            tbl.remove(tr)
+
+        ultima = rows - 1 if estilo.destacar_ultima_linha else -1
+        corpo_par = _estilo_celula_xml(estilo.tamanho_fonte_corpo, False, CINZA_ESCURO, RGBColor(0xF2, 0xF2, 0xF2))
+        corpo_impar = _estilo_celula_xml(estilo.tamanho_fonte_corpo, False, CINZA_ESCURO, BRANCO)
+        cabecalho = _estilo_celula_xml(estilo.tamanho_fonte, True, BRANCO, AZUL_ESCURO)
+        destaque = _estilo_celula_xml(estilo.tamanho_fonte_destaque, True, BRANCO, AZUL_ESCURO)
+
+        partes = [f"<a:tbl {nsdecls('a')}>"]
         for r in range(rows):
+            if r == 0:
+                run_props, cell_props = cabecalho
+            elif r == ultima:
+                run_props, cell_props = destaque
+            else:
+                run_props, cell_props = corpo_par if r % 2 == 0 else corpo_impar
+            partes.append(f'<a:tr h="{alturas[r]}">')
             for c in range(cols):
-                cell = table.cell(r, c)
-                cell.text = str(data[r][c])
-                for paragraph in cell.text_frame.paragraphs:
-                    paragraph.font.size = Pt(11)
-                    paragraph.font.name = "Calibri"
-                    if r == 0:
-                        paragraph.font.bold = True
-                        paragraph.font.color.rgb = BRANCO
-                        paragraph.alignment = PP_ALIGN.CENTER
-                    else:
-                        paragraph.font.color.rgb = CINZA_ESCURO
-                        if c > 0:
-                            paragraph.alignment = PP_ALIGN.RIGHT
-
-                # Header row styling
                 if r == 0:
-                    cell.fill.solid()
-                    cell.fill.fore_color.rgb = AZUL_ESCURO
+                    algn = ' algn="ctr"'
+                elif c > 0:
+                    algn = ' algn="r"'
                 else:
-                    cell.fill.solid()
-                    cell.fill.fore_color.rgb = (
-                        RGBColor(0xF2, 0xF2, 0xF2) if r % 2 == 0
-                        else BRANCO
-                    )
+                    algn = ""
+                partes.append("<a:tc><a:txBody><a:bodyPr/><a:lstStyle/>")
+                for linha in str(data[r][c]).split("\n"):
+                    partes.append(f"<a:p><a:pPr{algn}/>")
+                    if linha:
+                        partes.append(f"<a:r>{run_props}<a:t>{escape(linha)}</a:t></a:r>")
+                    partes.append("</a:p>")
+                partes.append(f"</a:txBody>{cell_props}</a:tc>")
+            partes.append("</a:tr>")
+        partes.append("</a:tbl>")
+
+        for tr in list(parse_xml("".join(partes))):
+            tbl.append(tr)
 
         return table
 
@@ -201,6 +283,10 @@ class PPTXGenerator:
         """Formata percentual."""
         return f"{valor:.1f}%"
 
+    def _fmt_anos(self, anos: float) -> str:
+        """Formata prazo em anos (payback sem ganho → N/A)."""
+        return f"{anos:.1f} anos" if anos != float("inf") else "N/A"
+
     # =========================================================================
     # Slides
     # =========================================================================
@@ -557,22 +643,13 @@ class PPTXGenerator:
         rows_data.append(["TOTAL", self._fmt(total)])
 
         n_rows = len(rows_data)
-        table = self._add_table(
+        self._add_table(
             slide, Inches(2), Inches(1.8), Inches(9), Inches(0.5 * n_rows + 0.3),
             n_rows, 2, rows_data,
             col_widths=[Inches(5.5), Inches(3.5)],
+            estilo=EstiloTabela(destacar_ultima_linha=True),  # linha total
         )
 
-        # Destacar linha total
-        last_row = n_rows - 1
-        for c in range(2):
-            cell = table.cell(last_row, c)
-            cell.fill.solid()
-            cell.fill.fore_color.rgb = AZUL_ESCURO
-            for p in cell.text_frame.paragraphs:
-                p.font.bold = True
-                p.font.color.rgb = BRANCO
-
     def _slide_08_custos_operacionais(self, resultados: ResultadosFinanceiros):
         self._slide_custos_categoria(
             "Quantificação — Dor 1: Mão de Obra",
@@ -604,10 +681,13 @@ class PPTXGenerator:
             resultados.total_dor5,
         )
 
-    def _slide_13_consolidacao(self, resultados: ResultadosFinanceiros):
+    def _slide_13_consolidacao(self, resultados: ResultadosFinanceiros, metas: MetasReducao,
+                               investimento: InvestimentoAutomacao):
         slide = self._add_slide()
         self._add_title_bar(slide, "Consolidação Financeira")
 
+        atribuicao = atribuicao_shapley(resultados, metas, investimento)
+
         # Tabela consolidada
         table_data = [
             ["Categoria", "Custo Anual (R$)", "% do Total"],
@@ -654,21 +734,38 @@ class PPTXGenerator:
             ["TOTAL", self._fmt(resultados.custo_total_anual_inacao), "100.0%"],
         ]
 
-        table = self._add_table(
-            slide, Inches(1.5), Inches(1.8), Inches(10), Inches(3.2),
+        self._add_table(
+            slide, Inches(0.6), Inches(1.8), Inches(6.2), Inches(3.2),
             len(table_data), 3, table_data,
-            col_widths=[Inches(4.5), Inches(3), Inches(2.5)],
+            col_widths=[Inches(2.8), Inches(2.0), Inches(1.4)],
+            estilo=EstiloTabela(destacar_ultima_linha=True),  # última linha
         )
 
-        # Destacar última linha
-        last_row = len(table_data) - 1
-        for c in range(3):
-            cell = table.cell(last_row, c)
-            cell.fill.solid()
-            cell.fill.fore_color.rgb = AZUL_ESCURO
-            for p in cell.text_frame.paragraphs:
-                p.font.bold = True
-                p.font.color.rgb = BRANCO
+        # Contribuição de cada fórmula (Shapley): as 5 maiores reduções de payback e as demais somadas
+        if atribuicao.codigos:
+            ordem = sorted(range(len(atribuicao.codigos)), key=lambda i: -atribuicao.payback_anos[i])
+            linhas = [(atribuicao.rotulos[i], atribuicao.payback_anos[i], atribuicao.roi[-1][i]) for i in ordem[:5]]
+            if len(ordem) > 5:
+                linhas.append((
+                    f"Demais ({len(ordem) - 5})",
+                    sum(atribuicao.payback_anos[i] for i in ordem[5:]),
+                    sum(atribuicao.roi[-1][i] for i in ordem[5:]),
+                ))
+            contribuicao = [["Fórmula", "Payback (anos)", f"ROI {len(atribuicao.roi)}a (p.p.)"]]
+            contribuicao += [[rotulo, f"−{anos:.2f}", f"+{roi:,.1f}"] for rotulo, anos, roi in linhas]
+            self._add_table(
+                slide, Inches(7.1), Inches(1.8), Inches(5.6), Inches(3.2),
+                len(contribuicao), 3, contribuicao,
+                col_widths=[Inches(2.9), Inches(1.3), Inches(1.4)],
+                estilo=EstiloTabela(tamanho_fonte=10, tamanho_fonte_corpo=10),
+            )
+            nota = f"Valores de Shapley: anos de payback reduzidos a partir de {atribuicao.horizonte_anos:g} anos."
+            if not any(atribuicao.payback_anos):
+                nota += " Payback acima do horizonte: nenhuma combinação se paga nele (contribuições 0)."
+            self._add_textbox(
+                slide, Inches(7.1), Inches(5.0), Inches(5.6), Inches(0.4),
+                nota, font_size=10, color=CINZA_MEDIO,
+            )
 
         # Métrica de ganho potencial
         self._add_metric_box(
@@ -678,246 +775,200 @@ class PPTXGenerator:
             color=VERDE,
         )
 
-    def _get_formula_details(
-        self,
-        resultados: ResultadosFinanceiros,
-        processo: ProcessoAtual,
-        parametros: ParametrosDetalhados,
-    ) -> list:
+    def _get_formula_details(self, rastreio: RastreioCalculo) -> list:
         """
         Retorna lista de (dor_titulo, rows) onde rows = [(formula, metodologia, valores, resultado)].
-        Apenas fórmulas com resultado > 0 são incluídas.
+        Monta os textos a partir do rastro do cálculo; apenas fórmulas com resultado > 0 são incluídas.
         """
-        fator = resultados.fator_encargos_usado
-        chp = resultados.custo_hora_parada
-        n_op = processo.pessoas_processo_turno * processo.turnos_por_dia
-        n_insp = processo.pessoas_inspecao_turno * processo.turnos_por_dia
-        custo_hora_op = (processo.salario_medio_operador * fator) / HORAS_MES_CUSTO_PRODUCAO
-        custo_hora_he = (processo.salario_medio_operador * fator) / HORAS_MES_CLT
+        titulos = [
+            ("Detalhamento — Dor 1: Custo de Mão de Obra", ("F01", "F02", "F03", "F04")),
+            ("Detalhamento — Dor 2: Qualidade", ("F05", "F06", "F07")),
+            ("Detalhamento — Dor 3: Produtividade", ("F08", "F09", "F10", "F11")),
+            ("Detalhamento — Dor 4: Segurança e Ergonomia", ("F12", "F13")),
+            ("Detalhamento — Dor 5: Custos Ocultos", ("F14", "F15", "F16", "F17", "F18")),
+        ]
 
         dors = []
+        for titulo, codigos in titulos:
+            rows = []
+            for codigo in codigos:
+                passo = rastreio.passo(codigo)
+                if passo is None or passo.resultado <= 0:
+                    continue
+                rows.extend(self._formula_rows(passo))
+            if rows:
+                dors.append((titulo, rows))
+        return dors
+
+    def _formula_rows(self, passo: PassoCalculo) -> list:
+        """Linhas (formula, metodologia, valores, resultado) de uma fórmula do rastro."""
+        e = passo.entradas
+        i = passo.intermediarios
+        c = passo.componentes
+        v = passo.resultado
 
-        # --- Dor 1 ---
-        rows = []
-        v = resultados.breakdown_dor1.get("F01 - Mão de Obra Direta", 0)
-        if v > 0:
-            rows.append((
-                "F01 - Mão de Obra Direta",
+        if passo.codigo == "F01":
+            return [(
+                passo.rotulo,
                 "Op × Salário × Encargos × 12",
-                f"{n_op} op × R${processo.salario_medio_operador:,.0f} × {fator:.2f} × 12",
+                f"{e['num_operadores']} op × R${e['salario_medio']:,.0f} × {e['fator_encargos']:.2f} × 12",
                 v,
-            ))
-        v = resultados.breakdown_dor1.get("F02 - Horas Extras", 0)
-        if v > 0 and parametros.f02_media_he_mes_por_pessoa:
-            rows.append((
-                "F02 - Horas Extras",
+            )]
+        if passo.codigo == "F02":
+            return [(
+                passo.rotulo,
                 "Op × HE/mês × Custo Hora × 1,5 × 12",
-                f"{n_op} op × {parametros.f02_media_he_mes_por_pessoa:.0f} HE × R${custo_hora_he:,.2f}/h × 1,5 × 12",
+                f"{e['num_operadores']} op × {e['media_he_mes']:.0f} HE × R${i['custo_hora_he']:,.2f}/h × 1,5 × 12",
                 v,
-            ))
-        v = resultados.breakdown_dor1.get("F03 - Curva de Aprendizagem", 0)
-        if v > 0 and parametros.f03_novas_contratacoes_ano:
-            meses = parametros.f03_meses_curva or 0
-            sal_nov = parametros.f03_salario_novato or processo.salario_medio_operador
-            sal_sup = parametros.f03_salario_supervisor or processo.salario_medio_supervisor
-            pct_sup = parametros.f03_percentual_tempo_supervisor or 0.0
-
-            custo_novato = sal_nov * fator * meses
-            custo_supervisor = sal_sup * fator * pct_sup * meses
-            custo_por_contrat = custo_novato + custo_supervisor
-
-            rows.append((
-                "F03 - Curva de Aprendizagem",
+            )]
+        if passo.codigo == "F03":
+            return [(
+                passo.rotulo,
                 "Contrat. × (Custo Novato + Custo Supervisor treinando)",
                 (
-                    f"Novato: R${custo_novato:,.0f} | "
-                    f"Sup.: R${custo_supervisor:,.0f} | "
-                    f"Por contrat.: R${custo_por_contrat:,.0f}\n"
-                    f"{parametros.f03_novas_contratacoes_ano} × R${custo_por_contrat:,.0f}"
+                    f"Novato: R${i['custo_novato']:,.0f} | "
+                    f"Sup.: R${i['custo_supervisor']:,.0f} | "
+                    f"Por contrat.: R${i['custo_por_contratacao']:,.0f}\n"
+                    f"{e['num_contratacoes']} × R${i['custo_por_contratacao']:,.0f}"
                 ),
                 v,
-            ))
-        v = resultados.breakdown_dor1.get("F04 - Turnover", 0)
-        if v > 0 and parametros.f04_desligamentos_ano:
-            ft = parametros.f04_fator_custo_turnover or 1.5
-            rows.append((
-                "F04 - Turnover",
+            )]
+        if passo.codigo == "F04":
+            return [(
+                passo.rotulo,
                 "Desl. × Salário × Fator Turnover",
-                f"{parametros.f04_desligamentos_ano} desl. × R${processo.salario_medio_operador:,.0f} × {ft:.1f}x",
+                f"{e['num_desligamentos']} desl. × R${e['salario_medio']:,.0f} × {e['fator_custo_turnover']:.1f}x",
                 v,
-            ))
-        if rows:
-            dors.append(("Detalhamento — Dor 1: Custo de Mão de Obra", rows))
-
-        # --- Dor 2 ---
-        rows = []
-        v = resultados.breakdown_dor2.get("F05 - Refugo", 0)
-        if v > 0 and parametros.f05_percentual_refugo is not None:
-            rows.append((
-                "F05 - Refugo",
-                "Prod. Mensal × % Refugo × Custo MP × 12",
-                f"× {parametros.f05_percentual_refugo*100:.1f}% refugo × R${processo.custo_materia_prima_peca:,.2f}/pç × 12",
-                v,
-            ))
-        v = resultados.breakdown_dor2.get("F05 - Retrabalho", 0)
-        if v > 0 and parametros.f05_percentual_retrabalho is not None:
-            rows.append((
-                "F05 - Retrabalho",
-                "Prod. Mensal × % Retrab. × Horas Retrab. × Custo Hora × 12",
-                f"× {parametros.f05_percentual_retrabalho*100:.1f}% × {parametros.f05_horas_retrabalho_por_unidade or '?'} h/un × R${custo_hora_op:,.2f}/h × 12",
-                v,
-            ))
-        v = resultados.breakdown_dor2.get("F06 - Inspeção Manual", 0)
-        if v > 0:
-            rows.append((
-                "F06 - Inspeção Manual",
+            )]
+        if passo.codigo == "F05":
+            rows = []
+            if c["F05 - Refugo"] > 0:
+                rows.append((
+                    "F05 - Refugo",
+                    "Prod. Mensal × % Refugo × Custo MP × 12",
+                    f"{e['producao_mensal']:,.0f} pç × {e['pct_refugo']*100:.1f}% refugo × R${e['custo_mp_unidade']:,.2f}/pç × 12",
+                    c["F05 - Refugo"],
+                ))
+            if c["F05 - Retrabalho"] > 0:
+                rows.append((
+                    "F05 - Retrabalho",
+                    "Prod. Mensal × % Retrab. × Horas Retrab. × Custo Hora × 12",
+                    f"{e['producao_mensal']:,.0f} pç × {e['pct_retrabalho']*100:.1f}% × {e['horas_retrab_unidade']} h/un × "
+                    f"R${e['custo_hora_operador']:,.2f}/h × 12",
+                    c["F05 - Retrabalho"],
+                ))
+            return rows
+        if passo.codigo == "F06":
+            return [(
+                passo.rotulo,
                 "Inspetores × Salário × Encargos × 12",
-                f"{n_insp} insp. × R${processo.salario_medio_inspetor:,.0f} × {fator:.2f} × 12",
+                f"{e['num_inspetores']} insp. × R${e['salario_inspetor']:,.0f} × {e['fator_encargos']:.2f} × 12",
                 v,
-            ))
-        v = resultados.breakdown_dor2.get("F07 - Escapes de Qualidade", 0)
-        if v > 0 and parametros.f07_reclamacoes_clientes_ano is not None:
-            rows.append((
-                "F07 - Escapes de Qualidade",
+            )]
+        if passo.codigo == "F07":
+            return [(
+                passo.rotulo,
                 "Reclamações/Ano × Custo Médio por Reclamação",
-                f"{parametros.f07_reclamacoes_clientes_ano} recl. × R${parametros.f07_custo_medio_por_reclamacao:,.0f}",
+                f"{e['reclamacoes_ano']} recl. × R${e['custo_medio_reclamacao']:,.0f}",
                 v,
-            ))
-        if rows:
-            dors.append(("Detalhamento — Dor 2: Qualidade", rows))
-
-        # --- Dor 3 ---
-        rows = []
-        v = resultados.breakdown_dor3.get("F08 - Custo de Oportunidade", 0)
-        if v > 0 and parametros.f08_percentual_demanda_reprimida is not None:
-            rows.append((
-                "F08 - Custo de Oportunidade",
+            )]
+        if passo.codigo == "F08":
+            return [(
+                passo.rotulo,
                 "Faturamento × % Demanda Reprimida × Margem × 12",
-                f"R${resultados.faturamento_mensal_linha:,.0f} × {parametros.f08_percentual_demanda_reprimida*100:.0f}% × {parametros.f08_margem_contribuicao*100:.0f}% × 12",
+                f"R${e['faturamento_mensal']:,.0f} × {e['pct_demanda_reprimida']*100:.0f}% × {e['margem_contribuicao']*100:.0f}% × 12",
                 v,
-            ))
-        v = resultados.breakdown_dor3.get("F09 - Ociosidade Silenciosa", 0)
-        if v > 0 and parametros.f09_minutos_ociosos_por_dia is not None:
-            rows.append((
-                "F09 - Ociosidade Silenciosa",
+            )]
+        if passo.codigo == "F09":
+            return [(
+                passo.rotulo,
                 "Op × (Min Ociosos / 60) × Custo Hora × Dias/Ano",
-                f"{n_op} op × ({parametros.f09_minutos_ociosos_por_dia:.0f} min/60) × R${custo_hora_op:,.2f}/h × {processo.dias_operacao_ano} dias",
+                f"{e['num_operadores']} op × ({e['min_ociosos_dia']:.0f} min/60) × R${e['custo_hora_operador']:,.2f}/h × {e['dias_ano']} dias",
                 v,
-            ))
-        v = resultados.breakdown_dor3.get("F10 - Paradas de Linha", 0)
-        if v > 0 and parametros.f10_paradas_mes is not None:
-            chp_f10 = parametros.f10_custo_hora_parada if (parametros.f10_custo_hora_parada and parametros.f10_custo_hora_parada > 0) else chp
-            rows.append((
-                "F10 - Paradas de Linha",
+            )]
+        if passo.codigo == "F10":
+            return [(
+                passo.rotulo,
                 "Paradas/mês × Duração (h) × Custo Hora Parada × 12",
-                f"{parametros.f10_paradas_mes} par. × {parametros.f10_duracao_media_parada_horas:.1f} h × R${chp_f10:,.2f}/h × 12",
+                f"{e['paradas_mes']} par. × {e['duracao_media_horas']:.1f} h × R${e['custo_hora_parada']:,.2f}/h × 12",
                 v,
-            ))
-        v = resultados.breakdown_dor3.get("F11 - Setup/Changeover", 0)
-        if v > 0 and parametros.f11_setups_mes is not None:
-            chp_f11 = parametros.f11_custo_hora_parada if (parametros.f11_custo_hora_parada and parametros.f11_custo_hora_parada > 0) else chp
-            rows.append((
-                "F11 - Setup/Changeover",
+            )]
+        if passo.codigo == "F11":
+            return [(
+                passo.rotulo,
                 "Setups/mês × Horas/Setup × Custo Hora Parada × 12",
-                f"{parametros.f11_setups_mes} set. × {parametros.f11_horas_por_setup:.2f} h × R${chp_f11:,.2f}/h × 12",
+                f"{e['setups_mes']} set. × {e['horas_setup']:.2f} h × R${e['custo_hora_parada']:,.2f}/h × 12",
                 v,
-            ))
-        if rows:
-            dors.append(("Detalhamento — Dor 3: Produtividade", rows))
-
-        # --- Dor 4 ---
-        rows = []
-        v_afast = resultados.breakdown_dor4.get("F12 - Afastamentos", 0)
-        v_acid = resultados.breakdown_dor4.get("F12 - Acidentes", 0)
-        v_legal = resultados.breakdown_dor4.get("F12 - Risco Legal", 0)
-        if (v_afast + v_acid + v_legal) > 0 and parametros.f12_afastamentos_ano is not None:
-            rows.append((
-                "F12 - Afastamentos",
-                "Afastamentos/ano × Custo Médio",
-                f"{parametros.f12_afastamentos_ano} afast. × R${parametros.f12_custo_medio_afastamento:,.0f}",
-                v_afast,
-            ))
-            rows.append((
-                "F12 - Acidentes",
-                "Acidentes/ano × Custo Médio",
-                f"{parametros.f12_acidentes_com_lesao_ano} acid. × R${parametros.f12_custo_medio_acidente:,.0f}",
-                v_acid,
-            ))
-            rows.append((
-                "F12 - Risco Legal",
-                "Prob. Processo × Custo Estimado",
-                f"{(parametros.f12_probabilidade_processo or 0)*100:.0f}% × R${parametros.f12_custo_estimado_processo:,.0f}",
-                v_legal,
-            ))
-        v = resultados.breakdown_dor4.get("F13 - Frota de Empilhadeiras", 0)
-        if v > 0 and parametros.f13_num_empilhadeiras is not None:
-            rows.append((
+            )]
+        if passo.codigo == "F12":
+            return [
+                (
+                    "F12 - Afastamentos",
+                    "Afastamentos/ano × Custo Médio",
+                    f"{e['afastamentos_ano']} afast. × R${e['custo_afastamento']:,.0f}",
+                    c["F12 - Afastamentos"],
+                ),
+                (
+                    "F12 - Acidentes",
+                    "Acidentes/ano × Custo Médio",
+                    f"{e['acidentes_ano']} acid. × R${e['custo_acidente']:,.0f}",
+                    c["F12 - Acidentes"],
+                ),
+                (
+                    "F12 - Risco Legal",
+                    "Prob. Processo × Custo Estimado",
+                    f"{e['prob_processo']*100:.0f}% × R${e['custo_processo']:,.0f}",
+                    c["F12 - Risco Legal"],
+                ),
+            ]
+        if passo.codigo == "F13":
+            mensal = e["custo_operador"] + e["custo_equipamento"] + e["custo_energia"] + e["custo_manutencao"]
+            return [(
                 "F13 - Frota Empilhadeiras",
                 "Nº Empilh. × (Op + Equip + Energ + Manut) × 12",
-                f"{parametros.f13_num_empilhadeiras} emp. × total mensal × 12",
+                f"{e['num_empilhadeiras']} emp. × R${mensal:,.0f}/mês × 12",
                 v,
-            ))
-        if rows:
-            dors.append(("Detalhamento — Dor 4: Segurança e Ergonomia", rows))
-
-        # --- Dor 5 ---
-        rows = []
-        v = resultados.breakdown_dor5.get("F14 - Supervisão", 0)
-        if v > 0 and parametros.f14_num_supervisores is not None:
-            n_sup = parametros.f14_num_supervisores * processo.turnos_por_dia
-            sal_sup = parametros.f14_salario_supervisor or processo.salario_medio_supervisor
-            rows.append((
-                "F14 - Supervisão",
+            )]
+        if passo.codigo == "F14":
+            return [(
+                passo.rotulo,
                 "Sup. (total turnos) × Salário × Encargos × 12",
-                f"{n_sup} sup. ({parametros.f14_num_supervisores}/turno × {processo.turnos_por_dia}t) × R${sal_sup:,.0f} × {fator:.2f} × 12",
+                f"{e['num_supervisores']} sup. (total) × R${e['salario_supervisor']:,.0f} × {e['fator_encargos']:.2f} × 12",
                 v,
-            ))
-        v = resultados.breakdown_dor5.get("F15 - Compliance/EPIs", 0)
-        if v > 0 and parametros.f15_custo_epi_ano_por_pessoa is not None:
-            rows.append((
-                "F15 - Compliance/EPIs",
+            )]
+        if passo.codigo == "F15":
+            return [(
+                passo.rotulo,
                 "Nº Op × (EPI/Ano + Exames/Ano)",
-                f"{n_op} op × (R${parametros.f15_custo_epi_ano_por_pessoa:,.0f} EPI + R${parametros.f15_custo_exames_ano_por_pessoa:,.0f} exames)",
+                f"{e['num_operadores']} op × (R${e['custo_epi_ano']:,.0f} EPI + R${e['custo_exames_ano']:,.0f} exames)",
                 v,
-            ))
-        v = resultados.breakdown_dor5.get("F16 - Energia e Utilidades", 0)
-        if v > 0 and parametros.f16_area_operacao_m2 is not None:
-            rows.append((
-                "F16 - Energia e Utilidades",
+            )]
+        if passo.codigo == "F16":
+            return [(
+                passo.rotulo,
                 "Área (m²) × Custo Energia/m²/Ano",
-                f"{parametros.f16_area_operacao_m2:,.0f} m² × R${parametros.f16_custo_energia_m2_ano:,.2f}/m²/ano",
+                f"{e['area_m2']:,.0f} m² × R${e['custo_energia_m2_ano']:,.2f}/m²/ano",
                 v,
-            ))
-        v = resultados.breakdown_dor5.get("F17 - Espaço Físico", 0)
-        if v > 0 and parametros.f17_area_m2 is not None:
-            pct = (parametros.f17_percentual_reducao_automacao or 0) * 100
-            rows.append((
-                "F17 - Espaço Físico",
+            )]
+        if passo.codigo == "F17":
+            return [(
+                passo.rotulo,
                 "Área (m²) × Custo m²/Ano × % Redução",
-                f"{parametros.f17_area_m2:,.0f} m² × R${parametros.f17_custo_m2_ano:,.2f}/m²/ano × {pct:.0f}%",
+                f"{e['area_m2']:,.0f} m² × R${e['custo_m2_ano']:,.2f}/m²/ano × {e['pct_reducao']*100:.0f}%",
                 v,
-            ))
-        v = resultados.breakdown_dor5.get("F18 - Gestão de Dados", 0)
-        if v > 0 and parametros.f18_pessoas_envolvidas is not None:
-            rows.append((
-                "F18 - Gestão de Dados",
+            )]
+        if passo.codigo == "F18":
+            return [(
+                passo.rotulo,
                 "Pessoas × Horas/Dia × Custo Hora × Dias/Ano",
-                f"{parametros.f18_pessoas_envolvidas} pes. × {parametros.f18_horas_dia_tarefas_dados:.1f} h/dia × R${custo_hora_op:,.2f}/h × {processo.dias_operacao_ano} dias",
+                f"{e['num_pessoas']} pes. × {e['horas_dia']:.1f} h/dia × R${e['custo_hora_operador']:,.2f}/h × {e['dias_ano']} dias",
                 v,
-            ))
-        if rows:
-            dors.append(("Detalhamento — Dor 5: Custos Ocultos", rows))
+            )]
+        return []
 
-        return dors
-
-    def _slides_detalhamento_calculos(
-        self,
-        resultados: ResultadosFinanceiros,
-        processo: ProcessoAtual,
-        parametros: ParametrosDetalhados,
-    ):
+    def _slides_detalhamento_calculos(self, rastreio: RastreioCalculo):
         """Gera um slide por Dor com tabela de detalhamento dos cálculos."""
-        dors = self._get_formula_details(resultados, processo, parametros)
+        dors = self._get_formula_details(rastreio)
         if not dors:
             return
 
@@ -937,32 +988,16 @@ class PPTXGenerator:
             row_h = 0.55
             table_h = row_h * n_rows + 0.2
 
-            table = self._add_table(
+            # Fonte reduzida para caber o conteúdo; linha total em destaque
+            self._add_table(
                 slide,
                 Inches(0.5), Inches(1.9),
                 Inches(12.3), Inches(table_h),
                 n_rows, 4, table_data,
                 col_widths=[Inches(2.5), Inches(3.8), Inches(4.0), Inches(2.0)],
+                estilo=EstiloTabela(tamanho_fonte_corpo=9, tamanho_fonte_destaque=10, destacar_ultima_linha=True),
             )
 
-            # Reduzir fonte para caber o conteúdo
-            for r in range(1, n_rows):
-                for c in range(4):
-                    cell = table.cell(r, c)
-                    for para in cell.text_frame.paragraphs:
-                        para.font.size = Pt(9)
-
-            # Destacar linha total
-            last = n_rows - 1
-            for c in range(4):
-                cell = table.cell(last, c)
-                cell.fill.solid()
-                cell.fill.fore_color.rgb = AZUL_ESCURO
-                for para in cell.text_frame.paragraphs:
-                    para.font.bold = True
-                    para.font.color.rgb = BRANCO
-                    para.font.size = Pt(10)
-
     def _slide_13_escopo_tecnico(self):
         slide = self._add_slide()
         self._add_title_bar(slide, "Escopo Técnico da Solução")
@@ -1025,12 +1060,10 @@ class PPTXGenerator:
         slide = self._add_slide()
         self._add_title_bar(slide, "Viabilidade Financeira")
 
+        faixa = indicadores_faixa(resultados, investimento)
+
         # Payback
-        payback_txt = (
-            f"{resultados.payback_anos:.1f} anos"
-            if resultados.payback_anos != float("inf")
-            else "N/A"
-        )
+        payback_txt = self._fmt_anos(resultados.payback_anos)
 
         box_w = Inches(2.7)
         gap = Inches(0.35)
@@ -1054,36 +1087,80 @@ class PPTXGenerator:
             "ROI 5 Anos", self._fmt_pct(resultados.roi_5_anos), color=VERDE,
         )
 
+        # Faixa do investimento informado (mínimo → otimista, máximo → pessimista)
+        self._add_textbox(
+            slide, Inches(0.7), top + Inches(1.35), Inches(12), Inches(0.4),
+            f"Investimento de {self._fmt(faixa.investimento.minimo)} a {self._fmt(faixa.investimento.maximo)}: "
+            f"payback de {self._fmt_anos(faixa.payback_anos.minimo)} a {self._fmt_anos(faixa.payback_anos.maximo)}",
+            font_size=12, color=CINZA_MEDIO, alignment=PP_ALIGN.CENTER,
+        )
+
         # Tabela comparativa (Ano 1 a 5)
-        table_data = [
-            ["", "Investimento Médio", "Ganho Anual", "Ganho Acumulado", "ROI"],
-            ["Ano 1",
-             self._fmt(investimento.valor_investimento_medio),
-             self._fmt(resultados.ganho_anual_potencial),
-             self._fmt(resultados.ganho_anual_potencial),
-             self._fmt_pct(resultados.roi_1_ano)],
-            ["Ano 2", "—",
-             self._fmt(resultados.ganho_anual_potencial),
-             self._fmt(resultados.ganho_anual_potencial * 2),
-             self._fmt_pct(resultados.roi_2_anos)],
-            ["Ano 3", "—",
-             self._fmt(resultados.ganho_anual_potencial),
-             self._fmt(resultados.ganho_anual_potencial * 3),
-             self._fmt_pct(resultados.roi_3_anos)],
-            ["Ano 4", "—",
-             self._fmt(resultados.ganho_anual_potencial),
-             self._fmt(resultados.ganho_anual_potencial * 4),
-             self._fmt_pct(resultados.roi_4_anos)],
-            ["Ano 5", "—",
-             self._fmt(resultados.ganho_anual_potencial),
-             self._fmt(resultados.ganho_anual_potencial * 5),
-             self._fmt_pct(resultados.roi_5_anos)],
-        ]
+        rois = (resultados.roi_1_ano, resultados.roi_2_anos, resultados.roi_3_anos,
+                resultados.roi_4_anos, resultados.roi_5_anos)
+        table_data = [["", "Investimento Médio", "Ganho Anual", "Ganho Acumulado", "ROI", "ROI (faixa)"]]
+        for ano, (roi, roi_faixa) in enumerate(zip(rois, faixa.roi), start=1):
+            table_data.append([
+                f"Ano {ano}",
+                self._fmt(investimento.valor_investimento_medio) if ano == 1 else "—",
+                self._fmt(resultados.ganho_anual_potencial),
+                self._fmt(resultados.ganho_anual_potencial * ano),
+                self._fmt_pct(roi),
+                f"{self._fmt_pct(roi_faixa.minimo)} a {self._fmt_pct(roi_faixa.maximo)}",
+            ])
 
         self._add_table(
-            slide, Inches(1.0), Inches(3.8), Inches(11), Inches(2.5),
-            6, 5, table_data,
-            col_widths=[Inches(1.2), Inches(2.8), Inches(2.3), Inches(2.5), Inches(2.2)],
+            slide, Inches(0.6), Inches(3.8), Inches(12.1), Inches(2.5),
+            6, 6, table_data,
+            col_widths=[Inches(1.0), Inches(2.4), Inches(2.1), Inches(2.3), Inches(1.5), Inches(2.8)],
+        )
+
+    def _slide_mapa_equilibrio(self, entradas: dict, espec: dict):
+        """Curvas de nível do payback no plano de dois parâmetros (gráfico XY nativo, editável)."""
+        slide = self._add_slide()
+        self._add_title_bar(slide, "Mapa de Equilíbrio")
+
+        mapa = calcular_mapa_equilibrio(entradas, espec["eixo_x"], espec["eixo_y"])
+
+        chart_data = XyChartData()
+        series = 0
+        for limiar, polilinhas in mapa.contornos.items():
+            for k, polilinha in enumerate(polilinhas):
+                nome = f"Payback {limiar:g} anos" + (f" ({k + 1})" if k else "")
+                serie = chart_data.add_series(nome)
+                series += 1
+                for x, y in polilinha:
+                    serie.add_data_point(x, y)
+
+        if not series:
+            self._add_textbox(
+                slide, Inches(1), Inches(3), Inches(11.3), Inches(1),
+                "Nenhuma curva de payback cruza a faixa analisada.",
+                font_size=16, color=CINZA_MEDIO, alignment=PP_ALIGN.CENTER,
+            )
+        else:
+            grafico = slide.shapes.add_chart(
+                XL_CHART_TYPE.XY_SCATTER_LINES_NO_MARKERS,
+                Inches(0.8), Inches(1.5), Inches(11.7), Inches(5),
+                chart_data,
+            ).chart
+            grafico.has_legend = True
+            grafico.legend.position = XL_LEGEND_POSITION.RIGHT
+            grafico.legend.include_in_layout = False
+            for eixo, titulo, valores in (
+                (grafico.category_axis, mapa.eixo_x, mapa.valores_x),
+                (grafico.value_axis, mapa.eixo_y, mapa.valores_y),
+            ):
+                eixo.has_title = True
+                eixo.axis_title.text_frame.text = titulo
+                eixo.minimum_scale = valores[0]
+                eixo.maximum_scale = valores[-1]
+
+        self._add_textbox(
+            slide, Inches(0.8), Inches(6.6), Inches(11.7), Inches(0.5),
+            "Cada curva separa as combinações com payback abaixo e acima do prazo indicado; "
+            "demais entradas como informadas.",
+            font_size=12, color=CINZA_MEDIO, alignment=PP_ALIGN.CENTER,
         )
 
     def _slide_16_proximas_etapas(self):
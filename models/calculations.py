@@ -4,10 +4,13 @@ Models de cálculo intermediário — V2.0.
 Reorganizado por 5 Dores com 18 fórmulas (F01–F18).
 """
 
-from dataclasses import dataclass
+from __future__ import annotations
 
+from dataclasses import dataclass, field
+from typing import Dict, List
 
-@dataclass
+
+@dataclass(slots=True)
 class BasesComuns:
     """Cálculos base reutilizados em múltiplas fórmulas."""
 
@@ -21,7 +24,7 @@ class BasesComuns:
     fator_encargos: float  # 1.7 / 1.85 / 2.0
 
 
-@dataclass
+@dataclass(slots=True)
 class CustosDor1MaoDeObra:
     """Dor 1: Custo Elevado de Mão de Obra."""
 
@@ -32,7 +35,7 @@ class CustosDor1MaoDeObra:
     total: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class CustosDor2Qualidade:
     """Dor 2: Baixa Qualidade."""
 
@@ -44,7 +47,7 @@ class CustosDor2Qualidade:
     total: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class CustosDor3Produtividade:
     """Dor 3: Baixa Produtividade."""
 
@@ -55,7 +58,7 @@ class CustosDor3Produtividade:
     total: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class CustosDor4Seguranca:
     """Dor 4: Falta de Segurança e Ergonomia."""
 
@@ -67,7 +70,7 @@ class CustosDor4Seguranca:
     total: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class CustosDor5CustosOcultos:
     """Dor 5: Custos Ocultos de Gestão e Estrutura."""
 
@@ -77,3 +80,31 @@ class CustosDor5CustosOcultos:
     f17_espaco_fisico: float = 0.0
     f18_gestao_dados: float = 0.0
     total: float = 0.0
+
+
+@dataclass(slots=True)
+class PassoCalculo:
+    """Registro de uma fórmula avaliada (entradas efetivamente usadas, fontes escolhidas e resultado)."""
+
+    codigo: str  # "F01" ... "F18"
+    rotulo: str  # ex.: "F01 - Mão de Obra Direta"
+    entradas: Dict[str, float]  # argumentos passados à função de `core.formulas`
+    resultado: float  # R$/ano
+    fontes: Dict[str, str] = field(default_factory=dict)  # campo → origem (ex.: "parametros.f10_custo_hora_parada")
+    intermediarios: Dict[str, float] = field(default_factory=dict)  # valores derivados exibidos nos detalhamentos
+    componentes: Dict[str, float] = field(default_factory=dict)  # subtotais (F05, F12)
+
+
+@dataclass(slots=True)
+class RastreioCalculo:
+    """Rastro compacto de um `ROICalculator.calcular(rastrear=True)`, consumido por dashboard e PPTX."""
+
+    bases: Dict[str, float]
+    passos: List[PassoCalculo] = field(default_factory=list)
+
+    def passo(self, codigo: str) -> PassoCalculo | None:
+        """Retorna o passo da fórmula `codigo` (ou None se não foi avaliada)."""
+        for passo in self.passos:
+            if passo.codigo == codigo:
+                return passo
+        return None
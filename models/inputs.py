@@ -2,11 +2,12 @@
 Schemas de entrada de dados do cliente — V2.0 (Custo da Inação).
 """
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, fields
+from enum import IntFlag
+from typing import Iterable, List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class ClienteBasicInfo:
     """Informações básicas do cliente (V2.0)."""
 
@@ -15,9 +16,10 @@ class ClienteBasicInfo:
     area_atuacao: str  # chave em `config.areas.AREAS_ARV`
     porte_empresa: str  # "pequena" | "media" | "grande"
     fator_encargos: float = 1.7  # 1.7 / 1.85 / 2.0
+    regiao: str = "brasil"  # chave em `config.benchmarks.REGIOES`
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessoAtual:
     """Dados do processo atual (V2.0)."""
 
@@ -47,11 +49,54 @@ class ProcessoAtual:
     faturamento_mensal_linha: Optional[float] = None  # R$ — derivado de producao × preco_venda
 
 
-@dataclass
+class Formula(IntFlag):
+    """
+    Fórmulas F01–F18 como bits: uma seleção inteira cabe em um `int` (chave de cache, conjuntos
+    com `&`, `|`, `~`; contagem com `quantidade`).
+    """
+
+    F01 = 1 << 0
+    F02 = 1 << 1
+    F03 = 1 << 2
+    F04 = 1 << 3
+    F05 = 1 << 4
+    F06 = 1 << 5
+    F07 = 1 << 6
+    F08 = 1 << 7
+    F09 = 1 << 8
+    F10 = 1 << 9
+    F11 = 1 << 10
+    F12 = 1 << 11
+    F13 = 1 << 12
+    F14 = 1 << 13
+    F15 = 1 << 14
+    F16 = 1 << 15
+    F17 = 1 << 16
+    F18 = 1 << 17
+
+    @classmethod
+    def de_codigos(cls, codigos: Iterable[str]) -> "Formula":
+        """Máscara a partir de códigos ("F01", "f05", ...); código desconhecido levanta KeyError."""
+        mascara = cls(0)
+        for codigo in codigos:
+            mascara |= cls[codigo.upper()]
+        return mascara
+
+    @property
+    def codigos(self) -> List[str]:
+        """Códigos presentes na máscara, em ordem (F01 → F18)."""
+        return [f"F{bit + 1:02d}" for bit in range(18) if self >> bit & 1]
+
+    @property
+    def quantidade(self) -> int:
+        return int(self).bit_count()
+
+
+@dataclass(slots=True)
 class DoresSelecionadas:
     """
     Dores/Fórmulas selecionadas — V2.0.
-    Flags mapeiam para F01–F18.
+    Flags mapeiam para F01–F18 (na ordem dos bits de `Formula`; ver `mascara`).
     """
 
     # DOR 1: CUSTO ELEVADO DE MÃO DE OBRA
@@ -82,8 +127,24 @@ class DoresSelecionadas:
     f17_espaco_fisico: bool = False
     f18_gestao_dados: bool = False
 
+    @property
+    def mascara(self) -> Formula:
+        """Seleção como um único inteiro (`Formula`)."""
+        valor = 0
+        for bit, campo in enumerate(_CAMPOS_DORES):
+            if getattr(self, campo):
+                valor |= 1 << bit
+        return Formula(valor)
+
+    @classmethod
+    def de_mascara(cls, mascara: int) -> "DoresSelecionadas":
+        return cls(*(bool(mascara >> bit & 1) for bit in range(len(_CAMPOS_DORES))))
+
+
+_CAMPOS_DORES = tuple(f.name for f in fields(DoresSelecionadas))
+
 
-@dataclass
+@dataclass(slots=True)
 class ParametrosDetalhados:
     """Parâmetros detalhados por fórmula (V2.0)."""
 
@@ -164,7 +225,7 @@ class ParametrosDetalhados:
     f18_horas_dia_tarefas_dados: Optional[float] = None  # h/dia
 
 
-@dataclass
+@dataclass(slots=True)
 class InvestimentoAutomacao:
     """Dados de investimento da automação (V2.0)."""
 
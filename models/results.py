@@ -2,11 +2,40 @@
 Schemas de resultados finais — V2.0.
 """
 
-from dataclasses import dataclass
-from typing import Dict
+import sys
+from array import array
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from typing import Dict, Iterable, Mapping, Optional, Tuple
 
+from models.calculations import RastreioCalculo
 
-@dataclass
+# Ordem fixa das posições nos vetores por fórmula (custos, metas, ganhos)
+CODIGOS_FORMULAS: Tuple[str, ...] = tuple(f"F{n:02d}" for n in range(1, 19))
+INDICE_FORMULA: Dict[str, int] = {codigo: i for i, codigo in enumerate(CODIGOS_FORMULAS)}
+# Campos de `ResultadosFinanceiros` com o custo por rótulo ("F05 - Refugo", ...), na ordem das dores
+CAMPOS_BREAKDOWN: Tuple[str, ...] = tuple(f"breakdown_dor{n}" for n in range(1, 6))
+
+
+def codigo_do_rotulo(rotulo: str) -> str:
+    """Código da fórmula de um rótulo de breakdown ("F05 - Refugo" → "F05")."""
+    return rotulo[:3]
+
+
+def vetor_formulas(por_codigo: Optional[Mapping[str, float]] = None) -> array:
+    """Vetor `array('d')` F01…F18; códigos ausentes em `por_codigo` ficam zerados."""
+    vetor = array("d", bytes(8 * len(CODIGOS_FORMULAS)))
+    for codigo, valor in (por_codigo or {}).items():
+        vetor[INDICE_FORMULA[codigo]] = valor
+    return vetor
+
+
+def por_codigo(vetor: Iterable[float]) -> Dict[str, float]:
+    """Visão nomeada de um vetor F01…F18: código → valor."""
+    return dict(zip(CODIGOS_FORMULAS, vetor, strict=True))
+
+
+@dataclass(slots=True)
 class MetasReducao:
     """Metas de redução de custos por fórmula (%) — V2.0 (armazenadas como fração 0–1)."""
 
@@ -29,8 +58,28 @@ class MetasReducao:
     meta_f17: float = 0.0
     meta_f18: float = 0.0
 
+    @property
+    def valores(self) -> Tuple[float, ...]:
+        """Metas na ordem F01…F18 (posições de `CODIGOS_FORMULAS`)."""
+        return _valores_metas(self)
+
+    @property
+    def vetor(self) -> array:
+        """`valores` como `array('d')`, para guardar metas de muitos cenários sem dataclasses."""
+        return array("d", _valores_metas(self))
+
+    @classmethod
+    def de_vetor(cls, valores: Iterable[float]) -> "MetasReducao":
+        valores = tuple(valores)
+        if len(valores) != len(CODIGOS_FORMULAS):
+            raise ValueError(f"Esperadas {len(CODIGOS_FORMULAS)} metas, recebidas {len(valores)}.")
+        return cls(*valores)
+
 
-@dataclass
+_valores_metas = attrgetter(*(f.name for f in fields(MetasReducao)))
+
+
+@dataclass(slots=True)
 class ResultadosFinanceiros:
     """Resultados consolidados V2.0 (Custo da Inação)."""
 
@@ -71,3 +120,127 @@ class ResultadosFinanceiros:
     area_atuacao: str
     porte_empresa: str
     fator_encargos_usado: float
+
+    # Rastro das fórmulas avaliadas (apenas quando `calcular(rastrear=True)`)
+    rastreio: Optional[RastreioCalculo] = None
+
+    def __post_init__(self):
+        # Rótulos internados: todos os resultados (inclusive desserializados) compartilham as mesmas strings
+        for nome in CAMPOS_BREAKDOWN:
+            setattr(self, nome, {sys.intern(k): v for k, v in getattr(self, nome).items()})
+
+    @property
+    def custos_formulas(self) -> array:
+        """Custo anual por fórmula (F01…F18) a partir dos breakdowns; subcomponentes (F05, F12) somados."""
+        custos = vetor_formulas()
+        for nome in CAMPOS_BREAKDOWN:
+            for rotulo, valor in getattr(self, nome).items():
+                custos[INDICE_FORMULA[codigo_do_rotulo(rotulo)]] += valor
+        return custos
+
+    def __reduce__(self):
+        # Desserialização (pickle do cache compartilhado) passa por `__init__`/`__post_init__`
+        return (self.__class__, tuple(getattr(self, f.name) for f in fields(self)))
+
+
+@dataclass(frozen=True, slots=True)
+class Intervalo:
+    """Faixa de um indicador: menor valor, valor no cenário central e maior valor."""
+
+    minimo: float
+    central: float
+    maximo: float
+
+
+@dataclass(slots=True)
+class IndicadoresFaixa:
+    """Indicadores avaliados na faixa de investimento (e de metas, se informada) — ver `core.intervalos`."""
+
+    investimento: Intervalo
+    ganho_anual: Intervalo
+    payback_anos: Intervalo
+    roi: Tuple[Intervalo, ...]  # ROI (%) em 1, 2, … anos
+
+
+@dataclass(frozen=True, slots=True)
+class Gradiente:
+    """Valor de um indicador e as derivadas parciais em relação a cada entrada (ordem de `Sensibilidades.entradas`)."""
+
+    valor: float
+    derivadas: array
+
+
+@dataclass(slots=True)
+class Sensibilidades:
+    """Derivadas exatas dos indicadores em relação às entradas numéricas — ver `core.derivadas`."""
+
+    entradas: Tuple[str, ...]  # "processo.salario_medio_operador", "metas.meta_f01", …
+    valores_entradas: array
+    resultados: ResultadosFinanceiros
+    ganho_anual_potencial: Gradiente
+    custo_total_anual_inacao: Gradiente
+    payback_anos: Gradiente
+
+    def derivada(self, indicador: str, entrada: str) -> float:
+        return getattr(self, indicador).derivadas[self.entradas.index(entrada)]
+
+    def elasticidades(self, indicador: str) -> Dict[str, float]:
+        """Variação (%) do indicador por 1% de cada entrada: ∂y/∂x · x / y (0 quando y é 0 ou infinito)."""
+        gradiente: Gradiente = getattr(self, indicador)
+        y = gradiente.valor
+        if y == 0 or y == float("inf"):
+            return dict.fromkeys(self.entradas, 0.0)
+        return {
+            entrada: derivada * x / y
+            for entrada, derivada, x in zip(self.entradas, gradiente.derivadas, self.valores_entradas)
+        }
+
+
+@dataclass(slots=True)
+class AtribuicaoShapley:
+    """Contribuição de cada fórmula com ganho (valores de Shapley) para payback e ROI — ver `core.atribuicao`."""
+
+    codigos: Tuple[str, ...]  # fórmulas com ganho > 0, ordem F01…F18
+    rotulos: Tuple[str, ...]
+    ganhos: Tuple[float, ...]  # ganho anual de cada fórmula (R$)
+    horizonte_anos: float
+    payback_anos: Tuple[float, ...]  # anos de payback reduzidos a partir do horizonte; soma = horizonte − min(payback, horizonte)
+    roi: Tuple[Tuple[float, ...], ...]  # por ano (1, 2, …): pontos percentuais de ROI; soma = ROI + 100
+
+
+@dataclass(slots=True)
+class AvaliacaoArvore:
+    """VPL esperado e distribuição do payback de um projeto em fases — ver `core.arvore_cenarios`."""
+
+    vpl_esperado: float  # R$ de hoje, com a decisão ótima em cada nó de decisão
+    horizonte_anos: int
+    taxa_desconto: float
+    paybacks: Tuple[Tuple[float, float], ...]  # (payback em anos, probabilidade), payback crescente
+    decisoes: Dict[Tuple[str, int], str]  # (nó de decisão, ano) → filho escolhido
+    nos_avaliados: int  # pares (nó, ano) avaliados; subárvores compartilhadas contam uma vez
+
+    def prob_payback_ate(self, anos: float) -> float:
+        return sum(p for payback, p in self.paybacks if payback <= anos)
+
+    def percentil_payback(self, p: float) -> float:
+        """Menor payback com probabilidade acumulada ≥ `p` (0–100); inf se o projeto não se paga."""
+        acumulada = 0.0
+        for payback, probabilidade in self.paybacks:
+            acumulada += probabilidade
+            if acumulada >= p / 100 - 1e-12:
+                return payback
+        return float("inf")
+
+
+@dataclass(slots=True)
+class OpcaoReal:
+    """Valor da opção de adiar (ou expandir) a automação — ver `core.opcoes_reais`."""
+
+    valor_projeto: float  # valor presente dos ganhos se investir hoje (ativo-objeto)
+    investimento: float
+    volatilidade: float  # a.a., usada na árvore
+    vpl_imediato: float  # valor_projeto − investimento (investir agora ou nunca)
+    valor_opcao: float  # valor da oportunidade com a flexibilidade de esperar
+    valor_espera: float  # valor_opcao − max(vpl_imediato, 0)
+    ano_exercicio: Optional[float]  # 1º momento em que investir é ótimo, com o ganho estimado; None: não investir na janela
+    prob_exercicio: float  # probabilidade (neutra ao risco) de investir dentro da janela
@@ -0,0 +1,260 @@
+"""
+Testes da API ASGI (api/servidor.py), chamada em processo (sem servidor HTTP).
+"""
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from api import servidor
+from api.carga import carga_em_processo
+from api.esquemas import ErroPayload, entradas_de_json, exemplo_payload, gerar_json
+from api.servidor import AplicacaoAPI
+from core.calculator import ROICalculator
+from core.centavos import calcular_exato
+from core.repositorio import RepositorioAnalises
+
+
+def _chamar(app, metodo, caminho, corpo=b""):
+    async def _executar():
+        enviado = False
+        resposta = {}
+
+        async def receive():
+            nonlocal enviado
+            if enviado:
+                return {"type": "http.disconnect"}
+            enviado = True
+            return {"type": "http.request", "body": corpo, "more_body": False}
+
+        async def send(mensagem):
+            if mensagem["type"] == "http.response.start":
+                resposta["status"] = mensagem["status"]
+            else:
+                resposta["corpo"] = mensagem["body"]
+
+        await app({"type": "http", "method": metodo, "path": caminho, "headers": []}, receive, send)
+        return resposta
+
+    return asyncio.run(_executar())
+
+
+@pytest.fixture
+def app():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        yield AplicacaoAPI(executor=executor)
+
+
+class TestEsquemas:
+    def test_dores_por_lista_de_codigos(self):
+        entradas = entradas_de_json(exemplo_payload())
+        assert entradas["dores"].f01_mao_de_obra_direta and entradas["dores"].f10_paradas_linha
+        assert not entradas["dores"].f03_curva_aprendizagem
+
+    def test_dores_por_mascara(self):
+        dados = exemplo_payload()
+        por_lista = entradas_de_json(dados)["dores"]
+        dados["dores"] = int(por_lista.mascara)
+        assert entradas_de_json(dados)["dores"] == por_lista
+        dados["dores"] = 1 << 18
+        with pytest.raises(ErroPayload, match="máscara"):
+            entradas_de_json(dados)
+
+    def test_campo_desconhecido(self):
+        dados = exemplo_payload()
+        dados["processo"]["turnos"] = 2
+        with pytest.raises(ErroPayload, match="turnos"):
+            entradas_de_json(dados)
+
+    @pytest.mark.parametrize(
+        "grupo, campo, valor",
+        [("processo", "cadencia_producao", "10"), ("processo", "turnos_por_dia", True), ("metas", "meta_f01", [0.5])],
+    )
+    def test_tipo_invalido(self, grupo, campo, valor):
+        dados = exemplo_payload()
+        dados.setdefault(grupo, {})[campo] = valor
+        with pytest.raises(ErroPayload, match=f"tipo inválido em: {campo}"):
+            entradas_de_json(dados)
+
+    @pytest.mark.parametrize("meta", [-5.0, 1.5, 1e308])
+    def test_meta_fora_de_0_a_1(self, meta):
+        dados = exemplo_payload()
+        dados["metas"] = {"meta_f01": meta}
+        with pytest.raises(ErroPayload, match="Meta de F01"):
+            entradas_de_json(dados)
+
+    def test_area_desconhecida(self):
+        dados = exemplo_payload()
+        dados["cliente"]["area_atuacao"] = "area_99_inexistente"
+        with pytest.raises(ErroPayload, match="Área de atuação deve ser uma de"):
+            entradas_de_json(dados)
+
+    def test_aplica_validadores_do_app(self):
+        dados = exemplo_payload()
+        dados["investimento"]["valor_investimento_min"] = 900_000.0
+        with pytest.raises(ErroPayload, match="mínimo não pode ser maior"):
+            entradas_de_json(dados)
+
+    def test_infinito_vira_null(self):
+        assert json.loads(gerar_json({"payback_anos": float("inf")})) == {"payback_anos": None}
+
+
+class TestRotas:
+    def test_calcular_igual_ao_motor(self, app):
+        resposta = _chamar(app, "POST", "/calcular", gerar_json(exemplo_payload()))
+        assert resposta["status"] == 200
+        esperado = ROICalculator(**entradas_de_json(exemplo_payload())).calcular()
+        dados = json.loads(resposta["corpo"])
+        assert dados["custo_total_anual_inacao"] == pytest.approx(esperado.custo_total_anual_inacao)
+        assert dados["payback_anos"] == pytest.approx(esperado.payback_anos)
+
+    def test_calcular_exato(self, app):
+        dados = exemplo_payload()
+        dados["exato"] = True
+        resposta = json.loads(_chamar(app, "POST", "/calcular", gerar_json(dados))["corpo"])
+        esperado = calcular_exato(**entradas_de_json(exemplo_payload()))
+        assert resposta["custo_total_anual_inacao"] == esperado.custo_total_anual_inacao
+        assert resposta["breakdown_dor1"] == esperado.breakdown_dor1
+
+        dados["exato"] = "sim"
+        assert _chamar(app, "POST", "/calcular", gerar_json(dados))["status"] == 400
+
+        dados["exato"] = True
+        dados["metas"] = {"meta_f01": 1e308}  # antes: OverflowError no modo exato (500)
+        assert _chamar(app, "POST", "/calcular", gerar_json(dados))["status"] == 400
+
+    def test_batch_com_erro_por_item(self, app):
+        invalido = exemplo_payload()
+        del invalido["cliente"]
+        corpo = gerar_json({"itens": [exemplo_payload(), invalido]})
+        dados = json.loads(_chamar(app, "POST", "/batch", corpo)["corpo"])
+        assert "custo_total_anual_inacao" in dados["resultados"][0]
+        assert "cliente" in dados["resultados"][1]["erro"]
+
+    def test_batch_grava_analises_validas_no_repositorio(self, tmp_path):
+        repositorio = RepositorioAnalises(str(tmp_path / "analises.sqlite"))
+        invalido = exemplo_payload()
+        del invalido["cliente"]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            app = AplicacaoAPI(executor=executor, repositorio=repositorio)
+            corpo = gerar_json({"itens": [exemplo_payload(), invalido, exemplo_payload()]})
+            assert _chamar(app, "POST", "/batch", corpo)["status"] == 200
+        assert repositorio.contar() == 2
+        assert repositorio.contar(cliente="Lead", area="area_1_linhas_montagem") == 2
+
+    def test_batch_falha_inesperada_fica_no_item(self, tmp_path, monkeypatch):
+        original = servidor._calcular_resultados
+
+        def calcular(entradas, exato):
+            if entradas["cliente"].nome_cliente == "Falha":
+                raise ZeroDivisionError("divisão por zero")
+            return original(entradas, exato)
+
+        monkeypatch.setattr(servidor, "_calcular_resultados", calcular)
+        repositorio = RepositorioAnalises(str(tmp_path / "analises.sqlite"))
+        falha = exemplo_payload()
+        falha["cliente"]["nome_cliente"] = "Falha"
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            app = AplicacaoAPI(executor=executor, repositorio=repositorio)
+            resposta = _chamar(app, "POST", "/batch", gerar_json({"itens": [exemplo_payload(), falha]}))
+        assert resposta["status"] == 200
+        dados = json.loads(resposta["corpo"])
+        assert "custo_total_anual_inacao" in dados["resultados"][0]
+        assert dados["resultados"][1]["erro"] == "ZeroDivisionError: divisão por zero"
+        assert repositorio.contar() == 1
+
+    def test_gravacao_fora_do_loop(self, tmp_path):
+        repositorio = RepositorioAnalises(str(tmp_path / "analises.sqlite"))
+        threads = []
+        salvar = repositorio.salvar
+        repositorio.salvar = lambda *args: threads.append(threading.get_ident()) or salvar(*args)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            app = AplicacaoAPI(executor=executor, repositorio=repositorio)
+            assert _chamar(app, "POST", "/calcular", gerar_json(exemplo_payload()))["status"] == 200
+        assert threads and threads[0] != threading.get_ident()
+        assert repositorio.contar() == 1
+
+    def test_montecarlo(self, app):
+        payload = exemplo_payload()
+        payload["simulacao"] = {"iteracoes": 500, "semente": 7}
+        resposta = _chamar(app, "POST", "/montecarlo", gerar_json(payload))
+        assert resposta["status"] == 200
+        dados = json.loads(resposta["corpo"])
+        assert dados["iteracoes"] == 500
+        assert dados["ganho_anual"]["p05"] <= dados["ganho_anual"]["p50"] <= dados["ganho_anual"]["p95"]
+
+    def test_montecarlo_com_benchmark(self, app):
+        payload = exemplo_payload()
+        payload["simulacao"] = {"iteracoes": 300, "semente": 7, "benchmark": True}
+        resposta = _chamar(app, "POST", "/montecarlo", gerar_json(payload))
+        assert resposta["status"] == 200
+        assert json.loads(resposta["corpo"])["iteracoes"] == 300
+        payload["simulacao"]["benchmark"] = "sim"
+        assert _chamar(app, "POST", "/montecarlo", gerar_json(payload))["status"] == 400
+
+    def test_montecarlo_com_correlacoes(self, app):
+        payload = exemplo_payload()
+        payload["simulacao"] = {
+            "iteracoes": 300,
+            "semente": 7,
+            "correlacoes": [["processo.salario_medio_operador", "parametros.f03_salario_novato", 0.8]],
+        }
+        resposta = _chamar(app, "POST", "/montecarlo", gerar_json(payload))
+        assert resposta["status"] == 200
+        assert json.loads(resposta["corpo"])["iteracoes"] == 300
+        for correlacoes in ([["processo.inexistente", "processo.salario_medio_operador", 0.5]], [["a", "b"]], "x"):
+            payload["simulacao"]["correlacoes"] = correlacoes
+            assert _chamar(app, "POST", "/montecarlo", gerar_json(payload))["status"] == 400
+
+    @pytest.mark.parametrize(
+        "metodo,caminho,corpo,status",
+        [
+            ("POST", "/nao-existe", b"{}", 404),
+            ("GET", "/calcular", b"", 405),
+            ("POST", "/calcular", b"{nao-json", 400),
+            ("POST", "/calcular", gerar_json({**exemplo_payload(), "processo": {"cadencia_producao": "10"}}), 400),
+            ("POST", "/montecarlo", gerar_json({**exemplo_payload(), "simulacao": {"iteracoes": 0}}), 400),
+        ],
+    )
+    def test_erros(self, app, metodo, caminho, corpo, status):
+        assert _chamar(app, metodo, caminho, corpo)["status"] == status
+
+    def test_saude(self, app):
+        resposta = _chamar(app, "GET", "/saude")
+        assert resposta["status"] == 200
+        assert json.loads(resposta["corpo"])["status"] == "ok"
+
+
+class TestCoalescencia:
+    def test_payloads_identicos_em_andamento_compartilham_tarefa(self, app, monkeypatch):
+        liberar = threading.Event()
+        chamadas = []
+
+        def tarefa_lenta(entradas, simulacao):
+            chamadas.append(simulacao)
+            liberar.wait(5)
+            return {"ok": True}
+
+        monkeypatch.setattr(servidor, "_tarefa_montecarlo", tarefa_lenta)
+        payload = exemplo_payload()
+        payload["simulacao"] = {"iteracoes": 10, "semente": 1}
+        corpo = gerar_json(payload)
+
+        async def _cenario():
+            tarefa = asyncio.ensure_future(carga_em_processo(app, "/montecarlo", corpo, requisicoes=5, concorrencia=5))
+            await asyncio.sleep(0.05)
+            liberar.set()
+            return await tarefa
+
+        relatorio = asyncio.run(_cenario())
+        assert relatorio.erros == 0
+        assert len(chamadas) == 1
+        assert app.metricas.coalescidas == 4
+
+
+def test_relatorio_de_carga(app):
+    relatorio = asyncio.run(carga_em_processo(app, "/calcular", gerar_json(exemplo_payload()), 200, 20))
+    assert relatorio.requisicoes == 200 and relatorio.erros == 0
+    assert 0 < relatorio.p50_ms <= relatorio.p99_ms <= relatorio.max_ms
@@ -0,0 +1,149 @@
+"""
+Testes do armazenamento compartilhado (core/armazenamento.py, core/sessoes.py).
+
+Cada "réplica" é simulada por instâncias independentes apontando para o mesmo arquivo SQLite.
+"""
+import io
+
+import pytest
+
+from core.armazenamento import Armazenamento, ArmazenamentoSQLite
+from core.cache import CacheTTL
+from core.sessoes import restaurar_sessao, salvar_sessao
+from models.inputs import ClienteBasicInfo, DoresSelecionadas
+
+
+class RelogioFalso:
+    def __init__(self):
+        self.agora = 1_000.0
+
+    def __call__(self):
+        return self.agora
+
+
+def _replica_cache(caminho, nome="calculo"):
+    return CacheTTL(nome, ttl_segundos=60, max_entradas=8, compartilhado=ArmazenamentoSQLite(str(caminho)))
+
+
+class TestInterface:
+    def test_backend_incompleto_falha_ao_instanciar(self):
+        class SemRemover(Armazenamento):
+            def obter(self, namespace, chave):
+                return None
+
+            def definir(self, namespace, chave, valor, ttl_segundos=None):
+                pass
+
+        with pytest.raises(TypeError, match="remover"):
+            SemRemover()
+
+    def test_contem_padrao_usa_obter(self):
+        class EmMemoria(Armazenamento):
+            def __init__(self):
+                self.dados = {}
+
+            def obter(self, namespace, chave):
+                return self.dados.get((namespace, chave))
+
+            def definir(self, namespace, chave, valor, ttl_segundos=None):
+                self.dados[(namespace, chave)] = valor
+
+            def remover(self, namespace, chave):
+                self.dados.pop((namespace, chave), None)
+
+        arm = EmMemoria()
+        arm.definir("ns", "k", b"v")
+        assert arm.contem("ns", "k") and not arm.contem("ns", "outra")
+
+
+class TestArmazenamentoSQLite:
+    def test_expira_por_ttl(self, tmp_path):
+        relogio = RelogioFalso()
+        arm = ArmazenamentoSQLite(str(tmp_path / "kv.sqlite"), relogio=relogio)
+        arm.definir("ns", "k", b"v", ttl_segundos=10)
+        assert arm.obter("ns", "k") == b"v"
+        relogio.agora += 10
+        assert arm.obter("ns", "k") is None
+        assert not arm.contem("ns", "k")
+        assert arm.limpar_expirados() == 1
+
+    def test_gravar_apaga_expirados_periodicamente(self, tmp_path):
+        relogio = RelogioFalso()
+        arm = ArmazenamentoSQLite(str(tmp_path / "kv.sqlite"), relogio=relogio, intervalo_limpeza=60)
+        arm.definir("pptx", "deck", b"x" * 1024, ttl_segundos=10)
+        relogio.agora += 30
+        arm.definir("ns", "a", b"1")  # dentro do intervalo: o deck expirado continua no arquivo
+        assert arm._conexao().execute("SELECT COUNT(*) FROM kv").fetchone()[0] == 2
+        relogio.agora += 30
+        arm.definir("ns", "b", b"2")
+        assert arm._conexao().execute("SELECT chave FROM kv ORDER BY chave").fetchall() == [("a",), ("b",)]
+
+    def test_namespaces_isolados(self, tmp_path):
+        arm = ArmazenamentoSQLite(str(tmp_path / "kv.sqlite"))
+        arm.definir("a", "k", b"1")
+        assert arm.obter("b", "k") is None
+
+
+class TestCacheEntreReplicas:
+    def test_valor_calculado_em_uma_replica_e_reaproveitado_na_outra(self, tmp_path):
+        caminho = tmp_path / "kv.sqlite"
+        replica_a, replica_b = _replica_cache(caminho), _replica_cache(caminho)
+        chamadas = []
+
+        def calcular():
+            chamadas.append(1)
+            return {"custo": 123.0}
+
+        assert replica_a.obter_ou_calcular("k", calcular) == {"custo": 123.0}
+        assert replica_b.contem("k")
+        assert replica_b.obter_ou_calcular("k", calcular) == {"custo": 123.0}
+        assert len(chamadas) == 1
+        assert replica_b.metricas.acertos_compartilhados == 1
+
+        # Segunda leitura na réplica B vem da memória local
+        replica_b.obter("k")
+        assert replica_b.metricas.acertos_compartilhados == 1
+        assert replica_b.metricas.acertos == 2
+
+    def test_deck_sobrevive_ao_reinicio_da_replica(self, tmp_path):
+        caminho = tmp_path / "kv.sqlite"
+        _replica_cache(caminho, "pptx").definir("deck", b"PK\x03\x04...")
+        reiniciada = _replica_cache(caminho, "pptx")
+        assert reiniciada.obter("deck") == b"PK\x03\x04..."
+
+
+class TestSessoes:
+    def test_sessao_restaurada_em_outra_replica(self, tmp_path):
+        caminho = str(tmp_path / "kv.sqlite")
+        estado = {
+            "etapa": 3,
+            "cliente": ClienteBasicInfo("Cliente", "Projeto", "area_1_linhas_montagem", "media"),
+            "dores": DoresSelecionadas(f01_mao_de_obra_direta=True),
+            "nome_cliente": "Cliente",
+            "parametros_erros": {"F02": []},
+            "pptx_buffer": io.BytesIO(b"deck"),
+            "proximo_3": False,
+        }
+        salvar_sessao(ArmazenamentoSQLite(caminho), "tok", estado)
+
+        restaurado = restaurar_sessao(ArmazenamentoSQLite(caminho), "tok")
+        assert restaurado["etapa"] == 3
+        assert restaurado["cliente"] == estado["cliente"]
+        assert restaurado["dores"].f01_mao_de_obra_direta
+        assert restaurado["parametros_erros"] == {"F02": []}
+        assert "pptx_buffer" not in restaurado
+        assert "proximo_3" not in restaurado
+
+    def test_so_grava_quando_o_estado_muda(self, tmp_path):
+        arm = ArmazenamentoSQLite(str(tmp_path / "kv.sqlite"))
+        escritas = []
+        definir_original = arm.definir
+        arm.definir = lambda *args, **kwargs: (escritas.append(args[1]), definir_original(*args, **kwargs))
+
+        digest = salvar_sessao(arm, "tok", {"etapa": 1})
+        digest = salvar_sessao(arm, "tok", {"etapa": 1}, digest)
+        salvar_sessao(arm, "tok", {"etapa": 2}, digest)
+        assert escritas == ["tok", "tok"]
+
+    def test_token_desconhecido(self, tmp_path):
+        assert restaurar_sessao(ArmazenamentoSQLite(str(tmp_path / "kv.sqlite")), "nao-existe") is None
@@ -0,0 +1,172 @@
+"""
+Testes da árvore de cenários de projetos em fases (core/arvore_cenarios.py).
+"""
+import math
+import time
+
+import pytest
+
+from core.arvore_cenarios import NoCenario, avaliar_arvore
+from core.calculator import ROICalculator
+from core.perfil_links import estado_representativo
+from models.inputs import DoresSelecionadas
+from models.results import MetasReducao
+
+TAXA = 0.12
+
+
+def _anuidade(inicio, horizonte=5, taxa=TAXA):
+    return sum((1 + taxa) ** -(ano + 1) for ano in range(inicio, horizonte))
+
+
+@pytest.fixture(scope="module")
+def entradas():
+    entradas = estado_representativo("area_1_linhas_montagem")
+    entradas["dores"] = DoresSelecionadas(f06_inspecao_manual=True, f10_paradas_linha=True)
+    return entradas
+
+
+@pytest.fixture(scope="module")
+def resultados(entradas):
+    return ROICalculator(**entradas).calcular()
+
+
+@pytest.fixture(scope="module")
+def custo_f06(resultados):
+    return resultados.custos_formulas[5]
+
+
+class TestFases:
+    def test_fase_unica_igual_ao_calculo(self, entradas, resultados):
+        investimento = entradas["investimento"].valor_investimento_medio
+        raiz = NoCenario("tudo", investimento, entradas["metas"])
+        avaliacao = avaliar_arvore(raiz, resultados)
+        assert avaliacao.paybacks == (pytest.approx((resultados.payback_anos, 1.0)),)
+        assert avaliacao.vpl_esperado == pytest.approx(
+            resultados.ganho_anual_potencial * _anuidade(0) - investimento
+        )
+
+    def test_no_de_acaso(self, resultados, custo_f06):
+        sucesso = NoCenario("meta atingida", delta_metas=MetasReducao(meta_f06=0.2))
+        fracasso = NoCenario("meta parcial")
+        raiz = NoCenario(
+            "inspeção", custo_f06, MetasReducao(meta_f06=0.5), anos=2,
+            filhos=[sucesso, fracasso], probabilidades=[0.7, 0.3],
+        )
+        avaliacao = avaliar_arvore(raiz, resultados)
+        base = custo_f06 * 0.5 * _anuidade(0) - custo_f06
+        assert avaliacao.vpl_esperado == pytest.approx(base + 0.7 * custo_f06 * 0.2 * _anuidade(2))
+        # Ganho de metade do custo: a parcela se paga no fim da fase, em qualquer ramo
+        assert avaliacao.paybacks == (pytest.approx((2.0, 1.0)),)
+        assert avaliacao.prob_payback_ate(2.0) == pytest.approx(1.0)
+
+    @pytest.mark.parametrize("parcela, escolhido", [(0.1, "robótica"), (10.0, "parar")])
+    def test_decisao_otima(self, resultados, custo_f06, parcela, escolhido):
+        robotica = NoCenario("robótica", custo_f06 * parcela, MetasReducao(meta_f06=0.3))
+        parar = NoCenario("parar")
+        decidir = NoCenario("decidir", anos=0, filhos=[robotica, parar], decisao=True)
+        raiz = NoCenario("inspeção", custo_f06, MetasReducao(meta_f06=0.4), filhos=[decidir], probabilidades=[1.0])
+        avaliacao = avaliar_arvore(raiz, resultados)
+        assert avaliacao.decisoes == {("decidir", 1): escolhido}
+
+        ramos = {"robótica": robotica, "parar": parar}
+        sem_decisao = NoCenario("inspeção", custo_f06, MetasReducao(meta_f06=0.4), filhos=[ramos[escolhido]], probabilidades=[1.0])
+        assert avaliacao.vpl_esperado == pytest.approx(avaliar_arvore(sem_decisao, resultados).vpl_esperado)
+
+    def test_parcela_posterior_reinicia_o_payback(self, resultados, custo_f06):
+        # Fase 1 se paga em 0,5 ano; a parcela da fase 2 deixa o caixa negativo de novo
+        ganho_1, ganho_2 = custo_f06 * 0.4, custo_f06 * 0.2
+        expansao = NoCenario("expansão", ganho_1 * 0.5 + 1.5 * (ganho_1 + ganho_2), MetasReducao(meta_f06=0.2))
+        raiz = NoCenario("inspeção", ganho_1 * 0.5, MetasReducao(meta_f06=0.4), filhos=[expansao], probabilidades=[1.0])
+        avaliacao = avaliar_arvore(raiz, resultados)
+        assert avaliacao.paybacks == (pytest.approx((2.5, 1.0)),)
+
+    def test_sem_ganho_nao_se_paga(self, resultados):
+        avaliacao = avaliar_arvore(NoCenario("sem metas", 1000.0), resultados)
+        assert avaliacao.paybacks == ((math.inf, 1.0),)
+        assert avaliacao.percentil_payback(50) == math.inf
+
+
+def _rede(profundidade, fator, compartilhada):
+    """Dois cenários por ano; com `compartilhada`, os dois pais de um ano apontam para os mesmos nós."""
+    anterior = [NoCenario(f"fim {i}", 0.0, MetasReducao(meta_f06=0.01 * (i + 1))) for i in range(2)]
+
+    def no(nivel, i, filhos):
+        return NoCenario(
+            f"{nivel}-{i}", fator * (i + 1), MetasReducao(meta_f06=0.02 * (i + 1)),
+            filhos=filhos, probabilidades=[0.4, 0.6],
+        )
+
+    for nivel in range(profundidade):
+        if compartilhada:
+            anterior = [no(nivel, i, anterior) for i in range(2)]
+        else:
+            anterior = [no(nivel, i, [_copiar(f) for f in anterior]) for i in range(2)]
+    return NoCenario("raiz", filhos=anterior, probabilidades=[0.5, 0.5])
+
+
+def _copiar(no):
+    return NoCenario(no.nome, no.investimento, no.delta_metas, no.anos, [_copiar(f) for f in no.filhos], no.probabilidades)
+
+
+class TestInducaoRetroativa:
+    def test_subarvores_compartilhadas_avaliadas_uma_vez(self, resultados, custo_f06):
+        compartilhada = avaliar_arvore(_rede(8, custo_f06 * 0.01, True), resultados, horizonte_anos=10)
+        expandida = avaliar_arvore(_rede(8, custo_f06 * 0.01, False), resultados, horizonte_anos=10)
+        assert compartilhada.vpl_esperado == pytest.approx(expandida.vpl_esperado, rel=1e-12)
+        assert sum(p for _, p in compartilhada.paybacks) == pytest.approx(1.0)
+        assert compartilhada.percentil_payback(50) == pytest.approx(expandida.percentil_payback(50))
+        assert compartilhada.nos_avaliados == 1 + 2 * 9
+        assert expandida.nos_avaliados > 1000
+
+    def test_milhares_de_nos_rapido(self, resultados, custo_f06):
+        def arvore(nivel):
+            filhos = [arvore(nivel - 1) for _ in range(3)] if nivel else []
+            return NoCenario(
+                f"n{nivel}", custo_f06 * 0.05, MetasReducao(meta_f06=0.02),
+                filhos=filhos, probabilidades=[0.2, 0.5, 0.3] if filhos else None,
+            )
+
+        raiz = arvore(7)
+        inicio = time.perf_counter()
+        avaliacao = avaliar_arvore(raiz, resultados, horizonte_anos=10)
+        decorrido = time.perf_counter() - inicio
+        assert avaliacao.nos_avaliados == 3280
+        assert decorrido < 0.5  # ~15 ms; folga para máquinas de CI
+
+    @pytest.mark.parametrize("fator", [0.05, 0.5])
+    def test_rede_profunda_sem_enumerar_caminhos(self, resultados, custo_f06, fator):
+        # 51 nós, 2^24 caminhos: a distribuição do payback é propagada por estado do caixa
+        inicio = time.perf_counter()
+        avaliacao = avaliar_arvore(_rede(24, custo_f06 * fator, True), resultados, horizonte_anos=30)
+        decorrido = time.perf_counter() - inicio
+        assert avaliacao.nos_avaliados == 1 + 2 * 25
+        assert sum(p for _, p in avaliacao.paybacks) == pytest.approx(1.0)
+        assert decorrido < 1  # ~60 ms; folga para máquinas de CI
+
+    def test_cadeia_longa_sem_recursao(self, resultados, custo_f06):
+        no = NoCenario("fim", custo_f06 * 0.01, MetasReducao(meta_f06=0.01))
+        for fase in range(3000):
+            no = NoCenario(f"fase {fase}", custo_f06 * 0.01, MetasReducao(meta_f06=0.01), filhos=[no], probabilidades=[1.0])
+        avaliacao = avaliar_arvore(no, resultados, horizonte_anos=10)
+        assert avaliacao.nos_avaliados == 3001
+        # Cada fase paga 1% do custo e soma 1% ao ganho: a 2ª parcela se paga no meio do 2º ano e,
+        # dali em diante, o caixa do ano anterior cobre cada parcela
+        assert avaliacao.paybacks == (pytest.approx((1.5, 1.0)),)
+
+
+class TestValidacao:
+    def test_probabilidades(self):
+        raiz = NoCenario("raiz", filhos=[NoCenario("a"), NoCenario("b")], probabilidades=[0.5, 0.4])
+        with pytest.raises(ValueError, match="somar 1"):
+            avaliar_arvore(raiz, None)
+
+    def test_ciclo(self):
+        raiz = NoCenario("raiz", probabilidades=[1.0])
+        raiz.filhos = [NoCenario("filho", filhos=[raiz], probabilidades=[1.0])]
+        with pytest.raises(ValueError, match="Ciclo"):
+            avaliar_arvore(raiz, None)
+
+    def test_decisao_sem_opcoes(self):
+        with pytest.raises(ValueError, match="decisão"):
+            avaliar_arvore(NoCenario("decidir", decisao=True), None)
@@ -0,0 +1,122 @@
+"""
+Testes da atribuição de Shapley (core/atribuicao.py).
+"""
+import itertools
+import math
+import random
+from dataclasses import replace
+
+import pytest
+
+from core.atribuicao import atribuicao_shapley, valores_shapley
+from core.cache import obter_cache
+from core.calculator import ROICalculator
+from core.perfil_links import estado_representativo
+from models.inputs import DoresSelecionadas, InvestimentoAutomacao
+from models.results import CAMPOS_BREAKDOWN, MetasReducao
+
+
+def _por_permutacoes(ganhos, valor):
+    """Definição: contribuição marginal média sobre todas as ordens."""
+    contribuicoes = [0.0] * len(ganhos)
+    for ordem in itertools.permutations(range(len(ganhos))):
+        soma = 0.0
+        for i in ordem:
+            contribuicoes[i] += valor(soma + ganhos[i]) - valor(soma)
+            soma += ganhos[i]
+    return [c / math.factorial(len(ganhos)) for c in contribuicoes]
+
+
+def _anos_reduzidos(investimento, horizonte=5.0):
+    return lambda ganho: horizonte - min(investimento / ganho, horizonte) if ganho > 0 else 0.0
+
+
+class TestValoresShapley:
+    @pytest.mark.parametrize("k", [1, 2, 3, 5, 7])
+    def test_igual_a_definicao(self, k):
+        rng = random.Random(k)
+        ganhos = [rng.uniform(1, 100) for _ in range(k)]
+        valor = _anos_reduzidos(150.0)
+        assert valores_shapley(ganhos, valor) == pytest.approx(_por_permutacoes(ganhos, valor), rel=1e-12, abs=1e-12)
+
+    def test_eficiencia_e_simetria_com_18_formulas(self):
+        ganhos = [1_000.0 * (1 + i % 6) for i in range(18)]
+        valor = _anos_reduzidos(40_000.0)
+        contribuicoes = valores_shapley(ganhos, valor)
+        assert sum(contribuicoes) == pytest.approx(valor(sum(ganhos)) - valor(0.0))
+        assert contribuicoes[0] == pytest.approx(contribuicoes[6]) == pytest.approx(contribuicoes[12])
+        assert contribuicoes[5] > contribuicoes[0]
+
+    def test_sem_jogadores(self):
+        assert valores_shapley([], _anos_reduzidos(1.0)) == []
+
+
+class TestAtribuicao:
+    @pytest.fixture
+    def entradas(self):
+        entradas = estado_representativo("area_3_controle_qualidade")
+        entradas["dores"] = DoresSelecionadas(f01_mao_de_obra_direta=True, f06_inspecao_manual=True, f18_gestao_dados=True)
+        entradas["metas"] = MetasReducao(meta_f06=0.6, meta_f18=0.4)  # F01 sem meta: jogador nulo
+        return entradas
+
+    def _investimento_para_payback(self, entradas, anos):
+        ganho = ROICalculator(**entradas).calcular().ganho_anual_potencial
+        return InvestimentoAutomacao(ganho * anos, ganho * anos)
+
+    def test_soma_payback_e_roi(self, entradas):
+        entradas["investimento"] = self._investimento_para_payback(entradas, 1.4)
+        resultados = ROICalculator(**entradas).calcular()
+        atribuicao = atribuicao_shapley(resultados, entradas["metas"], entradas["investimento"])
+
+        assert atribuicao.codigos == ("F06", "F18")
+        assert atribuicao.rotulos == ("F06 - Inspeção Manual", "F18 - Gestão de Dados")
+        assert sum(atribuicao.payback_anos) == pytest.approx(atribuicao.horizonte_anos - resultados.payback_anos)
+        rois = (resultados.roi_1_ano, resultados.roi_2_anos, resultados.roi_3_anos, resultados.roi_4_anos, resultados.roi_5_anos)
+        for contribuicoes, roi in zip(atribuicao.roi, rois):
+            assert sum(contribuicoes) == pytest.approx(roi + 100)
+
+    def test_roi_igual_a_enumeracao(self, entradas):
+        resultados = ROICalculator(**entradas).calcular()
+        atribuicao = atribuicao_shapley(resultados, entradas["metas"], entradas["investimento"])
+        investimento = entradas["investimento"].valor_investimento_medio
+        for anos, contribuicoes in enumerate(atribuicao.roi, start=1):
+            enumeradas = valores_shapley(atribuicao.ganhos, lambda g: (g * anos - investimento) / investimento * 100)
+            assert contribuicoes == pytest.approx(enumeradas)
+
+    def test_payback_nao_e_a_fatia_do_ganho(self, entradas):
+        # Nenhuma das duas fórmulas paga o investimento sozinha no horizonte: só juntas reduzem o
+        # payback, então dividem a redução igualmente, apesar de ganhos diferentes
+        entradas["investimento"] = self._investimento_para_payback(entradas, 4.0)
+        resultados = ROICalculator(**entradas).calcular()
+        atribuicao = atribuicao_shapley(resultados, entradas["metas"], entradas["investimento"])
+        total = sum(atribuicao.payback_anos)
+        fatias = [g / sum(atribuicao.ganhos) * total for g in atribuicao.ganhos]
+        assert atribuicao.payback_anos != pytest.approx(fatias)
+        assert atribuicao.payback_anos == pytest.approx([total / 2, total / 2])
+
+    def test_payback_acima_do_horizonte_satura(self, entradas):
+        entradas["investimento"] = self._investimento_para_payback(entradas, 7.0)
+        resultados = ROICalculator(**entradas).calcular()
+        atribuicao = atribuicao_shapley(resultados, entradas["metas"], entradas["investimento"])
+        assert resultados.payback_anos > atribuicao.horizonte_anos
+        assert atribuicao.payback_anos == (0.0, 0.0)  # soma = H − min(payback, H) = 0
+
+    def test_chave_inclui_rotulos(self, entradas):
+        resultados = ROICalculator(**entradas).calcular()
+        primeira = atribuicao_shapley(resultados, entradas["metas"], entradas["investimento"])
+        # Mesmos ganhos, outra composição de rótulos: não pode reaproveitar a entrada do cache
+        nome = next(n for n in CAMPOS_BREAKDOWN if "F06 - Inspeção Manual" in getattr(resultados, n))
+        breakdown = {r.replace("Inspeção Manual", "Inspeção Visual"): v for r, v in getattr(resultados, nome).items()}
+        outra = atribuicao_shapley(replace(resultados, **{nome: breakdown}), entradas["metas"], entradas["investimento"])
+        assert outra.ganhos == primeira.ganhos
+        assert outra.rotulos[0] == "F06 - Inspeção Visual"
+
+    def test_memoizada_por_cenario(self, entradas):
+        resultados = ROICalculator(**entradas).calcular()
+        cache = obter_cache("atribuicao")
+        cache.limpar()
+        primeira = atribuicao_shapley(resultados, entradas["metas"], entradas["investimento"])
+        assert atribuicao_shapley(resultados, entradas["metas"], entradas["investimento"]) is primeira
+        outra = atribuicao_shapley(resultados, MetasReducao(meta_f06=0.6, meta_f18=0.5), entradas["investimento"])
+        assert outra is not primeira
+        assert len(cache) == 2
@@ -0,0 +1,89 @@
+"""
+Testes da tabela de benchmarks (config/benchmarks.py, core/benchmarks.py).
+"""
+from dataclasses import replace
+
+import pytest
+
+from config.benchmarks import FAIXAS_NACIONAIS, FATORES_REGIONAIS
+from core.benchmarks import Faixa, TabelaBenchmarks, obter_tabela, variacoes_montecarlo
+from core.montecarlo import simular_montecarlo
+from core.perfil_links import estado_representativo
+from core.validators import validar_cliente
+
+AREA = "area_3_controle_qualidade"
+
+
+@pytest.fixture
+def tabela():
+    nacionais = {
+        "salario_medio_operador": (2_000.0, 2_500.0, 3_000.0),
+        "f10_paradas_mes": (0, 4, 20),
+        "f05_percentual_refugo": (0.002, 0.01, 0.08),
+    }
+    celulas = {
+        ("*", "pequena", "brasil"): {"f10_paradas_mes": (0, 2, 10)},
+        ("*", "grande", "brasil"): {"f10_paradas_mes": (2, 7, 30), "salario_medio_operador": (2_400.0, 3_000.0, 4_000.0)},
+        (AREA, "*", "brasil"): {"f05_percentual_refugo": (0.005, 0.02, 0.10)},
+        ("*", "*", "norte"): {"salario_medio_operador": (1_900.0, 2_300.0, 2_800.0)},
+    }
+    return TabelaBenchmarks(nacionais, celulas, versao="teste")
+
+
+class TestTabelaBenchmarks:
+    def test_interpola_porte_ausente(self, tabela):
+        assert tabela.faixas(AREA, "pequena")["f10_paradas_mes"] == Faixa(0, 2, 10)
+        assert tabela.faixas(AREA, "media")["f10_paradas_mes"] == Faixa(1, 4, 20)  # inteiros arredondados
+        assert tabela.faixas(AREA, "grande")["f10_paradas_mes"] == Faixa(2, 7, 30)
+
+    def test_sem_vizinho_definido_usa_nivel_seguinte(self, tabela):
+        # Só "grande" define o salário: pequena e média não extrapolam, ficam com o nacional
+        assert tabela.faixas(AREA, "pequena")["salario_medio_operador"].tipico == 2_500.0
+        assert tabela.faixas(AREA, "media")["salario_medio_operador"].tipico == 2_500.0
+
+    def test_celula_da_area_vale_para_todos_os_portes(self, tabela):
+        for porte in ("pequena", "media", "grande"):
+            assert tabela.faixas(AREA, porte)["f05_percentual_refugo"].tipico == 0.02
+        assert tabela.faixas("area_4_embalagem", "media")["f05_percentual_refugo"].tipico == 0.01
+
+    def test_regiao(self, tabela):
+        nordeste = tabela.faixas(AREA, "grande", "nordeste")
+        assert nordeste["salario_medio_operador"].tipico == pytest.approx(3_000.0 * FATORES_REGIONAIS["nordeste"])
+        assert nordeste["f10_paradas_mes"] == Faixa(2, 7, 30)  # não monetário: sem fator
+        assert tabela.faixas(AREA, "grande", "norte")["salario_medio_operador"].tipico == 2_300.0  # célula própria
+
+    def test_chaves_desconhecidas(self, tabela):
+        assert tabela.faixas("area_inexistente", "media", "marte") == tabela.faixas("*", "media", "brasil")
+        with pytest.raises(ValueError):
+            TabelaBenchmarks({}, {("*", "gigante", "brasil"): {}})
+
+    def test_tabela_padrao_completa_e_coerente(self):
+        tabela = obter_tabela()
+        assert obter_tabela() is tabela
+        for (area, porte, regiao), faixas in tabela._indice.items():
+            assert set(faixas) == set(FAIXAS_NACIONAIS)
+            for campo, faixa in faixas.items():
+                assert faixa.minimo <= faixa.tipico <= faixa.maximo, (area, porte, regiao, campo)
+
+
+class TestUsos:
+    def test_regiao_e_area_validadas(self):
+        cliente = estado_representativo(AREA)["cliente"]
+        assert validar_cliente(replace(cliente, regiao="sul")) == []
+        assert validar_cliente(replace(cliente, regiao="marte"))
+        assert validar_cliente(replace(cliente, area_atuacao="area_99_inexistente"))
+
+    def test_variacoes_montecarlo(self):
+        cliente = estado_representativo(AREA)["cliente"]
+        variacoes = variacoes_montecarlo(cliente, ["F01", "F05", "F07"])
+        assert set(variacoes) == {"F05", "F07"}  # F01 não tem parâmetros próprios
+        assert all(0.05 <= v <= 0.6 for v in variacoes.values())
+
+    def test_montecarlo_com_variacoes_por_formula(self):
+        estado = estado_representativo(AREA)
+        fixo = simular_montecarlo(**estado, iteracoes=200, variacao=0.0, semente=1)
+        assert fixo.ganho_anual.p05 == pytest.approx(fixo.ganho_anual.p95)
+        variado = simular_montecarlo(**estado, iteracoes=200, variacao=0.0, semente=1, variacoes={"F05": 0.5})
+        assert variado.ganho_anual.p05 < variado.ganho_anual.p95
+        with pytest.raises(ValueError):
+            simular_montecarlo(**estado, iteracoes=10, variacoes={"F05": 1.0})
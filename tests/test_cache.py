@@ -0,0 +1,75 @@
+"""
+Testes unitários para core/cache.py
+"""
+import pytest
+
+from core.cache import CacheTTL, chave_entradas
+from models.inputs import DoresSelecionadas, InvestimentoAutomacao, ParametrosDetalhados
+
+
+class RelogioFalso:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+
+class TestChaveEntradas:
+    def test_int_e_float_geram_mesma_chave(self):
+        a = ParametrosDetalhados(f10_paradas_mes=4)
+        b = ParametrosDetalhados(f10_paradas_mes=4.0)
+        assert chave_entradas(a) == chave_entradas(b)
+
+    def test_dores_pela_mascara(self):
+        a = DoresSelecionadas(f01_mao_de_obra_direta=True, f05_refugo_retrabalho=True)
+        b = DoresSelecionadas.de_mascara(a.mascara)
+        assert chave_entradas(a) == chave_entradas(b)
+        assert chave_entradas(a) != chave_entradas(DoresSelecionadas(f01_mao_de_obra_direta=True))
+
+    def test_entradas_diferentes_geram_chaves_diferentes(self):
+        a = InvestimentoAutomacao(valor_investimento_min=400_000.0, valor_investimento_max=600_000.0)
+        b = InvestimentoAutomacao(valor_investimento_min=400_000.0, valor_investimento_max=600_001.0)
+        assert chave_entradas(a) != chave_entradas(b)
+
+
+class TestCacheTTL:
+    def test_acerto_e_falha(self):
+        cache = CacheTTL("t", ttl_segundos=10, max_entradas=4)
+        chamadas = []
+
+        def calcular():
+            chamadas.append(1)
+            return 42
+
+        assert cache.obter_ou_calcular("k", calcular) == 42
+        assert cache.obter_ou_calcular("k", calcular) == 42
+        assert len(chamadas) == 1
+        assert cache.metricas.acertos == 1
+        assert cache.metricas.falhas == 1
+        assert cache.metricas.taxa_acerto == pytest.approx(0.5)
+
+    def test_expira_apos_ttl(self):
+        relogio = RelogioFalso()
+        cache = CacheTTL("t", ttl_segundos=10, max_entradas=4, relogio=relogio)
+        cache.definir("k", "v")
+        relogio.agora = 9.9
+        assert cache.obter("k") == "v"
+        relogio.agora = 10.0
+        assert cache.obter("k") is None
+        assert cache.metricas.expiracoes == 1
+
+    def test_descarta_menos_usado_acima_do_limite(self):
+        cache = CacheTTL("t", ttl_segundos=10, max_entradas=2)
+        cache.definir("a", 1)
+        cache.definir("b", 2)
+        cache.obter("a")  # "b" passa a ser o menos usado
+        cache.definir("c", 3)
+        assert cache.obter("b") is None
+        assert cache.obter("a") == 1
+        assert len(cache) == 2
+        assert cache.metricas.descartes == 1
+
+    def test_max_entradas_invalido(self):
+        with pytest.raises(ValueError):
+            CacheTTL("t", ttl_segundos=10, max_entradas=0)
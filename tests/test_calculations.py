@@ -8,10 +8,11 @@ from models.inputs import (
     ClienteBasicInfo,
     ProcessoAtual,
     DoresSelecionadas,
+    Formula,
     ParametrosDetalhados,
     InvestimentoAutomacao,
 )
-from models.results import MetasReducao
+from models.results import MetasReducao, por_codigo
 
 
 @pytest.fixture
@@ -120,6 +121,22 @@ class TestCalculoCompleto:
         # Payback: 500.000 / 255.000 ≈ 1.96
         assert resultado.payback_anos == pytest.approx(1.9607, rel=1e-2)
 
+    def test_dores_pela_mascara(self, cliente_padrao, processo_padrao, investimento_padrao):
+        """A máscara de fórmulas equivale às flags de `DoresSelecionadas`."""
+        comum = dict(
+            cliente=cliente_padrao,
+            processo=processo_padrao,
+            parametros=ParametrosDetalhados(),
+            investimento=investimento_padrao,
+            metas=MetasReducao(meta_f01=0.5),
+        )
+        por_flags = ROICalculator(dores=DoresSelecionadas(f01_mao_de_obra_direta=True), **comum).calcular()
+        por_mascara = ROICalculator(dores=Formula.F01, **comum).calcular()
+        por_inteiro = ROICalculator(dores=1, **comum).calcular()
+
+        assert por_mascara == por_flags
+        assert por_inteiro == por_flags
+
     def test_breakdown_preenchido(self, cliente_padrao, processo_padrao, investimento_padrao):
         """Múltiplas dores selecionadas devem somar corretamente."""
         dores = DoresSelecionadas(
@@ -144,6 +161,37 @@ class TestCalculoCompleto:
         assert resultado.breakdown_dor1["F01 - Mão de Obra Direta"] == 510_000
         assert resultado.breakdown_dor2["F07 - Escapes de Qualidade"] == 24_000
 
+    def test_vetores_por_formula(self, cliente_padrao, processo_padrao, investimento_padrao):
+        """Custos e metas como vetores F01…F18: o ganho é o produto escalar."""
+        dores = DoresSelecionadas(f01_mao_de_obra_direta=True, f05_refugo_retrabalho=True)
+        parametros = ParametrosDetalhados(
+            f05_percentual_refugo=0.02,
+            f05_percentual_retrabalho=0.03,
+            f05_horas_retrabalho_por_unidade=0.2,
+        )
+        metas = MetasReducao.de_vetor([0.5, 0, 0, 0, 0.25] + [0] * 13)
+        assert metas.meta_f05 == 0.25
+        assert list(metas.vetor) == list(metas.valores)
+
+        resultado = ROICalculator(
+            cliente=cliente_padrao,
+            processo=processo_padrao,
+            dores=dores,
+            parametros=parametros,
+            investimento=investimento_padrao,
+            metas=metas,
+        ).calcular()
+
+        custos = por_codigo(resultado.custos_formulas)
+        assert custos["F01"] == 510_000
+        assert custos["F05"] == pytest.approx(
+            resultado.breakdown_dor2["F05 - Refugo"] + resultado.breakdown_dor2["F05 - Retrabalho"]
+        )
+        assert sum(custos.values()) == pytest.approx(resultado.custo_total_anual_inacao)
+        assert resultado.ganho_anual_potencial == pytest.approx(0.5 * custos["F01"] + 0.25 * custos["F05"])
+        with pytest.raises(ValueError):
+            MetasReducao.de_vetor([0.5] * 17)
+
 
 class TestInvestimento:
     def test_investimento_medio(self):
@@ -152,3 +200,65 @@ class TestInvestimento:
             valor_investimento_max=600_000.0,
         )
         assert inv.valor_investimento_medio == 500_000.0
+
+
+class TestRastreio:
+    def test_sem_rastreio_por_padrao(self, cliente_padrao, processo_padrao, investimento_padrao):
+        calc = ROICalculator(
+            cliente=cliente_padrao,
+            processo=processo_padrao,
+            dores=DoresSelecionadas(f01_mao_de_obra_direta=True),
+            parametros=ParametrosDetalhados(),
+            investimento=investimento_padrao,
+            metas=MetasReducao(),
+        )
+        assert calc.calcular().rastreio is None
+
+    def test_rastreio_registra_entradas_e_resultado(self, cliente_padrao, processo_padrao, investimento_padrao):
+        dores = DoresSelecionadas(f01_mao_de_obra_direta=True, f02_horas_extras=True)
+        calc = ROICalculator(
+            cliente=cliente_padrao,
+            processo=processo_padrao,
+            dores=dores,
+            parametros=ParametrosDetalhados(f02_media_he_mes_por_pessoa=10.0),
+            investimento=investimento_padrao,
+            metas=MetasReducao(),
+        )
+        resultado = calc.calcular(rastrear=True)
+        rastreio = resultado.rastreio
+
+        assert [p.codigo for p in rastreio.passos] == ["F01", "F02"]
+        f01 = rastreio.passo("F01")
+        assert f01.entradas == {"num_operadores": 10, "salario_medio": 2500.0, "fator_encargos": 1.7}
+        assert f01.resultado == resultado.breakdown_dor1["F01 - Mão de Obra Direta"]
+        # Hora base HE: (2500 × 1,7) / 220
+        assert rastreio.passo("F02").intermediarios["custo_hora_he"] == pytest.approx(19.318, rel=1e-3)
+        # CHP: 1.760.000 / (8 × 2 × 250/12) = 5.280/h
+        assert rastreio.bases["custo_hora_parada"] == pytest.approx(5_280.0)
+
+    def test_rastreio_registra_fallback_custo_hora_parada(self, cliente_padrao, processo_padrao, investimento_padrao):
+        dores = DoresSelecionadas(f10_paradas_linha=True, f11_setup_changeover=True)
+        parametros = ParametrosDetalhados(
+            f10_paradas_mes=4,
+            f10_duracao_media_parada_horas=1.0,
+            f10_custo_hora_parada=0.0,  # 0 → usa o CHP derivado do faturamento
+            f11_setups_mes=10,
+            f11_horas_por_setup=0.5,
+            f11_custo_hora_parada=2_000.0,
+        )
+        calc = ROICalculator(
+            cliente=cliente_padrao,
+            processo=processo_padrao,
+            dores=dores,
+            parametros=parametros,
+            investimento=investimento_padrao,
+            metas=MetasReducao(),
+        )
+        rastreio = calc.calcular(rastrear=True).rastreio
+
+        f10 = rastreio.passo("F10")
+        assert f10.fontes["custo_hora_parada"] == "bases.custo_hora_parada"
+        assert f10.entradas["custo_hora_parada"] == pytest.approx(5_280.0)
+        f11 = rastreio.passo("F11")
+        assert f11.fontes["custo_hora_parada"] == "parametros.f11_custo_hora_parada"
+        assert f11.resultado == pytest.approx(10 * 0.5 * 2_000.0 * 12)
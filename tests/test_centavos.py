@@ -0,0 +1,102 @@
+"""
+Testes do modo exato em centavos (core/centavos.py), inclusive o diferencial contra o cálculo em float.
+"""
+import random
+from dataclasses import fields, replace
+
+import pytest
+
+from config.areas import AREAS_ARV, MASCARAS_AREAS
+from core.calculator import ROICalculator
+from core.centavos import calcular_exato, centavos
+from core.perfil_links import estado_representativo
+from models.inputs import DoresSelecionadas, ParametrosDetalhados
+from models.results import MetasReducao
+
+_BREAKDOWNS = ("breakdown_dor1", "breakdown_dor2", "breakdown_dor3", "breakdown_dor4", "breakdown_dor5")
+
+
+def _casos(quantidade_por_area: int):
+    """Entradas variadas: subconjuntos das fórmulas da área, parâmetros e metas perturbados."""
+    rng = random.Random(43)
+    for area in AREAS_ARV:
+        base = estado_representativo(area)
+        for _ in range(quantidade_por_area):
+            mascara = MASCARAS_AREAS[area] & rng.getrandbits(18)
+            parametros = {}
+            for campo in fields(ParametrosDetalhados):
+                valor = getattr(base["parametros"], campo.name)
+                if isinstance(valor, float):
+                    parametros[campo.name] = round(valor * rng.uniform(0.5, 1.5), 4 if valor < 1 else 2)
+            yield dict(
+                base,
+                dores=DoresSelecionadas.de_mascara(mascara),
+                parametros=replace(base["parametros"], **parametros),
+                processo=replace(base["processo"], salario_medio_operador=round(rng.uniform(1_800, 4_000), 2)),
+                metas=MetasReducao(*(round(rng.random(), 2) for _ in range(18))),
+            )
+
+
+class TestArredondamento:
+    def test_meio_centavo_para_cima(self):
+        assert centavos(0.125) == 13
+        assert centavos(0.005) == 1
+        assert centavos(0.0049) == 0
+        assert centavos(-0.125) == -13
+        assert centavos(2.675) == 268  # em float, round(2.675, 2) == 2.67
+
+    def test_linhas_decimais_exatas(self):
+        entradas = estado_representativo("area_3_controle_qualidade")
+        entradas["dores"] = DoresSelecionadas(f07_escapes_qualidade=True)
+        entradas["parametros"] = replace(
+            entradas["parametros"], f07_reclamacoes_clientes_ano=3, f07_custo_medio_por_reclamacao=0.1
+        )
+        entradas["metas"] = MetasReducao(meta_f07=0.5)
+
+        assert ROICalculator(**entradas).calcular().breakdown_dor2["F07 - Escapes de Qualidade"] != 0.3
+        exato = calcular_exato(**entradas)
+        assert exato.breakdown_dor2["F07 - Escapes de Qualidade"] == 0.3
+        assert exato.ganho_anual_potencial == 0.15
+
+
+class TestDiferencial:
+    @pytest.mark.parametrize("entradas", list(_casos(8)))
+    def test_igual_ao_float_dentro_da_tolerancia(self, entradas):
+        aprox = ROICalculator(**entradas).calcular()
+        exato = calcular_exato(**entradas)
+
+        linhas = 0
+        for nome in _BREAKDOWNS:
+            for rotulo, valor in getattr(aprox, nome).items():
+                linhas += 1
+                assert getattr(exato, nome)[rotulo] == pytest.approx(valor, rel=1e-12, abs=0.005 + 1e-9)
+        assert exato.custo_total_anual_inacao == pytest.approx(aprox.custo_total_anual_inacao, rel=1e-12, abs=0.005 * linhas)
+        assert exato.ganho_anual_potencial == pytest.approx(aprox.ganho_anual_potencial, rel=1e-12, abs=0.01 * 18)
+        assert exato.investimento_medio == pytest.approx(aprox.investimento_medio, abs=0.005)
+        if aprox.ganho_anual_potencial > 1:
+            # Payback/ROI herdam o arredondamento do ganho (até 0,18 R$) e do investimento
+            rel = 0.18 / aprox.ganho_anual_potencial + 0.005 / aprox.investimento_medio + 1e-9
+            assert exato.payback_anos == pytest.approx(aprox.payback_anos, rel=rel)
+            assert exato.roi_5_anos + 100 == pytest.approx(aprox.roi_5_anos + 100, rel=rel)
+
+    def test_totais_batem_com_as_linhas(self):
+        carteira = [calcular_exato(**entradas) for entradas in _casos(4)]
+        for exato in carteira:
+            linhas = [centavos(v) for nome in _BREAKDOWNS for v in getattr(exato, nome).values()]
+            assert centavos(exato.custo_total_anual_inacao) == sum(linhas)
+            for indice, nome in enumerate(_BREAKDOWNS, start=1):
+                assert centavos(getattr(exato, f"total_dor{indice}")) == sum(
+                    centavos(v) for v in getattr(exato, nome).values()
+                )
+        # Carteira: a soma dos totais em centavos é a soma de todas as linhas
+        assert sum(centavos(r.custo_total_anual_inacao) for r in carteira) == sum(
+            centavos(v) for r in carteira for nome in _BREAKDOWNS for v in getattr(r, nome).values()
+        )
+
+    def test_rastreio_em_float(self):
+        entradas = estado_representativo("area_1_linhas_montagem")
+        rastreio = calcular_exato(**entradas, rastrear=True).rastreio
+        assert rastreio.passos
+        for passo in rastreio.passos:
+            assert isinstance(passo.resultado, float)
+            assert all(not hasattr(v, "n") for v in passo.entradas.values())
@@ -0,0 +1,98 @@
+"""
+Testes do codec binário do estado do wizard (core/codec_estado.py) e dos modelos com __slots__.
+"""
+import pickle
+import sys
+
+import pytest
+
+from core.calculator import ROICalculator
+from core.codec_estado import (
+    ErroCodec,
+    codificar_estado,
+    codificar_modelo,
+    decodificar_estado,
+    decodificar_modelo,
+)
+from models.inputs import (
+    ClienteBasicInfo,
+    DoresSelecionadas,
+    InvestimentoAutomacao,
+    ParametrosDetalhados,
+    ProcessoAtual,
+)
+from models.results import MetasReducao
+
+
+@pytest.fixture
+def estado():
+    return {
+        "cliente": ClienteBasicInfo(
+            nome_cliente="Metalúrgica São João",
+            nome_projeto="Célula de solda",
+            area_atuacao="area_1_linhas_montagem",
+            porte_empresa="media",
+            fator_encargos=1.7,
+        ),
+        "processo": ProcessoAtual(cadencia_producao=10.0, faturamento_mensal_linha=1_760_000.0),
+        "dores": DoresSelecionadas(f01_mao_de_obra_direta=True, f10_paradas_linha=True),
+        "parametros": ParametrosDetalhados(f10_paradas_mes=4, f10_duracao_media_parada_horas=1.25),
+        "investimento": InvestimentoAutomacao(valor_investimento_min=400_000.0, valor_investimento_max=600_000.0),
+        "metas": MetasReducao(meta_f01=0.5, meta_f10=0.35),
+    }
+
+
+class TestCodecEstado:
+    def test_ida_e_volta(self, estado):
+        assert decodificar_estado(codificar_estado(estado)) == estado
+
+    def test_chaves_ausentes_sao_omitidas(self, estado):
+        parcial = {"cliente": estado["cliente"], "metas": None}
+        assert decodificar_estado(codificar_estado(parcial)) == {"cliente": estado["cliente"]}
+
+    def test_menor_que_pickle(self, estado):
+        compacto = codificar_estado(estado)
+        assert len(compacto) * 5 < len(pickle.dumps(estado))
+
+    def test_valores_especiais(self):
+        parametros = ParametrosDetalhados(f02_media_he_mes_por_pessoa=-3.5, f10_paradas_mes=2**40)
+        assert decodificar_modelo(ParametrosDetalhados, codificar_modelo(parametros)) == parametros
+
+    def test_blob_truncado_ou_de_outra_versao(self, estado):
+        blob = codificar_estado(estado)
+        with pytest.raises(ErroCodec):
+            decodificar_estado(blob[:-3])
+        with pytest.raises(ErroCodec):
+            decodificar_estado(bytes([99]) + blob[1:])
+
+    @pytest.mark.parametrize(
+        "modelo",
+        [
+            ProcessoAtual(cadencia_producao="10"),
+            ProcessoAtual(turnos_por_dia=True),
+            MetasReducao(meta_f05="0.3"),
+            DoresSelecionadas(f01_mao_de_obra_direta=1),
+        ],
+    )
+    def test_tipo_que_nao_confere_com_a_anotacao(self, modelo):
+        with pytest.raises(ErroCodec, match="tipo inválido"):
+            decodificar_modelo(type(modelo), codificar_modelo(modelo))
+
+    def test_blob_sem_campos_novos_usa_defaults(self):
+        # Blob de uma versão anterior do modelo, com só os 2 primeiros campos (tipo + double cada)
+        atual = codificar_modelo(MetasReducao(meta_f01=0.5, meta_f02=0.25))
+        antigo = bytes([2]) + atual[1:1 + 2 * 9]
+        assert decodificar_modelo(MetasReducao, antigo) == MetasReducao(meta_f01=0.5, meta_f02=0.25)
+
+
+class TestModelosCompactos:
+    def test_modelos_sem_dict_de_instancia(self, estado):
+        for obj in estado.values():
+            assert not hasattr(obj, "__dict__")
+
+    def test_rotulos_dos_breakdowns_internados(self, estado):
+        resultados = ROICalculator(**estado).calcular()
+        copia = pickle.loads(pickle.dumps(resultados))
+        rotulo = next(iter(copia.breakdown_dor1))
+        assert rotulo is sys.intern(rotulo)
+        assert copia == resultados
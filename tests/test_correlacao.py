@@ -0,0 +1,134 @@
+"""
+Testes das entradas correlacionadas do Monte Carlo (core/correlacao.py).
+"""
+import random
+import statistics
+
+import pytest
+
+from config.constants import MONTECARLO_CORRELACOES_PADRAO
+from core.calculator import ROICalculator
+from core.correlacao import (
+    EspecCorrelacao,
+    cholesky,
+    correlacao_mais_proxima,
+    fator_correlacao,
+    fatores_correlacionados,
+)
+from core.montecarlo import simular_montecarlo
+from core.perfil_links import estado_representativo
+from models.inputs import DoresSelecionadas, InvestimentoAutomacao
+from models.results import MetasReducao
+
+PARADAS_SETUPS = ("parametros.f10_paradas_mes", "parametros.f11_setups_mes")
+
+
+def _produto(fator):
+    n = len(fator)
+    return [[sum(fator[i][k] * fator[j][k] for k in range(n)) for j in range(n)] for i in range(n)]
+
+
+class TestMatriz:
+    def test_cholesky_reconstroi(self):
+        matriz = [[1.0, 0.6, 0.3], [0.6, 1.0, 0.5], [0.3, 0.5, 1.0]]
+        fator = cholesky(matriz)
+        assert all(fator[i][j] == 0 for i in range(3) for j in range(i + 1, 3))
+        for linha, esperada in zip(_produto(fator), matriz):
+            assert linha == pytest.approx(esperada)
+
+    def test_reparo_da_matriz_nao_positiva_definida(self):
+        # Correlações incompatíveis: a ~ b, b ~ c, mas a ~ −c
+        matriz = [[1.0, 0.9, -0.9], [0.9, 1.0, 0.9], [-0.9, 0.9, 1.0]]
+        with pytest.raises(ValueError):
+            cholesky(matriz)
+        reparada = correlacao_mais_proxima(matriz)
+        cholesky(reparada)
+        assert [reparada[i][i] for i in range(3)] == [1.0, 1.0, 1.0]
+        assert reparada[0][1] == pytest.approx(reparada[1][0])
+        # Solução conhecida do problema simétrico: ±0,5 fora da diagonal
+        assert reparada[0][1] == pytest.approx(0.5, abs=1e-4)
+        assert reparada[0][2] == pytest.approx(-0.5, abs=1e-4)
+
+    def test_fator_memoizado_e_reparo_informado(self):
+        espec = EspecCorrelacao.de_pares(MONTECARLO_CORRELACOES_PADRAO)
+        fator, reparada = fator_correlacao(espec)
+        assert not reparada
+        assert fator_correlacao(EspecCorrelacao.de_pares(MONTECARLO_CORRELACOES_PADRAO))[0] is fator
+
+        incompativel = EspecCorrelacao.de_pares(
+            [
+                ("processo.salario_medio_operador", "parametros.f03_salario_novato", 0.9),
+                ("parametros.f03_salario_novato", "parametros.f03_salario_supervisor", 0.9),
+                ("processo.salario_medio_operador", "parametros.f03_salario_supervisor", -0.9),
+            ]
+        )
+        assert fator_correlacao(incompativel)[1]
+
+    @pytest.mark.parametrize(
+        "pares",
+        [
+            [("processo.inexistente", "processo.salario_medio_operador", 0.5)],
+            [("processo.salario_medio_operador", "parametros.f03_salario_novato", 1.5)],
+            [("processo.salario_medio_operador", "processo.salario_medio_operador", 0.5)],
+            [],
+        ],
+    )
+    def test_especificacao_invalida(self, pares):
+        with pytest.raises(ValueError):
+            fator_correlacao(EspecCorrelacao.de_pares(pares))
+
+    def test_matriz_assimetrica(self):
+        espec = EspecCorrelacao(PARADAS_SETUPS, ((1.0, 0.5), (0.4, 1.0)))
+        with pytest.raises(ValueError):
+            fator_correlacao(espec)
+
+
+class TestSorteio:
+    def test_blocos_com_a_correlacao_pedida(self):
+        espec = EspecCorrelacao.de_pares([(*PARADAS_SETUPS, 0.8)])
+        blocos = list(fatores_correlacionados(espec, 0.3, random.Random(3), 5000))
+        assert [len(b) for b in blocos] == [1024, 1024, 1024, 1024, 904]
+        amostras = [f for bloco in blocos for f in bloco]
+        assert all(0.7 <= f <= 1.3 for fatores in amostras for f in fatores)
+        paradas, setups = zip(*amostras)
+        assert statistics.correlation(paradas, setups) == pytest.approx(0.8, abs=0.05)
+        assert statistics.mean(paradas) == pytest.approx(1.0, abs=0.01)
+
+
+class TestMonteCarloCorrelacionado:
+    @pytest.fixture
+    def entradas(self):
+        entradas = estado_representativo("area_1_linhas_montagem")
+        entradas["dores"] = DoresSelecionadas(f10_paradas_linha=True, f11_setup_changeover=True)
+        entradas["metas"] = MetasReducao(meta_f10=0.5, meta_f11=0.5)
+        ganho = ROICalculator(**entradas).calcular().ganho_anual_potencial
+        entradas["investimento"] = InvestimentoAutomacao(ganho * 2, ganho * 2)
+        return entradas
+
+    def _simular(self, entradas, rho):
+        espec = EspecCorrelacao.de_pares([(*PARADAS_SETUPS, rho)])
+        return simular_montecarlo(**entradas, iteracoes=3000, variacao=0.3, semente=11, correlacao=espec)
+
+    def test_correlacao_alarga_o_payback(self, entradas):
+        independente = self._simular(entradas, 0.0)
+        correlacionado = self._simular(entradas, 0.95)
+        assert independente.payback_anos.p50 == pytest.approx(2.0, rel=0.05)
+        amplitude = lambda r: r.payback_anos.p95 - r.payback_anos.p05
+        assert amplitude(correlacionado) > 1.15 * amplitude(independente)
+
+    def test_sem_variacao_reproduz_o_calculo(self, entradas):
+        resultado = simular_montecarlo(
+            **entradas, iteracoes=50, variacao=0.0, correlacao=EspecCorrelacao.de_pares([(*PARADAS_SETUPS, 0.7)])
+        )
+        assert resultado.payback_anos.p05 == pytest.approx(2.0)
+        assert resultado.payback_anos.p95 == pytest.approx(2.0)
+
+    def test_campos_sem_formula_afetada_nao_mudam_o_sorteio(self, entradas):
+        espec = EspecCorrelacao.de_pares([("processo.salario_medio_operador", "parametros.f03_salario_novato", 0.8)])
+        base = simular_montecarlo(**entradas, iteracoes=200, semente=5)
+        assert simular_montecarlo(**entradas, iteracoes=200, semente=5, correlacao=espec) == base
+
+    def test_especificacao_invalida(self, entradas):
+        espec = EspecCorrelacao(PARADAS_SETUPS, ((1.0, 2.0), (2.0, 1.0)))
+        with pytest.raises(ValueError):
+            simular_montecarlo(**entradas, iteracoes=10, correlacao=espec)
@@ -0,0 +1,128 @@
+"""
+Testes das derivadas por diferenciação automática (core/derivadas.py).
+"""
+import math
+from dataclasses import replace
+
+import pytest
+
+from config.areas import AREAS_ARV
+from core.calculator import ROICalculator
+from core.derivadas import calcular_derivadas
+from core.perfil_links import estado_representativo
+from models.inputs import DoresSelecionadas, ParametrosDetalhados, ProcessoAtual
+from models.results import MetasReducao
+
+INDICADORES = ("ganho_anual_potencial", "custo_total_anual_inacao", "payback_anos")
+
+
+def _diferenca_central(entradas, entrada, indicador):
+    grupo, campo = entrada.split(".")
+    x = getattr(entradas[grupo], campo)
+    h = max(abs(x), 1) * 1e-4
+
+    def f(valor):
+        perturbadas = dict(entradas, **{grupo: replace(entradas[grupo], **{campo: valor})})
+        return getattr(ROICalculator(**perturbadas).calcular(), indicador)
+
+    return (f(x + h) - f(x - h)) / (2 * h), h
+
+
+class TestGradiente:
+    @pytest.mark.parametrize("area", AREAS_ARV)
+    def test_valores_iguais_ao_calculo(self, area):
+        entradas = estado_representativo(area)
+        assert calcular_derivadas(**entradas).resultados == ROICalculator(**entradas).calcular()
+
+    @pytest.mark.parametrize("area", AREAS_ARV)
+    def test_confere_com_diferencas_finitas(self, area):
+        entradas = estado_representativo(area)
+        sensibilidades = calcular_derivadas(**entradas)
+        for indicador in INDICADORES:
+            gradiente = getattr(sensibilidades, indicador)
+            for entrada, derivada in zip(sensibilidades.entradas, gradiente.derivadas):
+                estimada, h = _diferenca_central(entradas, entrada, indicador)
+                # Fórmulas multilineares: só o arredondamento do float separa as duas
+                assert derivada == pytest.approx(estimada, rel=1e-4, abs=abs(gradiente.valor) * 1e-9 / h)
+
+
+class TestRamos:
+    @pytest.fixture
+    def entradas(self):
+        entradas = estado_representativo("area_1_linhas_montagem")
+        entradas["metas"] = MetasReducao(*([0.5] * 18))
+        return entradas
+
+    def test_bases_comuns(self, entradas):
+        entradas["dores"] = DoresSelecionadas(f01_mao_de_obra_direta=True, f18_gestao_dados=True)
+        s = calcular_derivadas(**entradas)
+        p, params, fator = entradas["processo"], entradas["parametros"], entradas["cliente"].fator_encargos
+        # F01 + F18 (via custo_hora_operador = salário × encargos / 176)
+        esperado = (
+            p.pessoas_processo_turno * p.turnos_por_dia * fator * 12
+            + params.f18_pessoas_envolvidas * params.f18_horas_dia_tarefas_dados * fator / 176 * p.dias_operacao_ano
+        ) * 0.5
+        assert s.derivada("ganho_anual_potencial", "processo.salario_medio_operador") == pytest.approx(esperado)
+        assert s.derivada("ganho_anual_potencial", "metas.meta_f01") == pytest.approx(s.resultados.breakdown_dor1["F01 - Mão de Obra Direta"])
+        assert s.derivada("ganho_anual_potencial", "metas.meta_f02") == 0.0
+
+    def test_fallbacks_f03_f14(self, entradas):
+        entradas["dores"] = DoresSelecionadas(f03_curva_aprendizagem=True, f14_supervisao=True)
+        entradas["processo"] = replace(entradas["processo"], supervisores_por_turno=2)
+        entradas["parametros"] = replace(
+            entradas["parametros"], f03_salario_novato=None, f14_num_supervisores=None, f14_salario_supervisor=None
+        )
+        s = calcular_derivadas(**entradas)
+        assert "parametros.f03_salario_novato" not in s.entradas
+        assert s.derivada("custo_total_anual_inacao", "processo.salario_medio_operador") > 0
+        # F14 com supervisores derivados de supervisores_por_turno × turnos_por_dia
+        p, fator = entradas["processo"], entradas["cliente"].fator_encargos
+        assert s.derivada("custo_total_anual_inacao", "processo.supervisores_por_turno") == pytest.approx(
+            p.turnos_por_dia * p.salario_medio_supervisor * fator * 12
+        )
+
+    @pytest.mark.parametrize("formula, campo", [("f10_paradas_linha", "f10_custo_hora_parada"), ("f11_setup_changeover", "f11_custo_hora_parada")])
+    def test_custo_hora_parada_informado_ou_derivado(self, entradas, formula, campo):
+        entradas["dores"] = DoresSelecionadas(**{formula: True})
+        entradas["processo"] = replace(entradas["processo"], faturamento_mensal_linha=500_000.0)
+
+        entradas["parametros"] = replace(entradas["parametros"], **{campo: 0.0})
+        derivado = calcular_derivadas(**entradas)
+        assert derivado.derivada("custo_total_anual_inacao", "processo.faturamento_mensal_linha") > 0
+        assert derivado.derivada("custo_total_anual_inacao", "processo.horas_por_turno") < 0
+        assert derivado.derivada("custo_total_anual_inacao", f"parametros.{campo}") == 0.0
+
+        entradas["parametros"] = replace(entradas["parametros"], **{campo: 900.0})
+        informado = calcular_derivadas(**entradas)
+        assert informado.derivada("custo_total_anual_inacao", "processo.faturamento_mensal_linha") == 0.0
+        assert informado.derivada("custo_total_anual_inacao", f"parametros.{campo}") > 0
+
+
+class TestIndicadores:
+    def test_payback_e_elasticidades(self):
+        entradas = estado_representativo("area_3_controle_qualidade")
+        s = calcular_derivadas(**entradas)
+        ganho = s.resultados.ganho_anual_potencial
+        assert s.derivada("payback_anos", "investimento.valor_investimento_min") == pytest.approx(0.5 / ganho)
+
+        # Payback ∝ investimento / ganho: elasticidade −1 no ganho total
+        elasticidades = s.elasticidades("payback_anos")
+        assert sum(v for k, v in elasticidades.items() if k.startswith("metas.")) == pytest.approx(-1.0)
+        assert sum(v for k, v in elasticidades.items() if k.startswith("investimento.")) == pytest.approx(1.0)
+
+    def test_sem_ganho(self):
+        entradas = estado_representativo("area_3_controle_qualidade")
+        entradas["metas"] = MetasReducao()
+        s = calcular_derivadas(**entradas)
+        assert s.payback_anos.valor == math.inf
+        assert all(math.isnan(d) for d in s.payback_anos.derivadas)
+        assert set(s.elasticidades("payback_anos").values()) == {0.0}
+
+    def test_entradas_none_ficam_de_fora(self):
+        entradas = estado_representativo("area_3_controle_qualidade")
+        entradas["processo"] = ProcessoAtual(producao_mensal=None, cadencia_producao=2.0)
+        entradas["parametros"] = ParametrosDetalhados()
+        s = calcular_derivadas(**entradas)
+        assert "processo.producao_mensal" not in s.entradas
+        assert "processo.cadencia_producao" in s.entradas
+        assert len(s.ganho_anual_potencial.derivadas) == len(s.entradas)
@@ -0,0 +1,69 @@
+"""
+Testes do esboço de quantis KLL (core/esbocos.py).
+"""
+import random
+from bisect import bisect_left
+
+import pytest
+
+from core.esbocos import EsbocoKLL
+
+
+@pytest.fixture
+def valores():
+    rng = random.Random(7)
+    return [rng.lognormvariate(10, 1) for _ in range(100_000)]
+
+
+def _erro_maximo(esboco, valores):
+    ordenados = sorted(valores)
+    return max(
+        abs(esboco.posto(v) - bisect_left(ordenados, v) / len(ordenados)) for v in ordenados[::500]
+    )
+
+
+class TestEsbocoKLL:
+    def test_erro_de_posto(self, valores):
+        esboco = EsbocoKLL(semente=1)
+        esboco.adicionar_varios(valores)
+        assert esboco.n == len(valores)
+        assert _erro_maximo(esboco, valores) < 0.02
+        assert sum(len(itens) for itens in esboco.niveis) < 1_000
+
+    def test_quantil(self, valores):
+        esboco = EsbocoKLL(semente=2)
+        esboco.adicionar_varios(valores)
+        ordenados = sorted(valores)
+        for q in (0.1, 0.5, 0.9):
+            assert bisect_left(ordenados, esboco.quantil(q)) / len(ordenados) == pytest.approx(q, abs=0.02)
+
+    def test_mesclar_equivale_a_um_esboco(self, valores):
+        partes = [EsbocoKLL(semente=i) for i in range(4)]
+        for i, valor in enumerate(valores):
+            partes[i % 4].adicionar(valor)
+        total = partes[0]
+        for parte in partes[1:]:
+            total.mesclar(parte)
+        assert total.n == len(valores)
+        assert _erro_maximo(total, valores) < 0.02
+
+    def test_poucos_valores_sao_exatos(self):
+        esboco = EsbocoKLL()
+        esboco.adicionar_varios([10.0, 20.0, 30.0, 40.0])
+        assert esboco.posto(25.0) == 0.5
+        assert esboco.posto(10.0) == 0.125
+        assert esboco.quantil(0.5) == 20.0
+
+    def test_serializacao(self, valores):
+        esboco = EsbocoKLL(semente=3)
+        esboco.adicionar_varios(valores[:5_000])
+        copia = EsbocoKLL.desserializar(esboco.serializar())
+        assert (copia.n, copia.k, copia.niveis) == (esboco.n, esboco.k, esboco.niveis)
+        copia.adicionar(1.0)
+        assert copia.n == esboco.n + 1
+
+    def test_esboco_vazio(self):
+        with pytest.raises(ValueError):
+            EsbocoKLL().posto(1.0)
+        with pytest.raises(ValueError):
+            EsbocoKLL().quantil(0.5)
@@ -0,0 +1,43 @@
+"""
+Testes unitários para core/especulacao.py
+"""
+import threading
+
+from core.cache import CacheTTL
+from core.especulacao import CalculoEspeculativo
+
+
+def test_resultado_especulado_fica_no_cache():
+    cache = CacheTTL("t", ttl_segundos=60, max_entradas=8)
+    esp = CalculoEspeculativo(cache)
+    esp.iniciar("k", lambda: 123)
+    assert esp.obter_ou_calcular("k", lambda: 0) == 123
+    assert cache.contem("k")
+
+
+def test_consulta_aguarda_calculo_em_andamento_sem_recalcular():
+    cache = CacheTTL("t", ttl_segundos=60, max_entradas=8)
+    esp = CalculoEspeculativo(cache)
+    liberar = threading.Event()
+    chamadas = []
+
+    def lento():
+        liberar.wait(1.0)
+        chamadas.append(1)
+        return "pronto"
+
+    esp.iniciar("k", lento)
+    esp.iniciar("k", lento)  # duplicata ignorada
+    threading.Timer(0.02, liberar.set).start()
+    assert esp.obter_ou_calcular("k", lambda: "recalculado") == "pronto"
+    assert chamadas == [1]
+    assert esp.iniciados == 1
+
+
+def test_nao_especula_chave_ja_em_cache():
+    cache = CacheTTL("t", ttl_segundos=60, max_entradas=8)
+    cache.definir("k", 1)
+    esp = CalculoEspeculativo(cache)
+    esp.iniciar("k", lambda: 2)
+    assert esp.iniciados == 0
+    assert esp.obter_ou_calcular("k", lambda: 3) == 1
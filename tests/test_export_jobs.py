@@ -0,0 +1,115 @@
+"""
+Testes unitários para export/jobs.py
+"""
+import threading
+import time
+
+from export.jobs import CANCELADO, CONCLUIDO, ERRO, GerenciadorExportacao
+
+
+def _aguardar(gerenciador, job_id, timeout=2.0):
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        job = gerenciador.obter(job_id)
+        if job.finalizado:
+            return job
+        time.sleep(0.005)
+    raise AssertionError("job não finalizou a tempo")
+
+
+def test_job_concluido_reporta_progresso_e_resultado():
+    g = GerenciadorExportacao(max_workers=1)
+
+    def tarefa(controle):
+        for i in range(3):
+            controle.reportar(i, 3)
+        return b"pptx"
+
+    job = _aguardar(g, g.submeter("k", tarefa))
+    assert job.status == CONCLUIDO
+    assert job.resultado == b"pptx"
+    assert job.progresso == 1.0
+
+
+def test_mesma_chave_reaproveita_job_ativo():
+    g = GerenciadorExportacao(max_workers=1)
+    liberar = threading.Event()
+
+    def tarefa(controle):
+        liberar.wait(1.0)
+        return b"ok"
+
+    id1 = g.submeter("k", tarefa)
+    id2 = g.submeter("k", tarefa)
+    assert id1 == id2
+    liberar.set()
+    _aguardar(g, id1)
+    # Job finalizado: nova submissão cria outro job
+    assert g.submeter("k", tarefa) != id1
+
+
+def test_cancelamento_interrompe_na_proxima_etapa():
+    g = GerenciadorExportacao(max_workers=1)
+    iniciou = threading.Event()
+    etapas = []
+
+    def tarefa(controle):
+        for i in range(1000):
+            controle.reportar(i, 1000)
+            etapas.append(i)
+            iniciou.set()
+            time.sleep(0.001)
+        return b"nunca"
+
+    job_id = g.submeter("k", tarefa)
+    iniciou.wait(1.0)
+    g.cancelar(job_id)
+    job = _aguardar(g, job_id)
+    assert job.status == CANCELADO
+    assert job.resultado is None
+    assert len(etapas) < 1000
+
+
+def test_erro_na_tarefa():
+    g = GerenciadorExportacao(max_workers=1)
+
+    def tarefa(controle):
+        raise RuntimeError("falhou")
+
+    job = _aguardar(g, g.submeter("k", tarefa))
+    assert job.status == ERRO
+    assert job.erro == "falhou"
+
+
+def test_cancelar_so_sem_outros_inscritos():
+    g = GerenciadorExportacao(max_workers=1)
+    bloqueio = threading.Event()
+    g.submeter("outro", lambda controle: bloqueio.wait(1.0) and b"")  # ocupa o worker: "k" fica pendente
+
+    job_id = g.submeter("k", lambda controle: b"deck", inscrito="sessao-a")
+    assert g.submeter("k", lambda controle: b"deck", inscrito="sessao-b") == job_id
+    assert not g.cancelar(job_id, "sessao-a")  # a sessão B ainda aguarda
+    assert not g.cancelar(job_id, "sessao-a")  # repetir não retira a sessão B
+    assert not g.obter(job_id).finalizado
+    assert g.cancelar(job_id, "sessao-b")
+    assert g.obter(job_id).status == CANCELADO
+    bloqueio.set()
+
+
+def test_cancelar_pendente_enquanto_o_worker_inicia():
+    # Cancelar e iniciar disputam o mesmo job: um cancelamento aceito nunca termina em resultado
+    for _ in range(200):
+        g = GerenciadorExportacao(max_workers=1)
+
+        def tarefa(controle):
+            controle.reportar(1, 2)
+            return b"deck"
+
+        job_id = g.submeter("k", tarefa)
+        solicitado = g.cancelar(job_id)
+        job = _aguardar(g, job_id)
+        if solicitado:
+            assert job.status == CANCELADO
+            assert job.resultado is None
+        else:
+            assert job.status == CONCLUIDO
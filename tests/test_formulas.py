@@ -17,6 +17,8 @@ from core.formulas import (
     calcular_payback,
     calcular_roi,
     calcular_ganho_anual,
+    calcular_ganho_anual_total,
+    calcular_ganhos_cenarios,
 )
 
 
@@ -139,3 +141,14 @@ class TestIndicadores:
     def test_ganho_anual(self):
         # 1.000.000 × 0.3 = 300.000
         assert calcular_ganho_anual(1_000_000, 0.3) == 300_000
+
+    def test_ganho_anual_total(self):
+        # 1.000.000 × 0,3 + 200.000 × 0,5 = 400.000
+        assert calcular_ganho_anual_total([1_000_000, 0, 200_000], [0.3, 1.0, 0.5]) == 400_000
+
+    def test_ganhos_cenarios(self):
+        custos = [[100.0, 200.0], [300.0, 0.0]]
+        assert calcular_ganhos_cenarios(custos, [0.5, 1.0]) == [250.0, 150.0]
+        assert calcular_ganhos_cenarios(custos, [[1.0, 0.0], [0.1, 1.0]]) == [100.0, 30.0]
+        with pytest.raises(ValueError):
+            calcular_ganhos_cenarios(custos, [[1.0, 0.0]])
@@ -0,0 +1,62 @@
+"""
+Testes dos indicadores em faixa (core/intervalos.py).
+"""
+import pytest
+
+from core.calculator import ROICalculator
+from core.formulas import calcular_payback, calcular_roi
+from core.intervalos import indicadores_faixa
+from core.perfil_links import estado_representativo
+from models.inputs import InvestimentoAutomacao
+from models.results import MetasReducao
+
+
+@pytest.fixture
+def analise():
+    entradas = estado_representativo("area_4_embalagem")
+    return entradas, ROICalculator(**entradas).calcular()
+
+
+class TestIndicadoresFaixa:
+    def test_faixa_do_investimento(self, analise):
+        entradas, resultados = analise
+        investimento = entradas["investimento"]
+        faixa = indicadores_faixa(resultados, investimento)
+
+        ganho = resultados.ganho_anual_potencial
+        assert faixa.ganho_anual.minimo == faixa.ganho_anual.maximo == ganho
+        assert faixa.investimento.minimo == investimento.valor_investimento_min
+        assert faixa.payback_anos.central == resultados.payback_anos
+        assert faixa.payback_anos.minimo == calcular_payback(investimento.valor_investimento_min, ganho)
+        assert faixa.payback_anos.maximo == calcular_payback(investimento.valor_investimento_max, ganho)
+        assert [r.central for r in faixa.roi] == [
+            resultados.roi_1_ano, resultados.roi_2_anos, resultados.roi_3_anos,
+            resultados.roi_4_anos, resultados.roi_5_anos,
+        ]
+        for anos, roi in enumerate(faixa.roi, start=1):
+            assert roi.minimo == calcular_roi(investimento.valor_investimento_max, ganho, anos)
+            assert roi.minimo <= roi.central <= roi.maximo
+
+    def test_faixa_das_metas_contem_todas_as_combinacoes(self, analise):
+        entradas, resultados = analise
+        metas = entradas["metas"]
+        metas_min = MetasReducao.de_vetor(v * 0.5 for v in metas.valores)
+        metas_max = MetasReducao.de_vetor(min(1.0, v * 1.5) for v in metas.valores)
+        faixa = indicadores_faixa(resultados, entradas["investimento"], metas_min, metas_max)
+
+        assert faixa.ganho_anual.minimo < resultados.ganho_anual_potencial < faixa.ganho_anual.maximo
+        for inv in (faixa.investimento.minimo, faixa.investimento.maximo):
+            for m in (metas_min, metas, metas_max):
+                r = ROICalculator(**dict(
+                    entradas,
+                    investimento=InvestimentoAutomacao(inv, inv),
+                    metas=m,
+                )).calcular()
+                assert faixa.payback_anos.minimo <= r.payback_anos * (1 + 1e-12)
+                assert r.payback_anos <= faixa.payback_anos.maximo * (1 + 1e-12)
+                assert faixa.roi[4].minimo - 1e-9 <= r.roi_5_anos <= faixa.roi[4].maximo + 1e-9
+
+    def test_metas_invertidas(self, analise):
+        entradas, resultados = analise
+        with pytest.raises(ValueError):
+            indicadores_faixa(resultados, entradas["investimento"], MetasReducao(meta_f01=0.9), MetasReducao())
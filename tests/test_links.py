@@ -0,0 +1,74 @@
+"""
+Testes dos links compartilháveis (core/links.py, core/perfil_links.py).
+"""
+import base64
+
+import pytest
+
+from config.areas import AREAS_ARV
+from config.constants import LINK_MAX_CARACTERES
+from core.calculator import ROICalculator
+from core.links import ErroLink, codificar_link, decodificar_link
+from core.perfil_links import estado_representativo, medir
+from core.validators import validar_parametros_detalhados
+
+
+def _b64(blob: bytes) -> str:
+    return base64.urlsafe_b64encode(blob).rstrip(b"=").decode("ascii")
+
+
+def _blob(link: str) -> bytes:
+    return base64.urlsafe_b64decode(link + "=" * (-len(link) % 4))
+
+
+class TestLinks:
+    @pytest.mark.parametrize("area", list(AREAS_ARV))
+    def test_ida_e_volta_reproduz_resultados(self, area):
+        estado = estado_representativo(area)
+        link = codificar_link(estado)
+
+        assert len(link) <= LINK_MAX_CARACTERES
+        assert link.replace("-", "").replace("_", "").isalnum()
+        reconstruido = decodificar_link(link)
+        assert reconstruido == estado
+        assert ROICalculator(**reconstruido).calcular() == ROICalculator(**estado).calcular()
+
+    def test_estado_representativo_e_valido(self):
+        for area in AREAS_ARV:
+            estado = estado_representativo(area)
+            assert validar_parametros_detalhados(estado["parametros"], estado["dores"], estado["processo"]) == []
+
+    def test_link_alterado_e_rejeitado(self):
+        blob = bytearray(_blob(codificar_link(estado_representativo("area_1_linhas_montagem"))))
+        blob[-5] ^= 0x01
+        with pytest.raises(ErroLink):
+            decodificar_link(_b64(bytes(blob)))
+
+    def test_link_truncado_e_rejeitado(self):
+        link = codificar_link(estado_representativo("area_4_embalagem"))
+        for corte in (3, len(link) // 2, len(link) - 2):
+            with pytest.raises(ErroLink):
+                decodificar_link(link[:corte])
+
+    def test_checksum_valido_com_tipo_errado(self):
+        # Link bem-formado (CRC confere) gerado com texto em um campo numérico
+        estado = estado_representativo("area_1_linhas_montagem")
+        estado["processo"].cadencia_producao = "10"
+        with pytest.raises(ErroLink, match="tipo inválido"):
+            decodificar_link(codificar_link(estado))
+
+    def test_versao_desconhecida(self):
+        blob = _blob(codificar_link(estado_representativo("area_6_robotica")))
+        with pytest.raises(ErroLink, match="Versão"):
+            decodificar_link(_b64(bytes([99]) + blob[1:]))
+
+    def test_texto_invalido_ou_longo_demais(self):
+        with pytest.raises(ErroLink):
+            decodificar_link("não é base64!")
+        with pytest.raises(ErroLink):
+            decodificar_link("A" * (LINK_MAX_CARACTERES + 1))
+
+    def test_benchmark_por_area(self):
+        perfil = medir("area_1_linhas_montagem", repeticoes=20)
+        assert perfil.caracteres <= LINK_MAX_CARACTERES
+        assert perfil.codificar_us > 0 and perfil.decodificar_us > 0
@@ -0,0 +1,161 @@
+"""
+Testes do mapa de equilíbrio (core/mapa_equilibrio.py).
+"""
+import math
+import random
+import time
+
+import pytest
+
+from core.calculator import ROICalculator
+from core.mapa_equilibrio import _com_valor, campos_eixo, contornos, faixa_sugerida, mapa_equilibrio
+from core.perfil_links import estado_representativo
+from models.inputs import DoresSelecionadas
+
+REFUGO = ("parametros.f05_percentual_refugo", 0.0, 0.2)
+INVESTIMENTO = ("investimento", 1e5, 5e7)
+
+
+@pytest.fixture
+def entradas():
+    return estado_representativo("area_3_controle_qualidade")
+
+
+def _avaliar(entradas, mapa, i, j):
+    celula = _com_valor(_com_valor(entradas, mapa.eixo_y, mapa.valores_y[i]), mapa.eixo_x, mapa.valores_x[j])
+    return ROICalculator(**celula).calcular()
+
+
+class TestGrade:
+    @pytest.mark.parametrize(
+        "eixo_x, eixo_y",
+        [
+            (REFUGO, INVESTIMENTO),
+            (REFUGO, ("parametros.f05_percentual_retrabalho", 0.0, 0.2)),
+            (("processo.salario_medio_operador", 1_000, 6_000), ("processo.turnos_por_dia", 1, 3)),
+            (("processo.pessoas_processo_turno", 0, 50), ("investimento.valor_investimento_max", 1e6, 1e8)),
+        ],
+    )
+    def test_igual_a_avaliacao_completa(self, entradas, eixo_x, eixo_y):
+        mapa = mapa_equilibrio(entradas, eixo_x, eixo_y, pontos=60)
+        rng = random.Random(45)
+        for _ in range(40):
+            i, j = rng.randrange(60), rng.randrange(60)
+            esperado = _avaliar(entradas, mapa, i, j)
+            assert mapa.ganho_anual[i][j] == pytest.approx(esperado.ganho_anual_potencial, rel=1e-9, abs=1e-6)
+            assert mapa.payback_anos[i][j] == pytest.approx(esperado.payback_anos, rel=1e-9)
+            assert mapa.roi[i][j] == pytest.approx(esperado.roi_5_anos, rel=1e-9, abs=1e-6)
+
+    def test_sem_aproximacao_avalia_celula_a_celula(self, entradas):
+        mapa = mapa_equilibrio(entradas, REFUGO, INVESTIMENTO, pontos=12, posto_max=0)
+        assert mapa.posto is None
+        assert mapa.payback_anos[5][7] == pytest.approx(_avaliar(entradas, mapa, 5, 7).payback_anos, rel=1e-12)
+
+    def test_grade_200x200_rapida(self, entradas):
+        inicio = time.perf_counter()
+        mapa = mapa_equilibrio(entradas, REFUGO, INVESTIMENTO)
+        decorrido = time.perf_counter() - inicio
+        assert len(mapa.payback_anos) == len(mapa.payback_anos[0]) == 200
+        assert mapa.posto is not None
+        assert decorrido < 0.1  # ~35 ms (alvo: 50 ms); folga para máquinas de CI
+
+    @pytest.mark.parametrize(
+        "eixo_x, eixo_y",
+        [
+            (("processo.pessoas_processo_turno", 0, 1e6), ("parametros.f05_percentual_refugo", 0.0, 1e-7)),
+            (("processo.salario_medio_operador", 0, 1e9), ("parametros.f18_horas_dia_tarefas_dados", 0, 1e-6)),
+            (("parametros.f05_percentual_refugo", 0.0, 1.0), ("processo.producao_mensal", 0, 1e12)),
+            (("parametros.f18_pessoas_envolvidas", 0.0, 1e7), ("processo.salario_medio_operador", 0, 1e-3)),
+        ],
+    )
+    def test_faixas_extremas_celula_a_celula(self, entradas, eixo_x, eixo_y):
+        # Eixos de muitas ordens de grandeza: cada célula, não só as sondadas, no erro relativo pedido
+        mapa = mapa_equilibrio(entradas, eixo_x, eixo_y, pontos=25)
+        for i in range(25):
+            for j in range(25):
+                esperado = _avaliar(entradas, mapa, i, j)
+                assert mapa.payback_anos[i][j] == pytest.approx(esperado.payback_anos, rel=1e-9)
+                assert mapa.ganho_anual[i][j] == pytest.approx(esperado.ganho_anual_potencial, rel=1e-9, abs=1e-6)
+
+    @pytest.mark.parametrize(
+        "eixo_x, eixo_y",
+        [
+            (("parametros.inexistente", 0, 1), INVESTIMENTO),
+            (("cliente.nome_cliente", 0, 1), INVESTIMENTO),
+            ((REFUGO[0], 0.2, 0.1), INVESTIMENTO),
+            ((REFUGO[0], -0.1, 0.1), INVESTIMENTO),
+            (REFUGO, REFUGO),
+        ],
+    )
+    def test_eixos_invalidos(self, entradas, eixo_x, eixo_y):
+        with pytest.raises(ValueError):
+            mapa_equilibrio(entradas, eixo_x, eixo_y, pontos=10)
+
+
+class TestEixos:
+    @pytest.fixture
+    def sem_f05(self, entradas):
+        entradas["dores"] = DoresSelecionadas(f06_inspecao_manual=True, f10_paradas_linha=True)
+        return entradas
+
+    def test_so_parametros_das_formulas_selecionadas(self, sem_f05):
+        campos = campos_eixo(sem_f05["dores"])
+        assert "parametros.f05_percentual_refugo" not in campos
+        assert "parametros.f10_paradas_mes" in campos
+        assert {"investimento", "processo.producao_mensal"} <= set(campos)
+        assert set(campos) < set(campos_eixo())
+
+    def test_faixa_sugerida(self, sem_f05):
+        parametros = sem_f05["parametros"]
+        parametros.f05_percentual_refugo = None  # fórmula fora da seleção
+        assert faixa_sugerida(sem_f05, "parametros.f05_percentual_refugo") == (0.0, 1.0)
+        assert sem_f05["processo"].producao_mensal is None  # estado informa a cadência
+        assert faixa_sugerida(sem_f05, "processo.producao_mensal") == (0.0, 1.0)
+        atual = sem_f05["processo"].salario_medio_operador
+        assert faixa_sugerida(sem_f05, "processo.salario_medio_operador") == (0.0, 2 * atual)
+
+        class Faixa:
+            minimo, maximo = 0.01, 0.08
+
+        assert faixa_sugerida(sem_f05, "parametros.f05_percentual_refugo", Faixa) == (0.01, 0.08)
+        investimento = sem_f05["investimento"]
+        assert faixa_sugerida(sem_f05, "investimento") == (
+            0.5 * investimento.valor_investimento_min, 1.5 * investimento.valor_investimento_max,
+        )
+
+    def test_mapa_padrao_do_dashboard_sem_f05(self, sem_f05):
+        # Eixos padrão do dashboard: investimento × 1º parâmetro das fórmulas selecionadas
+        campos = campos_eixo(sem_f05["dores"])
+        campo_y = next(c for c in campos if c.startswith("parametros."))
+        eixo_x = ("investimento", *faixa_sugerida(sem_f05, "investimento"))
+        eixo_y = (campo_y, *faixa_sugerida(sem_f05, campo_y))
+        mapa = mapa_equilibrio(sem_f05, eixo_x, eixo_y, pontos=20)
+        assert mapa.payback_anos[7][3] == pytest.approx(_avaliar(sem_f05, mapa, 7, 3).payback_anos, rel=1e-9)
+
+
+class TestContornos:
+    def test_pontos_no_limiar(self, entradas):
+        eixo_y = ("investimento", 1e7, 6e8)  # ganho anual ≈ R$ 130–145 mi
+        mapa = mapa_equilibrio(entradas, REFUGO, eixo_y, limiares_payback=(1.0, 3.0), pontos=80)
+        for limiar, polilinhas in mapa.contornos.items():
+            assert polilinhas
+            for x, y in (p for polilinha in polilinhas for p in polilinha):
+                celula = _com_valor(_com_valor(entradas, REFUGO[0], x), "investimento", y)
+                assert ROICalculator(**celula).calcular().payback_anos == pytest.approx(limiar, rel=1e-6)
+
+    def test_circulo_fechado(self):
+        xs = [k / 10 for k in range(-20, 21)]
+        grade = [[x * x + y * y for x in xs] for y in xs]
+        (circulo,) = contornos(grade, xs, xs, 1.0)
+        assert circulo[0] == circulo[-1]
+        assert all(math.hypot(x, y) == pytest.approx(1.0, abs=0.02) for x, y in circulo)
+
+    def test_infinito_e_sem_cruzamento(self):
+        xs, ys = [0.0, 1.0, 2.0], [0.0, 1.0]
+        grade = [[math.inf, 4.0, 2.0], [math.inf, 4.0, 2.0]]
+        (linha,) = contornos(grade, xs, ys, 3.0)
+        assert sorted(linha) == [(1.5, 0.0), (1.5, 1.0)]
+        # Payback infinito fica acima de qualquer limiar: a curva passa na coluna finita vizinha
+        (borda,) = contornos(grade, xs, ys, 10.0)
+        assert sorted(borda) == [(1.0, 0.0), (1.0, 1.0)]
+        assert contornos(grade, xs, ys, 1.0) == []
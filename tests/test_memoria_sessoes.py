@@ -0,0 +1,123 @@
+"""
+Testes do depósito de blobs por sessão (core/memoria_sessoes.py).
+"""
+import os
+
+import pytest
+
+from core.memoria_sessoes import DepositoSessoes
+
+
+class RelogioFalso:
+    def __init__(self):
+        self.agora = 1_000.0
+
+    def __call__(self):
+        return self.agora
+
+
+@pytest.fixture
+def relogio():
+    return RelogioFalso()
+
+
+@pytest.fixture
+def deposito(tmp_path, relogio):
+    return DepositoSessoes(orcamento_sessao=100, orcamento_total=250, diretorio=str(tmp_path), relogio=relogio)
+
+
+class TestDepositoSessoes:
+    def test_guardar_e_obter(self, deposito):
+        deposito.guardar("s1", "estado", b"abc")
+        assert deposito.obter("s1", "estado") == b"abc"
+        assert deposito.obter("s1", "pptx") is None
+        assert deposito.obter("s2", "estado") is None
+
+    def test_orcamento_por_sessao_envia_mais_antigo_para_disco(self, deposito, tmp_path):
+        deposito.guardar("s1", "a", b"x" * 60)
+        deposito.guardar("s1", "b", b"y" * 60)
+
+        uso = deposito.uso_por_sessao()["s1"]
+        assert (uso.memoria_bytes, uso.disco_bytes, uso.itens) == (60, 60, 2)
+        assert len(os.listdir(tmp_path)) == 1
+
+        # Relido do disco, volta para a memória e o outro item sai
+        assert deposito.obter("s1", "a") == b"x" * 60
+        uso = deposito.uso_por_sessao()["s1"]
+        assert (uso.memoria_bytes, uso.disco_bytes) == (60, 60)
+        assert deposito.obter("s1", "b") == b"y" * 60
+
+    def test_blob_maior_que_o_orcamento_vai_direto_para_disco(self, deposito):
+        deposito.guardar("s1", "pptx", b"z" * 500)
+        assert deposito.uso_por_sessao()["s1"].memoria_bytes == 0
+        assert deposito.obter("s1", "pptx") == b"z" * 500
+
+    def test_lru_entre_sessoes(self, deposito):
+        for sessao in ("s1", "s2", "s3"):
+            deposito.guardar(sessao, "pptx", b"d" * 80)
+        deposito.obter("s1", "pptx")  # s1 passa a ser a mais recente
+        deposito.guardar("s4", "pptx", b"d" * 80)
+
+        uso = deposito.uso_por_sessao()
+        assert deposito.memoria_total <= 250
+        assert uso["s2"].disco_bytes == 80
+        assert uso["s1"].memoria_bytes == 80
+        assert uso["s4"].memoria_bytes == 80
+
+    def test_substituir_nao_duplica(self, deposito):
+        deposito.guardar("s1", "estado", b"a" * 40)
+        deposito.guardar("s1", "estado", b"b" * 30)
+        assert deposito.memoria_total == 30
+        assert deposito.obter("s1", "estado") == b"b" * 30
+
+    def test_limpar_inativas_remove_memoria_e_disco(self, deposito, relogio, tmp_path):
+        deposito.guardar("velha", "pptx", b"v" * 500)
+        relogio.agora += 3600
+        deposito.guardar("nova", "estado", b"n")
+
+        assert deposito.limpar_inativas(inatividade_segundos=1800) == 1
+        assert "velha" not in deposito.uso_por_sessao()
+        assert os.listdir(tmp_path) == []
+        assert deposito.obter("nova", "estado") == b"n"
+
+    def test_limpeza_no_maximo_a_cada_intervalo(self, deposito, relogio):
+        intervalo = 4 * 3600
+        deposito.guardar("s1", "pptx", b"a")
+        relogio.agora += 3 * 3600
+        assert deposito.limpar_inativas_se_devido(intervalo) == 1
+        deposito.guardar("s2", "pptx", b"b")
+        relogio.agora += 3 * 3600  # s2 já está inativa, mas a última varredura foi há 3 h
+        assert deposito.limpar_inativas_se_devido(intervalo) == 0
+        assert "s2" in deposito.uso_por_sessao()
+        relogio.agora += 3600
+        assert deposito.limpar_inativas_se_devido(intervalo) == 1
+        assert deposito.uso_por_sessao() == {}
+
+    def test_arquivos_de_depositos_no_mesmo_diretorio_nao_colidem(self, tmp_path, relogio):
+        # Réplicas (ou reinícios) com o mesmo diretório: os nomes não dependem de pid nem contador
+        a = DepositoSessoes(orcamento_sessao=10, orcamento_total=10, diretorio=str(tmp_path), relogio=relogio)
+        b = DepositoSessoes(orcamento_sessao=10, orcamento_total=10, diretorio=str(tmp_path), relogio=relogio)
+        a.guardar("s1", "pptx", b"a" * 50)
+        b.guardar("s1", "pptx", b"b" * 50)
+        assert len(os.listdir(tmp_path)) == 2
+        assert a.obter("s1", "pptx") == b"a" * 50
+        assert b.obter("s1", "pptx") == b"b" * 50
+
+    def test_gravacao_em_disco_sem_o_lock(self, deposito, monkeypatch, tmp_path):
+        from core import memoria_sessoes
+
+        mkstemp = memoria_sessoes.tempfile.mkstemp
+        lidos = []
+
+        def mkstemp_com_leitura(**kwargs):
+            # Durante a gravação o lock está livre e o blob segue disponível (volta para a memória)
+            lidos.append(deposito.obter("s1", "pptx"))
+            return mkstemp(**kwargs)
+
+        monkeypatch.setattr(memoria_sessoes.tempfile, "mkstemp", mkstemp_com_leitura)
+        deposito.guardar("s1", "pptx", b"z" * 500)
+        assert lidos == [b"z" * 500]
+        # O blob relido fica em memória e a gravação que perdeu a corrida é descartada
+        assert os.listdir(tmp_path) == []
+        assert deposito.uso_por_sessao()["s1"].memoria_bytes == 500
+        assert deposito.obter("s1", "pptx") == b"z" * 500
@@ -0,0 +1,107 @@
+"""
+Testes das opções reais de adiar a automação (core/opcoes_reais.py).
+"""
+import math
+import random
+import time
+
+import pytest
+
+from core.montecarlo import ResultadoMonteCarlo, ResumoDistribuicao
+from core.opcoes_reais import opcao_do_cenario, valorar_opcao, valorar_opcoes, volatilidade_montecarlo
+from core.perfil_links import estado_representativo
+from models.inputs import InvestimentoAutomacao
+
+VIDA, TAXA, LIVRE_RISCO = 5, 0.12, 0.10
+ANUIDADE = sum((1 + TAXA) ** -ano for ano in range(1, VIDA + 1))
+
+
+def _fi(x):
+    return 0.5 * math.erfc(-x / math.sqrt(2))
+
+
+def _europeia(valor, investimento, volatilidade, prazo):
+    """Black-Scholes-Merton (opção europeia com dividendo contínuo δ = 1 ÷ anuidade)."""
+    dividendo = 1 / ANUIDADE
+    d1 = (math.log(valor / investimento) + (LIVRE_RISCO - dividendo + volatilidade ** 2 / 2) * prazo) / (volatilidade * math.sqrt(prazo))
+    d2 = d1 - volatilidade * math.sqrt(prazo)
+    return valor * math.exp(-dividendo * prazo) * _fi(d1) - investimento * math.exp(-LIVRE_RISCO * prazo) * _fi(d2)
+
+
+class TestArvore:
+    def test_sem_prazo_e_investir_agora_ou_nunca(self):
+        for investimento in (300.0, 400.0):
+            opcao = valorar_opcao(100.0, investimento, 0.3, prazo_anos=0)
+            assert opcao.valor_projeto == pytest.approx(100 * ANUIDADE)
+            assert opcao.valor_opcao == pytest.approx(max(opcao.vpl_imediato, 0.0))
+            assert opcao.valor_espera == 0.0
+
+    def test_limites_e_convergencia(self):
+        grossa = valorar_opcao(100.0, 400.0, 0.3, passos_por_ano=50)
+        fina = valorar_opcao(100.0, 400.0, 0.3, passos_por_ano=200)
+        assert fina.valor_opcao == pytest.approx(grossa.valor_opcao, rel=0.01)
+        # Americana: entre a europeia e o próprio projeto
+        assert _europeia(fina.valor_projeto, 400.0, 0.3, 3) <= fina.valor_opcao <= fina.valor_projeto
+
+    def test_esperar_vale_quando_o_projeto_nao_se_paga_hoje(self):
+        opcao = valorar_opcao(100.0, 400.0, 0.3)
+        assert opcao.vpl_imediato < 0
+        assert opcao.valor_espera == opcao.valor_opcao > 0
+        assert opcao.ano_exercicio is None  # com o ganho estimado, nunca vale investir na janela
+        assert 0 < opcao.prob_exercicio < 1
+        assert valorar_opcao(100.0, 400.0, 0.4).valor_opcao > opcao.valor_opcao
+
+    def test_no_limiar_esperar_e_adiar(self):
+        opcao = valorar_opcao(100.0, 100 * ANUIDADE - 1, 0.3)
+        assert opcao.valor_espera > 0
+        assert 0 < opcao.ano_exercicio <= 3
+
+    def test_projeto_muito_bom_investe_ja(self):
+        opcao = valorar_opcao(100.0, 150.0, 0.3)
+        assert opcao.ano_exercicio == 0.0
+        assert opcao.prob_exercicio == 1.0
+        assert opcao.valor_opcao == pytest.approx(opcao.vpl_imediato)
+
+    @pytest.mark.parametrize("investimento, valor", [(300.0, 100 * ANUIDADE - 300), (400.0, 0.0)])
+    def test_sem_volatilidade_e_deterministico(self, investimento, valor):
+        opcao = valorar_opcao(100.0, investimento, 0.0)
+        assert opcao.valor_opcao == pytest.approx(valor)
+        assert opcao.prob_exercicio == (1.0 if valor else 0.0)
+
+    def test_validacao(self):
+        with pytest.raises(ValueError):
+            valorar_opcoes([100.0], [300.0, 400.0], [0.3])
+        with pytest.raises(ValueError):
+            valorar_opcao(100.0, 300.0, -0.1)
+
+
+class TestLote:
+    def test_lote_igual_a_individual_e_rapido(self):
+        rng = random.Random(1)
+        ganhos = [rng.uniform(1e5, 1e6) for _ in range(2000)]
+        investimentos = [g * rng.uniform(2, 5) for g in ganhos]
+        volatilidades = [rng.uniform(0.1, 0.4) for _ in ganhos]
+        inicio = time.perf_counter()
+        opcoes = valorar_opcoes(ganhos, investimentos, volatilidades)
+        decorrido = time.perf_counter() - inicio
+        assert len(opcoes) == 2000
+        for k in (0, 777, 1999):
+            assert opcoes[k] == valorar_opcao(ganhos[k], investimentos[k], volatilidades[k])
+        assert decorrido < 5  # ~0,6 s; folga para máquinas de CI
+
+
+class TestCenario:
+    def test_volatilidade_montecarlo(self):
+        resumo = ResumoDistribuicao(media=100.0, p05=80.0, p50=100.0, p95=125.0)
+        resultado = ResultadoMonteCarlo(1000, resumo, resumo, resumo, 1.0)
+        assert volatilidade_montecarlo(resultado) == pytest.approx(math.log(125 / 80) / (2 * 1.6448536), rel=1e-6)
+        fixo = ResumoDistribuicao(media=100.0, p05=100.0, p50=100.0, p95=100.0)
+        assert volatilidade_montecarlo(ResultadoMonteCarlo(1000, fixo, fixo, fixo, 1.0)) == 0.0
+
+    def test_opcao_do_cenario(self):
+        entradas = estado_representativo("area_3_controle_qualidade")
+        ganho = opcao_do_cenario(**entradas, iteracoes=300, semente=1).valor_projeto / ANUIDADE
+        entradas["investimento"] = InvestimentoAutomacao(ganho * ANUIDADE * 1.1, ganho * ANUIDADE * 1.1)
+        opcao = opcao_do_cenario(**entradas, iteracoes=300, semente=1)
+        assert opcao.volatilidade > 0
+        assert opcao.vpl_imediato < 0 < opcao.valor_opcao
@@ -0,0 +1,151 @@
+"""
+Testes do gerador de PPTX (export/pptx_generator.py). Rodam só com o python-pptx instalado.
+"""
+import io
+import time
+
+import pytest
+
+pytest.importorskip("pptx")
+
+from pptx import Presentation  # noqa: E402
+from pptx.dml.color import RGBColor  # noqa: E402
+from pptx.enum.text import PP_ALIGN  # noqa: E402
+from pptx.util import Inches, Pt  # noqa: E402
+
+from core.calculator import ROICalculator  # noqa: E402
+from core.perfil_links import estado_representativo  # noqa: E402
+from export.pptx_generator import (  # noqa: E402
+    AZUL_ESCURO,
+    BRANCO,
+    CINZA_ESCURO,
+    EstiloTabela,
+    PPTXGenerator,
+)
+
+CINZA_CLARO = RGBColor(0xF2, 0xF2, 0xF2)
+AREA = "area_3_controle_qualidade"
+
+
+def _tabela(gerador, dados, estilo=None):
+    slide = gerador._add_slide()
+    return gerador._add_table(
+        slide, Inches(0.5), Inches(0.5), Inches(12), Inches(6), len(dados), len(dados[0]), dados, estilo=estilo
+    )
+
+
+def _run(celula):
+    return celula.text_frame.paragraphs[0].runs[0]
+
+
+def _tabela_celula_a_celula(gerador, dados):
+    """Construtor anterior ao XML em uma passada: formata célula a célula (referência de tempo)."""
+    slide = gerador._add_slide()
+    rows, cols = len(dados), len(dados[0])
+    table = slide.shapes.add_table(rows, cols, Inches(0.5), Inches(0.5), Inches(12), Inches(6)).table
+    for r in range(rows):
+        for c in range(cols):
+            cell = table.cell(r, c)
+            cell.text = str(dados[r][c])
+            for paragraph in cell.text_frame.paragraphs:
+                paragraph.font.size = Pt(11)
+                paragraph.font.name = "Calibri"
+                if r == 0:
+                    paragraph.font.bold = True
+                    paragraph.font.color.rgb = BRANCO
+                    paragraph.alignment = PP_ALIGN.CENTER
+                else:
+                    paragraph.font.color.rgb = CINZA_ESCURO
+                    if c > 0:
+                        paragraph.alignment = PP_ALIGN.RIGHT
+            cell.fill.solid()
+            cell.fill.fore_color.rgb = AZUL_ESCURO if r == 0 else (CINZA_CLARO if r % 2 == 0 else BRANCO)
+    return table
+
+
+@pytest.fixture
+def gerador():
+    return PPTXGenerator()
+
+
+class TestTabela:
+    def test_texto_e_escape(self, gerador):
+        dados = [
+            ["Fórmula", "Valor"],
+            ["P&D <piloto>", 'R$ 1.234,56 "estimado"'],
+            ["Duas\nlinhas", ""],
+        ]
+        tabela = _tabela(gerador, dados)
+        assert (len(tabela.rows), len(tabela.columns)) == (3, 2)
+        for r, linha in enumerate(dados):
+            for c, texto in enumerate(linha):
+                assert tabela.cell(r, c).text == texto
+        assert len(tabela.cell(2, 0).text_frame.paragraphs) == 2
+
+    def test_estilos_por_tipo_de_linha(self, gerador):
+        dados = [["Item", "Valor"], ["a", "1"], ["b", "2"], ["TOTAL", "3"]]
+        tabela = _tabela(gerador, dados, EstiloTabela(tamanho_fonte_corpo=10, destacar_ultima_linha=True))
+
+        cabecalho = tabela.cell(0, 1)
+        assert cabecalho.fill.fore_color.rgb == AZUL_ESCURO
+        assert cabecalho.text_frame.paragraphs[0].alignment == PP_ALIGN.CENTER
+        assert (_run(cabecalho).font.bold, _run(cabecalho).font.color.rgb) == (True, BRANCO)
+        assert (_run(cabecalho).font.size, _run(cabecalho).font.name) == (Pt(11), "Calibri")
+
+        assert tabela.cell(1, 0).fill.fore_color.rgb == BRANCO
+        assert tabela.cell(2, 0).fill.fore_color.rgb == CINZA_CLARO
+        corpo = _run(tabela.cell(1, 1))
+        assert (corpo.font.bold, corpo.font.color.rgb, corpo.font.size) == (False, CINZA_ESCURO, Pt(10))
+        assert tabela.cell(1, 0).text_frame.paragraphs[0].alignment is None
+        assert tabela.cell(1, 1).text_frame.paragraphs[0].alignment == PP_ALIGN.RIGHT
+
+        total = tabela.cell(3, 0)
+        assert total.fill.fore_color.rgb == AZUL_ESCURO
+        assert (_run(total).font.bold, _run(total).font.color.rgb) == (True, BRANCO)
+
+    def test_sobrevive_a_gravar_e_reabrir(self, gerador):
+        dados = [["A", "B"], ["x & y", "1"], ["z", "2"]]
+        _tabela(gerador, dados)
+        buffer = io.BytesIO()
+        gerador.prs.save(buffer)
+        buffer.seek(0)
+        forma = next(s for s in Presentation(buffer).slides[0].shapes if s.has_table)
+        assert [[forma.table.cell(r, c).text for c in range(2)] for r in range(3)] == dados
+
+    def test_mais_rapida_que_celula_a_celula(self):
+        dados = [["Fórmula", "Campo", "Valor", "Unidade"]] + [
+            [f"F{i % 18 + 1:02d}", f"campo_{i}", f"R$ {i * 1234.5:,.2f}", "R$/ano"] for i in range(120)
+        ]
+
+        def medir(construir):
+            tempos = []
+            for _ in range(3):
+                gerador = PPTXGenerator()
+                inicio = time.perf_counter()
+                construir(gerador)
+                tempos.append(time.perf_counter() - inicio)
+            return min(tempos)
+
+        novo = medir(lambda g: _tabela(g, dados))
+        antigo = medir(lambda g: _tabela_celula_a_celula(g, dados))
+        assert novo < antigo, f"XML em uma passada: {novo * 1000:.1f} ms; célula a célula: {antigo * 1000:.1f} ms"
+
+
+class TestApresentacao:
+    @pytest.fixture
+    def entradas(self):
+        entradas = estado_representativo(AREA)
+        entradas["resultados"] = ROICalculator(**entradas).calcular(rastrear=True)
+        return entradas
+
+    def test_deck_completo(self, entradas):
+        # Detalhamento (rastreio), viabilidade com a faixa de investimento, mapa de equilíbrio e Shapley
+        espec = {"eixo_x": ("parametros.f05_percentual_refugo", 0.0, 0.2), "eixo_y": ("investimento", 1e5, 5e7)}
+        slides = Presentation(PPTXGenerator().gerar(**entradas, mapa_equilibrio=espec)).slides
+        formas = [forma for slide in slides for forma in slide.shapes]
+        textos = " ".join(forma.text_frame.text for forma in formas if forma.has_text_frame)
+        assert "Metodologia de cálculo e valores aplicados" in textos
+        assert "Viabilidade Financeira" in textos
+        assert "Valores de Shapley" in textos
+        assert "Mapa de Equilíbrio" in textos
+        assert any(forma.has_chart for forma in formas)
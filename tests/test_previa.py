@@ -0,0 +1,131 @@
+"""
+Testes unitários para core/previa.py (prévia de ROI incremental)
+"""
+import time
+
+import pytest
+
+from core.calculator import ROICalculator
+from core.previa import PreviaIncremental
+from models.inputs import (
+    ClienteBasicInfo,
+    DoresSelecionadas,
+    InvestimentoAutomacao,
+    ParametrosDetalhados,
+    ProcessoAtual,
+)
+from models.results import MetasReducao
+
+
+@pytest.fixture
+def cliente():
+    return ClienteBasicInfo(
+        nome_cliente="Cliente X",
+        nome_projeto="Projeto Y",
+        area_atuacao="area_1_linhas_montagem",
+        porte_empresa="media",
+        fator_encargos=1.7,
+    )
+
+
+@pytest.fixture
+def processo():
+    return ProcessoAtual(cadencia_producao=10.0, faturamento_mensal_linha=1_760_000.0)
+
+
+@pytest.fixture
+def dores():
+    return DoresSelecionadas(
+        f01_mao_de_obra_direta=True,
+        f02_horas_extras=True,
+        f05_refugo_retrabalho=True,
+        f10_paradas_linha=True,
+        f12_riscos_acidentes=True,
+    )
+
+
+@pytest.fixture
+def parametros():
+    return ParametrosDetalhados(
+        f02_media_he_mes_por_pessoa=10.0,
+        f05_percentual_refugo=0.01,
+        f05_percentual_retrabalho=0.03,
+        f05_horas_retrabalho_por_unidade=0.2,
+        f10_paradas_mes=4,
+        f10_duracao_media_parada_horas=1.0,
+        f12_afastamentos_ano=2,
+        f12_custo_medio_afastamento=8000.0,
+        f12_acidentes_com_lesao_ano=1,
+        f12_custo_medio_acidente=15000.0,
+        f12_probabilidade_processo=0.05,
+        f12_custo_estimado_processo=50_000.0,
+    )
+
+
+@pytest.fixture
+def metas():
+    return MetasReducao(meta_f01=0.5, meta_f02=0.7, meta_f05=0.7, meta_f10=0.5, meta_f12=0.5)
+
+
+@pytest.fixture
+def investimento():
+    return InvestimentoAutomacao(valor_investimento_min=400_000.0, valor_investimento_max=600_000.0)
+
+
+class TestPreviaIncremental:
+    def test_igual_ao_calculo_completo(self, cliente, processo, dores, parametros, metas, investimento):
+        previa = PreviaIncremental().atualizar(cliente, processo, dores, parametros, metas, investimento)
+        completo = ROICalculator(cliente, processo, dores, parametros, investimento, metas).calcular()
+
+        assert previa.custo_total_anual_inacao == pytest.approx(completo.custo_total_anual_inacao, rel=1e-12)
+        assert previa.ganho_anual_potencial == pytest.approx(completo.ganho_anual_potencial, rel=1e-12)
+        assert previa.payback_anos == pytest.approx(completo.payback_anos, rel=1e-12)
+
+    def test_reavalia_apenas_formula_alterada(self, cliente, processo, dores, parametros, metas, investimento):
+        motor = PreviaIncremental()
+        assert motor.atualizar(cliente, processo, dores, parametros, metas, investimento).formulas_recalculadas == 5
+
+        parametros.f10_paradas_mes = 8
+        previa = motor.atualizar(cliente, processo, dores, parametros, metas, investimento)
+        assert previa.formulas_recalculadas == 1
+
+        completo = ROICalculator(cliente, processo, dores, parametros, investimento, metas).calcular()
+        assert previa.custo_total_anual_inacao == pytest.approx(completo.custo_total_anual_inacao, rel=1e-12)
+
+    def test_metas_e_investimento_nao_reavaliam_formulas(self, cliente, processo, dores, parametros, metas, investimento):
+        motor = PreviaIncremental()
+        motor.atualizar(cliente, processo, dores, parametros, metas, investimento)
+
+        metas.meta_f01 = 0.9
+        investimento.valor_investimento_max = 800_000.0
+        previa = motor.atualizar(cliente, processo, dores, parametros, metas, investimento)
+
+        assert previa.formulas_recalculadas == 0
+        completo = ROICalculator(cliente, processo, dores, parametros, investimento, metas).calcular()
+        assert previa.ganho_anual_potencial == pytest.approx(completo.ganho_anual_potencial, rel=1e-12)
+        assert previa.payback_anos == pytest.approx(completo.payback_anos, rel=1e-12)
+
+    def test_mudanca_no_processo_reavalia_tudo(self, cliente, processo, dores, parametros):
+        motor = PreviaIncremental()
+        motor.atualizar(cliente, processo, dores, parametros)
+        processo.salario_medio_operador = 3000.0
+        assert motor.atualizar(cliente, processo, dores, parametros).formulas_recalculadas == 5
+
+    def test_sem_metas_mostra_apenas_custo(self, cliente, processo, dores, parametros):
+        previa = PreviaIncremental().atualizar(cliente, processo, dores, parametros)
+        assert previa.custo_total_anual_inacao > 0
+        assert previa.ganho_anual_potencial is None
+        assert previa.payback_anos is None
+
+    def test_atualizacao_de_uma_formula_abaixo_de_5ms(self, cliente, processo, dores, parametros, metas, investimento):
+        motor = PreviaIncremental()
+        motor.atualizar(cliente, processo, dores, parametros, metas, investimento)
+
+        duracoes = []
+        for i in range(50):
+            parametros.f10_paradas_mes = i
+            inicio = time.perf_counter()
+            motor.atualizar(cliente, processo, dores, parametros, metas, investimento)
+            duracoes.append(time.perf_counter() - inicio)
+
+        assert sorted(duracoes)[len(duracoes) // 2] < 0.005
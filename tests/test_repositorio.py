@@ -0,0 +1,144 @@
+"""
+Testes do repositório de análises (core/repositorio.py).
+"""
+import statistics
+from dataclasses import replace
+from datetime import date, datetime, timezone
+
+import pytest
+
+from core.calculator import ROICalculator
+from core.perfil_links import estado_representativo
+from core.perfil_repositorio import analises_sinteticas
+from core.repositorio import RepositorioAnalises, trimestre
+
+
+@pytest.fixture
+def repositorio(tmp_path):
+    return RepositorioAnalises(str(tmp_path / "analises.sqlite"))
+
+
+@pytest.fixture
+def analise():
+    entradas = estado_representativo("area_3_controle_qualidade")
+    return entradas, ROICalculator(**entradas).calcular(rastrear=True)
+
+
+class TestRepositorioAnalises:
+    def test_salvar_e_carregar(self, repositorio, analise):
+        entradas, resultados = analise
+        id_ = repositorio.salvar(entradas, resultados, criado_em=datetime(2025, 8, 14, 10, 30))
+
+        gravada = repositorio.carregar(id_)
+        assert gravada.entradas == entradas
+        assert gravada.resultados == replace(resultados, rastreio=None)
+        assert list(gravada.resultados.breakdown_dor2) == list(resultados.breakdown_dor2)
+        assert gravada.resumo.nome_cliente == entradas["cliente"].nome_cliente
+        assert gravada.resumo.criado_em == datetime(2025, 8, 14, 10, 30, tzinfo=timezone.utc)
+        assert gravada.resumo.versao_formulas == "2.0"
+        assert repositorio.carregar(id_ + 1) is None
+
+    def test_lote_e_paginacao_por_cursor(self, repositorio):
+        ids = repositorio.salvar_lote(list(analises_sinteticas(230, semente=1)))
+        assert ids == list(range(1, 231))
+
+        vistos, cursor = [], None
+        while True:
+            pagina = repositorio.listar(limite=50, cursor=cursor)
+            vistos.extend(pagina.itens)
+            cursor = pagina.proximo_cursor
+            if cursor is None:
+                break
+        assert sorted(r.id for r in vistos) == ids
+        assert [r.criado_em for r in vistos] == sorted((r.criado_em for r in vistos), reverse=True)
+
+    def test_filtros(self, repositorio):
+        repositorio.salvar_lote(list(analises_sinteticas(300, semente=2)))
+        desde, ate = trimestre(2024, 3)
+        pagina = repositorio.listar(area="area_4_embalagem", porte="grande", desde=desde, ate=ate, limite=500)
+        assert pagina.itens
+        for r in pagina.itens:
+            assert (r.area_atuacao, r.porte_empresa) == ("area_4_embalagem", "grande")
+            assert date(2024, 7, 1) <= r.criado_em.date() < date(2024, 10, 1)
+        assert len(pagina.itens) == repositorio.contar(area="area_4_embalagem", porte="grande", desde=desde, ate=ate)
+
+        cliente = pagina.itens[0].nome_cliente
+        assert all(r.nome_cliente == cliente for r in repositorio.listar(cliente=cliente).itens)
+
+    def test_mediana_do_payback_por_area_no_trimestre(self, repositorio):
+        analises = list(analises_sinteticas(600, semente=3))
+        repositorio.salvar_lote(analises)
+        desde, ate = trimestre(2024, 3)
+        inicio = datetime(2024, 7, 1, tzinfo=timezone.utc)
+        fim = datetime(2024, 10, 1, tzinfo=timezone.utc)
+
+        esperado = {}
+        for _, res, criado_em in analises:
+            if inicio <= criado_em < fim:
+                esperado.setdefault(res.area_atuacao, []).append(res.payback_anos)
+
+        agregados = repositorio.agregar("payback_anos", "area_atuacao", desde=desde, ate=ate)
+        assert set(agregados) == set(esperado)
+        for area, valores in esperado.items():
+            assert agregados[area].quantidade == len(valores)
+            assert agregados[area].mediana == pytest.approx(statistics.median(valores))
+            assert agregados[area].media == pytest.approx(statistics.fmean(valores))
+            assert agregados[area].maximo == pytest.approx(max(valores))
+
+    def test_agregar_rejeita_coluna_arbitraria(self, repositorio):
+        with pytest.raises(ValueError):
+            repositorio.agregar("entradas")
+        with pytest.raises(ValueError):
+            repositorio.agregar("payback_anos", "nome_projeto; DROP TABLE analises")
+
+    def test_lote_com_falha_nao_grava_nada(self, repositorio, analise):
+        entradas, resultados = analise
+        with pytest.raises(AttributeError):
+            repositorio.salvar_lote([(entradas, resultados, None), ({"cliente": None}, resultados, None)])
+        assert repositorio.contar() == 0
+        assert repositorio.salvar(entradas, resultados) == 1
+
+    def test_percentis_de_custo_entre_semelhantes(self, tmp_path):
+        caminho = str(tmp_path / "analises.sqlite")
+        repositorio = RepositorioAnalises(caminho)
+        analises = list(analises_sinteticas(480, semente=4))
+        for inicio in range(0, len(analises), 100):
+            repositorio.salvar_lote(analises[inicio:inicio + 100])
+
+        _, base, _ = analises[0]
+        area, porte = base.area_atuacao, base.porte_empresa
+        rotulo, valor = next((r, v) for r, v in base.breakdown_dor2.items() if v > 0)
+        semelhantes = [
+            res.breakdown_dor2[rotulo] * 1.1
+            for _, res, _ in analises
+            if (res.area_atuacao, res.porte_empresa) == (area, porte)
+        ]
+        # Os breakdowns sintéticos são iguais por área × porte: todos os semelhantes ficam abaixo
+        posicoes = repositorio.percentis(area, porte, {rotulo: semelhantes[0], "F99 - Inexistente": 1.0},
+                                         minimo_amostras=len(semelhantes))
+        assert set(posicoes) == {rotulo}
+        assert posicoes[rotulo].amostras == len(semelhantes)
+        assert posicoes[rotulo].percentil == 100
+        assert repositorio.percentis(area, porte, {rotulo: valor}, minimo_amostras=len(semelhantes) + 1) == {}
+
+        # Arquivo sem esboços (gravado antes deles): reconstruídos ao abrir
+        repositorio._conexao().execute("DELETE FROM esbocos")
+        reaberto = RepositorioAnalises(caminho)
+        assert reaberto.percentis(area, porte, {rotulo: valor}, minimo_amostras=1)[rotulo].amostras == len(semelhantes)
+
+    def test_percentil_aproximado(self, repositorio, analise):
+        entradas, resultados = analise
+        rotulo = next(r for r, v in resultados.breakdown_dor2.items() if v > 0)
+        custos = [float(i) for i in range(1, 1001)]
+        repositorio.salvar_lote(
+            (entradas, replace(resultados, breakdown_dor2={rotulo: c}), None) for c in custos
+        )
+        posicao = repositorio.percentis(resultados.area_atuacao, resultados.porte_empresa, {rotulo: 250.5})[rotulo]
+        assert posicao.amostras == 1000
+        assert posicao.percentil == pytest.approx(25, abs=2)
+
+    def test_trimestre(self):
+        assert trimestre(2025, 3) == (date(2025, 7, 1), date(2025, 10, 1))
+        assert trimestre(2025, 4) == (date(2025, 10, 1), date(2026, 1, 1))
+        with pytest.raises(ValueError):
+            trimestre(2025, 5)
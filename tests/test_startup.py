@@ -0,0 +1,81 @@
+"""
+Testes de orçamento de inicialização: a etapa 0 não deve carregar dependências pesadas.
+
+Medem a importação dos módulos do projeto que a primeira tela carrega — não a primeira
+renderização, que depende do servidor do Streamlit.
+"""
+import ast
+from pathlib import Path
+
+from config.constants import MODULOS_PESADOS, ORCAMENTO_IMPORTACAO_INICIAL_MS
+from core.perfil_importacao import (
+    _parse_importtime,
+    custo_por_modulo,
+    medir_importacao,
+    modulos_carregados,
+)
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+def _importacoes_do_projeto(arquivo: Path) -> set[str]:
+    """Módulos do projeto importados no topo de `arquivo`."""
+    arvore = ast.parse(arquivo.read_text(encoding="utf-8"))
+    modulos = []
+    for no in arvore.body:
+        if isinstance(no, ast.Import):
+            modulos += [alias.name for alias in no.names]
+        elif isinstance(no, ast.ImportFrom) and no.module:
+            modulos.append(no.module)
+    return {m for m in modulos if (RAIZ / m.split(".")[0]).is_dir()}
+
+
+def _modulos_iniciais() -> list[str]:
+    """
+    Módulos do projeto importados no topo de app.py, incluindo os que os módulos `ui` importam.
+
+    Os próprios módulos `ui` ficam de fora (importam o streamlit, ausente nos testes); as
+    dependências do projeto que eles puxam — ex.: `core.benchmarks` via `ui.forms` — são medidas.
+    """
+    modulos, pendentes = set(), [RAIZ / "app.py"]
+    while pendentes:
+        for modulo in _importacoes_do_projeto(pendentes.pop()) - modulos:
+            modulos.add(modulo)
+            if modulo.split(".")[0] == "ui":
+                pendentes.append(RAIZ / (modulo.replace(".", "/") + ".py"))
+    return sorted(m for m in modulos if m.split(".")[0] != "ui")
+
+
+MODULOS_INICIAIS = _modulos_iniciais()
+
+
+class TestParseImporttime:
+    def test_extrai_tempos_e_profundidade(self):
+        saida = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |     json.decoder\n"
+            "import time:       300 |        420 |   json\n"
+            "import time:        50 |        470 | core.cache\n"
+        )
+        tempos = _parse_importtime(saida)
+        assert [t.modulo for t in tempos] == ["json.decoder", "json", "core.cache"]
+        assert [t.profundidade for t in tempos] == [2, 1, 0]
+        assert custo_por_modulo(tempos) == {"core.cache": 470}
+
+
+class TestOrcamentoInicializacao:
+    def test_lista_acompanha_app(self):
+        assert {"core.cache", "core.calculator", "core.links", "core.repositorio", "export.jobs"} <= set(MODULOS_INICIAIS)
+        # Importados pela primeira tela por meio de ui.forms
+        assert {"core.benchmarks", "core.formulas", "config.areas"} <= set(MODULOS_INICIAIS)
+        assert not any(m.startswith(("ui", "streamlit")) for m in MODULOS_INICIAIS)
+
+    def test_modulos_iniciais_nao_carregam_dependencias_pesadas(self):
+        carregados = set(modulos_carregados(MODULOS_INICIAIS))
+        pesados = {m for m in carregados if m.split(".")[0] in MODULOS_PESADOS}
+        assert not pesados, f"Importação inicial carrega: {sorted(pesados)}"
+
+    def test_modulos_iniciais_dentro_do_orcamento(self):
+        custos = custo_por_modulo(medir_importacao(MODULOS_INICIAIS))
+        total_ms = sum(custos.get(m, 0) for m in MODULOS_INICIAIS) / 1000
+        assert total_ms < ORCAMENTO_IMPORTACAO_INICIAL_MS
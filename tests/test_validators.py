@@ -0,0 +1,81 @@
+"""
+Testes unitários para a validação por fórmula (core/validators.py).
+"""
+from core.validators import (
+    CAMPOS_POR_FORMULA,
+    formulas_selecionadas,
+    validar_metas,
+    validar_parametros_detalhados,
+    validar_parametros_formula,
+)
+from config.areas import AREAS_ARV, MASCARAS_AREAS
+from models.inputs import DoresSelecionadas, Formula, ParametrosDetalhados, ProcessoAtual
+from models.results import MetasReducao
+
+
+def _dores(**flags) -> DoresSelecionadas:
+    dores = DoresSelecionadas()
+    for nome, valor in flags.items():
+        setattr(dores, nome, valor)
+    return dores
+
+
+class TestFormulasSelecionadas:
+    def test_codigos_na_ordem_do_modelo(self):
+        dores = _dores(f10_paradas_linha=True, f02_horas_extras=True, f01_mao_de_obra_direta=True)
+        assert formulas_selecionadas(dores) == ["F01", "F02", "F10"]
+
+    def test_mascara_de_bits(self):
+        dores = _dores(f01_mao_de_obra_direta=True, f05_refugo_retrabalho=True, f18_gestao_dados=True)
+        assert dores.mascara == Formula.F01 | Formula.F05 | Formula.F18
+        assert dores.mascara.codigos == ["F01", "F05", "F18"]
+        assert dores.mascara.quantidade == 3
+        assert DoresSelecionadas.de_mascara(dores.mascara) == dores
+        assert DoresSelecionadas.de_mascara(0) == DoresSelecionadas()
+        assert Formula.de_codigos(["f05", "F01", "F18"]) == dores.mascara
+        assert formulas_selecionadas(int(dores.mascara)) == ["F01", "F05", "F18"]
+
+    def test_mascaras_das_areas(self):
+        for area, info in AREAS_ARV.items():
+            assert sorted(MASCARAS_AREAS[area].codigos) == sorted(info["formulas_aplicaveis"])
+        qualidade = MASCARAS_AREAS["area_3_controle_qualidade"]
+        dores = _dores(f05_refugo_retrabalho=True, f10_paradas_linha=True)
+        assert (dores.mascara & qualidade).codigos == ["F05"]
+        assert (dores.mascara & ~qualidade).codigos == ["F10"]
+
+    def test_campos_agrupados_por_prefixo(self):
+        assert CAMPOS_POR_FORMULA["F10"] == ("f10_paradas_mes", "f10_duracao_media_parada_horas", "f10_custo_hora_parada")
+        assert "F01" not in CAMPOS_POR_FORMULA  # F01 não tem parâmetros próprios
+
+
+class TestValidacaoPorFormula:
+    def test_erros_apenas_da_formula_validada(self):
+        params = ParametrosDetalhados(f02_media_he_mes_por_pessoa=-1.0)
+        processo = ProcessoAtual(faturamento_mensal_linha=None)
+        erros_f02 = validar_parametros_formula("F02", params, processo)
+        erros_f10 = validar_parametros_formula("F10", params, processo)
+        assert erros_f02 and all(e.startswith("F02") for e in erros_f02)
+        assert erros_f10 and all(e.startswith("F10") for e in erros_f10)
+
+    def test_formula_sem_parametros_nao_gera_erros(self):
+        assert validar_parametros_formula("F01", ParametrosDetalhados(), ProcessoAtual()) == []
+
+    def test_subconjunto_equivale_a_validacao_completa_filtrada(self):
+        dores = _dores(f02_horas_extras=True, f10_paradas_linha=True, f18_gestao_dados=True)
+        params = ParametrosDetalhados(f02_media_he_mes_por_pessoa=-1.0)
+        processo = ProcessoAtual(faturamento_mensal_linha=None)
+
+        completa = validar_parametros_detalhados(params, dores, processo)
+        parcial = validar_parametros_detalhados(params, dores, processo, formulas=["F10"])
+
+        assert parcial == [e for e in completa if e.startswith("F10")]
+        assert validar_parametros_detalhados(params, dores, processo, formulas=[]) == []
+
+
+class TestValidarMetas:
+    def test_limites_inclusos(self):
+        assert validar_metas(MetasReducao(meta_f01=0.0, meta_f05=1.0, meta_f10=0.35)) == []
+
+    def test_fora_de_0_a_100_porcento(self):
+        erros = validar_metas(MetasReducao(meta_f02=-5.0, meta_f07=1e308, meta_f12=float("nan")))
+        assert [e[8:11] for e in erros] == ["F02", "F07", "F12"]
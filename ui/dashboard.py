@@ -1,17 +1,45 @@
 """
 Dashboard de resultados financeiros.
 """
+from __future__ import annotations
+
+from typing import Mapping
+
 import streamlit as st
 import pandas as pd
 
-from models.results import ResultadosFinanceiros
-from models.inputs import ProcessoAtual, ParametrosDetalhados
-from core.formulas import calcular_horas_operacao_mes
-from config.constants import HORAS_MES_CLT
-
+from config.constants import MAPA_LIMIARES_PAYBACK, MAPA_PONTOS_DASHBOARD
+from core.benchmarks import obter_tabela
+from core.cache import chave_entradas, obter_cache
+from core.mapa_equilibrio import INVESTIMENTO_UNICO, campos_eixo, faixa_sugerida, mapa_equilibrio
+from models.results import AtribuicaoShapley, IndicadoresFaixa, ResultadosFinanceiros
+from models.calculations import RastreioCalculo
+from core.repositorio import PosicaoBenchmark
+
+
+def render_dashboard(
+    resultados: ResultadosFinanceiros,
+    chave: str | None = None,
+    percentis: Mapping[str, PosicaoBenchmark] | None = None,
+    faixa: IndicadoresFaixa | None = None,
+    atribuicao: AtribuicaoShapley | None = None,
+):
+    """
+    Renderiza dashboard completo de resultados.
+
+    `chave` identifica as entradas do cálculo (ver `core.cache.chave_entradas`); quando informada,
+    as tabelas pandas são reaproveitadas do cache entre reruns. `percentis` (rótulo de custo →
+    posição entre análises semelhantes, ver `RepositorioAnalises.percentis`) adiciona a comparação.
+    `faixa` (ver `core.intervalos.indicadores_faixa`) mostra payback e ROI na faixa de investimento.
+    `atribuicao` (ver `core.atribuicao.atribuicao_shapley`) mostra a contribuição de cada fórmula.
+    """
+    if chave is None:
+        roi_df, resumo_df = _preparar_tabelas(resultados, faixa)
+    else:
+        roi_df, resumo_df = obter_cache("dashboard").obter_ou_calcular(
+            chave, lambda: _preparar_tabelas(resultados, faixa)
+        )
 
-def render_dashboard(resultados: ResultadosFinanceiros, processo: ProcessoAtual = None, parametros: ParametrosDetalhados = None):
-    """Renderiza dashboard completo de resultados."""
     st.header("📈 Análise do Custo da Inação")
     st.markdown("---")
 
@@ -29,6 +57,8 @@ def render_dashboard(resultados: ResultadosFinanceiros, processo: ProcessoAtual
             else "N/A"
         )
         st.metric("Payback Simples", payback_txt)
+        if faixa is not None:
+            st.caption(f"Faixa: {_fmt_anos(faixa.payback_anos.minimo)} a {_fmt_anos(faixa.payback_anos.maximo)}")
     with col4:
         st.metric("ROI 5 Anos", f"{resultados.roi_5_anos:.1f}%")
 
@@ -45,12 +75,8 @@ def render_dashboard(resultados: ResultadosFinanceiros, processo: ProcessoAtual
         with c2:
             chp_txt = f"R$ {resultados.custo_hora_parada:,.2f}/h" if resultados.custo_hora_parada > 0 else "Não informado"
             st.metric("Custo Hora Parada", chp_txt)
-            if processo is not None:
-                horas_op_mes = calcular_horas_operacao_mes(
-                    float(processo.horas_por_turno),
-                    int(processo.turnos_por_dia),
-                    int(processo.dias_operacao_ano),
-                )
+            if resultados.rastreio is not None:
+                horas_op_mes = resultados.rastreio.bases["horas_operacao_mes"]
                 st.caption(f"Base: {horas_op_mes:,.0f}h/mês (horas_turno × turnos × dias_ano/12)")
         with c3:
             st.metric("Fator de Encargos", f"{resultados.fator_encargos_usado:.2f}x")
@@ -62,20 +88,27 @@ def render_dashboard(resultados: ResultadosFinanceiros, processo: ProcessoAtual
     col_inv, col_roi = st.columns([1, 2])
     with col_inv:
         st.metric("Investimento Médio", f"R$ {resultados.investimento_medio:,.2f}")
+        if faixa is not None:
+            st.caption(f"Faixa: R$ {faixa.investimento.minimo:,.2f} a R$ {faixa.investimento.maximo:,.2f}")
     with col_roi:
-        roi_df = pd.DataFrame(
-            {
-                "Período": ["1 Ano", "2 Anos", "3 Anos", "4 Anos", "5 Anos"],
-                "ROI (%)": [
-                    f"{resultados.roi_1_ano:.1f}%",
-                    f"{resultados.roi_2_anos:.1f}%",
-                    f"{resultados.roi_3_anos:.1f}%",
-                    f"{resultados.roi_4_anos:.1f}%",
-                    f"{resultados.roi_5_anos:.1f}%",
-                ],
-            }
-        )
         st.dataframe(roi_df, use_container_width=True, hide_index=True)
+    if faixa is not None:
+        st.line_chart(_faixa_roi_df(faixa), x="Ano", y=["Pessimista", "Central", "Otimista"])
+        st.caption(
+            "Pessimista: investimento máximo (e metas mínimas); otimista: investimento mínimo (e metas máximas)."
+        )
+    if atribuicao is not None and atribuicao.codigos:
+        st.markdown("**Contribuição de cada fórmula (valores de Shapley)**")
+        st.dataframe(_atribuicao_df(atribuicao), use_container_width=True, hide_index=True)
+        st.caption(
+            f"Payback: anos reduzidos a partir de {atribuicao.horizonte_anos:g} anos, repartidos de forma "
+            "independente da ordem das fórmulas. ROI: pontos percentuais somados a −100% (sem ganho)."
+        )
+        if not any(atribuicao.payback_anos):
+            st.caption(
+                f"⚠️ O payback passa de {atribuicao.horizonte_anos:g} anos: nenhuma combinação de fórmulas se paga "
+                "dentro do horizonte, então as contribuições de payback são todas 0."
+            )
 
     st.markdown("---")
 
@@ -104,13 +137,156 @@ def render_dashboard(resultados: ResultadosFinanceiros, processo: ProcessoAtual
         st.metric("🧠 Custos Ocultos", f"R$ {resultados.total_dor5:,.2f}")
         _render_breakdown_expander(resultados.breakdown_dor5)
 
+    if percentis:
+        _render_comparacao(resultados, percentis)
+
     st.markdown("---")
 
     # --- Tabela resumo ---
     st.subheader("Resumo Consolidado")
 
-    total = resultados.custo_total_anual_inacao or 0.0
+    st.dataframe(resumo_df, use_container_width=True, hide_index=True)
+
+    # --- Detalhamento dos Cálculos ---
+    if resultados.rastreio is not None:
+        st.markdown("---")
+        st.subheader("📋 Detalhamento dos Cálculos")
+        _render_calculo_detalhado(resultados.rastreio)
+
+
+def render_mapa_equilibrio(entradas: Mapping):
+    """
+    Mapa de equilíbrio: payback em dois parâmetros escolhidos, com as curvas de 1, 2 e 3 anos.
+
+    A escolha dos eixos fica em `st.session_state["mapa_equilibrio"]`, que leva o mesmo mapa ao PPTX.
+    """
+    with st.expander("🗺️ Mapa de Equilíbrio"):
+        campos = campos_eixo(entradas["dores"])
+        col_x, col_y = st.columns(2)
+        with col_x:
+            campo_x = st.selectbox("Eixo horizontal", campos, index=campos.index(INVESTIMENTO_UNICO), key="mapa_campo_x")
+            faixa_x = _faixa_eixo(entradas, campo_x, "mapa_faixa_x")
+        with col_y:
+            padrao_y = next((c for c in campos if c.startswith("parametros.")), "processo.producao_mensal")
+            campo_y = st.selectbox("Eixo vertical", campos, index=campos.index(padrao_y), key="mapa_campo_y")
+            faixa_y = _faixa_eixo(entradas, campo_y, "mapa_faixa_y")
+
+        if campo_x == campo_y or faixa_x is None or faixa_y is None:
+            st.info("Escolha dois campos diferentes, cada um com mínimo menor que o máximo.")
+            st.session_state.pop("mapa_equilibrio", None)
+            return
+
+        espec = {"eixo_x": (campo_x, *faixa_x), "eixo_y": (campo_y, *faixa_y)}
+        st.session_state["mapa_equilibrio"] = espec
+        mapa = obter_cache("mapa").obter_ou_calcular(
+            chave_entradas(*entradas.values(), espec["eixo_x"], espec["eixo_y"], MAPA_PONTOS_DASHBOARD),
+            lambda: mapa_equilibrio(entradas, espec["eixo_x"], espec["eixo_y"], pontos=MAPA_PONTOS_DASHBOARD),
+        )
+        st.altair_chart(_grafico_mapa(mapa), use_container_width=True)
+        st.caption(
+            f"Payback (anos) por combinação; curvas em {', '.join(f'{a:g}' for a in MAPA_LIMIARES_PAYBACK)} anos. "
+            "Demais entradas como informadas; o mapa também entra no PPTX."
+        )
+
+
+def _faixa_eixo(entradas: Mapping, campo: str, chave: str) -> tuple[float, float] | None:
+    """Mínimo e máximo do eixo: sugestão pela faixa de benchmark (ou em torno do valor atual)."""
+    faixa = None
+    if not campo.startswith(INVESTIMENTO_UNICO):
+        faixa = obter_tabela().faixas_cliente(entradas["cliente"]).get(campo.split(".", 1)[1])
+    sugestao = faixa_sugerida(entradas, campo, faixa)
+    chave_min, chave_max = f"{chave}_{campo}_min", f"{chave}_{campo}_max"
+    st.session_state.setdefault(chave_min, sugestao[0])  # sem `value=`: a sessão restaurada grava as mesmas chaves
+    st.session_state.setdefault(chave_max, sugestao[1])
+    col_min, col_max = st.columns(2)
+    minimo = col_min.number_input("Mínimo", min_value=0.0, key=chave_min)
+    maximo = col_max.number_input("Máximo", min_value=0.0, key=chave_max)
+    return (minimo, maximo) if maximo > minimo else None
+
+
+def _grafico_mapa(mapa):
+    """Heatmap do payback (limitado ao maior limiar × 2) com as curvas de nível por cima."""
+    import altair as alt  # só quando o mapa é aberto
+
+    teto = 2 * max(MAPA_LIMIARES_PAYBACK)
+    celulas = pd.DataFrame(
+        [
+            {"x": x, "y": y, "payback": min(p, teto)}
+            for y, linha in zip(mapa.valores_y, mapa.payback_anos)
+            for x, p in zip(mapa.valores_x, linha)
+        ]
+    )
+    curvas = pd.DataFrame(
+        [
+            {"x": x, "y": y, "curva": f"{limiar:g} anos #{k}", "ordem": ordem}
+            for limiar, polilinhas in mapa.contornos.items()
+            for k, polilinha in enumerate(polilinhas)
+            for ordem, (x, y) in enumerate(polilinha)
+        ],
+        columns=["x", "y", "curva", "ordem"],
+    )
+    heatmap = alt.Chart(celulas).mark_rect().encode(
+        x=alt.X("x:Q", bin=alt.Bin(maxbins=len(mapa.valores_x)), title=mapa.eixo_x),
+        y=alt.Y("y:Q", bin=alt.Bin(maxbins=len(mapa.valores_y)), title=mapa.eixo_y),
+        color=alt.Color("mean(payback):Q", title="Payback (anos)", scale=alt.Scale(scheme="redyellowgreen", reverse=True)),
+    )
+    linhas = alt.Chart(curvas).mark_line(color="black").encode(x="x:Q", y="y:Q", detail="curva:N", order="ordem:Q")
+    return heatmap + linhas
+
+
+def _fmt_anos(anos: float) -> str:
+    return f"{anos:.2f} anos" if anos != float("inf") else "N/A"
+
+
+def _faixa_roi_df(faixa: IndicadoresFaixa) -> pd.DataFrame:
+    """Banda do ROI (%) por ano para o gráfico."""
+    return pd.DataFrame(
+        {
+            "Ano": list(range(1, len(faixa.roi) + 1)),
+            "Pessimista": [roi.minimo for roi in faixa.roi],
+            "Central": [roi.central for roi in faixa.roi],
+            "Otimista": [roi.maximo for roi in faixa.roi],
+        }
+    )
+
+
+def _atribuicao_df(atribuicao: AtribuicaoShapley) -> pd.DataFrame:
+    """Contribuições por fórmula, da maior redução de payback para a menor."""
     df = pd.DataFrame(
+        {
+            "Fórmula": atribuicao.rotulos,
+            "Ganho Anual": atribuicao.ganhos,
+            "Payback (anos reduzidos)": atribuicao.payback_anos,
+            f"ROI {len(atribuicao.roi)} anos (p.p.)": atribuicao.roi[-1],
+        }
+    ).sort_values("Payback (anos reduzidos)", ascending=False)
+    df["Ganho Anual"] = df["Ganho Anual"].apply(lambda x: f"R$ {x:,.2f}")
+    df["Payback (anos reduzidos)"] = df["Payback (anos reduzidos)"].apply(lambda x: f"{x:.2f}")
+    df[f"ROI {len(atribuicao.roi)} anos (p.p.)"] = df[f"ROI {len(atribuicao.roi)} anos (p.p.)"].apply(lambda x: f"{x:,.1f}")
+    return df
+
+
+def _preparar_tabelas(
+    resultados: ResultadosFinanceiros, faixa: IndicadoresFaixa | None = None
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Monta as tabelas (ROI por período e resumo por Dor) já formatadas para exibição."""
+    roi_df = pd.DataFrame(
+        {
+            "Período": ["1 Ano", "2 Anos", "3 Anos", "4 Anos", "5 Anos"],
+            "ROI (%)": [
+                f"{resultados.roi_1_ano:.1f}%",
+                f"{resultados.roi_2_anos:.1f}%",
+                f"{resultados.roi_3_anos:.1f}%",
+                f"{resultados.roi_4_anos:.1f}%",
+                f"{resultados.roi_5_anos:.1f}%",
+            ],
+        }
+    )
+    if faixa is not None:
+        roi_df["Faixa (%)"] = [f"{roi.minimo:.1f}% a {roi.maximo:.1f}%" for roi in faixa.roi]
+
+    total = resultados.custo_total_anual_inacao or 0.0
+    resumo_df = pd.DataFrame(
         {
             "Dor": [
                 "Dor 1 - Mão de Obra",
@@ -139,16 +315,10 @@ def render_dashboard(resultados: ResultadosFinanceiros, processo: ProcessoAtual
         }
     )
 
-    df["Custo Atual (R$)"] = df["Custo Atual (R$)"].apply(lambda x: f"R$ {x:,.2f}")
-    df["% do Total"] = df["% do Total"].apply(lambda x: f"{x:.1f}%")
+    resumo_df["Custo Atual (R$)"] = resumo_df["Custo Atual (R$)"].apply(lambda x: f"R$ {x:,.2f}")
+    resumo_df["% do Total"] = resumo_df["% do Total"].apply(lambda x: f"{x:.1f}%")
 
-    st.dataframe(df, use_container_width=True, hide_index=True)
-
-    # --- Detalhamento dos Cálculos ---
-    if processo is not None and parametros is not None:
-        st.markdown("---")
-        st.subheader("📋 Detalhamento dos Cálculos")
-        _render_calculo_detalhado(resultados, processo, parametros)
+    return roi_df, resumo_df
 
 
 def _render_breakdown_expander(breakdown: dict[str, float]):
@@ -161,230 +331,197 @@ def _render_breakdown_expander(breakdown: dict[str, float]):
             st.write(f"**{nome}:** R$ {valor:,.2f}")
 
 
-def _render_calculo_detalhado(resultados: ResultadosFinanceiros, processo: ProcessoAtual, parametros: ParametrosDetalhados):
-    """Renderiza seção de detalhamento linha a linha de cada fórmula ativa."""
+def _render_comparacao(resultados: ResultadosFinanceiros, percentis: Mapping[str, PosicaoBenchmark]):
+    """Posição de cada custo entre as análises gravadas da mesma área e porte."""
+    with st.expander(f"📊 Comparação com análises semelhantes ({resultados.area_atuacao}, porte {resultados.porte_empresa})"):
+        for rotulo, posicao in sorted(percentis.items(), key=lambda item: -item[1].percentil):
+            st.write(
+                f"**{rotulo}:** percentil {posicao.percentil:.0f} — maior que o de "
+                f"{posicao.percentil:.0f}% de {posicao.amostras:,} análises semelhantes"
+            )
+        st.caption("Percentis aproximados (erro típico de ±1 ponto), atualizados a cada análise concluída.")
 
-    fator = resultados.fator_encargos_usado
-    chp = resultados.custo_hora_parada
 
-    detalhes = []
+def _render_calculo_detalhado(rastreio: RastreioCalculo):
+    """Renderiza seção de detalhamento linha a linha de cada fórmula ativa (a partir do rastro do cálculo)."""
 
-    # --- Dor 1 ---
-    v = resultados.breakdown_dor1.get("F01 - Mão de Obra Direta", 0)
-    if v > 0:
-        n = processo.pessoas_processo_turno * processo.turnos_por_dia
-        detalhes.append((
-            "F01 - Mão de Obra Direta",
-            f"Nº Operadores × Salário × Fator Encargos × 12",
-            f"{n} operadores × R$ {processo.salario_medio_operador:,.2f} × {fator:.2f} × 12",
-            v,
-        ))
-
-    v = resultados.breakdown_dor1.get("F02 - Horas Extras", 0)
-    if v > 0 and parametros.f02_media_he_mes_por_pessoa is not None:
-        n = processo.pessoas_processo_turno * processo.turnos_por_dia
-        custo_hora = (processo.salario_medio_operador * fator) / HORAS_MES_CLT
-        detalhes.append((
-            "F02 - Horas Extras",
-            "Nº Operadores × HE/mês × Custo Hora × 1,5 × 12",
-            f"{n} op × {parametros.f02_media_he_mes_por_pessoa:.0f} HE/mês × R$ {custo_hora:,.2f}/h × 1,5 × 12",
-            v,
-        ))
-
-    v = resultados.breakdown_dor1.get("F03 - Curva de Aprendizagem", 0)
-    if v > 0 and parametros.f03_novas_contratacoes_ano is not None:
-        n = parametros.f03_novas_contratacoes_ano
-        meses = parametros.f03_meses_curva or 0
-        sal_nov = parametros.f03_salario_novato or processo.salario_medio_operador
-        sal_sup = parametros.f03_salario_supervisor or processo.salario_medio_supervisor
-        pct_sup = parametros.f03_percentual_tempo_supervisor or 0.0
-
-        custo_novato = sal_nov * fator * meses
-        custo_supervisor = sal_sup * fator * pct_sup * meses
-        custo_por_contratacao = custo_novato + custo_supervisor
-
-        valores = (
-            f"Fórmula: Nº Contratações × (Custo Novato + Custo Supervisor)\n\n"
-            f"Custo Novato/contratação:\n"
-            f"R$ {sal_nov:,.2f} × {fator:.2f} × {meses} meses = R$ {custo_novato:,.2f}\n\n"
-            f"Custo Supervisor/contratação:\n"
-            f"R$ {sal_sup:,.2f} × {fator:.2f} × {pct_sup*100:.0f}% × {meses} meses = R$ {custo_supervisor:,.2f}\n\n"
-            f"Custo por contratação: R$ {custo_por_contratacao:,.2f}\n"
-            f"Total: {n} × R$ {custo_por_contratacao:,.2f} = R$ {(n*custo_por_contratacao):,.2f}"
-        )
+    detalhes = []
 
-        detalhes.append(
-            (
-                "F03 - Curva de Aprendizagem",
+    for passo in rastreio.passos:
+        if passo.resultado <= 0:
+            continue
+        e = passo.entradas
+        i = passo.intermediarios
+
+        if passo.codigo == "F01":
+            detalhes.append((
+                passo.rotulo,
+                "Nº Operadores × Salário × Fator Encargos × 12",
+                f"{e['num_operadores']} operadores × R$ {e['salario_medio']:,.2f} × {e['fator_encargos']:.2f} × 12",
+                passo.resultado,
+            ))
+
+        elif passo.codigo == "F02":
+            detalhes.append((
+                passo.rotulo,
+                "Nº Operadores × HE/mês × Custo Hora × 1,5 × 12",
+                f"{e['num_operadores']} op × {e['media_he_mes']:.0f} HE/mês × R$ {i['custo_hora_he']:,.2f}/h × 1,5 × 12",
+                passo.resultado,
+            ))
+
+        elif passo.codigo == "F03":
+            n = e["num_contratacoes"]
+            valores = (
+                f"Fórmula: Nº Contratações × (Custo Novato + Custo Supervisor)\n\n"
+                f"Custo Novato/contratação:\n"
+                f"R$ {e['salario_novato']:,.2f} × {e['fator_encargos']:.2f} × {e['meses_curva']} meses = R$ {i['custo_novato']:,.2f}\n\n"
+                f"Custo Supervisor/contratação:\n"
+                f"R$ {e['salario_supervisor']:,.2f} × {e['fator_encargos']:.2f} × {e['pct_tempo_supervisor']*100:.0f}% × "
+                f"{e['meses_curva']} meses = R$ {i['custo_supervisor']:,.2f}\n\n"
+                f"Custo por contratação: R$ {i['custo_por_contratacao']:,.2f}\n"
+                f"Total: {n} × R$ {i['custo_por_contratacao']:,.2f} = R$ {passo.resultado:,.2f}"
+            )
+            detalhes.append((
+                passo.rotulo,
                 "Nº Contratações × (Custo Novato + Custo Supervisor durante treinamento)",
                 valores,
-                v,
-            )
-        )
-
-    v = resultados.breakdown_dor1.get("F04 - Turnover", 0)
-    if v > 0 and parametros.f04_desligamentos_ano is not None:
-        fator_turnover = parametros.f04_fator_custo_turnover or 1.5
-        detalhes.append((
-            "F04 - Turnover",
-            "Nº Desligamentos × Salário × Fator Turnover",
-            f"{parametros.f04_desligamentos_ano} desl. × R$ {processo.salario_medio_operador:,.2f} × {fator_turnover:.1f}x",
-            v,
-        ))
-
-    # --- Dor 2 ---
-    v = resultados.breakdown_dor2.get("F05 - Refugo", 0)
-    if v > 0 and parametros.f05_percentual_refugo is not None:
-        detalhes.append((
-            "F05 - Refugo",
-            "Produção Mensal × % Refugo × Custo MP × 12",
-            f"× {parametros.f05_percentual_refugo*100:.1f}% refugo × R$ {processo.custo_materia_prima_peca:,.2f}/peça × 12",
-            v,
-        ))
-
-    v = resultados.breakdown_dor2.get("F05 - Retrabalho", 0)
-    if v > 0 and parametros.f05_percentual_retrabalho is not None:
-        custo_hora = (processo.salario_medio_operador * fator) / 176
-        detalhes.append((
-            "F05 - Retrabalho",
-            "Produção Mensal × % Retrabalho × Horas Retrab. × Custo Hora × 12",
-            f"× {parametros.f05_percentual_retrabalho*100:.1f}% retrab. × {parametros.f05_horas_retrabalho_por_unidade or '?'} h/un × R$ {custo_hora:,.2f}/h × 12",
-            v,
-        ))
-
-    v = resultados.breakdown_dor2.get("F06 - Inspeção Manual", 0)
-    if v > 0:
-        n = processo.pessoas_inspecao_turno * processo.turnos_por_dia
-        detalhes.append((
-            "F06 - Inspeção Manual",
-            "Nº Inspetores × Salário × Fator Encargos × 12",
-            f"{n} inspetores × R$ {processo.salario_medio_inspetor:,.2f} × {fator:.2f} × 12",
-            v,
-        ))
-
-    v = resultados.breakdown_dor2.get("F07 - Escapes de Qualidade", 0)
-    if v > 0 and parametros.f07_reclamacoes_clientes_ano is not None:
-        detalhes.append((
-            "F07 - Escapes de Qualidade",
-            "Nº Reclamações/Ano × Custo Médio por Reclamação",
-            f"{parametros.f07_reclamacoes_clientes_ano} recl. × R$ {parametros.f07_custo_medio_por_reclamacao:,.2f}",
-            v,
-        ))
-
-    # --- Dor 3 ---
-    v = resultados.breakdown_dor3.get("F08 - Custo de Oportunidade", 0)
-    if v > 0 and parametros.f08_percentual_demanda_reprimida is not None:
-        detalhes.append((
-            "F08 - Custo de Oportunidade",
-            "Faturamento Mensal × % Demanda Reprimida × Margem Contrib. × 12",
-            f"R$ {resultados.faturamento_mensal_linha:,.2f} × {parametros.f08_percentual_demanda_reprimida*100:.0f}% × {parametros.f08_margem_contribuicao*100:.0f}% × 12",
-            v,
-        ))
-
-    v = resultados.breakdown_dor3.get("F09 - Ociosidade Silenciosa", 0)
-    if v > 0 and parametros.f09_minutos_ociosos_por_dia is not None:
-        n = processo.pessoas_processo_turno * processo.turnos_por_dia
-        custo_hora = (processo.salario_medio_operador * fator) / 176
-        detalhes.append((
-            "F09 - Ociosidade Silenciosa",
-            "Nº Operadores × (Min Ociosos / 60) × Custo Hora × Dias/Ano",
-            f"{n} op × ({parametros.f09_minutos_ociosos_por_dia:.0f} min / 60) × R$ {custo_hora:,.2f}/h × {processo.dias_operacao_ano} dias",
-            v,
-        ))
-
-    v = resultados.breakdown_dor3.get("F10 - Paradas de Linha", 0)
-    if v > 0 and parametros.f10_paradas_mes is not None:
-        chp_usado = parametros.f10_custo_hora_parada if (parametros.f10_custo_hora_parada and parametros.f10_custo_hora_parada > 0) else chp
-        detalhes.append((
-            "F10 - Paradas de Linha",
-            "Nº Paradas/Mês × Duração (h) × Custo Hora Parada × 12",
-            f"{parametros.f10_paradas_mes} paradas × {parametros.f10_duracao_media_parada_horas:.1f} h × R$ {chp_usado:,.2f}/h × 12",
-            v,
-        ))
-
-    v = resultados.breakdown_dor3.get("F11 - Setup/Changeover", 0)
-    if v > 0 and parametros.f11_setups_mes is not None:
-        chp_usado = parametros.f11_custo_hora_parada if (parametros.f11_custo_hora_parada and parametros.f11_custo_hora_parada > 0) else chp
-        detalhes.append((
-            "F11 - Setup/Changeover",
-            "Nº Setups/Mês × Horas/Setup × Custo Hora Parada × 12",
-            f"{parametros.f11_setups_mes} setups × {parametros.f11_horas_por_setup:.2f} h × R$ {chp_usado:,.2f}/h × 12",
-            v,
-        ))
-
-    # --- Dor 4 ---
-    v_afast = resultados.breakdown_dor4.get("F12 - Afastamentos", 0)
-    v_acid = resultados.breakdown_dor4.get("F12 - Acidentes", 0)
-    v_legal = resultados.breakdown_dor4.get("F12 - Risco Legal", 0)
-    if (v_afast + v_acid + v_legal) > 0 and parametros.f12_afastamentos_ano is not None:
-        detalhes.append((
-            "F12 - Riscos, Acidentes e Doenças",
-            "Afastamentos + Acidentes + Risco Legal",
-            f"{parametros.f12_afastamentos_ano} afast. × R$ {parametros.f12_custo_medio_afastamento:,.2f}  |  "
-            f"{parametros.f12_acidentes_com_lesao_ano} acid. × R$ {parametros.f12_custo_medio_acidente:,.2f}  |  "
-            f"{(parametros.f12_probabilidade_processo or 0)*100:.0f}% × R$ {parametros.f12_custo_estimado_processo:,.2f}",
-            v_afast + v_acid + v_legal,
-        ))
-
-    v = resultados.breakdown_dor4.get("F13 - Frota de Empilhadeiras", 0)
-    if v > 0 and parametros.f13_num_empilhadeiras is not None:
-        detalhes.append((
-            "F13 - Frota de Empilhadeiras",
-            "Nº Empilhadeiras × (Operador + Equipamento + Energia + Manutenção) × 12",
-            f"{parametros.f13_num_empilhadeiras} emp. × (op + equip + energ + manut) × 12",
-            v,
-        ))
-
-    # --- Dor 5 ---
-    v = resultados.breakdown_dor5.get("F14 - Supervisão", 0)
-    if v > 0 and parametros.f14_num_supervisores is not None:
-        n_total = parametros.f14_num_supervisores
-        sal = parametros.f14_salario_supervisor or processo.salario_medio_supervisor
-        detalhes.append((
-            "F14 - Supervisão",
-            "Nº Supervisores (total) × Salário × Fator Encargos × 12",
-            f"{n_total} supervisores (total) × R$ {sal:,.2f} × {fator:.2f} × 12",
-            v,
-        ))
-
-    v = resultados.breakdown_dor5.get("F15 - Compliance/EPIs", 0)
-    if v > 0 and parametros.f15_custo_epi_ano_por_pessoa is not None:
-        n = processo.pessoas_processo_turno * processo.turnos_por_dia
-        detalhes.append((
-            "F15 - Compliance/EPIs",
-            "Nº Operadores × (Custo EPI/Ano + Custo Exames/Ano)",
-            f"{n} op × (R$ {parametros.f15_custo_epi_ano_por_pessoa:,.2f} EPI + R$ {parametros.f15_custo_exames_ano_por_pessoa:,.2f} exames)",
-            v,
-        ))
-
-    v = resultados.breakdown_dor5.get("F16 - Energia e Utilidades", 0)
-    if v > 0 and parametros.f16_area_operacao_m2 is not None:
-        detalhes.append((
-            "F16 - Energia e Utilidades",
-            "Área (m²) × Custo Energia/m²/Ano",
-            f"{parametros.f16_area_operacao_m2:,.0f} m² × R$ {parametros.f16_custo_energia_m2_ano:,.2f}/m²/ano",
-            v,
-        ))
-
-    v = resultados.breakdown_dor5.get("F17 - Espaço Físico", 0)
-    if v > 0 and parametros.f17_area_m2 is not None:
-        pct = (parametros.f17_percentual_reducao_automacao or 0) * 100
-        detalhes.append((
-            "F17 - Espaço Físico",
-            "Área (m²) × Custo m²/Ano × % Redução com Automação",
-            f"{parametros.f17_area_m2:,.0f} m² × R$ {parametros.f17_custo_m2_ano:,.2f}/m²/ano × {pct:.0f}%",
-            v,
-        ))
-
-    v = resultados.breakdown_dor5.get("F18 - Gestão de Dados", 0)
-    if v > 0 and parametros.f18_pessoas_envolvidas is not None:
-        custo_hora = (processo.salario_medio_operador * fator) / 176
-        detalhes.append((
-            "F18 - Gestão de Dados",
-            "Nº Pessoas × Horas/Dia × Custo Hora × Dias/Ano",
-            f"{parametros.f18_pessoas_envolvidas} pessoas × {parametros.f18_horas_dia_tarefas_dados:.1f} h/dia × R$ {custo_hora:,.2f}/h × {processo.dias_operacao_ano} dias",
-            v,
-        ))
+                passo.resultado,
+            ))
+
+        elif passo.codigo == "F04":
+            detalhes.append((
+                passo.rotulo,
+                "Nº Desligamentos × Salário × Fator Turnover",
+                f"{e['num_desligamentos']} desl. × R$ {e['salario_medio']:,.2f} × {e['fator_custo_turnover']:.1f}x",
+                passo.resultado,
+            ))
+
+        elif passo.codigo == "F05":
+            refugo = passo.componentes["F05 - Refugo"]
+            retrabalho = passo.componentes["F05 - Retrabalho"]
+            if refugo > 0:
+                detalhes.append((
+                    "F05 - Refugo",
+                    "Produção Mensal × % Refugo × Custo MP × 12",
+                    f"{e['producao_mensal']:,.0f} peças × {e['pct_refugo']*100:.1f}% refugo × "
+                    f"R$ {e['custo_mp_unidade']:,.2f}/peça × 12",
+                    refugo,
+                ))
+            if retrabalho > 0:
+                detalhes.append((
+                    "F05 - Retrabalho",
+                    "Produção Mensal × % Retrabalho × Horas Retrab. × Custo Hora × 12",
+                    f"{e['producao_mensal']:,.0f} peças × {e['pct_retrabalho']*100:.1f}% retrab. × "
+                    f"{e['horas_retrab_unidade']} h/un × R$ {e['custo_hora_operador']:,.2f}/h × 12",
+                    retrabalho,
+                ))
+
+        elif passo.codigo == "F06":
+            detalhes.append((
+                passo.rotulo,
+                "Nº Inspetores × Salário × Fator Encargos × 12",
+                f"{e['num_inspetores']} inspetores × R$ {e['salario_inspetor']:,.2f} × {e['fator_encargos']:.2f} × 12",
+                passo.resultado,
+            ))
+
+        elif passo.codigo == "F07":
+            detalhes.append((
+                passo.rotulo,
+                "Nº Reclamações/Ano × Custo Médio por Reclamação",
+                f"{e['reclamacoes_ano']} recl. × R$ {e['custo_medio_reclamacao']:,.2f}",
+                passo.resultado,
+            ))
+
+        elif passo.codigo == "F08":
+            detalhes.append((
+                passo.rotulo,
+                "Faturamento Mensal × % Demanda Reprimida × Margem Contrib. × 12",
+                f"R$ {e['faturamento_mensal']:,.2f} × {e['pct_demanda_reprimida']*100:.0f}% × {e['margem_contribuicao']*100:.0f}% × 12",
+                passo.resultado,
+            ))
+
+        elif passo.codigo == "F09":
+            detalhes.append((
+                passo.rotulo,
+                "Nº Operadores × (Min Ociosos / 60) × Custo Hora × Dias/Ano",
+                f"{e['num_operadores']} op × ({e['min_ociosos_dia']:.0f} min / 60) × R$ {e['custo_hora_operador']:,.2f}/h × {e['dias_ano']} dias",
+                passo.resultado,
+            ))
+
+        elif passo.codigo == "F10":
+            detalhes.append((
+                passo.rotulo,
+                "Nº Paradas/Mês × Duração (h) × Custo Hora Parada × 12",
+                f"{e['paradas_mes']} paradas × {e['duracao_media_horas']:.1f} h × R$ {e['custo_hora_parada']:,.2f}/h × 12",
+                passo.resultado,
+            ))
+
+        elif passo.codigo == "F11":
+            detalhes.append((
+                passo.rotulo,
+                "Nº Setups/Mês × Horas/Setup × Custo Hora Parada × 12",
+                f"{e['setups_mes']} setups × {e['horas_setup']:.2f} h × R$ {e['custo_hora_parada']:,.2f}/h × 12",
+                passo.resultado,
+            ))
+
+        elif passo.codigo == "F12":
+            detalhes.append((
+                passo.rotulo,
+                "Afastamentos + Acidentes + Risco Legal",
+                f"{e['afastamentos_ano']} afast. × R$ {e['custo_afastamento']:,.2f}  |  "
+                f"{e['acidentes_ano']} acid. × R$ {e['custo_acidente']:,.2f}  |  "
+                f"{e['prob_processo']*100:.0f}% × R$ {e['custo_processo']:,.2f}",
+                passo.resultado,
+            ))
+
+        elif passo.codigo == "F13":
+            mensal = e["custo_operador"] + e["custo_equipamento"] + e["custo_energia"] + e["custo_manutencao"]
+            detalhes.append((
+                passo.rotulo,
+                "Nº Empilhadeiras × (Operador + Equipamento + Energia + Manutenção) × 12",
+                f"{e['num_empilhadeiras']} emp. × R$ {mensal:,.2f}/mês × 12",
+                passo.resultado,
+            ))
+
+        elif passo.codigo == "F14":
+            detalhes.append((
+                passo.rotulo,
+                "Nº Supervisores (total) × Salário × Fator Encargos × 12",
+                f"{e['num_supervisores']} supervisores (total) × R$ {e['salario_supervisor']:,.2f} × {e['fator_encargos']:.2f} × 12",
+                passo.resultado,
+            ))
+
+        elif passo.codigo == "F15":
+            detalhes.append((
+                passo.rotulo,
+                "Nº Operadores × (Custo EPI/Ano + Custo Exames/Ano)",
+                f"{e['num_operadores']} op × (R$ {e['custo_epi_ano']:,.2f} EPI + R$ {e['custo_exames_ano']:,.2f} exames)",
+                passo.resultado,
+            ))
+
+        elif passo.codigo == "F16":
+            detalhes.append((
+                passo.rotulo,
+                "Área (m²) × Custo Energia/m²/Ano",
+                f"{e['area_m2']:,.0f} m² × R$ {e['custo_energia_m2_ano']:,.2f}/m²/ano",
+                passo.resultado,
+            ))
+
+        elif passo.codigo == "F17":
+            detalhes.append((
+                passo.rotulo,
+                "Área (m²) × Custo m²/Ano × % Redução com Automação",
+                f"{e['area_m2']:,.0f} m² × R$ {e['custo_m2_ano']:,.2f}/m²/ano × {e['pct_reducao']*100:.0f}%",
+                passo.resultado,
+            ))
+
+        elif passo.codigo == "F18":
+            detalhes.append((
+                passo.rotulo,
+                "Nº Pessoas × Horas/Dia × Custo Hora × Dias/Ano",
+                f"{e['num_pessoas']} pessoas × {e['horas_dia']:.1f} h/dia × R$ {e['custo_hora_operador']:,.2f}/h × {e['dias_ano']} dias",
+                passo.resultado,
+            ))
 
     if not detalhes:
         st.info("Nenhum cálculo ativo para detalhar.")
@@ -3,27 +3,41 @@ Formulários Streamlit para input de dados.
 """
 from __future__ import annotations
 
+from dataclasses import fields, replace
+from typing import Any, Callable
+
 import streamlit as st
 
-from config.areas import AREAS_ARV
-from config.constants import (
-    DIAS_OPERACAO_ANO_DEFAULT,
-    FATOR_CUSTO_TURNOVER_DEFAULT,
-    FATOR_ENCARGOS_OPCOES,
-    HORAS_MES_CUSTO_PRODUCAO,
-    SALARIO_INSPETOR_DEFAULT,
-    SALARIO_OPERADOR_DEFAULT,
-    SALARIO_SUPERVISOR_DEFAULT,
-)
+from config.areas import AREAS_ARV, MASCARAS_AREAS
+from config.benchmarks import REGIOES
+from config.constants import FATOR_ENCARGOS_OPCOES, HORAS_MES_CUSTO_PRODUCAO
 from models.inputs import (
     ClienteBasicInfo,
     ProcessoAtual,
     DoresSelecionadas,
+    Formula,
     ParametrosDetalhados,
     InvestimentoAutomacao,
 )
 from models.results import MetasReducao
+from core.benchmarks import obter_tabela
 from core.formulas import calcular_faturamento_mensal, calcular_horas_operacao_mes
+from core.validators import CAMPOS_POR_FORMULA, formulas_selecionadas, validar_parametros_formula
+
+_PORTES = {"Pequena": "pequena", "Média": "media", "Grande": "grande"}
+_MODO_CADENCIA = "Cadência (peças/min)"
+_MODO_MENSAL = "Produção mensal (peças/mês)"
+
+
+def _padrao(chave: str, valor: Any) -> str:
+    """
+    Valor inicial do widget `chave`, gravado uma única vez no `session_state`; devolve a chave.
+
+    Os widgets com `key` não recebem `value=`: o link compartilhado e a sessão restaurada gravam
+    as mesmas chaves antes da renderização, e o Streamlit avisa quando as duas fontes coexistem.
+    """
+    st.session_state.setdefault(chave, valor)
+    return chave
 
 
 def render_dados_basicos() -> tuple[ClienteBasicInfo, ProcessoAtual]:
@@ -33,8 +47,9 @@ def render_dados_basicos() -> tuple[ClienteBasicInfo, ProcessoAtual]:
 
     col1, col2, col3 = st.columns(3)
     with col1:
-        nome_cliente = st.text_input("Nome do Cliente", value="", key="nome_cliente")
-        nome_projeto = st.text_input("Nome do Projeto", value="", key="nome_projeto")
+        nome_cliente = st.text_input("Nome do Cliente", key=_padrao("nome_cliente", ""))
+        nome_projeto = st.text_input("Nome do Projeto", key=_padrao("nome_projeto", ""))
+        regiao = st.selectbox("Região", options=list(REGIOES), format_func=REGIOES.get, key="regiao")
 
     with col2:
         area = st.selectbox(
@@ -46,8 +61,8 @@ def render_dados_basicos() -> tuple[ClienteBasicInfo, ProcessoAtual]:
         st.caption(AREAS_ARV.get(area, {}).get("descricao", ""))
 
     with col3:
-        porte_label = st.selectbox("Porte da Empresa", ["Pequena", "Média", "Grande"], key="porte_empresa")
-        porte = {"Pequena": "pequena", "Média": "media", "Grande": "grande"}[porte_label]
+        porte_label = st.selectbox("Porte da Empresa", list(_PORTES), key="porte_empresa")
+        porte = _PORTES[porte_label]
         fator_label = st.selectbox(
             "Fator de Encargos Trabalhistas",
             options=list(FATOR_ENCARGOS_OPCOES.keys()),
@@ -61,14 +76,16 @@ def render_dados_basicos() -> tuple[ClienteBasicInfo, ProcessoAtual]:
         area_atuacao=area,
         porte_empresa=porte,
         fator_encargos=fator,
+        regiao=regiao,
     )
+    _sugerir_processo(cliente)
 
     st.markdown("---")
     st.header("2 - Dados do Processo Atual")
 
     modo_producao = st.radio(
         "Como você quer informar a produção?",
-        options=["Cadência (peças/min)", "Produção mensal (peças/mês)"],
+        options=[_MODO_CADENCIA, _MODO_MENSAL],
         horizontal=True,
         key="modo_producao",
     )
@@ -76,30 +93,30 @@ def render_dados_basicos() -> tuple[ClienteBasicInfo, ProcessoAtual]:
     col1, col2, col3 = st.columns(3)
 
     with col1:
-        if modo_producao == "Cadência (peças/min)":
-            cadencia = st.number_input("Cadência de Produção (peças/min)", min_value=0.0, value=10.0, step=0.1, key="cadencia")
+        if modo_producao == _MODO_CADENCIA:
+            cadencia = st.number_input("Cadência de Produção (peças/min)", min_value=0.0, step=0.1, key=_padrao("cadencia", 10.0))
             producao_mensal = None
         else:
-            producao_mensal = st.number_input("Produção Mensal (peças/mês)", min_value=0.0, value=200_000.0, step=1_000.0, key="producao_mensal")
+            producao_mensal = st.number_input("Produção Mensal (peças/mês)", min_value=0.0, step=1_000.0, key=_padrao("producao_mensal", 200_000.0))
             cadencia = None
 
-        horas_turno = st.number_input("Horas por Turno", min_value=1.0, max_value=24.0, value=8.0, step=0.5, key="horas_turno")
-        turnos_dia = st.number_input("Turnos por Dia", min_value=1, max_value=3, value=2, key="turnos_dia")
-        dias_ano = st.number_input("Dias de Operação por Ano", min_value=1, max_value=365, value=DIAS_OPERACAO_ANO_DEFAULT, key="dias_ano")
+        horas_turno = st.number_input("Horas por Turno", min_value=1.0, max_value=24.0, step=0.5, key=_padrao("horas_turno", 8.0))
+        turnos_dia = st.number_input("Turnos por Dia", min_value=1, max_value=3, key=_padrao("turnos_dia", 2))
+        dias_ano = st.number_input("Dias de Operação por Ano", min_value=1, max_value=365, key="dias_ano")
 
     with col2:
-        pessoas_processo = st.number_input("Operadores no Processo por Turno", min_value=0, value=5, key="pessoas_processo")
-        pessoas_inspecao = st.number_input("Inspetores por Turno", min_value=0, value=1, key="pessoas_inspecao")
-        supervisores = st.number_input("Supervisores por Turno", min_value=0, value=0, step=1, key="supervisores_por_turno")
+        pessoas_processo = st.number_input("Operadores no Processo por Turno", min_value=0, key=_padrao("pessoas_processo", 5))
+        pessoas_inspecao = st.number_input("Inspetores por Turno", min_value=0, key=_padrao("pessoas_inspecao", 1))
+        supervisores = st.number_input("Supervisores por Turno", min_value=0, step=1, key=_padrao("supervisores_por_turno", 0))
 
     with col3:
-        salario_operador = st.number_input("Salário Médio Operador (R$ bruto)", min_value=0.0, value=SALARIO_OPERADOR_DEFAULT, step=100.0, key="salario_operador")
-        salario_inspetor = st.number_input("Salário Médio Inspetor (R$ bruto)", min_value=0.0, value=SALARIO_INSPETOR_DEFAULT, step=100.0, key="salario_inspetor")
-        salario_supervisor = st.number_input("Salário Médio Supervisor (R$ bruto)", min_value=0.0, value=SALARIO_SUPERVISOR_DEFAULT, step=100.0, key="salario_supervisor")
+        salario_operador = st.number_input("Salário Médio Operador (R$ bruto)", min_value=0.0, step=100.0, key="salario_operador")
+        salario_inspetor = st.number_input("Salário Médio Inspetor (R$ bruto)", min_value=0.0, step=100.0, key="salario_inspetor")
+        salario_supervisor = st.number_input("Salário Médio Supervisor (R$ bruto)", min_value=0.0, step=100.0, key="salario_supervisor")
 
-        custo_unitario = st.number_input("Custo Unitário da Peça (R$)", min_value=0.0, value=100.0, step=1.0, key="custo_unitario_peca")
-        custo_mp = st.number_input("Custo Matéria-Prima por Peça (R$)", min_value=0.0, value=15.0, step=0.5, key="custo_mp_peca")
-        preco_venda = st.number_input("Preço de Venda por Peça (R$)", min_value=0.0, value=0.0, step=1.0, key="preco_venda_peca",
+        custo_unitario = st.number_input("Custo Unitário da Peça (R$)", min_value=0.0, step=1.0, key=_padrao("custo_unitario_peca", 100.0))
+        custo_mp = st.number_input("Custo Matéria-Prima por Peça (R$)", min_value=0.0, step=0.5, key=_padrao("custo_mp_peca", 15.0))
+        preco_venda = st.number_input("Preço de Venda por Peça (R$)", min_value=0.0, step=1.0, key=_padrao("preco_venda_peca", 0.0),
                                       help="Usado para calcular o Faturamento Mensal e o Custo Hora Parada automaticamente.")
 
     # Faturamento mensal estimado (pré-preenchimento)
@@ -192,6 +209,47 @@ def render_dados_basicos() -> tuple[ClienteBasicInfo, ProcessoAtual]:
     return cliente, processo
 
 
+# Widget do processo → (campo com benchmark, conversão para o valor do widget)
+_WIDGETS_PROCESSO_BENCHMARK: dict[str, tuple[str, Callable[[Any], Any]]] = {
+    "dias_ano": ("dias_operacao_ano", int),
+    "salario_operador": ("salario_medio_operador", float),
+    "salario_inspetor": ("salario_medio_inspetor", float),
+    "salario_supervisor": ("salario_medio_supervisor", float),
+}
+
+
+def _sugerir_processo(cliente: ClienteBasicInfo):
+    """
+    Preenche salários e dias de operação com os típicos de área/porte/região. Ao mudar a área, o
+    porte ou a região, só os campos que o usuário não alterou acompanham a nova sugestão.
+    """
+    faixas = obter_tabela().faixas_cliente(cliente)
+    anteriores = st.session_state.get("sugestoes_processo", {})
+    atuais = {}
+    for chave, (campo, converter) in _WIDGETS_PROCESSO_BENCHMARK.items():
+        atuais[chave] = converter(faixas[campo].tipico)
+        if chave not in st.session_state or st.session_state[chave] == anteriores.get(chave):
+            st.session_state[chave] = atuais[chave]
+    st.session_state["sugestoes_processo"] = atuais
+
+
+def _sugestao(cliente: ClienteBasicInfo, chave: str) -> dict[str, Any]:
+    """`key` (com o valor típico como padrão) e `help` de um widget de parâmetro, pela faixa da área/porte/região."""
+    campo, converter = _WIDGETS_PARAMETROS[chave]
+    faixa = obter_tabela().faixas_cliente(cliente)[campo]
+    minimo, tipico, maximo = (_numero(converter(v)) for v in (faixa.minimo, faixa.tipico, faixa.maximo))
+    return {
+        "key": _padrao(chave, converter(faixa.tipico)),
+        "help": f"Típico para a área, porte e região do cliente: {tipico} (faixa comum: {minimo} a {maximo}).",
+    }
+
+
+def _numero(valor: float) -> str:
+    if float(valor).is_integer():
+        return f"{int(valor):,}"
+    return f"{valor:,.2f}".rstrip("0").rstrip(".")
+
+
 def render_selecao_dores(area_selecionada: str) -> DoresSelecionadas:
     """
     Renderiza checkboxes organizados por 5 Dores.
@@ -199,39 +257,44 @@ def render_selecao_dores(area_selecionada: str) -> DoresSelecionadas:
     """
 
     st.header("3 - Selecione as Dores Aplicáveis")
-    formulas_sugeridas = AREAS_ARV[area_selecionada]["formulas_aplicaveis"]
+    sugeridas = MASCARAS_AREAS[area_selecionada]
     st.info(f"Fórmulas pré-selecionadas para {AREAS_ARV[area_selecionada]['nome']}")
 
     dores = DoresSelecionadas()
 
     with st.expander("💰 Dor 1: Custo Elevado de Mão de Obra", expanded=True):
-        dores.f01_mao_de_obra_direta = st.checkbox("F01: Mão de Obra Direta", value="F01" in formulas_sugeridas, key="f01")
-        dores.f02_horas_extras = st.checkbox("F02: Horas Extras Recorrentes", value="F02" in formulas_sugeridas, key="f02")
-        dores.f03_curva_aprendizagem = st.checkbox("F03: Curva de Aprendizagem", value="F03" in formulas_sugeridas, key="f03")
-        dores.f04_turnover = st.checkbox("F04: Turnover (Rotatividade)", value="F04" in formulas_sugeridas, key="f04")
+        dores.f01_mao_de_obra_direta = st.checkbox("F01: Mão de Obra Direta", key=_padrao("f01", Formula.F01 in sugeridas))
+        dores.f02_horas_extras = st.checkbox("F02: Horas Extras Recorrentes", key=_padrao("f02", Formula.F02 in sugeridas))
+        dores.f03_curva_aprendizagem = st.checkbox("F03: Curva de Aprendizagem", key=_padrao("f03", Formula.F03 in sugeridas))
+        dores.f04_turnover = st.checkbox("F04: Turnover (Rotatividade)", key=_padrao("f04", Formula.F04 in sugeridas))
 
     with st.expander("🔍 Dor 2: Baixa Qualidade", expanded=True):
-        dores.f05_refugo_retrabalho = st.checkbox("F05: Refugo e Retrabalho", value="F05" in formulas_sugeridas, key="f05")
-        dores.f06_inspecao_manual = st.checkbox("F06: Inspeção Manual", value="F06" in formulas_sugeridas, key="f06")
-        dores.f07_escapes_qualidade = st.checkbox("F07: Escapes de Qualidade", value="F07" in formulas_sugeridas, key="f07")
+        dores.f05_refugo_retrabalho = st.checkbox("F05: Refugo e Retrabalho", key=_padrao("f05", Formula.F05 in sugeridas))
+        dores.f06_inspecao_manual = st.checkbox("F06: Inspeção Manual", key=_padrao("f06", Formula.F06 in sugeridas))
+        dores.f07_escapes_qualidade = st.checkbox("F07: Escapes de Qualidade", key=_padrao("f07", Formula.F07 in sugeridas))
 
     with st.expander("📊 Dor 3: Baixa Produtividade", expanded=True):
-        dores.f08_custo_oportunidade = st.checkbox("F08: Custo de Oportunidade", value="F08" in formulas_sugeridas, key="f08")
-        dores.f09_ociosidade_silenciosa = st.checkbox("F09: Ociosidade Silenciosa", value="F09" in formulas_sugeridas, key="f09")
-        dores.f10_paradas_linha = st.checkbox("F10: Paradas de Linha", value="F10" in formulas_sugeridas, key="f10")
-        dores.f11_setup_changeover = st.checkbox("F11: Setup / Changeover", value="F11" in formulas_sugeridas, key="f11")
+        dores.f08_custo_oportunidade = st.checkbox("F08: Custo de Oportunidade", key=_padrao("f08", Formula.F08 in sugeridas))
+        dores.f09_ociosidade_silenciosa = st.checkbox("F09: Ociosidade Silenciosa", key=_padrao("f09", Formula.F09 in sugeridas))
+        dores.f10_paradas_linha = st.checkbox("F10: Paradas de Linha", key=_padrao("f10", Formula.F10 in sugeridas))
+        dores.f11_setup_changeover = st.checkbox("F11: Setup / Changeover", key=_padrao("f11", Formula.F11 in sugeridas))
 
     with st.expander("⚠️ Dor 4: Segurança e Ergonomia", expanded=True):
-        dores.f12_riscos_acidentes = st.checkbox("F12: Riscos, Acidentes e Doenças", value="F12" in formulas_sugeridas, key="f12")
-        dores.f13_frota_empilhadeiras = st.checkbox("F13: Frota de Empilhadeiras (TCO)", value="F13" in formulas_sugeridas, key="f13")
+        dores.f12_riscos_acidentes = st.checkbox("F12: Riscos, Acidentes e Doenças", key=_padrao("f12", Formula.F12 in sugeridas))
+        dores.f13_frota_empilhadeiras = st.checkbox("F13: Frota de Empilhadeiras (TCO)", key=_padrao("f13", Formula.F13 in sugeridas))
 
     with st.expander("🧠 Dor 5: Custos Ocultos de Gestão", expanded=True):
-        dores.f14_supervisao = st.checkbox("F14: Supervisão e Gestão", value="F14" in formulas_sugeridas, key="f14")
-        dores.f15_compliance_epis = st.checkbox("F15: Compliance, EPIs e Exames", value="F15" in formulas_sugeridas, key="f15")
-        dores.f16_energia_utilidades = st.checkbox("F16: Energia e Utilidades", value="F16" in formulas_sugeridas, key="f16")
-        dores.f17_espaco_fisico = st.checkbox("F17: Espaço Físico", value="F17" in formulas_sugeridas, key="f17")
-        dores.f18_gestao_dados = st.checkbox("F18: Gestão Manual de Dados", value="F18" in formulas_sugeridas, key="f18")
-
+        dores.f14_supervisao = st.checkbox("F14: Supervisão e Gestão", key=_padrao("f14", Formula.F14 in sugeridas))
+        dores.f15_compliance_epis = st.checkbox("F15: Compliance, EPIs e Exames", key=_padrao("f15", Formula.F15 in sugeridas))
+        dores.f16_energia_utilidades = st.checkbox("F16: Energia e Utilidades", key=_padrao("f16", Formula.F16 in sugeridas))
+        dores.f17_espaco_fisico = st.checkbox("F17: Espaço Físico", key=_padrao("f17", Formula.F17 in sugeridas))
+        dores.f18_gestao_dados = st.checkbox("F18: Gestão Manual de Dados", key=_padrao("f18", Formula.F18 in sugeridas))
+
+    selecao = dores.mascara
+    st.caption(
+        f"{selecao.quantidade} fórmula(s) selecionada(s) — {(selecao & sugeridas).quantidade} de "
+        f"{sugeridas.quantidade} sugeridas para a área, {(selecao & ~sugeridas).quantidade} fora da sugestão."
+    )
     return dores
 
 
@@ -239,268 +302,324 @@ def render_parametros_detalhados(
     dores: DoresSelecionadas,
     processo: ProcessoAtual,
     cliente: ClienteBasicInfo,
-) -> ParametrosDetalhados:
-    """Renderiza parâmetros detalhados condicionais por fórmula (V2.0)."""
+    ao_validar: Callable[[ParametrosDetalhados, list[str]], None] | None = None,
+) -> tuple[ParametrosDetalhados, list[str]]:
+    """
+    Renderiza parâmetros detalhados condicionais por fórmula (V2.0).
+
+    Cada fórmula é um fragmento (`st.fragment`): alterar um campo reexecuta só o bloco daquela
+    fórmula, que revalida apenas a si mesma. Os valores ficam em um rascunho no `session_state` e,
+    após cada bloco, `ao_validar(params, erros)` recebe o estado consolidado da etapa.
+
+    Retorna os parâmetros das fórmulas selecionadas e os erros de validação.
+    """
 
     st.header("4 - Parâmetros Detalhados")
     st.caption("Os campos abaixo só aparecem para as fórmulas selecionadas.")
 
-    params = ParametrosDetalhados()
-
-    # Dor 1
-    if dores.f02_horas_extras:
-        with st.expander("F02: Horas Extras", expanded=True):
-            params.f02_media_he_mes_por_pessoa = st.number_input(
-                "Média de horas extras por mês por pessoa",
-                min_value=0.0,
-                value=10.0,
-                step=1.0,
-                key="p_f02_he",
-            )
+    rascunho = _rascunho_parametros(processo)
+    for codigo in formulas_selecionadas(dores):
+        if codigo in _BLOCOS_PARAMETROS:
+            _fragmento_parametros(codigo, rascunho, dores, processo, cliente, ao_validar)
 
-    if dores.f03_curva_aprendizagem:
-        with st.expander("F03: Curva de Aprendizagem", expanded=True):
-            params.f03_novas_contratacoes_ano = st.number_input(
-                "Novas contratações por ano",
-                min_value=0,
-                value=3,
-                step=1,
-                key="p_f03_contrat",
-            )
-            params.f03_salario_novato = st.number_input(
-                "Salário do novato (R$)",
-                min_value=0.0,
-                value=float(processo.salario_medio_operador),
-                step=100.0,
-                key="p_f03_sal_nov",
-            )
-            params.f03_meses_curva = st.number_input(
-                "Meses até produtividade plena",
-                min_value=1,
-                value=3,
-                step=1,
-                key="p_f03_meses",
-            )
-            params.f03_salario_supervisor = st.number_input(
-                "Salário do supervisor que treina (R$)",
-                min_value=0.0,
-                value=float(processo.salario_medio_supervisor),
-                step=100.0,
-                key="p_f03_sal_sup",
-            )
-            params.f03_percentual_tempo_supervisor = (
-                st.slider(
-                    "Percentual do tempo do supervisor dedicado ao treinamento (%)",
-                    min_value=0,
-                    max_value=100,
-                    value=20,
-                    key="p_f03_pct",
-                )
-                / 100
-            )
+    return _consolidar_parametros(rascunho, dores)
 
-    if dores.f04_turnover:
-        with st.expander("F04: Turnover (Rotatividade)", expanded=True):
-            params.f04_desligamentos_ano = st.number_input(
-                "Desligamentos por ano",
-                min_value=0,
-                value=3,
-                step=1,
-                key="p_f04_desl",
-            )
-            params.f04_fator_custo_turnover = st.number_input(
-                "Fator de custo de turnover (benchmark 1,5 a 3,0)",
-                min_value=1.0,
-                value=float(FATOR_CUSTO_TURNOVER_DEFAULT),
-                step=0.1,
-                key="p_f04_fator",
-            )
 
-    # Dor 2
-    if dores.f05_refugo_retrabalho:
-        with st.expander("F05: Refugo e Retrabalho", expanded=True):
-            params.f05_percentual_refugo = (
-                st.slider("Percentual de refugo (%)", 0.0, 30.0, 1.0, 0.1, key="p_f05_ref") / 100
-            )
-            params.f05_percentual_retrabalho = (
-                st.slider("Percentual de retrabalho (%)", 0.0, 30.0, 3.0, 0.1, key="p_f05_ret") / 100
-            )
-            params.f05_horas_retrabalho_por_unidade = st.number_input(
-                "Horas de retrabalho por unidade (h)",
-                min_value=0.0,
-                value=0.2,
-                step=0.05,
-                key="p_f05_h",
-            )
+def _rascunho_parametros(processo: ProcessoAtual) -> ParametrosDetalhados:
+    """Rascunho dos parâmetros da sessão; os erros por fórmula são descartados se o processo mudou."""
+    if st.session_state.get("parametros_rascunho_processo") != processo:
+        st.session_state["parametros_rascunho_processo"] = processo
+        st.session_state["parametros_erros"] = {}
+    return st.session_state.setdefault("parametros_rascunho", ParametrosDetalhados())
 
-    if dores.f07_escapes_qualidade:
-        with st.expander("F07: Escapes de Qualidade", expanded=True):
-            params.f07_reclamacoes_clientes_ano = st.number_input(
-                "Reclamações de clientes por ano",
-                min_value=0,
-                value=12,
-                step=1,
-                key="p_f07_recl",
-            )
-            params.f07_custo_medio_por_reclamacao = st.number_input(
-                "Custo médio real por reclamação (R$)",
-                min_value=0.0,
-                value=2000.0,
-                step=100.0,
-                key="p_f07_custo",
-            )
 
-    # Dor 3
-    if dores.f08_custo_oportunidade:
-        with st.expander("F08: Custo de Oportunidade", expanded=True):
-            params.f08_percentual_demanda_reprimida = (
-                st.slider("Percentual de demanda reprimida (%)", 0, 100, 10, key="p_f08_dem") / 100
-            )
-            params.f08_margem_contribuicao = (
-                st.slider("Margem de contribuição (%)", 0, 100, 30, key="p_f08_marg") / 100
-            )
+@st.fragment
+def _fragmento_parametros(
+    codigo: str,
+    rascunho: ParametrosDetalhados,
+    dores: DoresSelecionadas,
+    processo: ProcessoAtual,
+    cliente: ClienteBasicInfo,
+    ao_validar: Callable[[ParametrosDetalhados, list[str]], None] | None,
+):
+    """Bloco de uma fórmula; só revalida quando algum campo da própria fórmula mudou."""
+    titulo, render = _BLOCOS_PARAMETROS[codigo]
+    campos = CAMPOS_POR_FORMULA[codigo]
+    anteriores = [getattr(rascunho, c) for c in campos]
+
+    with st.expander(titulo, expanded=True):
+        render(rascunho, processo, cliente)
+        erros = st.session_state.setdefault("parametros_erros", {})
+        if codigo not in erros or [getattr(rascunho, c) for c in campos] != anteriores:
+            erros[codigo] = validar_parametros_formula(codigo, rascunho, processo)
+        for e in erros[codigo]:
+            st.error(e)
+
+    if ao_validar is not None:
+        ao_validar(*_consolidar_parametros(rascunho, dores))
+
+
+def _consolidar_parametros(
+    rascunho: ParametrosDetalhados, dores: DoresSelecionadas
+) -> tuple[ParametrosDetalhados, list[str]]:
+    """Parâmetros apenas das fórmulas selecionadas e os erros já apurados, na ordem das fórmulas."""
+    selecionadas = formulas_selecionadas(dores)
+    valores = {c: getattr(rascunho, c) for codigo in selecionadas for c in CAMPOS_POR_FORMULA.get(codigo, ())}
+    erros_por_formula = st.session_state.get("parametros_erros", {})
+    erros = [e for codigo in selecionadas for e in erros_por_formula.get(codigo, [])]
+    return ParametrosDetalhados(**valores), erros
+
+
+def _parametros_f02(params: ParametrosDetalhados, processo: ProcessoAtual, cliente: ClienteBasicInfo):
+    params.f02_media_he_mes_por_pessoa = st.number_input(
+        "Média de horas extras por mês por pessoa",
+        min_value=0.0,
+        **_sugestao(cliente, "p_f02_he"),
+        step=1.0,
+    )
 
-    if dores.f09_ociosidade_silenciosa:
-        with st.expander("F09: Ociosidade Silenciosa", expanded=True):
-            params.f09_minutos_ociosos_por_dia = st.number_input(
-                "Minutos ociosos por dia por operador (min)",
-                min_value=0.0,
-                value=15.0,
-                step=1.0,
-                key="p_f09_min",
-            )
 
-    if dores.f10_paradas_linha:
-        with st.expander("F10: Paradas de Linha", expanded=True):
-            params.f10_paradas_mes = st.number_input("Paradas por mês", min_value=0, value=4, step=1, key="p_f10_par")
-            params.f10_duracao_media_parada_horas = st.number_input(
-                "Duração média por parada (h)", min_value=0.0, value=1.0, step=0.25, key="p_f10_dur"
-            )
-            horas_op_mes = calcular_horas_operacao_mes(
-                float(processo.horas_por_turno),
-                int(processo.turnos_por_dia),
-                int(processo.dias_operacao_ano),
-            )
-            chp_derivado = ((processo.faturamento_mensal_linha or 0.0) / horas_op_mes) if horas_op_mes > 0 else 0.0
-            st.caption(
-                f"CHP derivado do faturamento (horas reais): **R$ {chp_derivado:,.2f}/h** "
-                f"(÷ {horas_op_mes:,.0f}h/mês). Preencha manualmente apenas se quiser sobrepor."
-            )
-            params.f10_custo_hora_parada = st.number_input(
-                "Custo hora parada manual (R$/h) — deixe como 0 para usar o CHP derivado",
-                min_value=0.0,
-                value=0.0,
-                step=10.0,
-                key="p_f10_chp",
-            )
+def _parametros_f03(params: ParametrosDetalhados, processo: ProcessoAtual, cliente: ClienteBasicInfo):
+    params.f03_novas_contratacoes_ano = st.number_input(
+        "Novas contratações por ano",
+        min_value=0,
+        **_sugestao(cliente, "p_f03_contrat"),
+        step=1,
+    )
+    params.f03_salario_novato = st.number_input(
+        "Salário do novato (R$)",
+        min_value=0.0,
+        step=100.0,
+        key=_padrao("p_f03_sal_nov", float(processo.salario_medio_operador)),
+    )
+    params.f03_meses_curva = st.number_input(
+        "Meses até produtividade plena",
+        min_value=1,
+        **_sugestao(cliente, "p_f03_meses"),
+        step=1,
+    )
+    params.f03_salario_supervisor = st.number_input(
+        "Salário do supervisor que treina (R$)",
+        min_value=0.0,
+        step=100.0,
+        key=_padrao("p_f03_sal_sup", float(processo.salario_medio_supervisor)),
+    )
+    params.f03_percentual_tempo_supervisor = (
+        st.slider(
+            "Percentual do tempo do supervisor dedicado ao treinamento (%)",
+            min_value=0,
+            max_value=100,
+            **_sugestao(cliente, "p_f03_pct"),
+        )
+        / 100
+    )
 
-    if dores.f11_setup_changeover:
-        with st.expander("F11: Setup / Changeover", expanded=True):
-            params.f11_setups_mes = st.number_input("Setups por mês", min_value=0, value=10, step=1, key="p_f11_set")
-            params.f11_horas_por_setup = st.number_input("Horas por setup (h)", min_value=0.0, value=0.5, step=0.25, key="p_f11_h")
-            horas_op_mes = calcular_horas_operacao_mes(
-                float(processo.horas_por_turno),
-                int(processo.turnos_por_dia),
-                int(processo.dias_operacao_ano),
-            )
-            chp_derivado = ((processo.faturamento_mensal_linha or 0.0) / horas_op_mes) if horas_op_mes > 0 else 0.0
-            st.caption(
-                f"CHP derivado do faturamento (horas reais): **R$ {chp_derivado:,.2f}/h** "
-                f"(÷ {horas_op_mes:,.0f}h/mês). Preencha manualmente apenas se quiser sobrepor."
-            )
-            params.f11_custo_hora_parada = st.number_input(
-                "Custo hora parada manual (R$/h) — deixe como 0 para usar o CHP derivado",
-                min_value=0.0,
-                value=0.0,
-                step=10.0,
-                key="p_f11_chp",
-            )
 
-    # Dor 4
-    if dores.f12_riscos_acidentes:
-        with st.expander("F12: Riscos, Acidentes e Doenças", expanded=True):
-            params.f12_afastamentos_ano = st.number_input("Afastamentos por ano", min_value=0, value=2, step=1, key="p_f12_afast")
-            params.f12_custo_medio_afastamento = st.number_input(
-                "Custo médio por afastamento (R$)", min_value=0.0, value=8000.0, step=500.0, key="p_f12_cafast"
-            )
-            params.f12_acidentes_com_lesao_ano = st.number_input("Acidentes com lesão por ano", min_value=0, value=1, step=1, key="p_f12_acid")
-            params.f12_custo_medio_acidente = st.number_input(
-                "Custo médio por acidente (R$)", min_value=0.0, value=15000.0, step=1000.0, key="p_f12_cacid"
-            )
-            params.f12_probabilidade_processo = st.slider("Probabilidade de processo (%)", 0, 100, 5, key="p_f12_prob") / 100
-            params.f12_custo_estimado_processo = st.number_input(
-                "Custo estimado do processo (R$)", min_value=0.0, value=50_000.0, step=5_000.0, key="p_f12_cproc"
-            )
+def _parametros_f04(params: ParametrosDetalhados, processo: ProcessoAtual, cliente: ClienteBasicInfo):
+    params.f04_desligamentos_ano = st.number_input(
+        "Desligamentos por ano",
+        min_value=0,
+        **_sugestao(cliente, "p_f04_desl"),
+        step=1,
+    )
+    params.f04_fator_custo_turnover = st.number_input(
+        "Fator de custo de turnover (benchmark 1,5 a 3,0)",
+        min_value=1.0,
+        **_sugestao(cliente, "p_f04_fator"),
+        step=0.1,
+    )
 
-    if dores.f13_frota_empilhadeiras:
-        with st.expander("F13: Frota de Empilhadeiras (TCO)", expanded=True):
-            params.f13_num_empilhadeiras = st.number_input("Número de empilhadeiras", min_value=0, value=2, step=1, key="p_f13_n")
-            params.f13_custo_operador_mes = st.number_input(
-                "Custo operador/mês (salário + encargos) (R$)",
-                min_value=0.0,
-                value=float(processo.salario_medio_operador * cliente.fator_encargos),
-                step=100.0,
-                key="p_f13_op",
-            )
-            params.f13_custo_equipamento_mes = st.number_input("Custo equipamento/mês (R$)", min_value=0.0, value=2500.0, step=100.0, key="p_f13_eq")
-            params.f13_custo_energia_mes = st.number_input("Custo energia/mês (R$)", min_value=0.0, value=300.0, step=50.0, key="p_f13_en")
-            params.f13_custo_manutencao_mes = st.number_input(
-                "Custo manutenção/mês (R$)", min_value=0.0, value=600.0, step=50.0, key="p_f13_man"
-            )
 
-    # Dor 5
-    if dores.f14_supervisao:
-        with st.expander("F14: Supervisão e Gestão", expanded=True):
-            total_default = processo.supervisores_por_turno * processo.turnos_por_dia
-            total_sup = st.number_input(
-                "Total de supervisores na planta (todos os turnos)",
-                min_value=0,
-                value=int(total_default),
-                step=1,
-                key="p_f14_n",
-                help="Número total de supervisores dedicados ao processo (soma de todos os turnos). Se 0, o custo de supervisão será R$0.",
-            )
-            params.f14_num_supervisores = int(total_sup)
-            params.f14_salario_supervisor = st.number_input(
-                "Salário do supervisor (R$)",
-                min_value=0.0,
-                value=float(processo.salario_medio_supervisor),
-                step=100.0,
-                key="p_f14_sal",
-            )
+def _parametros_f05(params: ParametrosDetalhados, processo: ProcessoAtual, cliente: ClienteBasicInfo):
+    params.f05_percentual_refugo = (
+        st.slider("Percentual de refugo (%)", 0.0, 30.0, step=0.1, **_sugestao(cliente, "p_f05_ref")) / 100
+    )
+    params.f05_percentual_retrabalho = (
+        st.slider("Percentual de retrabalho (%)", 0.0, 30.0, step=0.1, **_sugestao(cliente, "p_f05_ret")) / 100
+    )
+    params.f05_horas_retrabalho_por_unidade = st.number_input(
+        "Horas de retrabalho por unidade (h)",
+        min_value=0.0,
+        **_sugestao(cliente, "p_f05_h"),
+        step=0.05,
+    )
 
-    if dores.f15_compliance_epis:
-        with st.expander("F15: Compliance, EPIs e Exames", expanded=True):
-            params.f15_custo_epi_ano_por_pessoa = st.number_input(
-                "Custo EPI/ano por pessoa (R$)", min_value=0.0, value=600.0, step=50.0, key="p_f15_epi"
-            )
-            params.f15_custo_exames_ano_por_pessoa = st.number_input(
-                "Custo exames/ano por pessoa (R$)", min_value=0.0, value=400.0, step=50.0, key="p_f15_ex"
-            )
 
-    if dores.f16_energia_utilidades:
-        with st.expander("F16: Energia e Utilidades", expanded=True):
-            params.f16_area_operacao_m2 = st.number_input("Área de operação (m²)", min_value=0.0, value=200.0, step=10.0, key="p_f16_a")
-            params.f16_custo_energia_m2_ano = st.number_input(
-                "Custo de energia por m²/ano (R$/m²/ano)", min_value=0.0, value=150.0, step=10.0, key="p_f16_c"
-            )
+def _parametros_f07(params: ParametrosDetalhados, processo: ProcessoAtual, cliente: ClienteBasicInfo):
+    params.f07_reclamacoes_clientes_ano = st.number_input(
+        "Reclamações de clientes por ano",
+        min_value=0,
+        **_sugestao(cliente, "p_f07_recl"),
+        step=1,
+    )
+    params.f07_custo_medio_por_reclamacao = st.number_input(
+        "Custo médio real por reclamação (R$)",
+        min_value=0.0,
+        **_sugestao(cliente, "p_f07_custo"),
+        step=100.0,
+    )
 
-    if dores.f17_espaco_fisico:
-        with st.expander("F17: Espaço Físico", expanded=True):
-            params.f17_area_m2 = st.number_input("Área (m²)", min_value=0.0, value=200.0, step=10.0, key="p_f17_a")
-            params.f17_custo_m2_ano = st.number_input("Custo m²/ano (R$/m²/ano)", min_value=0.0, value=500.0, step=10.0, key="p_f17_c")
-            params.f17_percentual_reducao_automacao = (
-                st.slider("Percentual de redução com automação (%)", 0, 100, 20, key="p_f17_pct") / 100
-            )
 
-    if dores.f18_gestao_dados:
-        with st.expander("F18: Gestão Manual de Dados", expanded=True):
-            params.f18_pessoas_envolvidas = st.number_input("Pessoas envolvidas", min_value=0, value=2, step=1, key="p_f18_p")
-            params.f18_horas_dia_tarefas_dados = st.number_input(
-                "Horas/dia em tarefas de dados", min_value=0.0, max_value=24.0, value=1.0, step=0.25, key="p_f18_h"
-            )
+def _parametros_f08(params: ParametrosDetalhados, processo: ProcessoAtual, cliente: ClienteBasicInfo):
+    params.f08_percentual_demanda_reprimida = (
+        st.slider("Percentual de demanda reprimida (%)", 0, 100, **_sugestao(cliente, "p_f08_dem")) / 100
+    )
+    params.f08_margem_contribuicao = (
+        st.slider("Margem de contribuição (%)", 0, 100, **_sugestao(cliente, "p_f08_marg")) / 100
+    )
+
+
+def _parametros_f09(params: ParametrosDetalhados, processo: ProcessoAtual, cliente: ClienteBasicInfo):
+    params.f09_minutos_ociosos_por_dia = st.number_input(
+        "Minutos ociosos por dia por operador (min)",
+        min_value=0.0,
+        **_sugestao(cliente, "p_f09_min"),
+        step=1.0,
+    )
+
+
+def _parametros_f10(params: ParametrosDetalhados, processo: ProcessoAtual, cliente: ClienteBasicInfo):
+    params.f10_paradas_mes = st.number_input("Paradas por mês", min_value=0, step=1, **_sugestao(cliente, "p_f10_par"))
+    params.f10_duracao_media_parada_horas = st.number_input(
+        "Duração média por parada (h)", min_value=0.0, step=0.25, **_sugestao(cliente, "p_f10_dur")
+    )
+    horas_op_mes = calcular_horas_operacao_mes(
+        float(processo.horas_por_turno),
+        int(processo.turnos_por_dia),
+        int(processo.dias_operacao_ano),
+    )
+    chp_derivado = ((processo.faturamento_mensal_linha or 0.0) / horas_op_mes) if horas_op_mes > 0 else 0.0
+    st.caption(
+        f"CHP derivado do faturamento (horas reais): **R$ {chp_derivado:,.2f}/h** "
+        f"(÷ {horas_op_mes:,.0f}h/mês). Preencha manualmente apenas se quiser sobrepor."
+    )
+    params.f10_custo_hora_parada = st.number_input(
+        "Custo hora parada manual (R$/h) — deixe como 0 para usar o CHP derivado",
+        min_value=0.0,
+        step=10.0,
+        key=_padrao("p_f10_chp", 0.0),
+    )
+
+
+def _parametros_f11(params: ParametrosDetalhados, processo: ProcessoAtual, cliente: ClienteBasicInfo):
+    params.f11_setups_mes = st.number_input("Setups por mês", min_value=0, step=1, **_sugestao(cliente, "p_f11_set"))
+    params.f11_horas_por_setup = st.number_input("Horas por setup (h)", min_value=0.0, step=0.25, **_sugestao(cliente, "p_f11_h"))
+    horas_op_mes = calcular_horas_operacao_mes(
+        float(processo.horas_por_turno),
+        int(processo.turnos_por_dia),
+        int(processo.dias_operacao_ano),
+    )
+    chp_derivado = ((processo.faturamento_mensal_linha or 0.0) / horas_op_mes) if horas_op_mes > 0 else 0.0
+    st.caption(
+        f"CHP derivado do faturamento (horas reais): **R$ {chp_derivado:,.2f}/h** "
+        f"(÷ {horas_op_mes:,.0f}h/mês). Preencha manualmente apenas se quiser sobrepor."
+    )
+    params.f11_custo_hora_parada = st.number_input(
+        "Custo hora parada manual (R$/h) — deixe como 0 para usar o CHP derivado",
+        min_value=0.0,
+        step=10.0,
+        key=_padrao("p_f11_chp", 0.0),
+    )
+
+
+def _parametros_f12(params: ParametrosDetalhados, processo: ProcessoAtual, cliente: ClienteBasicInfo):
+    params.f12_afastamentos_ano = st.number_input("Afastamentos por ano", min_value=0, step=1, **_sugestao(cliente, "p_f12_afast"))
+    params.f12_custo_medio_afastamento = st.number_input(
+        "Custo médio por afastamento (R$)", min_value=0.0, step=500.0, **_sugestao(cliente, "p_f12_cafast")
+    )
+    params.f12_acidentes_com_lesao_ano = st.number_input("Acidentes com lesão por ano", min_value=0, step=1, **_sugestao(cliente, "p_f12_acid"))
+    params.f12_custo_medio_acidente = st.number_input(
+        "Custo médio por acidente (R$)", min_value=0.0, step=1000.0, **_sugestao(cliente, "p_f12_cacid")
+    )
+    params.f12_probabilidade_processo = st.slider("Probabilidade de processo (%)", 0, 100, **_sugestao(cliente, "p_f12_prob")) / 100
+    params.f12_custo_estimado_processo = st.number_input(
+        "Custo estimado do processo (R$)", min_value=0.0, step=5_000.0, **_sugestao(cliente, "p_f12_cproc")
+    )
+
+
+def _parametros_f13(params: ParametrosDetalhados, processo: ProcessoAtual, cliente: ClienteBasicInfo):
+    params.f13_num_empilhadeiras = st.number_input("Número de empilhadeiras", min_value=0, step=1, **_sugestao(cliente, "p_f13_n"))
+    params.f13_custo_operador_mes = st.number_input(
+        "Custo operador/mês (salário + encargos) (R$)",
+        min_value=0.0,
+        step=100.0,
+        key=_padrao("p_f13_op", float(processo.salario_medio_operador * cliente.fator_encargos)),
+    )
+    params.f13_custo_equipamento_mes = st.number_input("Custo equipamento/mês (R$)", min_value=0.0, step=100.0, **_sugestao(cliente, "p_f13_eq"))
+    params.f13_custo_energia_mes = st.number_input("Custo energia/mês (R$)", min_value=0.0, step=50.0, **_sugestao(cliente, "p_f13_en"))
+    params.f13_custo_manutencao_mes = st.number_input(
+        "Custo manutenção/mês (R$)", min_value=0.0, step=50.0, **_sugestao(cliente, "p_f13_man")
+    )
+
+
+def _parametros_f14(params: ParametrosDetalhados, processo: ProcessoAtual, cliente: ClienteBasicInfo):
+    total_default = processo.supervisores_por_turno * processo.turnos_por_dia
+    total_sup = st.number_input(
+        "Total de supervisores na planta (todos os turnos)",
+        min_value=0,
+        step=1,
+        key=_padrao("p_f14_n", int(total_default)),
+        help="Número total de supervisores dedicados ao processo (soma de todos os turnos). Se 0, o custo de supervisão será R$0.",
+    )
+    params.f14_num_supervisores = int(total_sup)
+    params.f14_salario_supervisor = st.number_input(
+        "Salário do supervisor (R$)",
+        min_value=0.0,
+        step=100.0,
+        key=_padrao("p_f14_sal", float(processo.salario_medio_supervisor)),
+    )
+
+
+def _parametros_f15(params: ParametrosDetalhados, processo: ProcessoAtual, cliente: ClienteBasicInfo):
+    params.f15_custo_epi_ano_por_pessoa = st.number_input(
+        "Custo EPI/ano por pessoa (R$)", min_value=0.0, step=50.0, **_sugestao(cliente, "p_f15_epi")
+    )
+    params.f15_custo_exames_ano_por_pessoa = st.number_input(
+        "Custo exames/ano por pessoa (R$)", min_value=0.0, step=50.0, **_sugestao(cliente, "p_f15_ex")
+    )
+
 
-    return params
+def _parametros_f16(params: ParametrosDetalhados, processo: ProcessoAtual, cliente: ClienteBasicInfo):
+    params.f16_area_operacao_m2 = st.number_input("Área de operação (m²)", min_value=0.0, step=10.0, **_sugestao(cliente, "p_f16_a"))
+    params.f16_custo_energia_m2_ano = st.number_input(
+        "Custo de energia por m²/ano (R$/m²/ano)", min_value=0.0, step=10.0, **_sugestao(cliente, "p_f16_c")
+    )
+
+
+def _parametros_f17(params: ParametrosDetalhados, processo: ProcessoAtual, cliente: ClienteBasicInfo):
+    params.f17_area_m2 = st.number_input("Área (m²)", min_value=0.0, step=10.0, **_sugestao(cliente, "p_f17_a"))
+    params.f17_custo_m2_ano = st.number_input("Custo m²/ano (R$/m²/ano)", min_value=0.0, step=10.0, **_sugestao(cliente, "p_f17_c"))
+    params.f17_percentual_reducao_automacao = (
+        st.slider("Percentual de redução com automação (%)", 0, 100, **_sugestao(cliente, "p_f17_pct")) / 100
+    )
+
+
+def _parametros_f18(params: ParametrosDetalhados, processo: ProcessoAtual, cliente: ClienteBasicInfo):
+    params.f18_pessoas_envolvidas = st.number_input("Pessoas envolvidas", min_value=0, step=1, **_sugestao(cliente, "p_f18_p"))
+    params.f18_horas_dia_tarefas_dados = st.number_input(
+        "Horas/dia em tarefas de dados", min_value=0.0, max_value=24.0, step=0.25, **_sugestao(cliente, "p_f18_h")
+    )
+
+
+# Título do expander e renderizador dos campos de cada fórmula com parâmetros próprios.
+_BLOCOS_PARAMETROS = {
+    "F02": ("F02: Horas Extras", _parametros_f02),
+    "F03": ("F03: Curva de Aprendizagem", _parametros_f03),
+    "F04": ("F04: Turnover (Rotatividade)", _parametros_f04),
+    "F05": ("F05: Refugo e Retrabalho", _parametros_f05),
+    "F07": ("F07: Escapes de Qualidade", _parametros_f07),
+    "F08": ("F08: Custo de Oportunidade", _parametros_f08),
+    "F09": ("F09: Ociosidade Silenciosa", _parametros_f09),
+    "F10": ("F10: Paradas de Linha", _parametros_f10),
+    "F11": ("F11: Setup / Changeover", _parametros_f11),
+    "F12": ("F12: Riscos, Acidentes e Doenças", _parametros_f12),
+    "F13": ("F13: Frota de Empilhadeiras (TCO)", _parametros_f13),
+    "F14": ("F14: Supervisão e Gestão", _parametros_f14),
+    "F15": ("F15: Compliance, EPIs e Exames", _parametros_f15),
+    "F16": ("F16: Energia e Utilidades", _parametros_f16),
+    "F17": ("F17: Espaço Físico", _parametros_f17),
+    "F18": ("F18: Gestão Manual de Dados", _parametros_f18),
+}
 
 
 def render_metas_reducao(dores: DoresSelecionadas) -> MetasReducao:
@@ -512,49 +631,49 @@ def render_metas_reducao(dores: DoresSelecionadas) -> MetasReducao:
 
     with st.expander("💰 Dor 1: Mão de Obra", expanded=True):
         if dores.f01_mao_de_obra_direta:
-            metas.meta_f01 = st.slider("F01: Mão de Obra Direta (%)", 0, 100, 50, key="m_f01") / 100
+            metas.meta_f01 = st.slider("F01: Mão de Obra Direta (%)", 0, 100, key=_padrao("m_f01", 50)) / 100
         if dores.f02_horas_extras:
-            metas.meta_f02 = st.slider("F02: Horas Extras (%)", 0, 100, 70, key="m_f02") / 100
+            metas.meta_f02 = st.slider("F02: Horas Extras (%)", 0, 100, key=_padrao("m_f02", 70)) / 100
         if dores.f03_curva_aprendizagem:
-            metas.meta_f03 = st.slider("F03: Curva de Aprendizagem (%)", 0, 100, 50, key="m_f03") / 100
+            metas.meta_f03 = st.slider("F03: Curva de Aprendizagem (%)", 0, 100, key=_padrao("m_f03", 50)) / 100
         if dores.f04_turnover:
-            metas.meta_f04 = st.slider("F04: Turnover (%)", 0, 100, 50, key="m_f04") / 100
+            metas.meta_f04 = st.slider("F04: Turnover (%)", 0, 100, key=_padrao("m_f04", 50)) / 100
 
     with st.expander("🔍 Dor 2: Qualidade", expanded=True):
         if dores.f05_refugo_retrabalho:
-            metas.meta_f05 = st.slider("F05: Refugo e Retrabalho (%)", 0, 100, 70, key="m_f05") / 100
+            metas.meta_f05 = st.slider("F05: Refugo e Retrabalho (%)", 0, 100, key=_padrao("m_f05", 70)) / 100
         if dores.f06_inspecao_manual:
-            metas.meta_f06 = st.slider("F06: Inspeção Manual (%)", 0, 100, 100, key="m_f06") / 100
+            metas.meta_f06 = st.slider("F06: Inspeção Manual (%)", 0, 100, key=_padrao("m_f06", 100)) / 100
         if dores.f07_escapes_qualidade:
-            metas.meta_f07 = st.slider("F07: Escapes de Qualidade (%)", 0, 100, 70, key="m_f07") / 100
+            metas.meta_f07 = st.slider("F07: Escapes de Qualidade (%)", 0, 100, key=_padrao("m_f07", 70)) / 100
 
     with st.expander("📊 Dor 3: Produtividade", expanded=True):
         if dores.f08_custo_oportunidade:
-            metas.meta_f08 = st.slider("F08: Custo de Oportunidade (%)", 0, 100, 50, key="m_f08") / 100
+            metas.meta_f08 = st.slider("F08: Custo de Oportunidade (%)", 0, 100, key=_padrao("m_f08", 50)) / 100
         if dores.f09_ociosidade_silenciosa:
-            metas.meta_f09 = st.slider("F09: Ociosidade Silenciosa (%)", 0, 100, 50, key="m_f09") / 100
+            metas.meta_f09 = st.slider("F09: Ociosidade Silenciosa (%)", 0, 100, key=_padrao("m_f09", 50)) / 100
         if dores.f10_paradas_linha:
-            metas.meta_f10 = st.slider("F10: Paradas de Linha (%)", 0, 100, 50, key="m_f10") / 100
+            metas.meta_f10 = st.slider("F10: Paradas de Linha (%)", 0, 100, key=_padrao("m_f10", 50)) / 100
         if dores.f11_setup_changeover:
-            metas.meta_f11 = st.slider("F11: Setup/Changeover (%)", 0, 100, 50, key="m_f11") / 100
+            metas.meta_f11 = st.slider("F11: Setup/Changeover (%)", 0, 100, key=_padrao("m_f11", 50)) / 100
 
     with st.expander("⚠️ Dor 4: Segurança e Ergonomia", expanded=True):
         if dores.f12_riscos_acidentes:
-            metas.meta_f12 = st.slider("F12: Riscos/Acidentes (%)", 0, 100, 50, key="m_f12") / 100
+            metas.meta_f12 = st.slider("F12: Riscos/Acidentes (%)", 0, 100, key=_padrao("m_f12", 50)) / 100
         if dores.f13_frota_empilhadeiras:
-            metas.meta_f13 = st.slider("F13: Frota de Empilhadeiras (%)", 0, 100, 80, key="m_f13") / 100
+            metas.meta_f13 = st.slider("F13: Frota de Empilhadeiras (%)", 0, 100, key=_padrao("m_f13", 80)) / 100
 
     with st.expander("🧠 Dor 5: Custos Ocultos", expanded=True):
         if dores.f14_supervisao:
-            metas.meta_f14 = st.slider("F14: Supervisão (%)", 0, 100, 50, key="m_f14") / 100
+            metas.meta_f14 = st.slider("F14: Supervisão (%)", 0, 100, key=_padrao("m_f14", 50)) / 100
         if dores.f15_compliance_epis:
-            metas.meta_f15 = st.slider("F15: Compliance/EPIs (%)", 0, 100, 50, key="m_f15") / 100
+            metas.meta_f15 = st.slider("F15: Compliance/EPIs (%)", 0, 100, key=_padrao("m_f15", 50)) / 100
         if dores.f16_energia_utilidades:
-            metas.meta_f16 = st.slider("F16: Energia/Utilidades (%)", 0, 100, 30, key="m_f16") / 100
+            metas.meta_f16 = st.slider("F16: Energia/Utilidades (%)", 0, 100, key=_padrao("m_f16", 30)) / 100
         if dores.f17_espaco_fisico:
-            metas.meta_f17 = st.slider("F17: Espaço Físico (%)", 0, 100, 30, key="m_f17") / 100
+            metas.meta_f17 = st.slider("F17: Espaço Físico (%)", 0, 100, key=_padrao("m_f17", 30)) / 100
         if dores.f18_gestao_dados:
-            metas.meta_f18 = st.slider("F18: Gestão de Dados (%)", 0, 100, 50, key="m_f18") / 100
+            metas.meta_f18 = st.slider("F18: Gestão de Dados (%)", 0, 100, key=_padrao("m_f18", 50)) / 100
 
     return metas
 
@@ -566,13 +685,13 @@ def render_investimento() -> InvestimentoAutomacao:
     col1, col2, col3 = st.columns(3)
     with col1:
         inv_min = st.number_input(
-            "Valor Mínimo (R$)", min_value=0.0, value=400_000.0,
-            step=10_000.0, key="inv_min",
+            "Valor Mínimo (R$)", min_value=0.0,
+            step=10_000.0, key=_padrao("inv_min", 400_000.0),
         )
     with col2:
         inv_max = st.number_input(
-            "Valor Máximo (R$)", min_value=0.0, value=600_000.0,
-            step=10_000.0, key="inv_max",
+            "Valor Máximo (R$)", min_value=0.0,
+            step=10_000.0, key=_padrao("inv_max", 600_000.0),
         )
     with col3:
         medio = (inv_min + inv_max) / 2
@@ -582,3 +701,123 @@ def render_investimento() -> InvestimentoAutomacao:
         valor_investimento_min=inv_min,
         valor_investimento_max=inv_max,
     )
+
+
+# --- Preenchimento dos widgets a partir das entradas (links compartilháveis) ---
+
+def _inteiro(v) -> int:
+    return int(round(v))
+
+
+def _percentual_inteiro(v) -> int:
+    return int(round(v * 100))
+
+
+def _percentual(v) -> float:
+    return float(v * 100)
+
+
+# Chave do widget → (campo de `ParametrosDetalhados`, conversão para o valor do widget)
+_WIDGETS_PARAMETROS: dict[str, tuple[str, Callable[[Any], Any]]] = {
+    "p_f02_he": ("f02_media_he_mes_por_pessoa", float),
+    "p_f03_contrat": ("f03_novas_contratacoes_ano", _inteiro),
+    "p_f03_sal_nov": ("f03_salario_novato", float),
+    "p_f03_meses": ("f03_meses_curva", _inteiro),
+    "p_f03_sal_sup": ("f03_salario_supervisor", float),
+    "p_f03_pct": ("f03_percentual_tempo_supervisor", _percentual_inteiro),
+    "p_f04_desl": ("f04_desligamentos_ano", _inteiro),
+    "p_f04_fator": ("f04_fator_custo_turnover", float),
+    "p_f05_ref": ("f05_percentual_refugo", _percentual),
+    "p_f05_ret": ("f05_percentual_retrabalho", _percentual),
+    "p_f05_h": ("f05_horas_retrabalho_por_unidade", float),
+    "p_f07_recl": ("f07_reclamacoes_clientes_ano", _inteiro),
+    "p_f07_custo": ("f07_custo_medio_por_reclamacao", float),
+    "p_f08_dem": ("f08_percentual_demanda_reprimida", _percentual_inteiro),
+    "p_f08_marg": ("f08_margem_contribuicao", _percentual_inteiro),
+    "p_f09_min": ("f09_minutos_ociosos_por_dia", float),
+    "p_f10_par": ("f10_paradas_mes", _inteiro),
+    "p_f10_dur": ("f10_duracao_media_parada_horas", float),
+    "p_f10_chp": ("f10_custo_hora_parada", float),
+    "p_f11_set": ("f11_setups_mes", _inteiro),
+    "p_f11_h": ("f11_horas_por_setup", float),
+    "p_f11_chp": ("f11_custo_hora_parada", float),
+    "p_f12_afast": ("f12_afastamentos_ano", _inteiro),
+    "p_f12_cafast": ("f12_custo_medio_afastamento", float),
+    "p_f12_acid": ("f12_acidentes_com_lesao_ano", _inteiro),
+    "p_f12_cacid": ("f12_custo_medio_acidente", float),
+    "p_f12_prob": ("f12_probabilidade_processo", _percentual_inteiro),
+    "p_f12_cproc": ("f12_custo_estimado_processo", float),
+    "p_f13_n": ("f13_num_empilhadeiras", _inteiro),
+    "p_f13_op": ("f13_custo_operador_mes", float),
+    "p_f13_eq": ("f13_custo_equipamento_mes", float),
+    "p_f13_en": ("f13_custo_energia_mes", float),
+    "p_f13_man": ("f13_custo_manutencao_mes", float),
+    "p_f14_n": ("f14_num_supervisores", _inteiro),
+    "p_f14_sal": ("f14_salario_supervisor", float),
+    "p_f15_epi": ("f15_custo_epi_ano_por_pessoa", float),
+    "p_f15_ex": ("f15_custo_exames_ano_por_pessoa", float),
+    "p_f16_a": ("f16_area_operacao_m2", float),
+    "p_f16_c": ("f16_custo_energia_m2_ano", float),
+    "p_f17_a": ("f17_area_m2", float),
+    "p_f17_c": ("f17_custo_m2_ano", float),
+    "p_f17_pct": ("f17_percentual_reducao_automacao", _percentual_inteiro),
+    "p_f18_p": ("f18_pessoas_envolvidas", _inteiro),
+    "p_f18_h": ("f18_horas_dia_tarefas_dados", float),
+}
+
+
+def valores_widgets(
+    cliente: ClienteBasicInfo,
+    processo: ProcessoAtual,
+    dores: DoresSelecionadas,
+    parametros: ParametrosDetalhados,
+    metas: MetasReducao,
+    investimento: InvestimentoAutomacao,
+) -> dict[str, Any]:
+    """
+    Valores do `session_state` (widgets por `key` + rascunho dos parâmetros) que reproduzem as entradas dadas.
+
+    Gravados antes da renderização, fazem os formulários exibirem — e devolverem — exatamente
+    essas entradas (ex.: ao abrir um link compartilhado e voltar às etapas anteriores).
+    """
+    fator_label = min(FATOR_ENCARGOS_OPCOES, key=lambda k: abs(FATOR_ENCARGOS_OPCOES[k] - cliente.fator_encargos))
+    valores: dict[str, Any] = {
+        "nome_cliente": cliente.nome_cliente,
+        "nome_projeto": cliente.nome_projeto,
+        "area_atuacao": cliente.area_atuacao,
+        "porte_empresa": next(k for k, v in _PORTES.items() if v == cliente.porte_empresa),
+        "fator_encargos": fator_label,
+        "regiao": cliente.regiao,
+        "modo_producao": _MODO_CADENCIA if processo.cadencia_producao is not None else _MODO_MENSAL,
+        "horas_turno": float(processo.horas_por_turno),
+        "turnos_dia": int(processo.turnos_por_dia),
+        "dias_ano": int(processo.dias_operacao_ano),
+        "pessoas_processo": int(processo.pessoas_processo_turno),
+        "pessoas_inspecao": int(processo.pessoas_inspecao_turno),
+        "supervisores_por_turno": int(processo.supervisores_por_turno),
+        "salario_operador": float(processo.salario_medio_operador),
+        "salario_inspetor": float(processo.salario_medio_inspetor),
+        "salario_supervisor": float(processo.salario_medio_supervisor),
+        "custo_unitario_peca": float(processo.custo_unitario_peca),
+        "custo_mp_peca": float(processo.custo_materia_prima_peca),
+        "preco_venda_peca": float(processo.preco_venda_peca or 0.0),
+        # Faturamento manual: reproduz o valor exato, mesmo que o auto-cálculo desse outro
+        "faturamento_usar_auto": False,
+        "faturamento_mensal_linha_manual": float(processo.faturamento_mensal_linha or 0.0),
+        "inv_min": float(investimento.valor_investimento_min),
+        "inv_max": float(investimento.valor_investimento_max),
+        "parametros_rascunho": replace(parametros),
+    }
+    if processo.cadencia_producao is not None:
+        valores["cadencia"] = float(processo.cadencia_producao)
+    if processo.producao_mensal is not None:
+        valores["producao_mensal"] = float(processo.producao_mensal)
+    for campo in fields(dores):
+        valores[campo.name[:3]] = getattr(dores, campo.name)  # "f01_mao_de_obra_direta" → "f01"
+    for campo in fields(metas):
+        valores[f"m_{campo.name[5:]}"] = _percentual_inteiro(getattr(metas, campo.name))  # "meta_f01" → "m_f01"
+    for chave, (campo, converter) in _WIDGETS_PARAMETROS.items():
+        valor = getattr(parametros, campo)
+        if valor is not None:
+            valores[chave] = converter(valor)
+    return valores
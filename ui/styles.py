@@ -31,6 +31,14 @@ def apply_custom_styles():
             border-radius: 8px;
         }
 
+        /* Painel de prévia do ROI (etapas 3–5) fixo no topo durante a rolagem */
+        [data-testid="stVerticalBlockBorderWrapper"]:has(.previa-roi):not(:has([data-testid="stVerticalBlockBorderWrapper"] .previa-roi)) {
+            position: sticky;
+            top: 3.5rem;
+            z-index: 99;
+            background-color: white;
+        }
+
         /* Botão primário */
         .stButton > button[kind="primary"] {
             background-color: #1f4e79;